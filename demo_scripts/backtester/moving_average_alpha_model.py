@@ -12,13 +12,17 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import numpy as np
+import pandas as pd
 import talib
+from numpy.lib.stride_tricks import as_strided
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel, AlphaModelSettings
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.qf_data_array import QFDataArray
 
 
 class MovingAverageAlphaModel(AlphaModel):
@@ -46,13 +50,57 @@ class MovingAverageAlphaModel(AlphaModel):
             raise ValueError('slow MA time period should be longer than fast MA time period')
 
     def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure) -> Exposure:
+        # both moving averages are calculated on the window of the last slow_time_period prices, so the models with
+        # the same slow_time_period may share them (if they use the same feature_cache)
         num_of_bars_needed = self.slow_time_period
-        close_tms = self.data_handler.historical_price(ticker, PriceField.Close, num_of_bars_needed)
+        fast_ma = self._get_feature(ticker, "EMA", (self.fast_time_period, num_of_bars_needed),
+                                    lambda: self._last_ema_value(ticker, self.fast_time_period, num_of_bars_needed))
+        slow_ma = self._get_feature(ticker, "EMA", (self.slow_time_period, num_of_bars_needed),
+                                    lambda: self._last_ema_value(ticker, self.slow_time_period, num_of_bars_needed))
 
-        fast_ma = talib.MA(close_tms, self.fast_time_period, matype=1)  # MA type: Exponential MA
-        slow_ma = talib.MA(close_tms, self.slow_time_period, matype=1)  # MA type: Exponential MA
-
-        if fast_ma[-1] > slow_ma[-1]:
+        if fast_ma > slow_ma:
             return Exposure.LONG
         else:
             return Exposure.SHORT
+
+    def _last_ema_value(self, ticker: Ticker, time_period: int, num_of_bars_needed: int) -> float:
+        close_tms = self._historical_price(ticker, PriceField.Close, num_of_bars_needed)
+        ema = talib.MA(close_tms, time_period, matype=1)  # MA type: Exponential MA
+        return ema[-1]
+
+    def calculate_exposures_vectorised(self, prices_data_array: QFDataArray) -> pd.DataFrame:
+        """
+        Vectorised version of calculate_exposure(). Both moving averages, which talib calculates on the window
+        of the last slow_time_period close prices (the exponential MA is seeded with the simple average of the first
+        fast_time_period prices in the window), are linear combinations of the prices in the window, so they are
+        calculated for all the dates and tickers at once as dot products of rolling windows and weights.
+        The exposures are NaN on the dates for which the window isn't full or contains missing prices.
+        """
+        close_prices = prices_data_array.loc[:, :, PriceField.Close].values.astype(np.float64)
+        num_of_dates, num_of_tickers = close_prices.shape
+        window_length = self.slow_time_period
+
+        alpha = 2.0 / (self.fast_time_period + 1)
+        fast_weights = np.empty(window_length)
+        fast_weights[:self.fast_time_period] = \
+            (1 - alpha) ** (window_length - self.fast_time_period) / self.fast_time_period
+        fast_weights[self.fast_time_period:] = \
+            alpha * (1 - alpha) ** np.arange(window_length - self.fast_time_period - 1, -1, -1)
+        slow_weights = np.full(window_length, 1.0 / window_length)
+
+        fast_ma = np.full((num_of_dates, num_of_tickers), np.nan)
+        slow_ma = np.full((num_of_dates, num_of_tickers), np.nan)
+        if num_of_dates >= window_length:
+            row_stride, column_stride = close_prices.strides
+            windows = as_strided(close_prices, shape=(num_of_dates - window_length + 1, window_length, num_of_tickers),
+                                 strides=(row_stride, row_stride, column_stride))
+            fast_ma[window_length - 1:] = np.einsum("dwt,w->dt", windows, fast_weights)
+            slow_ma[window_length - 1:] = np.einsum("dwt,w->dt", windows, slow_weights)
+
+        with np.errstate(invalid='ignore'):
+            exposures = np.where(fast_ma > slow_ma, Exposure.LONG.value, Exposure.SHORT.value).astype(np.float64)
+        # on the dates without enough history the exposures are calculated by calculate_exposure()
+        exposures[np.isnan(fast_ma) | np.isnan(slow_ma)] = np.nan
+
+        return pd.DataFrame(data=exposures, index=prices_data_array.dates.to_index(),
+                            columns=prices_data_array.tickers.to_index())
@@ -13,14 +13,18 @@
 #     limitations under the License.
 
 from abc import abstractmethod, ABCMeta
-from typing import Sequence, Dict
+from typing import Sequence, Dict, Optional, Tuple, Callable, Any, Union
+
+import pandas as pd
 
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.alpha_model.feature_cache import FeatureCache
 from qf_lib.backtesting.alpha_model.signal import Signal
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
+from qf_lib.containers.qf_data_array import QFDataArray
 
 
 class AlphaModelSettings(object):
@@ -58,6 +62,9 @@ class AlphaModel(object, metaclass=ABCMeta):
     settings = None  # type: AlphaModelSettings
     "holds parameters of a parametrized model used in production"
 
+    feature_cache = None  # type: Optional[FeatureCache]
+    "if set, the features (e.g. ATR) are taken from the cache, which may be shared with other AlphaModels"
+
     def __init__(self, risk_estimation_factor: float, data_handler: DataHandler):
         """
         Parameters
@@ -112,6 +119,30 @@ class AlphaModel(object, metaclass=ABCMeta):
         """
         pass
 
+    def calculate_exposures_vectorised(self, prices_data_array: QFDataArray) -> Optional[pd.DataFrame]:
+        """
+        Optional, vectorised counterpart of calculate_exposure(), used by the FastAlphaModelTester to calculate
+        the exposures for all the dates and tickers at once instead of calling calculate_exposure() date by date
+        and ticker by ticker.
+
+        The value for a given date and ticker must be equal to the value of the Exposure which would be returned by
+        calculate_exposure() called on that date (so it may be based on the prices up to and including that date).
+        Only the models whose exposures don't depend on the current_exposure can implement this method.
+        The values which can't be calculated from the given prices (e.g. on the first dates, for which the history
+        is too short) should be NaN: the FastAlphaModelTester calculates them with calculate_exposure().
+
+        Parameters
+        ----------
+        prices_data_array
+            QFDataArray (dates x tickers x fields) with all the prices (OHLCV) available for the backtest
+
+        Returns
+        -------
+            DataFrame indexed with dates with a column for each ticker, containing values of Exposures
+            (e.g. 1.0 for Exposure.LONG) or None (default) if the model doesn't support the vectorised calculation
+        """
+        return None
+
     def calculate_fraction_at_risk(self, ticker: Ticker) -> float:
         """
         Returns the float value which determines the risk factor for an AlphaModel and a specified Ticker,
@@ -150,11 +181,32 @@ class AlphaModel(object, metaclass=ABCMeta):
             multiplied by the risk_estimation_factor, being a property of each AlphaModel:
             fraction_at_risk = ATR / last_close * risk_estimation_factor
         """
-        num_of_bars_needed = time_period + 1
-        fields = [PriceField.High, PriceField.Low, PriceField.Close]
-        prices_df = self.data_handler.historical_price(ticker, fields, num_of_bars_needed)
-        fraction_at_risk = average_true_range(prices_df, normalized=True) * self.risk_estimation_factor
+        def calculate_normalized_atr():
+            num_of_bars_needed = time_period + 1
+            fields = [PriceField.High, PriceField.Low, PriceField.Close]
+            prices_df = self.data_handler.historical_price(ticker, fields, num_of_bars_needed)
+            return average_true_range(prices_df, normalized=True)
+
+        normalized_atr = self._get_feature(ticker, "NATR", (time_period,), calculate_normalized_atr)
+        fraction_at_risk = normalized_atr * self.risk_estimation_factor
         return fraction_at_risk
 
+    def _get_feature(self, ticker: Ticker, feature_name: str, params: Tuple, calculate_feature: Callable[[], Any]):
+        """
+        Returns the feature from the feature_cache (see: FeatureCache.get_feature()) or, if the model doesn't use
+        the cache, just calculates it with calculate_feature().
+        """
+        if self.feature_cache is None:
+            return calculate_feature()
+        return self.feature_cache.get_feature(ticker, feature_name, params, calculate_feature)
+
+    def _historical_price(self, ticker: Ticker, fields: Union[PriceField, Sequence[PriceField]], nr_of_bars: int):
+        """
+        Returns the result of DataHandler.historical_price() for the ticker, using the feature_cache if it is set.
+        """
+        if self.feature_cache is None:
+            return self.data_handler.historical_price(ticker, fields, nr_of_bars)
+        return self.feature_cache.historical_price(ticker, fields, nr_of_bars)
+
     def __str__(self):
         return self.__class__.__name__
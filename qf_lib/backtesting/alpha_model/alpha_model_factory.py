@@ -12,7 +12,8 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import Type
+import copy
+from typing import Type, Optional
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
@@ -31,3 +32,12 @@ class AlphaModelFactory(object):
                            risk_estimation_factor=model_type.settings.risk_estimation_factor,
                            data_handler=self.data_handler)
         return model
+
+    def with_data_handler(self, data_handler: Optional[DataHandler]) -> "AlphaModelFactory":
+        """
+        Returns a copy of the factory, which passes the given data_handler to the created models (e.g. the factory
+        sent to the worker processes of the FastAlphaModelTester, which create their own data handlers).
+        """
+        factory = copy.copy(self)
+        factory.data_handler = data_handler
+        return factory
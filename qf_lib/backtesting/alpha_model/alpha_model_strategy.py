@@ -12,11 +12,12 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import List, Dict, Sequence
+from typing import List, Dict, Sequence, Mapping
 
 import numpy as np
 
 from qf_lib.backtesting.alpha_model.signal import Signal
+from qf_lib.backtesting.alpha_model.signal_recorder import SignalRecorder
 from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.portfolio.position import Position
 from qf_lib.backtesting.trading_session.trading_session import TradingSession
@@ -56,12 +57,25 @@ class AlphaModelStrategy(object):
 
         self._model_tickers_dict = model_tickers_dict
         self._use_stop_losses = use_stop_losses
-        self.signals_df = QFDataFrame()  # rows indexed by date and columns by "Ticker@AlphaModel" string
+        self.signal_recorder = SignalRecorder()
 
         ts.notifiers.scheduler.subscribe(BeforeMarketOpenEvent, listener=self)
         self.logger = qf_logger.getChild(self.__class__.__name__)
         self._log_configuration()
 
+    @property
+    def signals_df(self) -> QFDataFrame:
+        """
+        DataFrame of all the generated Signals, with rows indexed by date and columns by "Ticker@AlphaModel" string.
+        It is created from the SignalRecorder when it is requested.
+        """
+        return self.signal_recorder.signals_df()
+
+    @property
+    def alpha_models(self) -> List[AlphaModel]:
+        """ AlphaModels used by the strategy. """
+        return list(self._model_tickers_dict.keys())
+
     def on_before_market_open(self, _: BeforeMarketOpenEvent=None):
         self.logger.info("on_before_market_open - Signals Generation Started")
         signals = self._calculate_signals()
@@ -74,7 +88,7 @@ class AlphaModelStrategy(object):
         self.logger.info("on_before_market_open - Orders Placed")
 
     def _calculate_signals(self):
-        current_positions = self._broker.get_positions()
+        current_positions = self._broker.get_positions_by_contract()
         signals = []
 
         for model, tickers in self._model_tickers_dict.items():
@@ -107,16 +121,12 @@ class AlphaModelStrategy(object):
     def _save_signals(self, signals: List[Signal]):
         for signal in signals:
             self.logger.info(signal)
-            column = signal.ticker.as_string() + "@" + signal.alpha_model.__class__.__name__
-            self.signals_df.loc[self._timer.now().date(), column] = signal  # save signals
+        self.signal_recorder.record(self._timer.now().date(), signals)
 
     @staticmethod
-    def _get_current_exposure(contract: Contract, current_positions: List[Position]) -> Exposure:
-        matching_position_quantities = [position.quantity()
-                                        for position in current_positions if position.contract() == contract]
-
-        assert len(matching_position_quantities) in [0, 1]
-        quantity = next(iter(matching_position_quantities), 0)
+    def _get_current_exposure(contract: Contract, current_positions: Mapping[Contract, Position]) -> Exposure:
+        position = current_positions.get(contract)
+        quantity = position.quantity() if position is not None else 0
         current_exposure = Exposure(np.sign(quantity))
         return current_exposure
 
@@ -0,0 +1,123 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Sequence, Tuple, Union
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.series.prices_series import PricesSeries
+
+
+class FeatureCache(object):
+    """
+    Cache of features (e.g. technical indicators like ATR, or windows of historical prices) calculated by AlphaModels
+    from the data provided by the DataHandler. Features are identified by the key: (ticker, feature name, parameters,
+    current time of the DataHandler's timer), so the same FeatureCache may be shared by many AlphaModels (e.g. all
+    the models tested by the FastAlphaModelTester) and identical computations are done only once.
+
+    When the number of cached features exceeds the max_size, the least recently used features are evicted.
+    """
+
+    HISTORICAL_PRICE = "historical_price"
+
+    def __init__(self, data_handler: DataHandler, max_size: int = 100000):
+        """
+        Parameters
+        ----------
+        data_handler
+            DataHandler which provides data for the features and the timer, which defines the current time
+        max_size
+            maximal number of cached features
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.data_handler = data_handler
+        self.max_size = max_size
+
+        self._features = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """ Number of features which were found in the cache. """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """ Number of features which had to be calculated. """
+        return self._misses
+
+    @property
+    def size(self) -> int:
+        """ Number of currently cached features. """
+        return len(self._features)
+
+    def get_feature(self, ticker: Ticker, feature_name: str, params: Tuple[Hashable, ...],
+                    calculate_feature: Callable[[], Any]) -> Any:
+        """
+        Returns the feature for the ticker at the current time. If it isn't cached yet, it is calculated
+        with calculate_feature() and put into the cache.
+
+        Parameters
+        ----------
+        ticker
+            ticker for which the feature is calculated
+        feature_name
+            name of the feature (e.g. "NATR")
+        params
+            tuple of all the parameters on which the value of the feature depends (e.g. the time period of ATR)
+        calculate_feature
+            function calculating the feature, called only if the feature isn't cached
+        """
+        key = (ticker, feature_name, params, self.data_handler.timer.now())
+
+        try:
+            feature = self._features[key]
+        except KeyError:
+            self._misses += 1
+            feature = calculate_feature()
+            self._features[key] = feature
+            if len(self._features) > self.max_size:
+                self._features.popitem(last=False)
+        else:
+            self._hits += 1
+            self._features.move_to_end(key)
+
+        return feature
+
+    def historical_price(self, ticker: Ticker, fields: Union[PriceField, Sequence[PriceField]],
+                         nr_of_bars: int) -> Union[PricesSeries, PricesDataFrame]:
+        """
+        Cached DataHandler.historical_price(...) for a single ticker. A copy of the cached container is returned,
+        so it may be safely modified.
+        """
+        fields_key = tuple(fields) if isinstance(fields, Sequence) else fields
+        prices = self.get_feature(ticker, self.HISTORICAL_PRICE, (fields_key, nr_of_bars),
+                                  lambda: self.data_handler.historical_price(ticker, fields, nr_of_bars))
+        return prices.copy()
+
+    def clear(self):
+        """ Removes all the cached features and resets the counters. """
+        self._features.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def __str__(self):
+        return "{}: {} features cached, {} hits, {} misses".format(
+            self.__class__.__name__, self.size, self.hits, self.misses)
@@ -0,0 +1,150 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from datetime import date
+from typing import Dict, Hashable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.alpha_model.signal import Signal
+from qf_lib.containers.chunked_array import ChunkedArray
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class SignalRecorder(object):
+    """
+    Records the Signals generated by AlphaModels in columnar arrays (date id, ticker id, model id, exposure code,
+    fraction at risk, confidence, expected move) instead of keeping the Signal objects. The DataFrames of signals,
+    exposures and fractions at risk are created only when they are requested (and cached until new signals are
+    recorded).
+
+    The DataFrames are indexed by dates and have a column for every "Ticker@AlphaModel" pair (in the order in which
+    the pairs occurred). If more than one signal was recorded for the same date and column, the last one is kept.
+    """
+
+    def __init__(self, chunk_size: int = 4096):
+        self._columns = {
+            "date_id": ChunkedArray(np.int64, chunk_size),
+            "ticker_id": ChunkedArray(np.int64, chunk_size),
+            "model_id": ChunkedArray(np.int64, chunk_size),
+            "exposure": ChunkedArray(np.int8, chunk_size),
+            "fraction_at_risk": ChunkedArray(np.float64, chunk_size),
+            "confidence": ChunkedArray(np.float64, chunk_size),
+            "expected_move": ChunkedArray(np.float64, chunk_size)
+        }  # type: Dict[str, ChunkedArray]
+
+        self._dates = []  # type: List[date]
+        self._tickers = []
+        self._models = []
+        self._ids = {"date_id": {}, "ticker_id": {}, "model_id": {}}  # type: Dict[str, Dict[Hashable, int]]
+
+        self._signals_df = None  # type: QFDataFrame
+
+    def record(self, signal_date: date, signals: Sequence[Signal]):
+        """ Records the signals generated on the given date. """
+        if len(signals) == 0:
+            return
+
+        date_id = self._get_id("date_id", signal_date, self._dates)
+        for signal in signals:
+            self._columns["date_id"].append(date_id)
+            self._columns["ticker_id"].append(self._get_id("ticker_id", signal.ticker, self._tickers))
+            self._columns["model_id"].append(self._get_id("model_id", signal.alpha_model, self._models))
+            self._columns["exposure"].append(signal.suggested_exposure.value)
+            self._columns["fraction_at_risk"].append(signal.fraction_at_risk)
+            self._columns["confidence"].append(signal.confidence)
+            self._columns["expected_move"].append(
+                np.nan if signal.expected_move is None else signal.expected_move)
+
+        self._signals_df = None
+
+    def signals_df(self) -> QFDataFrame:
+        """ Returns the DataFrame of Signals (rows indexed by dates, columns by "Ticker@AlphaModel" strings). """
+        if self._signals_df is None:
+            signals = np.empty(len(self), dtype=object)
+            signals[:] = [self._create_signal(i) for i in range(len(self))]
+            self._signals_df = self._to_data_frame(signals, dtype=object)
+        return self._signals_df
+
+    def exposures_df(self) -> QFDataFrame:
+        """ Returns the DataFrame of names of suggested exposures (e.g. "LONG"). """
+        # exposure codes are the values of the Exposure (-1, 0, 1), shifted by 1 they are positions in the array
+        exposure_names = np.empty(3, dtype=object)
+        for exposure in Exposure:
+            exposure_names[int(exposure.value) + 1] = exposure.name
+
+        names = exposure_names[self._columns["exposure"].values().astype(np.int64) + 1]
+        return self._to_data_frame(names, dtype=object)
+
+    def fractions_at_risk_df(self) -> QFDataFrame:
+        """ Returns the DataFrame of fractions at risk. """
+        return self._to_data_frame(self._columns["fraction_at_risk"].values(), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._columns["date_id"])
+
+    def _get_id(self, column_name: str, key: Hashable, keys: List) -> int:
+        ids = self._ids[column_name]
+        key_id = ids.get(key)
+        if key_id is None:
+            key_id = len(keys)
+            keys.append(key)
+            ids[key] = key_id
+        return key_id
+
+    def _create_signal(self, index: int) -> Signal:
+        expected_move = self._columns["expected_move"][index]
+        return Signal(
+            ticker=self._tickers[self._columns["ticker_id"][index]],
+            suggested_exposure=Exposure(float(self._columns["exposure"][index])),
+            fraction_at_risk=self._columns["fraction_at_risk"][index].item(),
+            confidence=self._columns["confidence"][index].item(),
+            expected_move=None if np.isnan(expected_move) else expected_move.item(),
+            alpha_model=self._models[self._columns["model_id"][index]]
+        )
+
+    def _to_data_frame(self, values: np.ndarray, dtype) -> QFDataFrame:
+        """ Scatters the recorded values into a dates x columns frame. """
+        ticker_ids = self._columns["ticker_id"].values()
+        model_ids = self._columns["model_id"].values()
+
+        # columns are identified by their names, so that all the models of the same type share the columns
+        number_of_models = max(len(self._models), 1)
+        pair_codes = ticker_ids * number_of_models + model_ids
+        unique_pair_codes, first_occurrences, pair_indices = np.unique(
+            pair_codes, return_index=True, return_inverse=True)
+        names_of_pairs = [self._column_name(code // number_of_models, code % number_of_models)
+                          for code in unique_pair_codes]
+
+        # order of columns: order of the first occurrence
+        column_names = []
+        column_ids = {}
+        for pair_index in np.argsort(first_occurrences, kind="stable"):
+            name = names_of_pairs[pair_index]
+            if name not in column_ids:
+                column_ids[name] = len(column_names)
+                column_names.append(name)
+        pair_to_column = np.array([column_ids[name] for name in names_of_pairs], dtype=np.int64)
+
+        data = np.full((len(self._dates), len(column_names)), np.nan, dtype=dtype)
+        data[self._columns["date_id"].values(), pair_to_column[pair_indices]] = values
+
+        dates_index = np.empty(len(self._dates), dtype=object)
+        dates_index[:] = self._dates
+        return QFDataFrame(data=data, index=pd.Index(dates_index), columns=pd.Index(column_names, dtype=object))
+
+    def _column_name(self, ticker_id: int, model_id: int) -> str:
+        return self._tickers[ticker_id].as_string() + "@" + self._models[model_id].__class__.__name__
@@ -12,9 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import List, Optional, Sequence
+from types import MappingProxyType
+from typing import List, Optional, Sequence, Mapping
 
 from qf_lib.backtesting.broker.broker import Broker
+from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.execution_handler.execution_handler import ExecutionHandler
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
@@ -26,12 +28,25 @@ class BacktestBroker(Broker):
         self.portfolio = portfolio
         self.execution_handler = execution_handler
 
+        self._positions_by_contract = None  # type: Mapping[Contract, Position]
+        self._positions_version = None
+
     def get_portfolio_value(self) -> Optional[float]:
         return self.portfolio.net_liquidation
 
     def get_positions(self) -> List[Position]:
         return list(self.portfolio.open_positions_dict.values())
 
+    def get_positions_by_contract(self) -> Mapping[Contract, Position]:
+        """
+        Returns the read-only snapshot of the open positions keyed by their contracts. The snapshot is shared
+        by all the callers and created again only after a position was opened or closed in the portfolio.
+        """
+        if self._positions_version != self.portfolio.open_positions_version:
+            self._positions_by_contract = MappingProxyType(dict(self.portfolio.open_positions_dict))
+            self._positions_version = self.portfolio.open_positions_version
+        return self._positions_by_contract
+
     def place_orders(self, orders: Sequence[Order]) -> Sequence[int]:
         id_list = self.execution_handler.accept_orders(orders)
         return id_list
@@ -13,8 +13,9 @@
 #     limitations under the License.
 
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Mapping
 
+from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.portfolio.position import Position
 
@@ -28,6 +29,13 @@ class Broker(object, metaclass=ABCMeta):
     def get_positions(self) -> List[Position]:
         pass
 
+    def get_positions_by_contract(self) -> Mapping[Contract, Position]:
+        """
+        Returns the current positions keyed by their contracts. Use it instead of searching the list returned by
+        get_positions() for the position of a given contract.
+        """
+        return {position.contract(): position for position in self.get_positions()}
+
     @abstractmethod
     def place_orders(self, orders: Sequence[Order]) -> Sequence[int]:
         pass
@@ -0,0 +1,148 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from datetime import datetime
+from typing import Sequence, Optional
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.array_bar_store import ArrayBarStore
+
+
+class CurrentPricesCursor(object):
+    """
+    Incremental cache of the current and the last available prices, used by the DataHandler when all the data
+    is preloaded (see: DataHandler.use_data_bundle()).
+
+    Open and Close prices are treated as a single stream of prices: the Open price of a bar becomes available at
+    the time of the MarketOpenEvent and the Close price at the time of the MarketCloseEvent. The cursor points to the
+    latest price which is available at the current time and for every ticker it keeps the latest valid (non-NaN)
+    price together with the date of the bar it comes from. When the time moves forward, only the prices between
+    the old and the new position of the cursor are processed. When the time moves backwards, the cursor is rewound.
+
+    The results are the same as the ones calculated by DataHandler from the 7-day window of prices (prices older
+    than 7 days are not considered to be available).
+    """
+
+    def __init__(self, data: QFDataArray, lookback_window: RelativeDelta = RelativeDelta(days=7)):
+        """
+        Parameters
+        ----------
+        data
+            QFDataArray which contains at least the Open and Close prices
+        lookback_window
+            prices of bars older than (today - lookback_window) are never returned as the last available prices
+        """
+        bar_store = ArrayBarStore(data)
+        tickers = bar_store.tickers
+        dates_index, values = bar_store.get_values(tickers, [PriceField.Open, PriceField.Close])
+
+        open_times = self._to_int64([date + MarketOpenEvent.trigger_time() for date in dates_index])
+        close_times = self._to_int64([date + MarketCloseEvent.trigger_time() for date in dates_index])
+        bar_dates = self._to_int64(dates_index)
+
+        times = np.concatenate([open_times, close_times])
+        order = np.argsort(times, kind="mergesort")
+
+        self._times = times[order]
+        self._bar_dates = np.concatenate([bar_dates, bar_dates])[order]
+        self._prices = np.concatenate([values[:, :, 0], values[:, :, 1]]).astype(np.float64)[order]
+        self._ticker_to_position = {ticker: i for i, ticker in enumerate(tickers)}
+        self._lookback_window = lookback_window
+
+        self._position = 0
+        self._last_prices = None  # type: Optional[np.ndarray]
+        self._last_bar_dates = None  # type: Optional[np.ndarray]
+        self._rewind()
+
+    def contains(self, tickers: Sequence[Ticker]) -> bool:
+        """ Returns True if all the tickers are in the cursor. """
+        return all(ticker in self._ticker_to_position for ticker in tickers)
+
+    def is_price_time(self, current_datetime: datetime) -> bool:
+        """ Returns True if the current_datetime is the time of the market open or market close of some bar. """
+        current_time = pd.Timestamp(current_datetime).value
+        position = int(np.searchsorted(self._times, current_time, side="left"))
+        return position < len(self._times) and self._times[position] == current_time
+
+    def current_prices(self, tickers: Sequence[Ticker], current_datetime: datetime) -> np.ndarray:
+        """
+        Returns the prices (Open or Close) for the current_datetime. If the current_datetime is not the time of
+        the market open or market close for which the bar is available, NaNs are returned.
+        """
+        self._move_to(current_datetime)
+        tickers_positions = self._tickers_positions(tickers)
+
+        if self._position > 0 and self._times[self._position - 1] == pd.Timestamp(current_datetime).value:
+            return self._prices[self._position - 1, tickers_positions]
+        return np.full(len(tickers_positions), np.nan)
+
+    def last_available_prices(self, tickers: Sequence[Ticker], current_datetime: datetime) -> np.ndarray:
+        """
+        Returns the latest available prices (Open or Close) for the current_datetime. NaN is returned only if there
+        were no valid prices within the lookback window.
+        """
+        prices = self.current_prices(tickers, current_datetime)
+        tickers_positions = self._tickers_positions(tickers)
+
+        current_date = datetime(current_datetime.year, current_datetime.month, current_datetime.day)
+        oldest_bar_date = pd.Timestamp(current_date - self._lookback_window).value
+
+        unavailable_prices = np.isnan(prices)
+        last_prices = self._last_prices[tickers_positions]
+        last_prices[self._last_bar_dates[tickers_positions] < oldest_bar_date] = np.nan
+        prices[unavailable_prices] = last_prices[unavailable_prices]
+
+        return prices
+
+    def _move_to(self, current_datetime: datetime):
+        new_position = int(np.searchsorted(self._times, pd.Timestamp(current_datetime).value, side="right"))
+        if new_position < self._position:
+            self._rewind()
+
+        if new_position > self._position:
+            self._update_last_prices(self._position, new_position)
+            self._position = new_position
+
+    def _update_last_prices(self, start_position: int, end_position: int):
+        prices = self._prices[start_position:end_position]
+        is_valid = ~np.isnan(prices)
+
+        has_valid_price = is_valid.any(axis=0)
+        last_valid_rows = len(prices) - 1 - np.argmax(is_valid[::-1], axis=0)
+
+        tickers_positions = np.flatnonzero(has_valid_price)
+        rows = last_valid_rows[has_valid_price]
+        self._last_prices[tickers_positions] = prices[rows, tickers_positions]
+        self._last_bar_dates[tickers_positions] = self._bar_dates[start_position + rows]
+
+    def _rewind(self):
+        num_of_tickers = len(self._ticker_to_position)
+        self._position = 0
+        self._last_prices = np.full(num_of_tickers, np.nan)
+        self._last_bar_dates = np.full(num_of_tickers, np.iinfo(np.int64).min, dtype=np.int64)
+
+    def _tickers_positions(self, tickers: Sequence[Ticker]) -> np.ndarray:
+        return np.array([self._ticker_to_position[ticker] for ticker in tickers], dtype=np.intp)
+
+    @staticmethod
+    def _to_int64(dates: Sequence[datetime]) -> np.ndarray:
+        return pd.DatetimeIndex(dates).values.astype("datetime64[ns]").view(np.int64)
@@ -13,13 +13,16 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import Union, Sequence, Type
+from typing import Union, Sequence, Type, Dict
 
+import numpy as np
 import pandas as pd
 
+from qf_lib.backtesting.data_handler.current_prices_cursor import CurrentPricesCursor
 from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
 from qf_lib.backtesting.events.time_event.regular_time_event import RegularTimeEvent
+from qf_lib.backtesting.events.time_event.trading_calendar import TradingCalendar
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
@@ -27,6 +30,7 @@ from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import TICKERS
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.cast_series import cast_series
 from qf_lib.containers.series.prices_series import PricesSeries
@@ -45,31 +49,46 @@ class DataHandler(DataProvider):
     The goal of a DataHandler is to provide backtester's components with financial data. It also makes sure that
     no data from the future (relative to a "current" time of a backtester) is being accessed, that is: that there
     is no look-ahead bias.
+
+    If the TradingCalendar is given, the latest market events (e.g. the latest MarketCloseEvent) are looked up
+    in its precomputed trigger times, so the exchange holidays defined in the calendar are taken into account.
     """
 
-    def __init__(self, price_data_provider: DataProvider, timer: Timer):
+    def __init__(self, price_data_provider: DataProvider, timer: Timer, trading_calendar: TradingCalendar = None):
         self._initial_data_provider = price_data_provider
         self.price_data_provider = price_data_provider
         self.timer = timer
-        self.time_helper = _DataHandlerTimeHelper(timer)
+        self.time_helper = _DataHandlerTimeHelper(timer, trading_calendar)
 
         self.is_optimised = False
+        self._current_prices_cursor = None  # type: CurrentPricesCursor
+        self._todays_bars_cache = _TodaysBarsCache()
 
     def use_data_bundle(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
-                        start_date: datetime, end_date: datetime):
+                        start_date: datetime, end_date: datetime, use_array_bar_store: bool = False):
         """
         Optimises running of the backtest. All the data will be downloaded before the backtest.
         Note that requesting during the backtest any other ticker or price field than the ones in the params
         of this function will result in an Exception.
+
+        If use_array_bar_store is True, the downloaded data is kept in the ArrayBarStore (numpy arrays instead of
+        the QFDataArray), which makes the queries faster for big universes of tickers.
+
+        If both Open and Close prices are in the bundle, get_last_available_price() and get_current_price() are
+        answered by the CurrentPricesCursor, which follows the timer and updates the latest prices incrementally.
         """
         assert not self.is_optimised, "Multiple calls on use_data_bundle() are forbidden"
 
         tickers, _ = convert_to_list(tickers, Ticker)
         fields, _ = convert_to_list(fields, PriceField)
         self.price_data_provider = PrefetchingDataProvider(
-            self._initial_data_provider, tickers, fields, start_date, end_date)
+            self._initial_data_provider, tickers, fields, start_date, end_date,
+            use_array_bar_store=use_array_bar_store)
         self.is_optimised = True
 
+        if PriceField.Open in fields and PriceField.Close in fields:
+            self._current_prices_cursor = CurrentPricesCursor(self.price_data_provider.data_bundle)
+
     def historical_price(
             self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
             nr_of_bars: int) -> Union[PricesSeries, PricesDataFrame, QFDataArray]:
@@ -215,6 +234,25 @@ class DataHandler(DataProvider):
 
         return last_available_bars
 
+    def get_bar_values_for_today(self, tickers: Sequence[Ticker], field: PriceField) -> np.ndarray:
+        """
+        Returns the values of the field in today's bars (see: get_bar_for_today()) of given tickers, as an array aligned
+        with the tickers (NaN if the value is not available). The tickers may repeat.
+
+        The bars are cached until the current time changes, so that only the bars of the tickers, which were not
+        requested before, are downloaded (e.g. the volumes for the slippage model and the prices for the executors
+        evaluated on the same bar are taken from the same cache).
+        """
+        current_datetime = self.timer.now()
+        if self._todays_bars_cache.time != current_datetime:
+            self._todays_bars_cache = _TodaysBarsCache(current_datetime)
+
+        missing_tickers = self._todays_bars_cache.missing_tickers(tickers)
+        if missing_tickers:
+            self._todays_bars_cache.add(missing_tickers, self.get_bar_for_today(missing_tickers))
+
+        return self._todays_bars_cache.values(tickers, field)
+
     def _get_end_date_without_look_ahead(self, end_date):
         latest_available_market_close = self.time_helper.datetime_of_latest_market_event(MarketCloseEvent)
         if end_date is not None:
@@ -232,6 +270,11 @@ class DataHandler(DataProvider):
             return pd.Series()
 
         current_datetime = self.timer.now()
+
+        if self._current_prices_cursor is not None and self._current_prices_cursor.contains(tickers):
+            return self._get_single_date_price_from_cursor(
+                tickers, was_single_ticker_provided, current_datetime, nans_allowed)
+
         current_date = self._zero_out_time_component(current_datetime)
 
         start_date = current_date - RelativeDelta(days=7)
@@ -267,6 +310,27 @@ class DataHandler(DataProvider):
         else:
             return prices_series
 
+    def _get_single_date_price_from_cursor(
+            self, tickers: Sequence[Ticker], was_single_ticker_provided: bool, current_datetime: datetime,
+            nans_allowed: bool) -> Union[float, pd.Series]:
+        if nans_allowed:
+            prices = self._current_prices_cursor.current_prices(tickers, current_datetime)
+            name = "Current asset prices"
+        else:
+            prices = self._current_prices_cursor.last_available_prices(tickers, current_datetime)
+            name = "Last available asset prices"
+
+        if was_single_ticker_provided:
+            return prices[0]
+
+        # the same labels and dtype as in case of the prices taken from the 7-day window: if there is a bar at
+        # the current time, the prices come from the row of the DataFrame of prices (of the object dtype, with
+        # the index of tickers); otherwise a Series of NaNs is created for the tickers
+        if self._current_prices_cursor.is_price_time(current_datetime):
+            return pd.Series(data=prices, index=pd.Index(tickers, name=TICKERS), name=name, dtype=object)
+        else:
+            return pd.Series(data=prices, index=tickers, name=name)
+
     def _zero_out_time_component(self, current_datetime):
         # below the time component is zeroed-out because most of data providers expect it to be so
         current_date = datetime(current_datetime.year, current_datetime.month, current_datetime.day)
@@ -286,7 +350,7 @@ class DataHandler(DataProvider):
 
         new_dates = market_open_datetimes + market_close_datetimes
 
-        prices_df = PricesDataFrame(index=new_dates, columns=prices_data_array.tickers)
+        prices_df = PricesDataFrame(index=new_dates, columns=pd.Index(prices_data_array.tickers.values, name=TICKERS))
         prices_df.loc[market_open_datetimes, :] = prices_data_array.loc[:, :, PriceField.Open].values
         prices_df.loc[market_close_datetimes, :] = prices_data_array.loc[:, :, PriceField.Close].values
 
@@ -303,14 +367,20 @@ class _DataHandlerTimeHelper(object):
     that is logic which makes sure that no data from the future is accessed in the backtest.
     """
 
-    def __init__(self, timer: Timer):
+    def __init__(self, timer: Timer, trading_calendar: TradingCalendar = None):
         self.timer = timer
+        self.trading_calendar = trading_calendar
 
     def datetime_of_latest_market_event(self, event_class: Type[RegularTimeEvent]):
-        time_of_event = event_class.trigger_time()
-
         now = self.timer.now()
 
+        if self.trading_calendar is not None:
+            latest_market_event = self.trading_calendar.latest_trigger_time(event_class, now)
+            if latest_market_event is not None:
+                return latest_market_event
+
+        time_of_event = event_class.trigger_time()
+
         today_market_event = now + time_of_event
         yesterday_market_event = today_market_event - RelativeDelta(days=1)
 
@@ -320,3 +390,35 @@ class _DataHandlerTimeHelper(object):
             latest_available_market_event = today_market_event
 
         return latest_available_market_event
+
+
+class _TodaysBarsCache(object):
+    """
+    OHLCV bars of the tickers for a single point in time, kept in an array (tickers x fields).
+    """
+
+    def __init__(self, time: datetime = None):
+        self.time = time
+        self._ticker_to_row = {}  # type: Dict[Ticker, int]
+        self._bars = np.empty((0, len(PriceField.ohlcv())))
+        self._field_to_column = {field: column for column, field in enumerate(PriceField.ohlcv())}
+
+    def missing_tickers(self, tickers: Sequence[Ticker]) -> Sequence[Ticker]:
+        return [ticker for ticker in dict.fromkeys(tickers) if ticker not in self._ticker_to_row]
+
+    def add(self, tickers: Sequence[Ticker], bars_df: pd.DataFrame):
+        # the array is filled element by element, because tickers would be treated as sequences by numpy
+        tickers_array = np.empty(len(tickers), dtype=object)
+        tickers_array[:] = tickers
+
+        # None values (no bar for today) become NaNs
+        bars = bars_df.reindex(index=pd.Index(tickers_array), columns=PriceField.ohlcv()).values.astype(np.float64)
+
+        first_row = len(self._bars)
+        self._ticker_to_row.update((ticker, first_row + i) for i, ticker in enumerate(tickers))
+        self._bars = np.concatenate([self._bars, bars])
+
+    def values(self, tickers: Sequence[Ticker], field: PriceField) -> np.ndarray:
+        ticker_to_row = self._ticker_to_row
+        rows = np.fromiter((ticker_to_row[ticker] for ticker in tickers), dtype=np.intp, count=len(tickers))
+        return self._bars[rows, self._field_to_column[field]]
@@ -0,0 +1,110 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from time import perf_counter
+
+from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTradingEvent
+from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_flow_controller import BacktestTimeFlowController
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+
+
+class BacktestEventLoop(object):
+    """
+    Event loop of a backtest, which dispatches TimeEvents directly to the listeners subscribed in the Scheduler,
+    without putting them into the EventManager's queue. The schedule of all TimeEvents between the current time
+    and the end of the backtest is computed at once (see: Scheduler.get_schedule()). The listeners are notified
+    in the same order as in the standard loop (TradingSession.start_trading()).
+
+    Events published in the EventManager by the listeners are dispatched by the EventManager after each TimeEvent.
+    If the subscriptions of the Scheduler change during the backtest, the remaining part of the schedule is
+    recomputed.
+
+    The loop can only be used if there are no other listeners of EmptyQueueEvents than the BacktestTimeFlowController
+    and no listeners of all events (see: is_applicable()), because these events are not generated by the loop.
+    """
+
+    CHUNK_SIZE = 10000
+    """number of events, which are converted at once from numpy datetime64 values to datetimes"""
+
+    def __init__(self, time_flow_controller: BacktestTimeFlowController, notifiers: Notifiers):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        self.time_flow_controller = time_flow_controller
+        self.notifiers = notifiers
+
+        self.event_manager = time_flow_controller.event_manager
+        self.scheduler = time_flow_controller.scheduler
+        self.settable_timer = time_flow_controller.settable_timer
+
+        self.number_of_dispatched_events = 0
+        """number of TimeEvents dispatched by the loop"""
+
+    def is_applicable(self) -> bool:
+        """
+        Returns True if the loop may be used instead of the standard loop without changing the observable behaviour
+        of the backtest.
+        """
+        empty_queue_event_listeners = self.notifiers.empty_queue_event_notifier.listeners
+        return len(self.notifiers.all_event_notifier.listeners) == 0 and \
+            empty_queue_event_listeners == {self.time_flow_controller}
+
+    def run(self):
+        """
+        Dispatches all TimeEvents until the end of the backtest and then dispatches the EndTradingEvent.
+        """
+        start_time = perf_counter()
+        self.number_of_dispatched_events = 0
+        end_datetime = self.time_flow_controller.backtest_end_datetime
+
+        while self.event_manager.continue_trading:
+            is_schedule_complete = self._dispatch_scheduled_events(end_datetime)
+            if is_schedule_complete:
+                self.event_manager.publish(EndTradingEvent(end_datetime))
+                self._dispatch_published_events()
+
+        elapsed_time = perf_counter() - start_time
+        events_per_second = self.number_of_dispatched_events / elapsed_time if elapsed_time > 0 else float("inf")
+        self.logger.info("Dispatched {:d} time events in {:.2f}s ({:.0f} events/s)".format(
+            self.number_of_dispatched_events, elapsed_time, events_per_second))
+
+    def _dispatch_scheduled_events(self, end_datetime) -> bool:
+        """
+        Dispatches the events from the schedule. Returns False if the schedule became out of date or the trading
+        was stopped before all the events were dispatched.
+        """
+        subscriptions_version = self.scheduler.subscriptions_version
+        times, event_types = self.scheduler.get_schedule(self.settable_timer.now(), end_datetime)
+
+        for chunk_start in range(0, len(times), self.CHUNK_SIZE):
+            chunk_end = chunk_start + self.CHUNK_SIZE
+            datetimes = times[chunk_start:chunk_end].astype(object)
+
+            for time, event_type in zip(datetimes, event_types[chunk_start:chunk_end]):
+                self.settable_timer.set_current_time(time)
+                self.scheduler.notify_all(event_type(time))
+                self.number_of_dispatched_events += 1
+
+                if not self.event_manager.events_queue.empty():
+                    self._dispatch_published_events()
+
+                if not self.event_manager.continue_trading or \
+                        subscriptions_version != self.scheduler.subscriptions_version:
+                    return False
+
+        return True
+
+    def _dispatch_published_events(self):
+        while self.event_manager.continue_trading and not self.event_manager.events_queue.empty():
+            self.event_manager.dispatch_next_event()
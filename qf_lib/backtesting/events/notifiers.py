@@ -16,6 +16,7 @@ from qf_lib.backtesting.events.empty_queue_event.empty_queue_event_notifier impo
 from qf_lib.backtesting.events.end_trading_event.end_trading_event_notifier import EndTradingEventNotifier
 from qf_lib.backtesting.events.event_base import AllEventNotifier
 from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.events.time_event.trading_calendar import TradingCalendar
 from qf_lib.common.utils.dateutils.timer import Timer
 
 
@@ -24,7 +25,7 @@ class Notifiers(object):
     Convenience class grouping all notifiers together.
     """
 
-    def __init__(self, timer: Timer):
+    def __init__(self, timer: Timer, trading_calendar: TradingCalendar = None):
         """
         When an Event of certain type is being dispatched by EventManager then what EventManger
         does is it finds the EventNotifier which corresponds to this type of Event. Then the EventNotifier
@@ -41,8 +42,11 @@ class Notifiers(object):
         Because of the fact that each EventNotifier also calls the EventNotifier for Events of more general type,
         each EventNotifier must have a reference to this "more general" EventNotifier. Most of Events inherit
         directly from the Event type. That's why most of notifiers will need a reference to AllEventNotifier.
+
+        The optional TradingCalendar is passed to the Scheduler, which then uses the precomputed trigger times
+        of TimeEvents.
         """
         self.all_event_notifier = AllEventNotifier()
         self.empty_queue_event_notifier = EmptyQueueEventNotifier(self.all_event_notifier)
         self.end_trading_event_notifier = EndTradingEventNotifier(self.all_event_notifier)
-        self.scheduler = Scheduler(timer)
+        self.scheduler = Scheduler(timer, trading_calendar)
@@ -14,6 +14,8 @@
 
 from datetime import datetime
 
+import numpy as np
+
 from qf_lib.backtesting.events.time_event.regular_date_time_rule import RegularDateTimeRule
 from qf_lib.backtesting.events.time_event.regular_time_event import RegularTimeEvent
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
@@ -38,5 +40,9 @@ class BeforeMarketOpenEvent(RegularTimeEvent):
         next_trigger_time = cls._trigger_time_rule.next_trigger_time(now)
         return next_trigger_time
 
+    @classmethod
+    def trigger_times(cls, start_time: datetime, end_time: datetime) -> np.ndarray:
+        return cls._trigger_time_rule.trigger_times(start_time, end_time)
+
     def notify(self, listener) -> None:
         listener.on_before_market_open(self)
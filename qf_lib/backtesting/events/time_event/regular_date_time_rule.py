@@ -12,7 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
 
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 
@@ -41,6 +44,98 @@ class RegularDateTimeRule(object):
 
         return next_trigger_time
 
+    def trigger_times(self, start_time: datetime, end_time: datetime) -> np.ndarray:
+        """
+        Returns all the trigger times t such that start_time < t <= end_time (the same times which would be returned
+        by calling next_trigger_time() repeatedly, starting from the start_time). If the event occurs in constant
+        intervals (e.g. every day at 9:30), the times are generated at once as a numpy array.
+
+        Parameters
+        ----------
+        start_time
+            the first trigger time must be after the start_time
+        end_time
+            the last trigger time can't be after the end_time
+
+        Returns
+        -------
+        array of trigger times (numpy datetime64[us] values)
+        """
+        first_trigger_time = self.next_trigger_time(start_time)
+        if first_trigger_time > end_time:
+            return np.array([], dtype="datetime64[us]")
+
+        # the day of the rule (not of the first trigger time, which might have been moved to the end of a short month)
+        # must exist in every month; if the day is not specified, all the trigger times have the same day
+        day = self.trigger_time.day if self.trigger_time.day is not None else first_trigger_time.day
+        months_step = self._constant_months_step()
+        if months_step is not None and day <= 28:
+            return self._monthly_trigger_times(first_trigger_time, end_time, months_step)
+
+        period = self._constant_period()
+        if period is None:
+            trigger_times = [first_trigger_time]
+            while True:
+                next_trigger_time = self.next_trigger_time(trigger_times[-1])
+                if next_trigger_time > end_time:
+                    break
+                trigger_times.append(next_trigger_time)
+            return np.array(trigger_times, dtype="datetime64[us]")
+
+        number_of_triggers = (end_time - first_trigger_time) // period + 1
+        return np.datetime64(first_trigger_time, "us") + \
+            np.arange(number_of_triggers) * np.timedelta64(period // timedelta(microseconds=1), "us")
+
+    def _constant_period(self) -> Optional[timedelta]:
+        """
+        Returns the constant interval between consecutive trigger times or None if the interval is not constant
+        (e.g. an event occurring every first day of a month).
+        """
+        if self.trigger_time.year is not None or self.trigger_time.month is not None or \
+                self.trigger_time.day is not None:
+            return None
+        elif self.trigger_time.weekday is not None:
+            return timedelta(weeks=1)
+        elif self.trigger_time.hour is not None:
+            return timedelta(days=1)
+        elif self.trigger_time.minute is not None:
+            return timedelta(hours=1)
+        elif self.trigger_time.second is not None:
+            return timedelta(minutes=1)
+        elif self.trigger_time.microsecond is not None:
+            return timedelta(seconds=1)
+        return None
+
+    def _constant_months_step(self) -> Optional[int]:
+        """
+        Returns the number of months between consecutive trigger times (12 for the events occurring every year,
+        1 for the events occurring every month) or None if the event doesn't occur on a fixed day of a month.
+        """
+        if self.trigger_time.year is not None or self.trigger_time.weekday is not None:
+            return None
+        elif self.trigger_time.month is not None:
+            return 12
+        elif self.trigger_time.day is not None:
+            return 1
+        return None
+
+    @staticmethod
+    def _monthly_trigger_times(first_trigger_time: datetime, end_time: datetime, months_step: int) -> np.ndarray:
+        """
+        Generates the trigger times occurring every months_step months, always at the same offset from the beginning
+        of the month as the first_trigger_time. The day of the first_trigger_time can't be greater than 28, so that
+        it exists in every month.
+        """
+        first_trigger_time = np.datetime64(first_trigger_time, "us")
+        first_month = first_trigger_time.astype("datetime64[M]")
+        offset_in_month = first_trigger_time - first_month.astype("datetime64[us]")
+
+        number_of_months = (np.datetime64(end_time, "M") - first_month).astype(int)
+        months = first_month + np.arange(0, number_of_months + 1, months_step)
+
+        trigger_times = months.astype("datetime64[us]") + offset_in_month
+        return trigger_times[trigger_times <= np.datetime64(end_time, "us")]
+
     def _get_next_trigger_time_after(self, start_time: datetime):
         # calculate proper adjustment (time shift):
         # if the month is important for the trigger time, than we should go to the next year
@@ -13,9 +13,12 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import Dict, Type, TypeVar, List, Any, Generator, Tuple
+from typing import Dict, Type, TypeVar, List, Any, Generator, Tuple, Optional
+
+import numpy as np
 
 from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+from qf_lib.backtesting.events.time_event.trading_calendar import TradingCalendar
 from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 
@@ -33,13 +36,19 @@ class Scheduler(object):
 
     One should not use Scheduler for subscribing to all TimeEvents. If you want to subscribe to all TimeEvents then
     use EventManager.subscribe(...) method.
+
+    If the TradingCalendar is given, the trigger times of events are looked up in its precomputed arrays
+    (and the exchange holidays defined in the calendar are skipped). Outside of the calendar's period the trigger
+    times are calculated with the TimeEvents' rules.
     """
 
-    def __init__(self, timer: Timer):
+    def __init__(self, timer: Timer, trading_calendar: Optional[TradingCalendar] = None):
         self.timer = timer
+        self.trading_calendar = trading_calendar
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
         self._time_event_to_subscribers = {}  # type: Dict[TypeOfEvent, List[Any]]
+        self._subscriptions_version = 0
 
     @classmethod
     def events_type(cls):
@@ -66,6 +75,56 @@ class Scheduler(object):
             self._time_event_to_subscribers[type_of_time_event] = listeners
 
         listeners.append(listener)
+        self._subscriptions_version += 1
+
+    def get_listeners(self, type_of_time_event: TypeOfEvent = None) -> List[Any]:
+        """
+        Returns the listeners subscribed to the concrete TimeEvent (in the order of subscriptions) or all the unique
+        listeners if the type of event is not given.
+        """
+        if type_of_time_event is not None:
+            return self._time_event_to_subscribers.get(type_of_time_event, [])
+
+        all_listeners = (listener for listeners in self._time_event_to_subscribers.values() for listener in listeners)
+        return list({id(listener): listener for listener in all_listeners}.values())
+
+    @property
+    def subscriptions_version(self) -> int:
+        """
+        Number which changes each time a new subscription is made. It may be used to detect that a schedule
+        created with get_schedule() is out of date.
+        """
+        return self._subscriptions_version
+
+    def get_schedule(self, start_time: datetime, end_time: datetime) -> Tuple[np.ndarray, List[TypeOfEvent]]:
+        """
+        Computes at once all the TimeEvents, which would be returned by consecutive calls of get_next_time_event()
+        while the time flows from the start_time (exclusive) to the end_time (inclusive). If events of different types
+        occur at the same time, only the event of the type subscribed first is kept.
+
+        Returns
+        -------
+        sorted array of events' times (numpy datetime64[us] values) and the list of corresponding types of events
+        """
+        event_types = list(self._time_event_to_subscribers)
+        if len(event_types) == 0:
+            return np.array([], dtype="datetime64[us]"), []
+
+        times_per_type = [self._trigger_times(event_type, start_time, end_time) for event_type in event_types]
+        times = np.concatenate(times_per_type).astype("datetime64[us]")
+        type_indices = np.repeat(np.arange(len(event_types)), [len(times) for times in times_per_type])
+
+        # stable sorting keeps the order of subscriptions for the events occurring at the same time
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        type_indices = type_indices[order]
+
+        is_first_at_given_time = np.ones(len(times), dtype=bool)
+        is_first_at_given_time[1:] = times[1:] != times[:-1]
+        times = times[is_first_at_given_time]
+        type_indices = type_indices[is_first_at_given_time]
+
+        return times, [event_types[i] for i in type_indices]
 
     def get_next_time_event(self) -> ConcreteTimeEvent:
         """
@@ -74,12 +133,28 @@ class Scheduler(object):
         now = self.timer.now()
 
         times_and_event_types = (
-            (time_event.next_trigger_time(now), time_event) for time_event in self._time_event_to_subscribers
+            (self._next_trigger_time(time_event, now), time_event) for time_event in self._time_event_to_subscribers
         )  # type: Generator[Tuple[datetime, TypeOfEvent]]
         next_trigger_time, time_event_type = min(times_and_event_types)  # type: Tuple[datetime, TypeOfEvent]
 
         return time_event_type(next_trigger_time)
 
+    def _trigger_times(self, event_type: TypeOfEvent, start_time: datetime, end_time: datetime) -> np.ndarray:
+        trigger_times = None
+        if self.trading_calendar is not None:
+            trigger_times = self.trading_calendar.trigger_times_between(event_type, start_time, end_time)
+        if trigger_times is None:
+            trigger_times = event_type.trigger_times(start_time, end_time)
+        return trigger_times
+
+    def _next_trigger_time(self, event_type: TypeOfEvent, now: datetime) -> datetime:
+        next_trigger_time = None
+        if self.trading_calendar is not None:
+            next_trigger_time = self.trading_calendar.next_trigger_time(event_type, now)
+        if next_trigger_time is None:
+            next_trigger_time = event_type.next_trigger_time(now)
+        return next_trigger_time
+
     def notify_all(self, time_event: ConcreteTimeEvent):
         """
         Notifies each listener of the occurrence of the given concrete event.
@@ -15,6 +15,8 @@
 from abc import abstractmethod, ABCMeta
 from datetime import datetime
 
+import numpy as np
+
 from qf_lib.backtesting.events.event_base import Event
 
 
@@ -28,6 +30,23 @@ class TimeEvent(Event, metaclass=ABCMeta):
     def next_trigger_time(cls, now: datetime) -> datetime:
         pass
 
+    @classmethod
+    def trigger_times(cls, start_time: datetime, end_time: datetime) -> np.ndarray:
+        """
+        Returns all the times t (start_time < t <= end_time) at which the event occurs, as an array of numpy
+        datetime64[us] values. By default next_trigger_time() is called repeatedly. TimeEvents which can generate
+        their trigger times faster (e.g. all at once) should override this method.
+        """
+        trigger_times = []
+        next_trigger_time = cls.next_trigger_time(start_time)
+
+        while start_time < next_trigger_time <= end_time:
+            trigger_times.append(next_trigger_time)
+            start_time = next_trigger_time
+            next_trigger_time = cls.next_trigger_time(start_time)
+
+        return np.array(trigger_times, dtype="datetime64[us]")
+
     @abstractmethod
     def notify(self, listener) -> None:
         pass
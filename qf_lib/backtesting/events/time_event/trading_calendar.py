@@ -0,0 +1,122 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence, Type
+
+import numpy as np
+
+from qf_lib.backtesting.events.time_event.regular_time_event import RegularTimeEvent
+from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+
+
+class TradingCalendar(object):
+    """
+    Precomputed trigger times of TimeEvents between the start_date and the end_date (e.g. of a backtest). The trigger
+    times of every type of TimeEvent are generated at once (see: TimeEvent.trigger_times()) when they are requested
+    for the first time and kept in a sorted numpy array, so that finding the next or the latest occurrence
+    of the event is a binary search.
+
+    Exchange holidays may be supplied as data: on these dates RegularTimeEvents (e.g. MarketOpenEvent,
+    MarketCloseEvent) don't occur.
+
+    Outside of the calendar's period the methods return None, so that the trigger time can be calculated with
+    the TimeEvent's rule instead.
+    """
+
+    def __init__(self, start_date: datetime, end_date: datetime, holidays: Sequence[datetime] = None):
+        """
+        Parameters
+        ----------
+        start_date
+            the earliest trigger time in the calendar (inclusive)
+        end_date
+            the latest trigger time in the calendar (inclusive)
+        holidays
+            dates on which the RegularTimeEvents don't occur
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+
+        if holidays is None:
+            holidays = []
+        self.holidays = np.unique(np.array(holidays, dtype="datetime64[D]"))
+
+        self._trigger_times = {}  # type: Dict[Type[TimeEvent], np.ndarray]
+        self._start_datetime64 = np.datetime64(start_date, "us")
+        self._end_datetime64 = np.datetime64(end_date, "us")
+
+    def trigger_times(self, time_event_type: Type[TimeEvent]) -> np.ndarray:
+        """
+        Returns all the trigger times of the TimeEvent in the calendar's period (sorted array of numpy datetime64[us]
+        values).
+        """
+        try:
+            return self._trigger_times[time_event_type]
+        except KeyError:
+            trigger_times = time_event_type.trigger_times(self.start_date - timedelta(microseconds=1), self.end_date)
+            trigger_times = trigger_times.astype("datetime64[us]")
+
+            if len(self.holidays) > 0 and issubclass(time_event_type, RegularTimeEvent):
+                is_holiday = np.isin(trigger_times.astype("datetime64[D]"), self.holidays)
+                trigger_times = trigger_times[~is_holiday]
+
+            self._trigger_times[time_event_type] = trigger_times
+            return trigger_times
+
+    def trigger_times_between(self, time_event_type: Type[TimeEvent], start_time: datetime,
+                              end_time: datetime) -> Optional[np.ndarray]:
+        """
+        Returns the trigger times t of the TimeEvent such that start_time < t <= end_time or None if the period isn't
+        covered by the calendar.
+        """
+        if start_time < self.start_date - timedelta(microseconds=1) or end_time > self.end_date:
+            return None
+
+        trigger_times = self.trigger_times(time_event_type)
+        first_index, last_index = np.searchsorted(
+            trigger_times, [np.datetime64(start_time, "us"), np.datetime64(end_time, "us")], side="right")
+        return trigger_times[first_index:last_index]
+
+    def next_trigger_time(self, time_event_type: Type[TimeEvent], now: datetime) -> Optional[datetime]:
+        """
+        Returns the first trigger time of the TimeEvent after now or None if it isn't known (it is after
+        the end of the calendar or now is before its start).
+        """
+        now = np.datetime64(now, "us")
+        if now < self._start_datetime64:
+            return None
+
+        trigger_times = self.trigger_times(time_event_type)
+        index = np.searchsorted(trigger_times, now, side="right")
+        if index == len(trigger_times):
+            return None
+
+        return trigger_times[index].item()
+
+    def latest_trigger_time(self, time_event_type: Type[TimeEvent], now: datetime) -> Optional[datetime]:
+        """
+        Returns the latest trigger time of the TimeEvent, which is not after now, or None if it isn't known (it is
+        before the start of the calendar or now is after its end).
+        """
+        now = np.datetime64(now, "us")
+        if now > self._end_datetime64:
+            return None
+
+        trigger_times = self.trigger_times(time_event_type)
+        index = np.searchsorted(trigger_times, now, side="right") - 1
+        if index < 0:
+            return None
+
+        return trigger_times[index].item()
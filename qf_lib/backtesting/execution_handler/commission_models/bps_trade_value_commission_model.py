@@ -12,6 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from typing import Sequence
+
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.order.order import Order
 
@@ -33,3 +37,7 @@ class BpsTradeValueCommissionModel(CommissionModel):
         quantity = abs(order.quantity)
         commission = fill_price * quantity * self.commission / 10000
         return commission
+
+    def calculate_commissions(self, orders: Sequence[Order], quantities: np.ndarray,
+                              fill_prices: np.ndarray) -> np.ndarray:
+        return fill_prices * np.absolute(quantities) * self.commission / 10000
@@ -13,6 +13,9 @@
 #     limitations under the License.
 
 from abc import ABCMeta, abstractmethod
+from typing import Sequence
+
+import numpy as np
 
 from qf_lib.backtesting.order.order import Order
 
@@ -21,3 +24,26 @@ class CommissionModel(object, metaclass=ABCMeta):
     @abstractmethod
     def calculate_commission(self, order: Order, fill_price: float) -> float:
         pass
+
+    def calculate_commissions(self, orders: Sequence[Order], quantities: np.ndarray,
+                              fill_prices: np.ndarray) -> np.ndarray:
+        """
+        Array-in/array-out version of calculate_commission(), used by the simulated executors to calculate
+        the commissions of all the executed Orders at once. By default calculate_commission() is called for every
+        Order; commission models override it with a vectorised calculation.
+
+        Parameters
+        ----------
+        orders
+            executed Orders
+        quantities
+            array of quantities of the Orders
+        fill_prices
+            array of fill prices of the Orders
+
+        Returns
+        -------
+        array of commissions
+        """
+        commissions = [self.calculate_commission(order, fill_price) for order, fill_price in zip(orders, fill_prices)]
+        return np.array(commissions, dtype=np.float64)
@@ -12,6 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from typing import Sequence
+
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.order.order import Order
 
@@ -32,3 +36,7 @@ class FixedCommissionModel(CommissionModel):
 
     def calculate_commission(self, order: Order, fill_price: float) -> float:
         return self.commission
+
+    def calculate_commissions(self, orders: Sequence[Order], quantities: np.ndarray,
+                              fill_prices: np.ndarray) -> np.ndarray:
+        return np.full(len(quantities), self.commission, dtype=np.float64)
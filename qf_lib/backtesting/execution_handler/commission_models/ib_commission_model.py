@@ -12,6 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from typing import Sequence
+
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.order.order import Order
 
@@ -30,3 +34,9 @@ class IBCommissionModel(CommissionModel):
         commission = max(1.0, min(0.005 * quantity, 0.01 * fill_price * quantity))
 
         return commission
+
+    def calculate_commissions(self, orders: Sequence[Order], quantities: np.ndarray,
+                              fill_prices: np.ndarray) -> np.ndarray:
+        # fmin and fmax ignore NaN fill prices in the same way as the built-in min and max do
+        quantities = np.absolute(quantities)
+        return np.fmax(1.0, np.fmin(0.005 * quantities, 0.01 * fill_prices * quantities))
@@ -25,6 +25,7 @@ from qf_lib.backtesting.execution_handler.execution_handler import ExecutionHand
 from qf_lib.backtesting.execution_handler.market_on_close_orders_executor import MarketOnCloseOrdersExecutor
 from qf_lib.backtesting.execution_handler.market_orders_executor import MarketOrdersExecutor
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
+from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
 from qf_lib.backtesting.execution_handler.stop_orders_executor import StopOrdersExecutor
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
 from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder, MarketOnCloseOrder
@@ -69,6 +70,11 @@ class SimulatedExecutionHandler(ExecutionHandler):
             contracts_to_tickers_mapper, data_handler, monitor, portfolio,
             timer, order_id_generator, commission_model, slippage_model)
 
+    @property
+    def executors(self) -> List[SimulatedExecutor]:
+        """ Executors of market, stop and market-on-close orders. """
+        return [self._market_orders_executor, self._stop_orders_executor, self._market_on_close_orders_executor]
+
     def on_market_close(self, _: MarketCloseEvent):
         self._stop_orders_executor.execute_orders()
         self._market_on_close_orders_executor.execute_orders()
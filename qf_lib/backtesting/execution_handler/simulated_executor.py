@@ -16,6 +16,8 @@ import abc
 from itertools import count
 from typing import List, Sequence, Optional, Dict, Tuple
 
+import numpy as np
+
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
@@ -87,24 +89,44 @@ class SimulatedExecutor(metaclass=abc.ABCMeta):
         no_slippage_fill_prices_list, to_be_executed_orders, unexecuted_orders_data_dict = \
             self._get_orders_with_fill_prices_without_slippage(open_orders_list, tickers)
 
-        fill_prices, _ = self._slippage_model.apply_slippage(to_be_executed_orders, no_slippage_fill_prices_list)
+        if to_be_executed_orders:
+            order_id_to_ticker = {order.id: ticker for order, ticker in zip(open_orders_list, tickers)}
+            to_be_executed_tickers = [order_id_to_ticker[order.id] for order in to_be_executed_orders]
+            quantities = np.array([order.quantity for order in to_be_executed_orders])
+
+            fill_prices = self._apply_slippage(
+                to_be_executed_orders, to_be_executed_tickers, quantities, no_slippage_fill_prices_list)
+            commissions = self._calculate_commissions(to_be_executed_orders, quantities, fill_prices)
 
-        for order, fill_price in zip(to_be_executed_orders, fill_prices):
-            self._execute_order(order, fill_price)
+            for order, fill_price, commission in zip(to_be_executed_orders, fill_prices, commissions):
+                self._execute_order(order, fill_price, commission)
 
         self._awaiting_orders = unexecuted_orders_data_dict
 
-    def _execute_order(self, order: Order, fill_price: float):
+    def _apply_slippage(self, orders: Sequence[Order], tickers: Sequence[Ticker], quantities: np.ndarray,
+                        no_slippage_fill_prices: Sequence[float]) -> List[float]:
         """
-        Simulates execution of a single Order by converting the Order into Transaction.
+        Calculates the fill prices of all the Orders at once.
         """
-        timestamp = self._timer.now()
-        contract = order.contract
-        quantity = order.quantity
+        fill_prices, _ = self._slippage_model.apply_slippage_batch(
+            orders, quantities, np.array(no_slippage_fill_prices, dtype=np.float64), tickers)
+        return np.asarray(fill_prices, dtype=np.float64).tolist()
 
-        commission = self._commission_model.calculate_commission(order, fill_price)
+    def _calculate_commissions(self, orders: Sequence[Order], quantities: np.ndarray,
+                               fill_prices: Sequence[float]) -> List[float]:
+        """
+        Calculates the commissions of all the Orders at once.
+        """
+        commissions = self._commission_model.calculate_commissions(
+            orders, quantities, np.array(fill_prices, dtype=np.float64))
+        return np.asarray(commissions, dtype=np.float64).tolist()
 
-        transaction = Transaction(timestamp, contract, quantity, fill_price, commission)
+    def _execute_order(self, order: Order, fill_price: float, commission: float):
+        """
+        Simulates execution of a single Order by converting the Order into Transaction.
+        """
+        timestamp = self._timer.now()
+        transaction = Transaction(timestamp, order.contract, order.quantity, fill_price, commission)
 
         self._monitor.record_transaction(transaction)
         self._portfolio.transact_transaction(transaction)
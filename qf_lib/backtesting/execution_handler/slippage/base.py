@@ -15,7 +15,10 @@
 from abc import ABCMeta, abstractmethod
 from typing import Sequence, Tuple
 
+import numpy as np
+
 from qf_lib.backtesting.order.order import Order
+from qf_lib.common.tickers.tickers import Ticker
 
 
 class Slippage(object, metaclass=ABCMeta):
@@ -40,3 +43,30 @@ class Slippage(object, metaclass=ABCMeta):
         sequence of fill prices (order corresponds to the order of orders provided as an argument of the method)
         """
         pass
+
+    def apply_slippage_batch(
+        self, orders: Sequence[Order], quantities: np.ndarray, no_slippage_fill_prices: np.ndarray,
+        tickers: Sequence[Ticker]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array-in/array-out version of apply_slippage(), used by the simulated executors to calculate the fill prices
+        of all the executed Orders at once. By default apply_slippage() is called; slippage models override it with
+        a vectorised calculation.
+
+        Parameters
+        ----------
+        orders
+            Orders for which the fill prices should be calculated
+        quantities
+            array of quantities of the Orders
+        no_slippage_fill_prices
+            array of fill prices without a slippage applied
+        tickers
+            tickers corresponding to the Orders
+
+        Returns
+        -------
+        arrays of fill prices and fill volumes
+        """
+        fill_prices, fill_volumes = self.apply_slippage(orders, no_slippage_fill_prices)
+        return np.asarray(fill_prices, dtype=np.float64), np.asarray(fill_volumes)
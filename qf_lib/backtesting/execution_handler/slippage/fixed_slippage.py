@@ -18,6 +18,7 @@ import numpy as np
 
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.order.order import Order
+from qf_lib.common.tickers.tickers import Ticker
 
 
 class FixedSlippage(Slippage):
@@ -31,6 +32,10 @@ class FixedSlippage(Slippage):
     def apply_slippage(self, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float]) \
             -> Tuple[Sequence[float], Sequence[int]]:
         fill_volumes = np.array([order.quantity for order in orders])
-        fill_prices = np.array(no_slippage_fill_prices) + np.copysign(self.slippage_per_share, fill_volumes)
+        return self.apply_slippage_batch(orders, fill_volumes, np.array(no_slippage_fill_prices), tickers=[])
 
-        return fill_prices, fill_volumes
+    def apply_slippage_batch(self, orders: Sequence[Order], quantities: np.ndarray,
+                             no_slippage_fill_prices: np.ndarray,
+                             tickers: Sequence[Ticker]) -> Tuple[np.ndarray, np.ndarray]:
+        fill_prices = np.asarray(no_slippage_fill_prices) + np.copysign(self.slippage_per_share, quantities)
+        return fill_prices, quantities
@@ -60,34 +60,29 @@ class VolumeShareSlippage(Slippage):
     def apply_slippage(
         self, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float]
     ) -> Tuple[Sequence[float], Sequence[int]]:
-        no_slippage_fill_prices = np.array(no_slippage_fill_prices)
-
         tickers = [self.contract_ticker_mapper.contract_to_ticker(order.contract) for order in orders]
-        market_daily_volumes = self._get_volumes_from_today(tickers)
-
         order_volumes = np.array([order.quantity for order in orders])
-        fill_volumes = self._get_fill_volumes(order_volumes, market_daily_volumes)
+
+        return self.apply_slippage_batch(orders, order_volumes, np.array(no_slippage_fill_prices), tickers)
+
+    def apply_slippage_batch(self, orders: Sequence[Order], quantities: np.ndarray,
+                             no_slippage_fill_prices: np.ndarray,
+                             tickers: Sequence[Ticker]) -> Tuple[np.ndarray, np.ndarray]:
+        # volumes are taken from the DataHandler's cache of today's bars
+        market_daily_volumes = self.data_handler.get_bar_values_for_today(tickers, PriceField.Volume)
+        fill_volumes = self._get_fill_volumes(quantities, market_daily_volumes)
 
         # no need to use absolute numbers; it's squared later on
         volume_shares = fill_volumes / market_daily_volumes  # type: Sequence[float]
 
         abs_price_impact = volume_shares ** 2 * self.price_impact * no_slippage_fill_prices
-        price_impact = np.copysign(abs_price_impact, order_volumes)
+        price_impact = np.copysign(abs_price_impact, quantities)
         slippage_prices = no_slippage_fill_prices + price_impact
 
         slippage_prices[fill_volumes == 0] = np.nan
 
-        # limit should still hold
-
         return slippage_prices, fill_volumes
 
-    def _get_volumes_from_today(self, tickers: Sequence[Ticker]):
-        unique_tickers = list(set(tickers))
-        today_bar = self.data_handler.get_bar_for_today(unique_tickers)
-        volumes = today_bar.loc[tickers, PriceField.Volume].values
-
-        return volumes
-
     def _get_fill_volumes(self, order_volumes, market_volumes):
         max_abs_order_volumes = market_volumes * self.max_volume_share_limit
         abs_order_volumes = np.absolute(order_volumes)
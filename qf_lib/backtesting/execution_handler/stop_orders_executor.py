@@ -12,9 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from itertools import count
-from typing import List, Sequence
+from itertools import count, compress
+from typing import List, Sequence, Optional
 
+import numpy as np
 import pandas as pd
 
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
@@ -28,6 +29,7 @@ from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.timer import Timer
 
 
@@ -40,6 +42,9 @@ class StopOrdersExecutor(SimulatedExecutor):
         super().__init__(contracts_to_tickers_mapper, data_handler, monitor, portfolio, timer,
                          order_id_generator, commission_model, slippage_model)
 
+        # arrays of open orders in the order of self._awaiting_orders; None if they have to be created again
+        self._open_stop_orders = None  # type: Optional[_OpenStopOrders]
+
     def accept_orders(self, orders: Sequence[Order]) -> List[int]:
         tickers = [self._contracts_to_tickers_mapper.contract_to_ticker(order.contract) for order in orders]
 
@@ -80,68 +85,134 @@ class StopOrdersExecutor(SimulatedExecutor):
             order.id = order_id
             order_id_list.append(order_id)
 
+        if self._open_stop_orders is not None:
+            self._open_stop_orders = self._open_stop_orders.append(_OpenStopOrders(orders, tickers))
+
         return order_id_list
 
+    def cancel_order(self, order_id: int) -> Optional[Order]:
+        cancelled_order = super().cancel_order(order_id)
+        if cancelled_order is not None:
+            self._open_stop_orders = None
+        return cancelled_order
+
+    def cancel_all_open_orders(self):
+        super().cancel_all_open_orders()
+        self._open_stop_orders = None
+
     def _get_orders_with_fill_prices_without_slippage(self, open_orders_list, tickers):
-        no_slippage_fill_prices_list = []
-        to_be_executed_orders = []
-        unexecuted_stop_orders_data_dict = {}
+        open_stop_orders = self._open_stop_orders
+        if open_stop_orders is None or len(open_stop_orders) != len(open_orders_list):
+            open_stop_orders = _OpenStopOrders(open_orders_list, tickers)
 
-        unique_tickers = list(set(tickers))
         # index=tickers, columns=fields
-        current_bars_df = self._data_handler.get_bar_for_today(unique_tickers)  # type: pd.DataFrame
+        current_bars_df = self._data_handler.get_bar_for_today(open_stop_orders.tickers)  # type: pd.DataFrame
+        open_prices, high_prices, low_prices, is_bar_complete = self._get_price_bars(
+            current_bars_df, open_stop_orders)
 
-        for order, ticker in zip(open_orders_list, tickers):
-            current_bar = current_bars_df.loc[ticker, :]
-            no_slippage_fill_price = self._calculate_no_slippage_fill_price(current_bar, order)
+        stop_prices = open_stop_orders.stop_prices
+        is_sell = open_stop_orders.is_sell
 
-            if no_slippage_fill_price is None:  # the Order cannot be executed
-                if order.time_in_force == TimeInForce.GTC:
-                    # preserve only GTC orders. DAY orders will be dropped at this point
-                    unexecuted_stop_orders_data_dict[order.id] = order
-            else:
-                to_be_executed_orders.append(order)
-                no_slippage_fill_prices_list.append(no_slippage_fill_price)
+        # Sell Stops are triggered by prices at or below the stop price, Buy Stops by prices at or above it
+        with np.errstate(invalid='ignore'):
+            is_gap_through = np.where(is_sell, open_prices <= stop_prices, open_prices >= stop_prices)
+            is_stop_hit = np.where(is_sell, low_prices <= stop_prices, high_prices >= stop_prices)
+
+        is_gap_through &= is_bar_complete
+        is_executed = is_bar_complete & (is_gap_through | is_stop_hit)
+        no_slippage_fill_prices = np.where(is_gap_through, open_prices, stop_prices)[is_executed]
+
+        # preserve only GTC orders. DAY orders will be dropped at this point
+        is_retained = ~is_executed & open_stop_orders.is_gtc
 
-        return no_slippage_fill_prices_list, to_be_executed_orders, unexecuted_stop_orders_data_dict
+        orders = open_stop_orders.orders
+        to_be_executed_orders = list(compress(orders, is_executed))
+        unexecuted_stop_orders_data_dict = {order.id: order for order in compress(orders, is_retained)}
 
-    def _calculate_no_slippage_fill_price(self, current_bar, order):
+        self._open_stop_orders = open_stop_orders.subset(is_retained)
+        return no_slippage_fill_prices.tolist(), to_be_executed_orders, unexecuted_stop_orders_data_dict
+
+    @staticmethod
+    def _get_price_bars(current_bars_df: pd.DataFrame, open_stop_orders: "_OpenStopOrders"):
         """
-        Returns the price which should be used for calculating the real fill price later on. It can return either:
-        OPEN or stop price. If the market opens at the price which triggers StopOrders instantly, the OPEN price
-        is returned. Otherwise if the LOW price (for Sell Stop) or HIGH price (for Buy Stop) exceeds the stop price,
-        the stop price is returned. If none of the above conditions is met, None is returned (which means that
-        StopOrder shouldn't be executed at any price).
+        Returns the Open, High and Low prices of the orders' tickers and the mask of orders, for which the bar is
+        complete. At least all values except Volume need to be available (Volume is not available for currencies),
+        otherwise there is no data for today for a given Ticker and the order is skipped.
         """
-        # Make sure that at least all values except Volume are available. Volume is not available for currencies.
-        price_bar = current_bar.loc[[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]]
-        if price_bar.isnull().values.any():  # there is no data for today for a given Ticker; skip it
-            return None
-
-        stop_price = order.execution_style.stop_price
-        open_price = current_bar.loc[PriceField.Open]
-        is_sell_stop = order.quantity < 0
-        no_slippage_fill_price = None
-
-        if is_sell_stop:
-            if open_price <= stop_price:
-                no_slippage_fill_price = open_price
-            else:
-                low_price = current_bar[PriceField.Low]
-                if low_price <= stop_price:
-                    no_slippage_fill_price = stop_price
-        else:  # is buy stop
-            if open_price >= stop_price:
-                no_slippage_fill_price = open_price
-            else:
-                high_price = current_bar[PriceField.High]
-                if high_price >= stop_price:
-                    no_slippage_fill_price = stop_price
+        price_fields = [PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]
+        tickers_index = open_stop_orders.tickers_index()
+        if not current_bars_df.index.equals(tickers_index):
+            current_bars_df = current_bars_df.reindex(index=tickers_index)
 
-        return no_slippage_fill_price
+        # None values (no bar for today) become NaNs
+        price_bars = current_bars_df.reindex(columns=price_fields).values.astype(np.float64)
+        price_bars = price_bars[open_stop_orders.ticker_codes]
+        is_bar_complete = ~np.isnan(price_bars).any(axis=1)
+
+        return price_bars[:, 0], price_bars[:, 1], price_bars[:, 2], is_bar_complete
 
     def _check_order_validity(self, order):
         assert order.time_in_force == TimeInForce.DAY or order.time_in_force == TimeInForce.GTC, \
             "Only TimeInForce.DAY or TimeInForce.GTC Time in Force is accepted by StopOrdersExecutor"
         assert isinstance(order.execution_style, StopOrder), \
             "Only StopOrder ExecutionStyle is supported by StopOrdersExecutor"
+
+
+class _OpenStopOrders(object):
+    """
+    Open stop orders kept in arrays: codes of the orders' tickers (positions in the list of unique tickers),
+    stop prices, sides (Sell or Buy Stop) and Time in Force (GTC or DAY), so that all the orders may be evaluated
+    against the bars at once.
+    """
+
+    def __init__(self, orders: Sequence[Order], tickers: Sequence[Ticker]):
+        self.orders = list(orders)
+        self.tickers = list(dict.fromkeys(tickers))
+
+        ticker_to_code = {ticker: code for code, ticker in enumerate(self.tickers)}
+        self.ticker_codes = np.array([ticker_to_code[ticker] for ticker in tickers], dtype=np.intp)
+        self.stop_prices = np.array([order.execution_style.stop_price for order in orders], dtype=np.float64)
+        self.is_sell = np.array([order.quantity < 0 for order in orders], dtype=bool)
+        self.is_gtc = np.array([order.time_in_force == TimeInForce.GTC for order in orders], dtype=bool)
+
+        self._tickers_index = None  # type: pd.Index
+
+    def __len__(self):
+        return len(self.orders)
+
+    def tickers_index(self) -> pd.Index:
+        if self._tickers_index is None:
+            # the array is filled element by element, because tickers would be treated as sequences by numpy
+            tickers = np.empty(len(self.tickers), dtype=object)
+            tickers[:] = self.tickers
+            self._tickers_index = pd.Index(tickers)
+        return self._tickers_index
+
+    def subset(self, mask: np.ndarray) -> "_OpenStopOrders":
+        """ Returns the orders selected by the boolean mask (only the tickers of these orders are kept). """
+        used_codes, ticker_codes = np.unique(self.ticker_codes[mask], return_inverse=True)
+        return self._create(list(compress(self.orders, mask)), [self.tickers[code] for code in used_codes],
+                            ticker_codes, self.stop_prices[mask], self.is_sell[mask], self.is_gtc[mask])
+
+    def append(self, other: "_OpenStopOrders") -> "_OpenStopOrders":
+        tickers = list(dict.fromkeys(self.tickers + other.tickers))
+        ticker_to_code = {ticker: code for code, ticker in enumerate(tickers)}
+        other_codes = np.array([ticker_to_code[ticker] for ticker in other.tickers], dtype=np.intp)
+
+        return self._create(self.orders + other.orders, tickers,
+                            np.concatenate([self.ticker_codes, other_codes[other.ticker_codes]]),
+                            np.concatenate([self.stop_prices, other.stop_prices]),
+                            np.concatenate([self.is_sell, other.is_sell]),
+                            np.concatenate([self.is_gtc, other.is_gtc]))
+
+    @classmethod
+    def _create(cls, orders, tickers, ticker_codes, stop_prices, is_sell, is_gtc) -> "_OpenStopOrders":
+        open_stop_orders = cls.__new__(cls)
+        open_stop_orders.orders = orders
+        open_stop_orders.tickers = tickers
+        open_stop_orders.ticker_codes = ticker_codes.astype(np.intp)
+        open_stop_orders.stop_prices = stop_prices
+        open_stop_orders.is_sell = is_sell
+        open_stop_orders.is_gtc = is_gtc
+        open_stop_orders._tickers_index = None
+        return open_stop_orders
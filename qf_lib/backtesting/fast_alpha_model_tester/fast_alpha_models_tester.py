@@ -12,10 +12,12 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from itertools import count
 from time import time
-from typing import Sequence, Tuple, Type
+from typing import Sequence, Tuple, Type, Optional
 
 import numpy as np
 import pandas as pd
@@ -24,10 +26,12 @@ from pandas import DataFrame
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.alpha_model.alpha_model_factory import AlphaModelFactory
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.alpha_model.feature_cache import FeatureCache
 from qf_lib.backtesting.fast_alpha_model_tester.backtest_summary import BacktestSummary, BacktestSummaryElement
 from qf_lib.backtesting.fast_alpha_model_tester.fast_data_handler import FastDataHandler
+from qf_lib.backtesting.fast_alpha_model_tester.memory_mapped_data_array import MemoryMappedDataArray
+from qf_lib.backtesting.fast_alpha_model_tester.trades_extractor import extract_trades
 from qf_lib.common.enums.price_field import PriceField
-from qf_lib.common.enums.trade_field import TradeField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
@@ -35,6 +39,8 @@ from qf_lib.containers.dataframe.cast_dataframe import cast_dataframe
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
 from qf_lib.containers.dimension_names import TICKERS
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 from qf_lib.portfolio_construction.portfolio_models.portfolio import Portfolio
 
 
@@ -42,20 +48,54 @@ class FastAlphaModelTester(object):
     """
     ModelTester in which portfolio construction is simulated by always following the suggested Exposures from
     AlphaModels. All Tickers are traded with same weights (weights are constant across time).
+
+    If the AlphaModel implements calculate_exposures_vectorised(), the exposures for all the dates and tickers are
+    calculated at once (only the ones it can't calculate, e.g. because of too short history, are calculated
+    with calculate_exposure()). Otherwise calculate_exposure() is called for every date and every ticker.
     """
 
     def __init__(self, model_type: Type[AlphaModel], parameter_sets: Sequence[Tuple],
                  tickers: Sequence[Ticker], start_date: datetime, end_date: datetime,
-                 data_handler: FastDataHandler, timer: SettableTimer, alpha_model_factory: AlphaModelFactory):
+                 data_handler: FastDataHandler, timer: SettableTimer, alpha_model_factory: AlphaModelFactory,
+                 data_history_start_date: datetime = None, number_of_workers: int = 1,
+                 feature_cache: FeatureCache = None):
+        """
+        Parameters
+        ----------
+        data_history_start_date
+            beginning of the prices history passed to AlphaModel.calculate_exposures_vectorised(); it should be
+            early enough for the model to have all the data it needs on the start_date of the backtest.
+            By default it is equal to the start_date.
+        number_of_workers
+            number of processes among which the parameter sets are distributed. By default (1) all the parameter
+            sets are tested sequentially in the current process. Testing in parallel requires the FastDataHandler
+            using the PresetDataProvider. The data_handler is not sent to the workers: the whole data bundle of its
+            PresetDataProvider is shared by all the workers and every worker wraps it in its own PresetDataProvider
+            (with the same settings) and FastDataHandler, so the models see the same data as in the sequential run.
+            If the alpha_model_factory is an AlphaModelFactory, the models created in a worker get that
+            FastDataHandler (see: AlphaModelFactory.with_data_handler()).
+        feature_cache
+            FeatureCache shared by all the tested models, so that the features which are the same for many parameter
+            sets are calculated only once. When the parameter sets are tested in many processes, every worker
+            uses its own cache of the same size.
+        """
         self._tickers = tickers
         self._start_date = start_date
         self._end_date = end_date
+        self._data_history_start_date = data_history_start_date if data_history_start_date is not None else start_date
 
         self._model_type = model_type
         self._parameter_sets = parameter_sets
         self._data_handler = data_handler
         self._timer = timer
         self._alpha_model_factory = alpha_model_factory
+        self._number_of_workers = number_of_workers
+        self._feature_cache = feature_cache
+
+        if self._number_of_workers > 1:
+            assert type(data_handler) is FastDataHandler and \
+                isinstance(data_handler.price_data_provider, PresetDataProvider), \
+                "Parameter sets can be tested in parallel only with the FastDataHandler using the PresetDataProvider"
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
         if type(self._data_handler) is not FastDataHandler:
@@ -64,62 +104,151 @@ class FastAlphaModelTester(object):
 
     def test_alpha_models(self) -> BacktestSummary:
         nr_of_param_sets = len(self._parameter_sets)
-        print("{} parameters sets to be tested".format(nr_of_param_sets))
-        prices_data_array = self._get_data_for_backtest()
+        self.logger.info("{} parameters sets to be tested".format(nr_of_param_sets))
 
-        backtest_dates = prices_data_array.dates.to_index()
+        start_time = time()
+        if self._number_of_workers > 1:
+            results = self._test_param_sets_in_parallel()
+        else:
+            prices_data_array = self._get_data_for_backtest()
+            history_data_array = self._get_history_for_vectorised_exposures(prices_data_array)
+            results = self._test_param_sets_sequentially(prices_data_array, history_data_array)
+
+        backtest_summary_elem_list = []
+        for param_set_ctr, (backtest_summary_elem, exposures_time, summary_time) in enumerate(results, start=1):
+            backtest_summary_elem_list.append(backtest_summary_elem)
+            self.logger.info("{} / {} parameters sets tested (exposures: {:.2f} s, backtest summary: {:.2f} s)".format(
+                param_set_ctr, nr_of_param_sets, exposures_time, summary_time))
+
+        self.logger.info("All parameters sets tested in {:.2f} s".format(time() - start_time))
+        if self._feature_cache is not None and self._number_of_workers <= 1:
+            self.logger.info(str(self._feature_cache))
 
-        exposure_values_df_list = self._generate_exposures_for_all_params_sets(
-            self._alpha_model_factory, backtest_dates, nr_of_param_sets)
-        backtest_summary_elem_list = self._calculate_backtest_summary_elements(
-            exposure_values_df_list, nr_of_param_sets, prices_data_array)
         backtest_summary = BacktestSummary(
             self._tickers, self._model_type, backtest_summary_elem_list, self._start_date, self._end_date)
         return backtest_summary
 
+    def check_vectorised_exposures(self) -> bool:
+        """
+        Checks if the exposures calculated with AlphaModel.calculate_exposures_vectorised() are the same as
+        the ones calculated date by date with AlphaModel.calculate_exposure(), for all the parameter sets.
+        All the differences are logged.
+
+        Returns
+        -------
+        True if both ways of calculating exposures give the same results for all the parameter sets;
+        False if they are different for any parameter set or if the model doesn't support vectorised calculation
+        """
+        prices_data_array = self._get_data_for_backtest()
+        history_data_array = self._get_history_for_vectorised_exposures(prices_data_array)
+        backtest_dates = prices_data_array.dates.to_index()
+
+        all_exposures_are_equal = True
+        for param_set in self._parameter_sets:
+            model = self._make_model(param_set)
+            vectorised_exposures_df = self._generate_exposure_values_vectorised(
+                model, history_data_array, backtest_dates)
+
+            if vectorised_exposures_df is None:
+                self.logger.warning("{} doesn't support vectorised calculation of exposures".format(model))
+                return False
+
+            exposures_df = self._generate_exposure_values(model, backtest_dates)
+            exposures_values = exposures_df.values.astype(np.float64)
+            vectorised_exposures_values = vectorised_exposures_df.values
+            different_values = (exposures_values != vectorised_exposures_values) & \
+                ~(np.isnan(exposures_values) & np.isnan(vectorised_exposures_values))
+            if different_values.any():
+                all_exposures_are_equal = False
+                dates_idx, tickers_idx = np.nonzero(different_values)
+                for date_idx, ticker_idx in zip(dates_idx, tickers_idx):
+                    self.logger.info("Parameters {}: different exposures for {} on {}: {} (date by date) vs {} "
+                                     "(vectorised)".format(param_set, self._tickers[ticker_idx],
+                                                           backtest_dates[date_idx],
+                                                           exposures_df.iloc[date_idx, ticker_idx],
+                                                           vectorised_exposures_df.iloc[date_idx, ticker_idx]))
+
+        return all_exposures_are_equal
+
+    def _make_model(self, param_set) -> AlphaModel:
+        model = self._alpha_model_factory.make_model(self._model_type, *param_set)
+        if self._feature_cache is not None:
+            model.feature_cache = self._feature_cache
+        return model
+
     def _get_data_for_backtest(self):
         self._timer.set_current_time(self._end_date)
         prices_data_array = self._data_handler.get_price(
             self._tickers, PriceField.ohlcv(), self._start_date, self._end_date)
         return prices_data_array
 
-    def _generate_exposures_for_all_params_sets(self, alpha_model_factory, backtest_dates, nr_of_param_sets):
-        exposure_values_df_list = []
-        print("Generating exposures:")
-        param_set_ctr = 1
+    def _get_history_for_vectorised_exposures(self, prices_data_array: QFDataArray) -> QFDataArray:
+        if self._data_history_start_date >= self._start_date:
+            return prices_data_array
 
-        for param_set in self._parameter_sets:
-            start_time = time()
-            model = alpha_model_factory.make_model(self._model_type, *param_set)
-            exposure_values_df = self._generate_exposure_values(model, backtest_dates)
-            exposure_values_df_list.append(exposure_values_df)
-            end_time = time()
-
-            print("{} / {} parameters sets tested".format(param_set_ctr, nr_of_param_sets))
-            print("iteration time = {:5.2f} minutes".format((end_time - start_time) / 60))
-            param_set_ctr += 1
+        self._timer.set_current_time(self._end_date)
+        history_data_array = self._data_handler.get_price(
+            self._tickers, PriceField.ohlcv(), self._data_history_start_date, self._end_date)
+        return history_data_array
 
-        return exposure_values_df_list
+    def _test_param_sets_sequentially(self, prices_data_array: QFDataArray, history_data_array: QFDataArray):
+        open_to_open_returns_df = self._get_open_prices(prices_data_array).to_simple_returns()
 
-    def _calculate_backtest_summary_elements(self, exposure_values_df_list, nr_of_param_sets, prices_data_array):
-        open_prices_df = self._get_open_prices(prices_data_array)
-        open_to_open_returns_df = open_prices_df.to_simple_returns()
-        backtest_summary_elem_list = []
-        print("Generating backtest summaries:")
-        param_set_ctr = 1
+        for param_set in self._parameter_sets:
+            yield self._test_param_set(param_set, prices_data_array, history_data_array, open_to_open_returns_df)
 
-        for param_set, exposure_values_df in zip(self._parameter_sets, exposure_values_df_list):
-            start_time = time()
-            backtest_summary_elem = self._calculate_backtest_summary(
-                param_set, prices_data_array, open_to_open_returns_df, exposure_values_df)
-            backtest_summary_elem_list.append(backtest_summary_elem)
+    def _test_param_sets_in_parallel(self):
+        """
+        Distributes the parameter sets among the worker processes. The data bundle of the PresetDataProvider is
+        written once to a memory-mapped file, which is shared by all the workers, so only the path of the file
+        (together with the labels and the shape of the array, and the settings of the data provider) and the parameter
+        set are sent with every task. The data handler isn't sent at all (see: number_of_workers). The results are
+        yielded in the order of the parameter sets.
+        """
+        self.logger.info("Testing parameters sets using {} worker processes".format(self._number_of_workers))
+
+        data_provider = self._data_handler.price_data_provider  # type: PresetDataProvider
+        shared_data_bundle = MemoryMappedDataArray(data_provider.data_bundle)
+
+        alpha_model_factory = self._alpha_model_factory
+        if isinstance(alpha_model_factory, AlphaModelFactory):
+            # every worker creates its own data handler, which is passed to the factory there
+            alpha_model_factory = alpha_model_factory.with_data_handler(None)
+
+        feature_cache_size = self._feature_cache.max_size if self._feature_cache is not None else None
+        task = _WorkerTask(self._model_type, self._tickers, self._start_date, self._end_date,
+                           self._data_history_start_date, alpha_model_factory, self._timer, shared_data_bundle,
+                           data_provider.start_date, data_provider.end_date, data_provider.check_data_availability,
+                           data_provider.use_array_bar_store, feature_cache_size)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self._number_of_workers) as executor:
+                futures = [executor.submit(_test_param_set_in_worker, task, param_set)
+                           for param_set in self._parameter_sets]
+                for future in futures:
+                    yield future.result()
+        finally:
+            shared_data_bundle.close()
+
+    def _test_param_set(self, param_set, prices_data_array: QFDataArray, history_data_array: QFDataArray,
+                        open_to_open_returns_df) -> Tuple[BacktestSummaryElement, float, float]:
+        """
+        Calculates exposures and the BacktestSummaryElement for one parameter set. Returns the element together
+        with the times (in seconds) of calculating the exposures and the backtest summary.
+        """
+        start_time = time()
+        model = self._make_model(param_set)
+        backtest_dates = prices_data_array.dates.to_index()
+        exposure_values_df = self._generate_exposure_values_vectorised(model, history_data_array, backtest_dates)
+        if exposure_values_df is None:
+            exposure_values_df = self._generate_exposure_values(model, backtest_dates)
+        exposures_end_time = time()
 
-            end_time = time()
-            print("{} / {} parameters sets tested".format(param_set_ctr, nr_of_param_sets))
-            print("iteration time = {:5.2f} minutes".format((end_time - start_time) / 60))
-            param_set_ctr += 1
+        backtest_summary_elem = self._calculate_backtest_summary(
+            param_set, prices_data_array, open_to_open_returns_df, exposure_values_df)
+        summary_end_time = time()
 
-        return backtest_summary_elem_list
+        return backtest_summary_elem, exposures_end_time - start_time, summary_end_time - exposures_end_time
 
     def _get_open_prices(self, prices_data_array):
         open_prices_pandas_df = prices_data_array.loc[:, :, PriceField.Open].to_pandas()
@@ -159,6 +288,38 @@ class FastAlphaModelTester(object):
 
         return exposure_values_df
 
+    def _generate_exposure_values_vectorised(self, model: AlphaModel, history_data_array: QFDataArray,
+                                             backtest_dates) -> Optional[DataFrame]:
+        exposures_df = model.calculate_exposures_vectorised(history_data_array)
+        if exposures_df is None:
+            return None
+
+        exposures_df = exposures_df.reindex(index=backtest_dates, columns=self._tickers)
+        exposure_values = exposures_df.values.astype(np.float64)
+        self._fill_missing_exposure_values(model, exposure_values, backtest_dates)
+
+        exposure_values_df = DataFrame(
+            data=exposure_values,
+            index=backtest_dates,
+            columns=pd.Index(self._tickers, name=TICKERS)
+        )
+
+        return exposure_values_df
+
+    def _fill_missing_exposure_values(self, model: AlphaModel, exposure_values: np.ndarray, backtest_dates):
+        """
+        Replaces (in place) the exposures which the model couldn't calculate in the vectorised way (NaNs, e.g. on
+        the first dates of the backtest if the history starts too late) with the ones returned by calculate_exposure().
+        """
+        missing_values = np.isnan(exposure_values)
+        for i in np.nonzero(missing_values.any(axis=1))[0]:
+            self._timer.set_current_time(backtest_dates[i])
+
+            for j in np.nonzero(missing_values[i])[0]:
+                curr_exp_value = exposure_values[i - 1, j] if i > 0 else 0.0
+                new_exp = model.calculate_exposure(self._tickers[j], Exposure(curr_exp_value))
+                exposure_values[i, j] = new_exp.value
+
     def _calculate_portfolio_returns_tms(self, open_to_open_returns_df, exposure_values_df):
         """
         SimpleReturnsSeries of the portfolio - for each date equal to the portfolio performance over the last
@@ -203,146 +364,81 @@ class FastAlphaModelTester(object):
         return portfolio_rets_tms
 
     def _calculate_trades(self, prices_array, exposures_df) -> pd.DataFrame:
-        all_trade_fields = [
-            TradeField.Ticker, TradeField.StartDate, TradeField.EndDate,
-            TradeField.Open, TradeField.MaxGain, TradeField.MaxLoss, TradeField.Close, TradeField.Return,
-            TradeField.Exposure
-        ]
-
-        trade_data_list = []
         shifted_signals_df = exposures_df.shift(1, axis=0)
+        # signals cropped to the time frame of the backtest (from start date till end date)
+        shifted_signals_df = shifted_signals_df.loc[self._start_date:]
 
-        for ticker, exposures_tms in shifted_signals_df.iteritems():
-            trade_data_partial_list = self.generate_trades_for_ticker(prices_array, exposures_tms, ticker)
-            trade_data_list += trade_data_partial_list
-
-        result = self._trade_data_to_df(all_trade_fields, trade_data_list)
-
-        return result
-
-    def generate_trades_for_ticker(self, prices_array, exposures_tms, ticker):
-        historical_data = self._get_historical_data(exposures_tms, prices_array, ticker)
-
-        prev_exposure = 0.0
-        trades_data_list = []
-        trade_data = None
-
-        # historical data cropped to the time frame of the backtest (from start date till end date)
-        cropped_historical_data = historical_data.loc[self._start_date:, :]
-        for _, row in cropped_historical_data.iterrows():
-            curr_exposure, curr_price, low_price, high_price = row.values
-            curr_date = row.name.to_pydatetime()
-
-            # skipping the nan exposures (the first one is sure to be nan)
-            if np.isnan(curr_exposure):
-                continue
-
-            out_of_the_market = trade_data is None
-            if out_of_the_market:
-                assert prev_exposure == 0.0
-
-                if curr_exposure != 0.0:
-                    trade_data = _TradeData.enter_trade(
-                        ticker, curr_date, curr_price, curr_exposure, high_price, low_price)
-            else:
-                assert prev_exposure != 0.0
-
-                exposure_change = int(curr_exposure - prev_exposure)
-                should_close_position = exposure_change != 0.0
-
-                if should_close_position:
-                    trade_data.exit_trade(curr_date, curr_price)
-                    trades_data_list.append(trade_data)
-                    trade_data = None
+        tickers = shifted_signals_df.columns
+        dates = shifted_signals_df.index
 
-                    going_into_opposite_direction = curr_exposure != 0.0
-                    if going_into_opposite_direction:
-                        trade_data = _TradeData.enter_trade(
-                            ticker, curr_date, curr_price, curr_exposure, high_price, low_price)
-                else:
-                    trade_data.update_high_and_low(high_price, low_price)
+        price_fields = [PriceField.Open, PriceField.High, PriceField.Low]
+        dates_positions = prices_array.dates.to_index().get_indexer(dates)
+        tickers_positions = pd.Index(prices_array.tickers.values).get_indexer(tickers)
+        fields_positions = pd.Index(prices_array.fields.values).get_indexer(price_fields)
 
-            prev_exposure = curr_exposure
+        prices = prices_array.values[:, tickers_positions, :][:, :, fields_positions].astype(np.float64)
+        prices = prices[dates_positions]
+        prices[dates_positions == -1] = np.nan
 
-        return trades_data_list
+        return extract_trades(shifted_signals_df.values, prices[:, :, 0], prices[:, :, 1], prices[:, :, 2],
+                              dates, tickers)
 
-    def _trade_data_to_df(self, all_trade_fields, trade_data_list):
-        row_data_list = []
 
-        for tr in trade_data_list:
-            row_data = (
-                tr.ticker, tr.start_date, tr.end_date, tr.open_price, tr.max_gain, tr.max_loss, tr.close_price,
-                tr.trade_return, tr.exposure_value)
-            row_data_list.append(row_data)
+_WorkerTask = namedtuple("_WorkerTask", [
+    "model_type", "tickers", "start_date", "end_date", "data_history_start_date", "alpha_model_factory", "timer",
+    "shared_data_bundle", "data_bundle_start_date", "data_bundle_end_date", "check_data_availability",
+    "use_array_bar_store", "feature_cache_size"])
+"""everything (but the parameter set) which is needed to test a parameter set in the worker process"""
 
-        result = pd.DataFrame(columns=pd.Index(all_trade_fields), data=row_data_list)
 
-        return result
+class _WorkerData(object):
+    """ Data loaded by the worker process, which is reused by all the tasks (with the same data bundle) it executes. """
 
-    def _get_historical_data(self, exposures_tms, prices_array, ticker):
-        prices_df = prices_array.loc[:, ticker, :].to_pandas()
-        prices_df = cast_dataframe(prices_df, PricesDataFrame)
+    def __init__(self, task: _WorkerTask):
+        data_bundle = task.shared_data_bundle.to_data_array()
+        self.data_provider = PresetDataProvider(data_bundle, task.data_bundle_start_date, task.data_bundle_end_date,
+                                                task.check_data_availability, task.use_array_bar_store)
 
-        open_prices_tms = prices_df.loc[:, PriceField.Open]
-        low_prices_tms = prices_df.loc[:, PriceField.Low]
-        high_prices_tms = prices_df.loc[:, PriceField.High]
+        # loaded by the first task
+        self.prices_data_array = None
+        self.history_data_array = None
+        self.open_to_open_returns_df = None
 
-        historical_data = pd.concat((exposures_tms, open_prices_tms, low_prices_tms, high_prices_tms), axis=1)
-        return historical_data
+        self.feature_cache = None
+        if task.feature_cache_size is not None:
+            self.feature_cache = FeatureCache(None, task.feature_cache_size)
 
 
-class _TradeData(object):
-    def __init__(self):
-        self.ticker = None
-        self.start_date = None
-        self.end_date = None
-        self.open_price = np.nan
-        self.close_price = np.nan
-        self.exposure_value = np.nan
+# path of the data bundle file -> _WorkerData
+_worker_data = dict()
 
-        self._highest_high_price = np.nan
-        self._lowest_low_price = np.nan
 
-    @classmethod
-    def enter_trade(cls, ticker: Ticker, start_date: datetime,
-                    open_price: float, exposure: float, high_price: float, low_price: float):
-        trade = _TradeData()
+def _test_param_set_in_worker(task: _WorkerTask, param_set) -> Tuple[BacktestSummaryElement, float, float]:
+    key = task.shared_data_bundle.file_path
+    if key not in _worker_data:
+        _worker_data.clear()
+        _worker_data[key] = _WorkerData(task)
+    worker_data = _worker_data[key]
 
-        trade.ticker = ticker
-        trade.exposure_value = exposure
-        trade.start_date = start_date
-        trade.open_price = open_price
-        trade._highest_high_price = high_price
-        trade._lowest_low_price = low_price
+    # the timer is sent with every task (together with the alpha model factory, which may refer to it),
+    # so the data handler is created for every task
+    data_handler = FastDataHandler(worker_data.data_provider, task.timer)
 
-        return trade
+    alpha_model_factory = task.alpha_model_factory
+    if isinstance(alpha_model_factory, AlphaModelFactory):
+        alpha_model_factory = alpha_model_factory.with_data_handler(data_handler)
+    if worker_data.feature_cache is not None:
+        worker_data.feature_cache.data_handler = data_handler
 
-    def exit_trade(self, end_date: datetime, close_price: float):
-        self.end_date = end_date
-        self.close_price = close_price
-
-    def update_high_and_low(self, high_price: float, low_price: float):
-        self._highest_high_price = max(high_price, self._highest_high_price)
-        self._lowest_low_price = min(low_price, self._lowest_low_price)
-
-    @property
-    def max_gain(self) -> float:
-        if self.exposure_value == 1.0:
-            max_gain = self._highest_high_price - self.open_price
-        else:  # exposure == -1.0
-            max_gain = self.open_price - self._lowest_low_price
+    tester = FastAlphaModelTester(task.model_type, [param_set], task.tickers, task.start_date, task.end_date,
+                                  data_handler, task.timer, alpha_model_factory, task.data_history_start_date,
+                                  feature_cache=worker_data.feature_cache)
 
-        return max_gain
-
-    @property
-    def max_loss(self):
-        if self.exposure_value == 1.0:
-            max_loss = self._lowest_low_price - self.open_price
-        else:  # exposure == -1.0
-            max_loss = self.open_price - self._highest_high_price
+    if worker_data.prices_data_array is None:
+        worker_data.prices_data_array = tester._get_data_for_backtest()
+        worker_data.history_data_array = tester._get_history_for_vectorised_exposures(worker_data.prices_data_array)
+        open_prices_df = tester._get_open_prices(worker_data.prices_data_array)
+        worker_data.open_to_open_returns_df = open_prices_df.to_simple_returns()
 
-        return max_loss
-
-    @property
-    def trade_return(self):
-        return (self.close_price / self.open_price - 1) * self.exposure_value
+    return tester._test_param_set(param_set, worker_data.prices_data_array, worker_data.history_data_array,
+                                  worker_data.open_to_open_returns_df)
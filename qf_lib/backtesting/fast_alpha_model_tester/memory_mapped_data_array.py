@@ -0,0 +1,95 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import os
+import tempfile
+
+import numpy as np
+
+from qf_lib.containers.qf_data_array import QFDataArray
+
+
+class MemoryMappedDataArray(object):
+    """
+    Keeps the values of a QFDataArray in a temporary memory-mapped file, so that the array can be shared between
+    processes (e.g. the workers of the FastAlphaModelTester) without pickling its values. When the object is pickled,
+    only the labels of the array and the path of the file are serialized.
+
+    The file is removed when close() is called (or when leaving the with-block). It must be done by the process
+    which created the object.
+    """
+
+    def __init__(self, data_array: QFDataArray, directory: str = None):
+        """
+        Parameters
+        ----------
+        data_array
+            array, which values should be written to the file
+        directory
+            directory in which the file should be created. By default the system temporary directory is used.
+        """
+        values = data_array.values
+        if values.dtype == object:
+            values = values.astype(np.float64)
+
+        self._dates = data_array.dates.to_index()
+        self._tickers = list(data_array.tickers.values)
+        self._fields = list(data_array.fields.values)
+        self._name = data_array.name
+        self._dtype = values.dtype
+        self._shape = values.shape
+
+        self._file_path = None
+        self._values = None
+
+        if values.size == 0:
+            # empty files can't be memory-mapped, so empty arrays are pickled together with the labels
+            self._values = values
+        else:
+            file_descriptor, self._file_path = tempfile.mkstemp(prefix="qf_data_array_", suffix=".dat",
+                                                                dir=directory)
+            os.close(file_descriptor)
+
+            memory_mapped_values = np.memmap(self._file_path, dtype=self._dtype, mode="w+", shape=self._shape)
+            memory_mapped_values[:] = values
+            memory_mapped_values.flush()
+            del memory_mapped_values
+
+    @property
+    def file_path(self) -> str:
+        """ Path to the memory-mapped file or None if the array is empty. """
+        return self._file_path
+
+    def to_data_array(self) -> QFDataArray:
+        """
+        Creates the QFDataArray backed by the memory-mapped file. The file is mapped in the copy-on-write mode,
+        so modifications of the returned array are never written back to the file.
+        """
+        if self._file_path is None:
+            values = self._values.copy()
+        else:
+            values = np.memmap(self._file_path, dtype=self._dtype, mode="c", shape=self._shape)
+
+        return QFDataArray.create(self._dates, self._tickers, self._fields, data=values, name=self._name)
+
+    def close(self):
+        """ Removes the memory-mapped file. """
+        if self._file_path is not None and os.path.exists(self._file_path):
+            os.remove(self._file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
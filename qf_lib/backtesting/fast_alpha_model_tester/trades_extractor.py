@@ -0,0 +1,130 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.trade_field import TradeField
+from qf_lib.common.tickers.tickers import Ticker
+
+TRADE_FIELDS = [
+    TradeField.Ticker, TradeField.StartDate, TradeField.EndDate,
+    TradeField.Open, TradeField.MaxGain, TradeField.MaxLoss, TradeField.Close, TradeField.Return,
+    TradeField.Exposure
+]
+
+
+def extract_trades(exposures: np.ndarray, open_prices: np.ndarray, high_prices: np.ndarray,
+                   low_prices: np.ndarray, dates: pd.DatetimeIndex, tickers: Sequence[Ticker]) -> pd.DataFrame:
+    """
+    Extracts the trades of all the tickers at once, from the exposures held on every date.
+
+    A trade is entered at the Open price of the first date on which the exposure becomes different from 0.0
+    and exited at the Open price of the first date on which the exposure changes (the position is reversed on the same
+    date if the new exposure is not 0.0). The High and Low prices of the dates on which the position is held (including
+    the entry date, excluding the exit date) determine the max gain and max loss. NaN exposures are skipped (the dates
+    are treated as if they didn't exist) and the trades which are still open on the last date are not returned.
+
+    Parameters
+    ----------
+    exposures
+        values of exposures (e.g. 1.0 for Exposure.LONG) held on every date; array of shape: dates x tickers
+    open_prices
+        Open prices (dates x tickers)
+    high_prices
+        High prices (dates x tickers)
+    low_prices
+        Low prices (dates x tickers)
+    dates
+        dates corresponding to the rows of arrays
+    tickers
+        tickers corresponding to the columns of arrays
+
+    Returns
+    -------
+    DataFrame with the TradeFields as columns (Ticker, StartDate, EndDate, Open, MaxGain, MaxLoss, Close, Return,
+    Exposure) and a row for every trade. Trades are sorted by tickers (in the order of given tickers) and start dates.
+    """
+    # all the arrays are flattened ticker by ticker and the dates with NaN exposures are removed
+    exposures = np.asarray(exposures, dtype=np.float64).T.ravel()
+    is_valid = ~np.isnan(exposures)
+
+    exposures = exposures[is_valid]
+    open_prices = np.asarray(open_prices, dtype=np.float64).T.ravel()[is_valid]
+    high_prices = np.asarray(high_prices, dtype=np.float64).T.ravel()[is_valid]
+    low_prices = np.asarray(low_prices, dtype=np.float64).T.ravel()[is_valid]
+
+    if len(exposures) == 0:
+        return pd.DataFrame(columns=pd.Index(TRADE_FIELDS), data=[])
+
+    num_of_dates = len(dates)
+    positions = np.flatnonzero(is_valid)
+    date_positions = positions % num_of_dates
+    ticker_positions = positions // num_of_dates
+
+    # exposure before the first date of every ticker is equal to 0.0
+    previous_exposures = np.empty_like(exposures)
+    previous_exposures[0] = 0.0
+    previous_exposures[1:] = exposures[:-1]
+    is_first_date_of_ticker = np.empty(len(exposures), dtype=bool)
+    is_first_date_of_ticker[0] = True
+    is_first_date_of_ticker[1:] = np.diff(ticker_positions) != 0
+    previous_exposures[is_first_date_of_ticker] = 0.0
+
+    # every trade starts at a change point and lasts until the next change point of the same ticker
+    change_points = np.flatnonzero(exposures != previous_exposures)
+    if len(change_points) == 0:
+        return pd.DataFrame(columns=pd.Index(TRADE_FIELDS), data=[])
+
+    highest_high_prices = np.fmax.reduceat(high_prices, change_points)
+    lowest_low_prices = np.fmin.reduceat(low_prices, change_points)
+
+    start_points = change_points[:-1]
+    end_points = change_points[1:]
+    is_trade = (exposures[start_points] != 0.0) & \
+               (ticker_positions[start_points] == ticker_positions[end_points])
+
+    start_points = start_points[is_trade]
+    end_points = end_points[is_trade]
+    highest_high_prices = highest_high_prices[:-1][is_trade]
+    lowest_low_prices = lowest_low_prices[:-1][is_trade]
+
+    trade_exposures = exposures[start_points]
+    entry_prices = open_prices[start_points]
+    exit_prices = open_prices[end_points]
+    is_long = trade_exposures == 1.0
+
+    max_gains = np.where(is_long, highest_high_prices - entry_prices, entry_prices - lowest_low_prices)
+    max_losses = np.where(is_long, lowest_low_prices - entry_prices, entry_prices - highest_high_prices)
+    returns = (exit_prices / entry_prices - 1) * trade_exposures
+
+    dates = pd.DatetimeIndex(dates)
+    tickers_array = np.empty(len(tickers), dtype=object)
+    tickers_array[:] = list(tickers)
+
+    trades_df = pd.DataFrame(columns=pd.Index(TRADE_FIELDS), data={
+        TradeField.Ticker: tickers_array[ticker_positions[start_points]],
+        TradeField.StartDate: dates[date_positions[start_points]],
+        TradeField.EndDate: dates[date_positions[end_points]],
+        TradeField.Open: entry_prices,
+        TradeField.MaxGain: max_gains,
+        TradeField.MaxLoss: max_losses,
+        TradeField.Close: exit_prices,
+        TradeField.Return: returns,
+        TradeField.Exposure: trade_exposures
+    })
+
+    return trades_df
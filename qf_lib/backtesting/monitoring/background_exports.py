@@ -0,0 +1,104 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Tuple
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+
+
+class BackgroundExportError(Exception):
+    """
+    Exception raised when some of the exports run by BackgroundExports failed. The errors attribute contains
+    the list of (description of the export, exception) pairs.
+    """
+
+    def __init__(self, errors: List[Tuple[str, BaseException]]):
+        self.errors = errors
+        super().__init__("{} export(s) failed: {}".format(
+            len(errors), "; ".join("{}: {!r}".format(description, ex) for description, ex in errors)))
+
+
+class BackgroundExports(object):
+    """
+    Pool of processes running the end-of-trading exports (PDFs, Excel files) in background, so that the next backtest
+    may start immediately. One pool may be shared by many monitors (e.g. all the backtests run in a batch).
+    The workers use the non-interactive matplotlib backend.
+
+    The processes are started with the first submitted export. wait() blocks until all the submitted exports are
+    finished and reports the errors.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+        self.max_workers = max_workers
+
+        self._executor = None  # type: ProcessPoolExecutor
+        self._pending_exports = []  # type: List[Tuple[str, Future]]
+
+    def submit(self, description: str, export_function: Callable, *args) -> Future:
+        """
+        Runs export_function(*args) in one of the worker processes. The function and the arguments must be picklable.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        future = self._executor.submit(_run_export, export_function, *args)
+        self._pending_exports.append((description, future))
+        return future
+
+    def wait(self, raise_errors: bool = True) -> List[Tuple[str, BaseException]]:
+        """
+        Waits until all the submitted exports are finished. Errors are logged and, if raise_errors is True,
+        BackgroundExportError is raised.
+
+        Returns
+        -------
+        list of (description of the export, exception) pairs for all the exports which failed
+        """
+        pending_exports, self._pending_exports = self._pending_exports, []
+
+        errors = []
+        for description, future in pending_exports:
+            exception = future.exception()
+            if exception is not None:
+                self.logger.error("Error while exporting {}: {!r}".format(description, exception))
+                errors.append((description, exception))
+
+        if errors and raise_errors:
+            raise BackgroundExportError(errors)
+
+        return errors
+
+    def shutdown(self, wait: bool = True):
+        """ Stops the worker processes (after finishing the submitted exports if wait is True). """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.wait(raise_errors=exc_type is None)
+        finally:
+            self.shutdown()
+
+
+def _run_export(export_function: Callable, *args):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    return export_function(*args)
@@ -12,7 +12,6 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-# it is important to import the matplotlib first and then switch the interactive/dynamic mode on.
 from io import TextIOWrapper
 
 import matplotlib.pyplot as plt
@@ -22,8 +21,6 @@ from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.starting_dir import get_starting_dir_abs_path
 
-plt.ion()  # required for dynamic chart
-
 import csv
 from qf_lib.documents_utils.excel.excel_exporter import ExcelExporter
 from qf_lib.backtesting.portfolio.transaction import Transaction
@@ -52,6 +49,9 @@ class BacktestMonitor(AbstractMonitor):
         self._pdf_exporter = pdf_exporter
         self._excel_exporter = excel_exporter
 
+        # the interactive/dynamic mode is switched on only when the monitor is used (not when it's imported)
+        plt.ion()  # required for dynamic chart
+
         # Set up an empty chart that can be updated
         self._figure, self._ax = plt.subplots()
         self._figure.set_size_inches(12, 5)
@@ -0,0 +1,192 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import csv
+from datetime import datetime
+from os import path, makedirs
+from typing import List, Tuple, Callable, Any
+
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.monitoring.background_exports import BackgroundExports
+from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.settings import Settings
+from qf_lib.starting_dir import get_starting_dir_abs_path
+
+
+class HeadlessBacktestMonitor(AbstractMonitor):
+    """
+    Monitor for running many backtests (e.g. in a batch) without any GUI. It doesn't draw the chart of the portfolio
+    value, writes the transactions to the CSV file in batches and runs the end-of-trading exports (tearsheet PDF,
+    leverage analysis PDF and the Excel file with the portfolio's timeseries) in background processes, so that
+    the next backtest may start immediately.
+
+    The reporting modules (matplotlib, PDF and Excel exporting) are imported only by the export workers, which use
+    the non-interactive matplotlib backend. Use wait_for_exports() to wait for the exports and get their errors.
+    """
+
+    def __init__(self, backtest_result: BacktestResult, settings: Settings, pdf_exporter, excel_exporter,
+                 background_exports: BackgroundExports = None, csv_buffer_size: int = 1000):
+        """
+        Parameters
+        ----------
+        backtest_result
+            result of the backtest
+        settings
+            settings of the project
+        pdf_exporter
+            PDFExporter used by the export workers
+        excel_exporter
+            ExcelExporter used by the export workers
+        background_exports
+            pool running the exports. It may be shared by many monitors. If None, the monitor creates its own pool
+            with a single worker (shut down in wait_for_exports())
+        csv_buffer_size
+            number of transactions buffered in memory before they are written to the CSV file
+        """
+        self.backtest_result = backtest_result
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+        self._settings = settings
+        self._pdf_exporter = pdf_exporter
+        self._excel_exporter = excel_exporter
+
+        self._owns_background_exports = background_exports is None
+        if background_exports is None:
+            background_exports = BackgroundExports(max_workers=1)
+        self._background_exports = background_exports
+
+        self._file_name_template = datetime.now().strftime("%Y_%m_%d-%H%M {}".format(backtest_result.backtest_name))
+        self._report_dir = "backtesting"
+
+        self._csv_buffer_size = csv_buffer_size
+        self._csv_rows = []  # type: List[List]
+        self._csv_file = self._init_csv_file(self._file_name_template)
+        self._csv_writer = csv.writer(self._csv_file)
+
+    def real_time_update(self, timestamp: datetime = None):
+        """
+        This method will not be used by the historical backtest
+        """
+        pass
+
+    def end_of_day_update(self, timestamp: datetime = None):
+        """
+        No chart is drawn by the headless monitor
+        """
+        pass
+
+    def record_transaction(self, transaction: Transaction):
+        """
+        Buffers the transaction; the buffer is written to the CSV file when it is full
+        """
+        self._csv_rows.append([
+            transaction.time,
+            transaction.contract.symbol,
+            transaction.quantity,
+            transaction.price,
+            transaction.commission
+        ])
+
+        if len(self._csv_rows) >= self._csv_buffer_size:
+            self._flush_csv_rows()
+
+    def end_of_trading_update(self, _: datetime = None):
+        """
+        Writes the remaining transactions to the CSV file and submits the exports of the results to the background
+        processes. It doesn't wait for the exports to finish.
+        """
+        self._flush_csv_rows()
+        self._close_csv_file()
+
+        portfolio_tms = self.backtest_result.portfolio.get_portfolio_timeseries()
+        portfolio_tms.name = self.backtest_result.backtest_name
+        leverage = self.backtest_result.portfolio.leverage()
+
+        for description, export_function, args in self._export_tasks(portfolio_tms, leverage):
+            self._background_exports.submit(
+                "{} of {}".format(description, self.backtest_result.backtest_name), export_function, *args)
+
+    def wait_for_exports(self, raise_errors: bool = True) -> List[Tuple[str, BaseException]]:
+        """
+        Waits until the exports are finished. See: BackgroundExports.wait(). If the monitor uses its own pool,
+        the pool is shut down.
+        """
+        try:
+            return self._background_exports.wait(raise_errors)
+        finally:
+            if self._owns_background_exports:
+                self._background_exports.shutdown()
+
+    def _export_tasks(self, portfolio_tms: QFSeries, leverage: QFSeries) -> List[Tuple[str, Callable, Tuple[Any]]]:
+        """
+        Returns the list of exports: (description, picklable export function, arguments of the function).
+        """
+        xlsx_filename = "{}.xlsx".format(self._file_name_template)
+        excel_file_path = path.join(self._report_dir, "timeseries", xlsx_filename)
+
+        return [
+            ("tearsheet", _export_tearsheet, (self._settings, self._pdf_exporter, portfolio_tms, self._report_dir)),
+            ("leverage analysis", _export_leverage_analysis,
+             (self._settings, self._pdf_exporter, portfolio_tms, leverage, self._report_dir)),
+            ("timeseries Excel file", _export_tms_to_excel, (self._excel_exporter, portfolio_tms, excel_file_path))
+        ]
+
+    def _init_csv_file(self, file_name_template: str):
+        """
+        Creates a new csv file for every backtest run, writes the header and returns the file.
+        """
+        output_dir = path.join(get_starting_dir_abs_path(), self._settings.output_directory, self._report_dir, "trades")
+        if not path.exists(output_dir):
+            makedirs(output_dir)
+
+        csv_filename = "{}.csv".format(file_name_template)
+        file_path = path.expanduser(path.join(output_dir, csv_filename))
+
+        file_handler = open(file_path, 'a', newline='')
+        csv.writer(file_handler).writerow(["Timestamp", "Contract", "Quantity", "Price", "Commission"])
+
+        return file_handler
+
+    def _flush_csv_rows(self):
+        if self._csv_rows and self._csv_file is not None:
+            self._csv_writer.writerows(self._csv_rows)
+            self._csv_rows = []
+
+    def _close_csv_file(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+
+
+def _export_tearsheet(settings: Settings, pdf_exporter, portfolio_tms: QFSeries, report_dir: str):
+    from qf_lib.analysis.tearsheets.tearsheet_without_benchmark import TearsheetWithoutBenchmark
+
+    tearsheet = TearsheetWithoutBenchmark(settings, pdf_exporter, portfolio_tms, title=portfolio_tms.name)
+    tearsheet.build_document()
+    tearsheet.save(report_dir)
+
+
+def _export_leverage_analysis(settings: Settings, pdf_exporter, portfolio_tms: QFSeries, leverage: QFSeries,
+                              report_dir: str):
+    from qf_lib.analysis.leverage_analysis.leverage_analysis_sheet import LeverageAnalysisSheet
+
+    leverage_sheet = LeverageAnalysisSheet(settings, pdf_exporter, leverage, portfolio_tms.name)
+    leverage_sheet.build_document()
+    leverage_sheet.save(report_dir)
+
+
+def _export_tms_to_excel(excel_exporter, portfolio_tms: QFSeries, relative_file_path: str):
+    excel_exporter.export_container(portfolio_tms, relative_file_path, starting_cell='A1', include_column_names=True)
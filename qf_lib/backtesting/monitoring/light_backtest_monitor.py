@@ -12,11 +12,6 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-# it is important to import the matplotlib first and then switch the interactive/dynamic mode on.
-import matplotlib.pyplot as plt
-
-plt.ion()  # required for dynamic chart
-
 from qf_lib.analysis.tearsheets.tearsheet_without_benchmark import TearsheetWithoutBenchmark
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.analysis.timeseries_analysis.timeseries_analysis import TimeseriesAnalysis
@@ -64,8 +64,8 @@ class PastSignalsGenerator(object):
     def collect_backtest_result(self):
         self.backtest_ts.start_trading()
         self.signals_df = self.strategy.signals_df
-        self.exposures_df = self.signals_df.applymap(lambda x: x.suggested_exposure.name)
-        self.fractions_at_risk_df = self.signals_df.applymap(lambda x: x.fraction_at_risk)
+        self.exposures_df = self.strategy.signal_recorder.exposures_df()
+        self.fractions_at_risk_df = self.strategy.signal_recorder.fractions_at_risk_df()
 
         portfolio_tms = self.backtest_ts.portfolio.get_portfolio_timeseries()
         portfolio_tms.index = portfolio_tms.index.date  # remove time part
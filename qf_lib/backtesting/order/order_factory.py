@@ -103,7 +103,7 @@ class OrderFactory(object):
         if tolerance_quantities is None:
             tolerance_quantities = {}
 
-        contract_to_positions = {position.contract(): position for position in self.broker.get_positions()}
+        contract_to_positions = self.broker.get_positions_by_contract()
 
         for contract, target_quantity in target_quantities.items():
             position = contract_to_positions.get(contract, None)
@@ -12,7 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import List
+from typing import List, Optional
 
 from numpy import sign
 
@@ -22,15 +22,30 @@ from qf_lib.backtesting.portfolio.transaction import Transaction
 
 
 class BacktestPosition(Position):
-    def __init__(self, contract: Contract) -> None:
+    """
+    Position used in backtests. All the values describing the position (cost basis, average cost per share,
+    realised PnL) are kept as running aggregates, updated on every transaction, so they are available in O(1) time
+    regardless of the number of transactions.
+    """
+
+    def __init__(self, contract: Contract, keep_transactions: bool = True) -> None:
+        """
+        Parameters
+        ----------
+        contract
+            contract identifying the position
+        keep_transactions
+            if True, all the transactions of the position are stored in the list: transactions. Otherwise the history
+            of transactions is not kept (transactions is None) and only the running aggregates are updated
+        """
         self._contract = contract
         """Contract identifying the position"""
 
         self.is_closed = False
         """Determines if the positions has been closed"""
 
-        self.transactions = []  # type: List[Transaction]
-        """List of all transactions for the asset"""
+        self.transactions = [] if keep_transactions else None  # type: Optional[List[Transaction]]
+        """List of all transactions for the asset (None if the history of transactions is not kept)"""
 
         self.number_of_shares = 0  # type: int
         """ Number of shares held currently in the portfolio. Positive value means this is a Long position
@@ -42,6 +57,21 @@ class BacktestPosition(Position):
         self.direction = 0  # type: int
         """ Direction of the position: Long = 1, Short = -1, Not defined = 0"""
 
+        # running aggregates of all the transactions
+        self._total_cost = 0.0  # sum of costs of all the transactions (see: _calculate_cost_of_transaction())
+        self._cost_of_bought_shares = 0.0
+        self._number_of_bought_shares = 0
+        self._cost_of_sold_shares = 0.0
+        self._number_of_sold_shares = 0  # negative number
+
+        # running aggregates used for the realised PnL: the shares which were not used for closing the position
+        # and their total value (the average price of shares including commissions times number of shares)
+        self._realised_pnl = 0.0
+        self._value_of_shares_bought_for_pnl = 0.0
+        self._number_of_shares_bought_for_pnl = 0
+        self._value_of_shares_sold_for_pnl = 0.0
+        self._number_of_shares_sold_for_pnl = 0
+
     @property
     def market_value(self) -> float:
         """ Estimated current market value of the position """
@@ -63,14 +93,27 @@ class BacktestPosition(Position):
         assert transaction.quantity != 0, "`Transaction.quantity` shouldn't be 0"
         assert transaction.price > 0.0, "Transaction.price must be positive. For short sales use a negative quantity"
 
-        self.transactions.append(transaction)
+        if self.transactions is not None:
+            self.transactions.append(transaction)
+
+        cost_of_transaction = self._calculate_cost_of_transaction(transaction)
+        self._update_realised_pnl(transaction)
+
+        self._total_cost += cost_of_transaction
+        if transaction.quantity > 0:
+            self._cost_of_bought_shares += cost_of_transaction
+            self._number_of_bought_shares += transaction.quantity
+        else:
+            self._cost_of_sold_shares += cost_of_transaction
+            self._number_of_sold_shares += transaction.quantity
+
         self.number_of_shares += transaction.quantity
         self.direction = sign(self.number_of_shares)
 
         if self.number_of_shares == 0:  # close the position if the number of shares drops to zero
             self.is_closed = True
 
-        return self._calculate_cost_of_transaction(transaction)
+        return cost_of_transaction
 
     def update_price(self, bid_price: float, ask_price: float):
         """
@@ -94,10 +137,7 @@ class BacktestPosition(Position):
         if self.number_of_shares == 0:
             return 0.0
 
-        result = 0.0
-        for transaction in self.transactions:
-            result += self._calculate_cost_of_transaction(transaction)
-        return result
+        return self._total_cost
 
     def contract(self) -> Contract:
         return self._contract
@@ -112,18 +152,13 @@ class BacktestPosition(Position):
         The value includes all incurred transaction costs and distributes them equally over all shares
         It is always a positive number.
         """
-        cost = 0.0
-        shares = 0
-
-        for transaction in self.transactions:
-            # take into account only BUY transaction if the position is long
-            # take into account only SELL transaction if the position is short
-            if sign(transaction.quantity) == self.direction:
-                cost += self._calculate_cost_of_transaction(transaction)
-                shares += transaction.quantity
-        if shares == 0:
-            return 0
-        return cost / shares
+        # take into account only BUY transaction if the position is long
+        # take into account only SELL transaction if the position is short
+        if self.direction == 1 and self._number_of_bought_shares != 0:
+            return self._cost_of_bought_shares / self._number_of_bought_shares
+        if self.direction == -1 and self._number_of_sold_shares != 0:
+            return self._cost_of_sold_shares / self._number_of_sold_shares
+        return 0
 
     def unrealised_pnl(self) -> float:
         """
@@ -135,50 +170,45 @@ class BacktestPosition(Position):
         """
         Calculate the realized pnl of the position.
         """
+        return self._realised_pnl
+
+    def _update_realised_pnl(self, transaction: Transaction):
+        """
+        Updates the realised PnL and the average prices of bought and sold shares. Must be called before
+        the number of shares is updated with the transaction.
+        """
+        quantity = self.number_of_shares
+        shares_for_pnl_calc = min([abs(transaction.quantity), abs(quantity)])
+        shares_for_avg_price_calc = abs(transaction.quantity)
+
+        if sign(quantity) == 1 and sign(transaction.quantity) == -1:  # we sell while being long
+            avg_buy_price = self._average_price(
+                self._value_of_shares_bought_for_pnl, self._number_of_shares_bought_for_pnl)
+            pnl = (transaction.price - avg_buy_price) * shares_for_pnl_calc - transaction.commission
+            self._realised_pnl += pnl
+            shares_for_avg_price_calc -= shares_for_pnl_calc
+
+        if sign(quantity) == -1 and sign(transaction.quantity) == 1:  # we buy while being short
+            avg_sell_price = self._average_price(
+                self._value_of_shares_sold_for_pnl, self._number_of_shares_sold_for_pnl)
+            pnl = (avg_sell_price - transaction.price) * shares_for_pnl_calc - transaction.commission
+            self._realised_pnl += pnl
+            shares_for_avg_price_calc -= shares_for_pnl_calc
+
+        # save the quantities and values of bought and sold shares so that they can be used for avg price calculation
+        value_of_shares = transaction.average_price_including_commission() * shares_for_avg_price_calc
+        if sign(transaction.quantity) == 1:
+            self._value_of_shares_bought_for_pnl += value_of_shares
+            self._number_of_shares_bought_for_pnl += shares_for_avg_price_calc
+        if sign(transaction.quantity) == -1:
+            self._value_of_shares_sold_for_pnl += value_of_shares
+            self._number_of_shares_sold_for_pnl += shares_for_avg_price_calc
 
-        quantity = 0  # how many shares we have in given point of time while looping through transactions
-        avg_buy_price = 0.0
-        avg_sell_price = 0.0
-        realized_pnl = 0.0
-
-        quantities_bought = []
-        quantities_sold = []
-        prices_bought = []
-        prices_sold = []
-
-        for transaction in self.transactions:
-            shares_for_pnl_calc = min([abs(transaction.quantity), abs(quantity)])
-            shares_for_avg_price_calc = abs(transaction.quantity)
-
-            if sign(quantity) == 1 and sign(transaction.quantity) == -1:  # we sell while being long
-                pnl = (transaction.price - avg_buy_price) * shares_for_pnl_calc - transaction.commission
-                realized_pnl += pnl
-                shares_for_avg_price_calc -= shares_for_pnl_calc
-
-            if sign(quantity) == -1 and sign(transaction.quantity) == 1:  # we buy while being short
-                pnl = (avg_sell_price - transaction.price) * shares_for_pnl_calc - transaction.commission
-                realized_pnl += pnl
-                shares_for_avg_price_calc -= shares_for_pnl_calc
-
-            # save the quantities and prices of bought and sold shares so that they can e used for avg price calculation
-            quantity += transaction.quantity
-            if sign(transaction.quantity) == 1:  # we buy -> update the avg buy price
-                quantities_bought.append(shares_for_avg_price_calc)
-                prices_bought.append(transaction.average_price_including_commission())
-            if sign(transaction.quantity) == -1:  # we buy -> update the avg buy price
-                quantities_sold.append(shares_for_avg_price_calc)
-                prices_sold.append(transaction.average_price_including_commission())
-
-            # update the avg prices by calculating weighted average of all shares bought and sold
-            if sum(quantities_bought) > 0:
-                avg_buy_price = sum(price * quantity for price, quantity in zip(prices_bought, quantities_bought))
-                avg_buy_price /= sum(quantities_bought)
-
-            if sum(quantities_sold) > 0:
-                avg_sell_price = sum(price * quantity for price, quantity in zip(prices_sold, quantities_sold))
-                avg_sell_price /= sum(quantities_sold)
-
-        return realized_pnl
+    @staticmethod
+    def _average_price(total_value: float, number_of_shares: int) -> float:
+        if number_of_shares > 0:
+            return total_value / number_of_shares
+        return 0.0
 
     @staticmethod
     def _calculate_cost_of_transaction(transaction: Transaction) -> float:
@@ -0,0 +1,166 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from abc import ABCMeta, abstractmethod
+from collections.abc import Sequence
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.containers.chunked_array import ChunkedArray
+
+
+class _ColumnarLedger(Sequence, metaclass=ABCMeta):
+    """
+    Base class for ledgers which store records (e.g. Transactions) column by column, in ChunkedArrays. Contracts
+    are stored as integer codes. The records are created only when they are accessed, so every access returns
+    a new object (modifications of the returned records are not stored in the ledger).
+    """
+
+    _COLUMNS = {}  # type: Dict[str, np.dtype]
+
+    def __init__(self, chunk_size: int = 4096, spill_threshold: int = None, spill_directory: str = None):
+        """
+        Parameters
+        ----------
+        chunk_size
+            number of records by which the columns grow
+        spill_threshold
+            number of records after which the columns are moved to memory-mapped files. If None, the records
+            are always kept in memory
+        spill_directory
+            directory in which the memory-mapped files are created. By default the system temporary directory is used
+        """
+        self._columns = {
+            name: ChunkedArray(dtype, chunk_size, spill_threshold, spill_directory)
+            for name, dtype in self._COLUMNS.items()
+        }  # type: Dict[str, ChunkedArray]
+
+        self._contracts = []  # type: List[Contract]
+        self._contract_to_code = {}  # type: Dict[Contract, int]
+
+    def column(self, name: str) -> np.ndarray:
+        """ Returns all the values of the column as a read-only array (contracts are returned as their codes). """
+        return self._columns[name].values()
+
+    def contracts(self) -> np.ndarray:
+        """ Returns the array of contracts of all the records. """
+        contracts = np.empty(len(self._contracts), dtype=object)
+        contracts[:] = self._contracts
+        return contracts[self.column("contract")]
+
+    def to_data_frame(self) -> pd.DataFrame:
+        """ Returns the DataFrame with a column for each field of the records and a row for each record. """
+        data = {name: self.column(name) for name in self._COLUMNS}
+        data["contract"] = self.contracts()
+        return pd.DataFrame(data=data, columns=list(self._COLUMNS))
+
+    def close(self):
+        """ Releases the memory-mapped files (if there are any). """
+        for column in self._columns.values():
+            column.close()
+
+    def __len__(self) -> int:
+        return len(self._columns["time"])
+
+    def __getitem__(self, item: Union[int, slice]):
+        """
+        Returns the record (or the list of records for a slice) with the given index. The records are rebuilt from
+        the columns on every access (also when iterating over the ledger), so changes made to the returned records
+        are lost: they are neither stored in the ledger nor visible in the records returned later.
+        """
+        if isinstance(item, slice):
+            return [self._create_record(i) for i in range(*item.indices(len(self)))]
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("{} index out of range".format(self.__class__.__name__))
+
+        return self._create_record(item)
+
+    def _append_record(self, **values):
+        contract = values["contract"]
+        contract_code = self._contract_to_code.get(contract)
+        if contract_code is None:
+            contract_code = len(self._contracts)
+            self._contracts.append(contract)
+            self._contract_to_code[contract] = contract_code
+        values["contract"] = contract_code
+
+        for name, value in values.items():
+            self._columns[name].append(value)
+
+    def _value(self, name: str, index: int):
+        value = self._columns[name][index]
+        if name == "contract":
+            return self._contracts[value]
+        return value.item()
+
+    @abstractmethod
+    def _create_record(self, index: int):
+        """ Creates a new record from the values stored in the columns at the given index. """
+        raise NotImplementedError("Should implement _create_record()")
+
+
+class TransactionsLedger(_ColumnarLedger):
+    """
+    Columnar ledger of Transactions. Supports the same operations as a list of Transactions, which does not
+    modify the transactions added before (appending, indexing, iterating). Indexing and iterating return new
+    Transaction objects, so changes made to them are not stored in the ledger.
+    """
+
+    _COLUMNS = {
+        "time": np.dtype("datetime64[us]"),
+        "contract": np.dtype(np.int64),
+        "quantity": np.dtype(np.int64),
+        "price": np.dtype(np.float64),
+        "commission": np.dtype(np.float64)
+    }
+
+    def append(self, transaction: Transaction):
+        self._append_record(time=transaction.time, contract=transaction.contract, quantity=transaction.quantity,
+                            price=transaction.price, commission=transaction.commission)
+
+    def _create_record(self, index: int) -> Transaction:
+        return Transaction(*(self._value(name, index) for name in self._COLUMNS))
+
+
+class TradesLedger(_ColumnarLedger):
+    """
+    Columnar ledger of Trades. Supports the same operations as a list of Trades, which does not modify the trades
+    added before (appending, indexing, iterating). Indexing and iterating return new Trade objects, so changes made
+    to them are not stored in the ledger.
+    """
+
+    _COLUMNS = {
+        "time": np.dtype("datetime64[us]"),
+        "contract": np.dtype(np.int64),
+        "quantity": np.dtype(np.int64),
+        "entry_price": np.dtype(np.float64),
+        "exit_price": np.dtype(np.float64),
+        "risk_as_percent": np.dtype(np.float64)
+    }
+
+    def append(self, trade: Trade):
+        self._append_record(time=trade.time, contract=trade.contract, quantity=trade.quantity,
+                            entry_price=trade.entry_price, exit_price=trade.exit_price,
+                            risk_as_percent=trade.risk_as_percent)
+
+    def _create_record(self, index: int) -> Trade:
+        return Trade(*(self._value(name, index) for name in self._COLUMNS))
@@ -12,30 +12,40 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from datetime import datetime
-from typing import List, Dict
+from itertools import compress
+from typing import List, Dict, Sequence
 
 import numpy as np
+import pandas as pd
 from numpy import sign
 
 from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
+from qf_lib.backtesting.portfolio.ledger import TransactionsLedger, TradesLedger
 from qf_lib.backtesting.portfolio.trade import Trade
 from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.chunked_array import ChunkedArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
 
 
 class Portfolio(object):
     def __init__(self, data_handler: DataHandler, initial_cash: float, timer: Timer,
-                 contract_ticker_mapper: ContractTickerMapper):
+                 contract_ticker_mapper: ContractTickerMapper, spill_threshold: int = None,
+                 spill_directory: str = None):
         """
         On creation, the Portfolio object contains no positions and all values are "reset" to the initial
         cash, with no PnL.
+
+        The transactions, trades and the time series of portfolio values and leverage are stored in columnar
+        ledgers (numpy arrays growing by chunks). If the spill_threshold is given, then each of them is moved
+        to a memory-mapped file in the spill_directory (by default: the system temporary directory), once the number
+        of its records reaches the spill_threshold.
         """
         self.initial_cash = initial_cash
         self.data_handler = data_handler
@@ -50,16 +60,23 @@ class Portfolio(object):
 
         # dates and portfolio values are keep separately because it is inefficient to append to the QFSeries
         # use get_portfolio_timeseries() to get them as a series.
-        self.dates = []  # type: List[datetime]
-        self.portfolio_values = []  # type: List[float]
+        self.dates = ChunkedArray("datetime64[us]", spill_threshold=spill_threshold, spill_directory=spill_directory)
+        self.portfolio_values = ChunkedArray(np.float64, spill_threshold=spill_threshold,
+                                             spill_directory=spill_directory)
         self.current_cash = initial_cash
 
-        self._leverage = []  # type: List[float]
+        self._leverage = ChunkedArray(np.float64, spill_threshold=spill_threshold, spill_directory=spill_directory)
 
         self.open_positions_dict = {}  # type: Dict[Contract, BacktestPosition]
         self.closed_positions = []  # type: List[BacktestPosition]
-        self.transactions = []  # type: List[Transaction]
-        self.trades = []  # type: List[Trade]
+        self.transactions = TransactionsLedger(spill_threshold=spill_threshold, spill_directory=spill_directory)
+        self.trades = TradesLedger(spill_threshold=spill_threshold, spill_directory=spill_directory)
+
+        self.open_positions_version = 0
+        """number which changes every time a position is opened, closed or removed from the open_positions_dict"""
+
+        self._open_positions = _OpenPositionsArrays()
+        self._contract_to_ticker = {}  # type: Dict[Contract, Ticker]
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
@@ -81,54 +98,58 @@ class Portfolio(object):
         if position.is_closed:
             self.open_positions_dict.pop(transaction.contract)
             self.closed_positions.append(position)
+            self._open_positions.remove([transaction.contract])
+            self.open_positions_version += 1
+        else:
+            self._open_positions.update_quantity(transaction.contract)
 
     def update(self):
         """
         Updates the value of all positions that are currently open by getting the most recent price.
         """
-        self.net_liquidation = self.current_cash
-        self.gross_value_of_positions = 0
-
-        contracts = self.open_positions_dict.keys()
-        contract_to_ticker_dict = {
-            contract: self.contract_ticker_mapper.contract_to_ticker(contract) for contract in contracts}
+        current_prices_series = self.data_handler.get_last_available_price(tickers=self._open_positions.tickers)
+        current_prices = self._open_positions.align_prices(current_prices_series)
 
-        all_tickers_in_portfolio = list(contract_to_ticker_dict.values())
-        current_prices_series = self.data_handler.get_last_available_price(tickers=all_tickers_in_portfolio)
+        is_price_missing = np.isnan(current_prices)
+        if is_price_missing.any():
+            self._remove_positions_assigned_to_acquired_companies(is_price_missing)
+            current_prices = current_prices[~is_price_missing]
 
-        self._remove_positions_assigned_to_acquired_companies(contract_to_ticker_dict, current_prices_series)
+        market_values = self._open_positions.quantities() * current_prices
+        self._open_positions.update_prices(current_prices)
 
-        for contract, position in self.open_positions_dict.items():
-            ticker = contract_to_ticker_dict[contract]
-            security_price = current_prices_series[ticker]
-            position.update_price(bid_price=security_price, ask_price=security_price)
-            self.net_liquidation += position.market_value
-            self.gross_value_of_positions += abs(position.market_value)
+        # the values are accumulated in the order of positions (cumsum is sequential, unlike sum), so they are
+        # identical to the values summed position by position
+        self.net_liquidation = float(np.cumsum(np.concatenate([[self.current_cash], market_values]))[-1])
+        self.gross_value_of_positions = float(np.cumsum(np.concatenate([[0.0], np.abs(market_values)]))[-1])
 
         self.dates.append(self.timer.now())
         self.portfolio_values.append(self.net_liquidation)
         self._leverage.append(self.gross_value_of_positions / self.net_liquidation)
 
-    def _remove_positions_assigned_to_acquired_companies(self, contract_to_ticker_dict, current_prices_series):
-        remove = [c for c in self.open_positions_dict if np.isnan(current_prices_series[contract_to_ticker_dict[c]])]
+    def _remove_positions_assigned_to_acquired_companies(self, is_price_missing: np.ndarray):
+        remove = [c for c, is_missing in zip(self._open_positions.contracts, is_price_missing) if is_missing]
         for con in remove:
             pos = self.open_positions_dict[con]
             self.current_cash += pos.current_price * pos.number_of_shares
-            self.net_liquidation += pos.current_price * pos.number_of_shares
             del self.open_positions_dict[con]
             self.logger.warning("{}: position assigned to Ticker {} removed due to incomplete price data."
                                 .format(str(self.timer.now()), con.symbol))
 
+        self._open_positions.remove(remove)
+        self.open_positions_version += 1
+
     def get_portfolio_timeseries(self) -> PricesSeries:
         """
         Returns a timeseries of value of the portfolio expressed in currency units
         """
-        portfolio_timeseries = PricesSeries(data=self.portfolio_values, index=self.dates)
+        portfolio_timeseries = PricesSeries(data=self.portfolio_values.values().copy(), index=self._dates_index())
         return portfolio_timeseries
 
-    def get_trades(self) -> List[Trade]:
+    def get_trades(self) -> Sequence[Trade]:
         """
-        Returns a list of Trades
+        Returns the sequence of Trades (the TradesLedger, which creates the Trades when they are accessed, so changes
+        made to the returned Trades are lost). Use self.trades.to_data_frame() to get all the trades as a DataFrame.
         """
         return self.trades
 
@@ -136,13 +157,26 @@ class Portfolio(object):
         """
         Leverage = GrossPositionValue / NetLiquidation
         """
-        return QFSeries(data=self._leverage, index=self.dates)
+        return QFSeries(data=self._leverage.values().copy(), index=self._dates_index())
+
+    def _dates_index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.dates.values())
+
+    def _get_ticker(self, contract: Contract) -> Ticker:
+        ticker = self._contract_to_ticker.get(contract)
+        if ticker is None:
+            ticker = self.contract_ticker_mapper.contract_to_ticker(contract)
+            self._contract_to_ticker[contract] = ticker
+        return ticker
 
     def _get_or_create_position(self, contract: Contract) -> BacktestPosition:
         position = self.open_positions_dict.get(contract, None)
         if position is None:
-            position = BacktestPosition(contract)
+            # all the transactions are kept by the portfolio
+            position = BacktestPosition(contract, keep_transactions=False)
             self.open_positions_dict[contract] = position
+            self._open_positions.add(position, self._get_ticker(contract))
+            self.open_positions_version += 1
 
         return position
 
@@ -174,3 +208,74 @@ class Portfolio(object):
                           entry_price=entry_price,
                           exit_price=exit_price)
             self.trades.append(trade)
+
+
+class _OpenPositionsArrays(object):
+    """
+    Open positions of the Portfolio kept in arrays aligned with each other (contracts, tickers and quantities),
+    in the same order as in the Portfolio.open_positions_dict, so that the positions can be valued with a few
+    numpy operations.
+    """
+
+    def __init__(self):
+        self.contracts = []  # type: List[Contract]
+        self.tickers = []  # type: List[Ticker]
+        self.positions = []  # type: List[BacktestPosition]
+
+        self._contract_to_index = {}  # type: Dict[Contract, int]
+        self._quantities = np.empty(64)
+        self._tickers_index = None  # type: pd.Index
+
+    def quantities(self) -> np.ndarray:
+        return self._quantities[:len(self.positions)]
+
+    def add(self, position: BacktestPosition, ticker: Ticker):
+        index = len(self.positions)
+        if index == len(self._quantities):
+            self._quantities = np.concatenate([self._quantities, np.empty(len(self._quantities))])
+
+        contract = position.contract()
+        self.contracts.append(contract)
+        self.tickers.append(ticker)
+        self.positions.append(position)
+        self._contract_to_index[contract] = index
+        self._quantities[index] = position.quantity()
+        self._tickers_index = None
+
+    def update_quantity(self, contract: Contract):
+        index = self._contract_to_index[contract]
+        self._quantities[index] = self.positions[index].quantity()
+
+    def remove(self, contracts: Sequence[Contract]):
+        if len(contracts) == 0:
+            return
+
+        is_kept = np.ones(len(self.positions), dtype=bool)
+        is_kept[[self._contract_to_index[contract] for contract in contracts]] = False
+
+        number_of_kept_positions = int(is_kept.sum())
+        self._quantities[:number_of_kept_positions] = self.quantities()[is_kept]
+        self.contracts = list(compress(self.contracts, is_kept))
+        self.tickers = list(compress(self.tickers, is_kept))
+        self.positions = list(compress(self.positions, is_kept))
+        self._contract_to_index = {contract: i for i, contract in enumerate(self.contracts)}
+        self._tickers_index = None
+
+    def align_prices(self, prices_series: pd.Series) -> np.ndarray:
+        """ Returns the prices of tickers (given as a series indexed by tickers) in the order of positions. """
+        if len(self.tickers) == 0:
+            return np.empty(0)
+
+        if self._tickers_index is None:
+            # the array is filled element by element, because tickers would be treated as sequences by numpy
+            tickers = np.empty(len(self.tickers), dtype=object)
+            tickers[:] = self.tickers
+            self._tickers_index = pd.Index(tickers)
+
+        if not prices_series.index.equals(self._tickers_index):
+            prices_series = prices_series.reindex(self._tickers_index)
+        return prices_series.values.astype(np.float64)
+
+    def update_prices(self, prices: np.ndarray):
+        for position, price in zip(self.positions, prices.tolist()):
+            position.current_price = price
@@ -102,8 +102,8 @@ class PositionSizer(object, metaclass=ABCMeta):
         return stop_price
 
     def _get_existing_position_quantity(self, contract):
-        positions = self._broker.get_positions()
-        quantity = next((position.quantity() for position in positions if position.contract() == contract), 0)
+        position = self._broker.get_positions_by_contract().get(contract)
+        quantity = position.quantity() if position is not None else 0
         return quantity
 
     def _check_for_duplicates(self, signals: Sequence[Signal]):
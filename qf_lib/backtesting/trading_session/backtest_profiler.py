@@ -0,0 +1,274 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import cProfile
+import json
+import os
+import pstats
+import tracemalloc
+from datetime import datetime
+from functools import wraps
+from time import perf_counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.alpha_model_strategy import AlphaModelStrategy
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.execution_handler.simulated_execution_handler import SimulatedExecutionHandler
+from qf_lib.common.utils.dateutils.timer import Timer
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class BacktestProfiler(object):
+    """
+    Opt-in instrumentation of the components of the BacktestTradingSession. Methods of the components (alpha models,
+    position sizer, execution handler and its executors, portfolio, data handler, broker and monitor) and the callbacks
+    of the Scheduler's listeners are wrapped with timers and call counters. The statistics are aggregated per type
+    of the TimeEvent being handled and per component. The times are inclusive (e.g. the time of
+    AlphaModel.get_signal contains the time of DataHandler's queries made by the model).
+
+    Only the instances of the components are modified (their methods are replaced by the wrappers), so when no
+    profiler is used, the backtest runs without any overhead.
+
+    Optionally cProfile and tracemalloc may be attached to the chosen window of dates of the backtest.
+    """
+
+    PROFILE_FILE_NAME = "backtest_profile"
+    OTHER_EVENTS = "Other"
+
+    DATA_HANDLER_METHODS = ("get_price", "get_history", "historical_price", "get_last_available_price",
+                            "get_current_price", "get_bar_for_today", "get_bar_values_for_today")
+    EXECUTION_HANDLER_METHODS = ("on_market_open", "on_market_close", "accept_orders", "cancel_all_open_orders")
+    EXECUTOR_METHODS = ("accept_orders", "execute_orders")
+    PORTFOLIO_METHODS = ("update", "transact_transaction")
+    MONITOR_METHODS = ("real_time_update", "end_of_day_update", "end_of_trading_update", "record_transaction")
+    BROKER_METHODS = ("place_orders", "cancel_all_open_orders", "get_positions", "get_positions_by_contract")
+    POSITION_SIZER_METHODS = ("size_signals",)
+    ALPHA_MODEL_METHODS = ("get_signal",)
+
+    def __init__(self, output_directory: str = None, profiling_window: Tuple[datetime, datetime] = None,
+                 use_cprofile: bool = True, use_tracemalloc: bool = False):
+        """
+        Parameters
+        ----------
+        output_directory
+            directory to which the statistics are written at the end of trading (as backtest_profile.json and
+            backtest_profile.csv, plus backtest_profile.prof with the cProfile's statistics). If None, the
+            statistics are only logged
+        profiling_window
+            (start, end) dates of the backtest during which cProfile and/or tracemalloc are active
+        use_cprofile
+            if True, cProfile is attached to the profiling_window
+        use_tracemalloc
+            if True, tracemalloc is attached to the profiling_window
+        """
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        self.output_directory = output_directory
+        self.profiling_window = profiling_window
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+
+        # (event type, component, method) -> [number of calls, total time]
+        self._statistics = {}  # type: Dict[Tuple[str, str, str], List]
+        self._current_event_type = self.OTHER_EVENTS
+        self._timer = None  # type: Timer
+
+        self._cprofile = None  # type: cProfile.Profile
+        self._is_window_active = False
+        self._was_window_finished = False
+        self._tracemalloc_start_snapshot = None  # type: tracemalloc.Snapshot
+
+        self.cprofile_stats = None  # type: pstats.Stats
+        self.tracemalloc_snapshots = None  # type: Tuple[tracemalloc.Snapshot, tracemalloc.Snapshot]
+
+    def instrument_session(self, ts) -> None:
+        """
+        Wraps the components of the BacktestTradingSession (and the AlphaModels of AlphaModelStrategies subscribed
+        to its Scheduler) with timers. It should be called once, when all the components are already set up.
+        """
+        self._timer = ts.timer
+
+        scheduler = ts.notifiers.scheduler
+        self._instrument_scheduler(scheduler)
+
+        self.instrument(ts.data_handler, self.DATA_HANDLER_METHODS, "DataHandler")
+        self.instrument(ts.portfolio, self.PORTFOLIO_METHODS, "Portfolio")
+        self.instrument(ts.monitor, self.MONITOR_METHODS, "Monitor")
+        self.instrument(ts.broker, self.BROKER_METHODS, "Broker")
+        self.instrument(ts.position_sizer, self.POSITION_SIZER_METHODS, "PositionSizer")
+
+        execution_handler = ts.broker.execution_handler
+        self.instrument(execution_handler, self.EXECUTION_HANDLER_METHODS, "ExecutionHandler")
+        if isinstance(execution_handler, SimulatedExecutionHandler):
+            for executor in execution_handler.executors:
+                self.instrument(executor, self.EXECUTOR_METHODS, executor.__class__.__name__)
+
+        for listener in scheduler.get_listeners():
+            if isinstance(listener, AlphaModelStrategy):
+                for alpha_model in listener.alpha_models:
+                    self.instrument(alpha_model, self.ALPHA_MODEL_METHODS)
+
+    def instrument(self, component: Any, method_names: Sequence[str], component_name: str = None) -> None:
+        """
+        Replaces the methods of the component (only of this instance) with wrappers measuring the time and the number
+        of calls. Methods, which the component doesn't have, are skipped.
+        """
+        if component is None:
+            return
+        if component_name is None:
+            component_name = component.__class__.__name__
+
+        for method_name in method_names:
+            method = getattr(component, method_name, None)
+            if callable(method):
+                setattr(component, method_name, self._timed(method, component_name, method_name))
+
+    def finish(self) -> None:
+        """
+        Stops cProfile and tracemalloc (if they are still running), logs the table of statistics and writes them
+        to the output_directory (if it was given).
+        """
+        self._stop_profiling_window()
+
+        statistics_df = self.to_data_frame()
+        self.logger.info("Backtest profile:\n{}".format(self.summary_table(statistics_df)))
+
+        if self.output_directory is not None:
+            os.makedirs(self.output_directory, exist_ok=True)
+            file_path = os.path.join(self.output_directory, self.PROFILE_FILE_NAME)
+
+            self.to_csv(file_path + ".csv", statistics_df)
+            self.to_json(file_path + ".json", statistics_df)
+            if self.cprofile_stats is not None:
+                self.cprofile_stats.dump_stats(file_path + ".prof")
+
+    def to_data_frame(self) -> QFDataFrame:
+        """
+        Returns the statistics as a QFDataFrame with the columns: event type, component, method, calls, total time [s]
+        and mean time [us]. Rows are sorted by the total time (descending).
+        """
+        rows = [(event_type, component, method, calls, total_time, total_time / calls * 1e6)
+                for (event_type, component, method), (calls, total_time) in self._statistics.items()]
+        statistics_df = QFDataFrame(rows, columns=[
+            "event type", "component", "method", "calls", "total time [s]", "mean time [us]"])
+
+        return statistics_df.sort_values("total time [s]", ascending=False).reset_index(drop=True)
+
+    def summary_table(self, statistics_df: pd.DataFrame = None) -> str:
+        """ Returns the statistics formatted as a text table. """
+        if statistics_df is None:
+            statistics_df = self.to_data_frame()
+        if statistics_df.empty:
+            return "No calls were recorded"
+
+        return statistics_df.to_string(index=False, float_format="{:.6f}".format)
+
+    def to_csv(self, file_path: str, statistics_df: pd.DataFrame = None) -> None:
+        if statistics_df is None:
+            statistics_df = self.to_data_frame()
+        statistics_df.to_csv(file_path, index=False)
+
+    def to_json(self, file_path: str, statistics_df: pd.DataFrame = None) -> None:
+        if statistics_df is None:
+            statistics_df = self.to_data_frame()
+        with open(file_path, "w") as file:
+            json.dump(statistics_df.to_dict(orient="records"), file, indent=2)
+
+    def _instrument_scheduler(self, scheduler: Scheduler):
+        """
+        Replaces Scheduler.notify_all with the version, which keeps the type of the current event, switches
+        the profiling window and measures the time of every listener's callback.
+        """
+        timed_notifications = {}  # (event type, listener) -> timed notification
+
+        @wraps(scheduler.notify_all)
+        def notify_all(time_event):
+            time_event_type = type(time_event)
+            self._current_event_type = time_event_type.__name__
+            if self.profiling_window is not None:
+                self._update_profiling_window()
+
+            for listener in scheduler.get_listeners(time_event_type):
+                key = (time_event_type, id(listener))
+                timed_notification = timed_notifications.get(key)
+                if timed_notification is None:
+                    timed_notification = self._timed(time_event_type.notify, listener.__class__.__name__, "notify")
+                    timed_notifications[key] = timed_notification
+
+                timed_notification(time_event, listener)
+
+            self._current_event_type = self.OTHER_EVENTS
+
+        scheduler.notify_all = notify_all
+
+    def _timed(self, function, component_name: str, method_name: str):
+        statistics = self._statistics
+
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            start_time = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed_time = perf_counter() - start_time
+                key = (self._current_event_type, component_name, method_name)
+                try:
+                    calls_and_time = statistics[key]
+                    calls_and_time[0] += 1
+                    calls_and_time[1] += elapsed_time
+                except KeyError:
+                    statistics[key] = [1, elapsed_time]
+
+        return timed_function
+
+    def _update_profiling_window(self):
+        window_start, window_end = self.profiling_window
+        now = self._timer.now()
+
+        if not self._is_window_active and not self._was_window_finished and window_start <= now <= window_end:
+            self._start_profiling_window()
+        elif self._is_window_active and now > window_end:
+            self._stop_profiling_window()
+
+    def _start_profiling_window(self):
+        self.logger.info("Profiling window started at {}".format(self._timer.now()))
+        self._is_window_active = True
+
+        if self.use_tracemalloc:
+            tracemalloc.start()
+            self._tracemalloc_start_snapshot = tracemalloc.take_snapshot()
+        if self.use_cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _stop_profiling_window(self):
+        if not self._is_window_active:
+            return
+
+        self._is_window_active = False
+        self._was_window_finished = True
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self.cprofile_stats = pstats.Stats(self._cprofile)
+            self._cprofile = None
+        if self._tracemalloc_start_snapshot is not None:
+            self.tracemalloc_snapshots = (self._tracemalloc_start_snapshot, tracemalloc.take_snapshot())
+            self._tracemalloc_start_snapshot = None
+            tracemalloc.stop()
+
+        self.logger.info("Profiling window finished at {}".format(self._timer.now()))
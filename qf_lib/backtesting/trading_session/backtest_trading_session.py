@@ -17,12 +17,14 @@ from typing import Union, Sequence
 from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.events.backtest_event_loop import BacktestEventLoop
 from qf_lib.backtesting.events.event_manager import EventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
 from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitor
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.backtesting.position_sizer.position_sizer import PositionSizer
+from qf_lib.backtesting.trading_session.backtest_profiler import BacktestProfiler
 from qf_lib.backtesting.trading_session.trading_session import TradingSession
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
@@ -39,9 +41,12 @@ class BacktestTradingSession(TradingSession):
     def __init__(self, contract_ticker_mapper: ContractTickerMapper, start_date, end_date,
                  position_sizer: PositionSizer, data_handler: DataHandler, timer: SettableTimer,
                  notifiers: Notifiers, portfolio: Portfolio, events_manager: EventManager, monitor: BacktestMonitor,
-                 broker: BacktestBroker, order_factory: OrderFactory):
+                 broker: BacktestBroker, order_factory: OrderFactory, event_loop: BacktestEventLoop = None,
+                 profiler: BacktestProfiler = None):
         """
-        Set up the backtest variables according to what has been passed in.
+        Set up the backtest variables according to what has been passed in. If the event_loop is given, it is used
+        instead of the standard loop of the EventManager (whenever it is applicable). If the profiler is given,
+        the components are instrumented with it when the trading starts.
         """
         super().__init__()
         self.logger = qf_logger.getChild(self.__class__.__name__)
@@ -60,9 +65,29 @@ class BacktestTradingSession(TradingSession):
         self.timer = timer
         self.order_factory = order_factory
         self.broker = broker
+        self.event_loop = event_loop
+        self.profiler = profiler
 
-    def use_data_preloading(self, tickers: Union[Ticker, Sequence[Ticker]], time_delta: RelativeDelta = None):
+    def start_trading(self) -> None:
+        if self.profiler is not None:
+            self.profiler.instrument_session(self)
+
+        if self.event_loop is None or not self.event_loop.is_applicable():
+            super().start_trading()
+        else:
+            self.logger.info("Trading Session - start trading...")
+            self.event_loop.run()
+
+            self.logger.info("Trading Session - trading finished...")
+            self.monitor.end_of_trading_update()
+
+        if self.profiler is not None:
+            self.profiler.finish()
+
+    def use_data_preloading(self, tickers: Union[Ticker, Sequence[Ticker]], time_delta: RelativeDelta = None,
+                            use_array_bar_store: bool = False):
         if time_delta is None:
             time_delta = RelativeDelta(years=1)
         data_history_start = self.start_date - time_delta
-        self.data_handler.use_data_bundle(tickers, PriceField.ohlcv(), data_history_start, self.end_date)
+        self.data_handler.use_data_bundle(tickers, PriceField.ohlcv(), data_history_start, self.end_date,
+                                          use_array_bar_store)
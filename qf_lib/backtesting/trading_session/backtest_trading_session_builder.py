@@ -14,7 +14,7 @@
 
 import logging
 from datetime import datetime
-from typing import List, Tuple, Type
+from typing import List, Sequence, Tuple, Type
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
@@ -22,8 +22,10 @@ from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import Contr
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
     DummyBloombergContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.events.backtest_event_loop import BacktestEventLoop
 from qf_lib.backtesting.events.event_manager import EventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_event.trading_calendar import TradingCalendar
 from qf_lib.backtesting.events.time_flow_controller import BacktestTimeFlowController
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
@@ -31,8 +33,10 @@ from qf_lib.backtesting.execution_handler.simulated_execution_handler import Sim
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.execution_handler.slippage.price_based_slippage import PriceBasedSlippage
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.monitoring.background_exports import BackgroundExports
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
 from qf_lib.backtesting.monitoring.dummy_monitor import DummyMonitor
+from qf_lib.backtesting.monitoring.headless_backtest_monitor import HeadlessBacktestMonitor
 from qf_lib.backtesting.monitoring.light_backtest_monitor import LightBacktestMonitor
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
@@ -40,6 +44,7 @@ from qf_lib.backtesting.portfolio.portfolio_handler import PortfolioHandler
 from qf_lib.backtesting.position_sizer.initial_risk_position_sizer import InitialRiskPositionSizer
 from qf_lib.backtesting.position_sizer.position_sizer import PositionSizer
 from qf_lib.backtesting.position_sizer.simple_position_sizer import SimplePositionSizer
+from qf_lib.backtesting.trading_session.backtest_profiler import BacktestProfiler
 from qf_lib.backtesting.trading_session.backtest_trading_session import BacktestTradingSession
 from qf_lib.common.tickers.tickers import QuandlTicker, Ticker, BloombergTicker
 from qf_lib.common.utils.dateutils.timer import SettableTimer
@@ -67,6 +72,10 @@ class BacktestTradingSessionBuilder(object):
         self._slippage_model = PriceBasedSlippage(0.0)
         self._position_sizer_type = SimplePositionSizer
         self._position_sizer_param = None
+        self._use_fast_event_loop = False
+        self._profiler = None
+        self._background_exports = None
+        self._holidays = []
 
         self._data_provider = data_provider
         self._settings = settings
@@ -104,6 +113,14 @@ class BacktestTradingSessionBuilder(object):
         assert issubclass(monitor_type, AbstractMonitor)
         self._monitor_type = monitor_type
 
+    def set_background_exports(self, background_exports: BackgroundExports):
+        """
+        Sets the pool of processes, which runs the end-of-trading exports of the HeadlessBacktestMonitor. The same pool
+        may be shared by the sessions of many backtests run one after another. By default every HeadlessBacktestMonitor
+        creates its own pool.
+        """
+        self._background_exports = background_exports
+
     def set_logging_level(self, logging_level: int):
         assert logging_level == logging.WARNING or logging_level == logging.INFO
         self._logging_level = logging_level
@@ -125,6 +142,28 @@ class BacktestTradingSessionBuilder(object):
         self._position_sizer_type = position_sizer_type
         self._position_sizer_param = param
 
+    def set_fast_event_loop(self, use_fast_event_loop: bool):
+        """
+        Enables or disables (default) the BacktestEventLoop, which dispatches the precomputed schedule of TimeEvents
+        directly to the listeners instead of passing each of them through the EventManager's queue.
+        """
+        self._use_fast_event_loop = use_fast_event_loop
+
+    def set_profiler(self, profiler: BacktestProfiler):
+        """
+        Enables the instrumentation of the session's components with the given BacktestProfiler (disabled by default).
+        At the end of trading the profiler logs the time spent in every component and writes the statistics
+        to its output directory.
+        """
+        self._profiler = profiler
+
+    def set_holidays(self, holidays: Sequence[datetime]):
+        """
+        Sets the exchange holidays, on which the regular market events (e.g. MarketOpenEvent, MarketCloseEvent)
+        are not generated.
+        """
+        self._holidays = list(holidays)
+
     @staticmethod
     def _create_event_manager(timer, notifiers: Notifiers):
         event_manager = EventManager(timer)
@@ -139,10 +178,11 @@ class BacktestTradingSessionBuilder(object):
 
     def build(self, start_date: datetime, end_date: datetime) -> BacktestTradingSession:
         self._timer = SettableTimer(start_date)
-        self._notifiers = Notifiers(self._timer)
+        self._trading_calendar = TradingCalendar(start_date, end_date, self._holidays)
+        self._notifiers = Notifiers(self._timer, self._trading_calendar)
         self._events_manager = self._create_event_manager(self._timer, self._notifiers)
 
-        self._data_handler = DataHandler(self._data_provider, self._timer)
+        self._data_handler = DataHandler(self._data_provider, self._timer, self._trading_calendar)
 
         self._portfolio = Portfolio(self._data_handler, self._initial_cash, self._timer, self._contract_ticker_mapper)
         self._backtest_result = BacktestResult(self._portfolio, self._backtest_name, start_date, end_date)
@@ -190,6 +230,10 @@ class BacktestTradingSessionBuilder(object):
             ])
         )
 
+        event_loop = None
+        if self._use_fast_event_loop:
+            event_loop = BacktestEventLoop(self._time_flow_controller, self._notifiers)
+
         ts = BacktestTradingSession(
             contract_ticker_mapper=self._contract_ticker_mapper,
             start_date=start_date,
@@ -202,13 +246,18 @@ class BacktestTradingSessionBuilder(object):
             events_manager=self._events_manager,
             monitor=self._monitor,
             broker=self._broker,
-            order_factory=self._order_factory
+            order_factory=self._order_factory,
+            event_loop=event_loop,
+            profiler=self._profiler
         )
         return ts
 
     def _monitor_setup(self):
         if self._monitor_type is DummyMonitor:
             return DummyMonitor()
+        if issubclass(self._monitor_type, HeadlessBacktestMonitor):
+            return self._monitor_type(self._backtest_result, self._settings, self._pdf_exporter, self._excel_exporter,
+                                      background_exports=self._background_exports)
         return self._monitor_type(self._backtest_result, self._settings, self._pdf_exporter, self._excel_exporter)
 
     def _position_sizer_setup(self):
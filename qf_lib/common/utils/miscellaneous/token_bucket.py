@@ -0,0 +1,60 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket rate limiter. Tokens are added at the constant rate (per second) up to the capacity
+    of the bucket. Every call of acquire() takes one token and blocks until it is available, so that in the long run
+    at most `rate` calls per second pass through, with bursts of at most `capacity` calls.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Parameters
+        ----------
+        rate
+            number of tokens added per second
+        capacity
+            maximal number of tokens in the bucket (maximal burst)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._last_update = monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """ Takes one token from the bucket, waiting until it is available. """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_update) * self.rate)
+            self._last_update = now
+
+            # the token is reserved now (the number of tokens may become negative), so that waiting threads are
+            # served in the order of calls
+            self._tokens -= 1
+            waiting_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if waiting_time > 0:
+            sleep(waiting_time)
@@ -12,8 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from math import sqrt
+
 from qf_lib.common.enums.frequency import Frequency
-from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.containers.rolling_kernels import rolling_std
 from qf_lib.containers.series.qf_series import QFSeries
 
 
@@ -46,15 +48,9 @@ def rolling_volatility(qf_series: QFSeries, frequency: Frequency = None, annuali
     if annualise:
         assert frequency is not None
 
-    volatility_values = []
-    for i in range(window_size - 1, len(returns_tms)):
-        start_index = i - window_size + 1
-        end_index = i + 1
-
-        returns_from_window = returns_tms[start_index:end_index]
-        volatility = get_volatility(returns_from_window, frequency, annualise)
-
-        volatility_values.append(volatility)
+    volatility_values = rolling_std(returns_tms.values, window_size)
+    if annualise:
+        volatility_values = volatility_values * sqrt(frequency.occurrences_in_year)
 
     first_date_idx = window_size - 1
     dates = returns_tms.index[first_date_idx::]
@@ -0,0 +1,143 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import tempfile
+from typing import Any, Iterator, Union
+
+import numpy as np
+
+
+class ChunkedArray(object):
+    """
+    One-dimensional, typed array to which values can be appended in amortised O(1) time. The values are kept
+    in chunks of fixed size, so appending never copies the values appended before.
+
+    If the spill_threshold is given, then after the number of values reaches it, all the values are moved
+    to a temporary memory-mapped file (which grows by chunks as well), so that they don't occupy the RAM.
+    The file is removed when the array is closed or garbage collected.
+    """
+
+    def __init__(self, dtype, chunk_size: int = 4096, spill_threshold: int = None, spill_directory: str = None):
+        """
+        Parameters
+        ----------
+        dtype
+            numpy dtype of the values (it must not be object if the values may be spilled to disk)
+        chunk_size
+            number of values by which the array grows
+        spill_threshold
+            number of values after which the values are moved to the memory-mapped file. If None, the values
+            are always kept in memory
+        spill_directory
+            directory in which the memory-mapped file is created. By default the system temporary directory is used
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        self.dtype = np.dtype(dtype)
+        if spill_threshold is not None and self.dtype.hasobject:
+            raise ValueError("Arrays of objects can't be spilled to disk")
+
+        self.chunk_size = chunk_size
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+
+        self._length = 0
+        self._chunks = []
+        self._values_cache = None
+
+        self._file = None
+        self._memory_mapped_values = None
+
+    @property
+    def is_spilled(self) -> bool:
+        """ True if the values were moved to the memory-mapped file. """
+        return self._file is not None
+
+    def append(self, value: Any):
+        """ Appends the value at the end of the array. """
+        if self.is_spilled:
+            if self._length == len(self._memory_mapped_values):
+                self._map_file(self._length + self.chunk_size)
+            self._memory_mapped_values[self._length] = value
+        else:
+            position_in_chunk = self._length % self.chunk_size
+            if position_in_chunk == 0:
+                self._chunks.append(np.empty(self.chunk_size, dtype=self.dtype))
+            self._chunks[-1][position_in_chunk] = value
+            self._values_cache = None
+
+        self._length += 1
+
+        if self.spill_threshold is not None and not self.is_spilled and self._length >= self.spill_threshold:
+            self._spill()
+
+    def values(self) -> np.ndarray:
+        """
+        Returns all the values as one contiguous, read-only array. If the values were spilled to disk, the array
+        is a view of the memory-mapped file. Otherwise the chunks are concatenated (only once for the same content).
+        """
+        if self.is_spilled:
+            values = self._memory_mapped_values[:self._length]
+        else:
+            if self._values_cache is None:
+                if len(self._chunks) == 0:
+                    self._values_cache = np.empty(0, dtype=self.dtype)
+                else:
+                    self._values_cache = np.concatenate(self._chunks)[:self._length]
+            values = self._values_cache
+
+        values = values.view()
+        values.flags.writeable = False
+        return values
+
+    def close(self):
+        """ Releases the memory-mapped file (if there is any). The values can't be accessed afterwards. """
+        self._memory_mapped_values = None
+        if self._file is not None:
+            self._file.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, item: Union[int, slice]) -> Any:
+        if isinstance(item, slice):
+            return self.values()[item]
+
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError("ChunkedArray index out of range")
+
+        if self.is_spilled:
+            return self._memory_mapped_values[item]
+        return self._chunks[item // self.chunk_size][item % self.chunk_size]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.values())
+
+    def _spill(self):
+        values = self.values()
+        self._file = tempfile.TemporaryFile(prefix="qf_chunked_array_", suffix=".dat", dir=self.spill_directory)
+
+        capacity = -(-self._length // self.chunk_size) * self.chunk_size
+        self._map_file(capacity)
+        self._memory_mapped_values[:self._length] = values
+
+        self._chunks = []
+        self._values_cache = None
+
+    def _map_file(self, capacity: int):
+        self._file.truncate(capacity * self.dtype.itemsize)
+        self._memory_mapped_values = np.memmap(self._file, dtype=self.dtype, mode="r+", shape=(capacity,))
@@ -20,6 +20,7 @@ import pandas as pd
 
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.containers.dataframe.cast_dataframe import cast_dataframe
+from qf_lib.containers.helpers import exponentially_smoothed_values
 from qf_lib.containers.series.cast_series import cast_series
 from qf_lib.containers.time_indexed_container import TimeIndexedContainer
 
@@ -182,15 +183,9 @@ class QFDataFrame(pd.DataFrame, TimeIndexedContainer):
 
         """
         lambda_coefficients = self._prepare_value_per_column_list(lambda_coeff)
-        lambda_coefficients_iter = self._get_iterator_for_pandas(lambda_coefficients)
+        smoothed_values = exponentially_smoothed_values(self.values, lambda_coefficients)
 
-        def exponential_avg_func(column, lambda_coeff_iter=lambda_coefficients_iter):
-            lambda_coefficient = next(lambda_coeff_iter)
-            smoothed_column = column.exponential_average(lambda_coefficient)
-            return smoothed_column
-
-        smoothed_df = self.apply(exponential_avg_func, axis=0)
-        smoothed_df = cast_dataframe(smoothed_df, self._constructor)
+        smoothed_df = self._constructor(data=smoothed_values, index=self.index.copy(), columns=self.columns.copy())
         return smoothed_df
 
     def total_cumulative_return(self) -> pd.Series:
@@ -237,8 +232,8 @@ class QFDataFrame(pd.DataFrame, TimeIndexedContainer):
                         "(is: {0}, should be: {1}".format(num_of_values, self.num_of_columns)
             raise ValueError(error_msg)
 
-    def rolling_window(self, window_size: int, func: Callable[[Union["QFSeries", np.ndarray]], float], step: int = 1,
-                       optimised: bool = False) -> "QFDataFrame":
+    def rolling_window(self, window_size: int, func: Union[str, Callable[[Union["QFSeries", np.ndarray]], float]],
+                       step: int = 1, optimised: bool = False) -> "QFDataFrame":
         """
         Looks at a number of windows of size ``window_size`` and transforms the data in those windows based on the
         specified ``func``. This is performed for each column inside this data frame.
@@ -256,21 +251,34 @@ class QFDataFrame(pd.DataFrame, TimeIndexedContainer):
             The function to call during each iteration. When ``other`` is ``None`` this function should take one
             ``QFSeries`` and return a value (Usually a number such as a ``float``). Otherwise, this function should take
             two ``QFSeries`` arguments and return a value.
+            It can also be the name of one of the common reductions: "sum", "mean", "var", "std", "min", "max".
+            Then the values for all the windows and all the columns are calculated at once, in O(n) time
+            (see: rolling_kernels).
         step
             The amount of data points to step through after each iteration, i.e. how much to move the window by in
             each iteration.
         optimised
-            Whether the more efficient pandas algorithm should be used for the rolling window application.
-            Note: This has some limitations: The ``step`` must be 1 and ``func`` will get an ``ndarray``
-            parameter which only contains values and no index.
+            Whether the more efficient algorithm should be used for the rolling window application.
+            Note: ``func`` will get an ``ndarray`` parameter which only contains values and no index. If the ``step``
+            is 1, the pandas algorithm is used. Otherwise ``func`` is applied to the strided views of the windows.
 
         Returns
         -------
         data frame containing the transformed data
         """
+        if isinstance(func, str):
+            from qf_lib.containers.rolling_kernels import rolling_reduction
+            values = rolling_reduction(self.values, window_size, func, step)
+            return QFDataFrame(data=values, index=self.index[window_size - 1::step], columns=self.columns)
+
         if optimised:
-            assert step == 1, "Optimised rolling is only possible with a step of 1."
-            return self.rolling(window=window_size, center=False).apply(func=func)
+            if step == 1:
+                return self.rolling(window=window_size, center=False).apply(func=func)
+
+            result = QFDataFrame()
+            for col in self:
+                result[col] = self[col].rolling_window(window_size, func, step=step, optimised=True)
+            return result
 
         result = QFDataFrame()
         for col in self:
@@ -12,7 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import Sequence, Any
+from typing import Sequence, Any, Union
+
+import numpy as np
+from scipy.signal import lfilter
 
 
 def rolling_window_slices(index: Sequence[Any], size: Any, step: int = 1) -> Sequence[slice]:
@@ -32,3 +35,44 @@ def rolling_window_slices(index: Sequence[Any], size: Any, step: int = 1) -> Seq
             break
 
     return slices
+
+
+def exponentially_smoothed_values(values: np.ndarray, lambda_coeff: Union[float, Sequence[float]]) -> np.ndarray:
+    """
+    Calculates the exponential average of values (1D array or 2D array, in which every column is smoothed separately):
+    smoothed[0] = values[0] and smoothed[i] = lambda_coeff * values[i] + (1 - lambda_coeff) * smoothed[i - 1].
+
+    The recursion is evaluated by a linear filter (scipy.signal.lfilter) for all the columns at once. As in the
+    recursion, a NaN value makes all the following smoothed values NaN.
+
+    Parameters
+    ----------
+    values
+        values to smooth; rows correspond to consecutive samples
+    lambda_coeff
+        lambda coefficient or (for 2D arrays) a sequence of lambda coefficients, one for each column
+
+    Returns
+    -------
+    array of the smoothed values (of the same shape as values)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    smoothed_values = values.copy()
+    if len(values) < 2:
+        return smoothed_values
+
+    if values.ndim == 1:
+        lambda_coefficients = np.array([lambda_coeff], dtype=np.float64)
+        smoothed_values = smoothed_values[:, np.newaxis]
+    else:
+        lambda_coefficients = np.broadcast_to(np.asarray(lambda_coeff, dtype=np.float64), values.shape[1:])
+
+    # columns with the same lambda coefficient are filtered together
+    for lambda_coefficient in np.unique(lambda_coefficients):
+        columns = np.flatnonzero(lambda_coefficients == lambda_coefficient)
+        column_values = smoothed_values[:, columns]
+        initial_conditions = (1 - lambda_coefficient) * column_values[:1]
+        smoothed_values[1:, columns], _ = lfilter(
+            [lambda_coefficient], [1.0, lambda_coefficient - 1], column_values[1:], axis=0, zi=initial_conditions)
+
+    return smoothed_values.reshape(values.shape)
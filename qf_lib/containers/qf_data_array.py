@@ -130,6 +130,21 @@ class QFDataArray(xr.DataArray):
         return result
 
     def asof(self, dates: Union[datetime, Sequence[datetime]]) -> "pd.DataFrame":
+        """
+        Returns the last row without any NaNs (for all the fields) for each ticker, which is as of the given date.
+        It is the equivalent of calling pd.DataFrame.asof(date) for each ticker's (dates x fields) frame.
+
+        Parameters
+        ----------
+        dates
+            a single date (the same for all the tickers) or the sequence of dates (one date per ticker)
+
+        Returns
+        -------
+        pd.DataFrame
+            tickers x fields frame with the values as of the given dates (NaNs for tickers for which no row without
+            NaNs is available as of the given date)
+        """
         tickers = self.tickers.values
         fields = self.fields.values
 
@@ -138,13 +153,26 @@ class QFDataArray(xr.DataArray):
         elif len(dates) != len(tickers):
             raise ValueError("Number of dates must be equal to the number of tickers")
 
-        asof_values = np.empty((len(tickers), len(fields)))
+        # for each ticker find the position of the last date which is <= the date for this ticker
+        dates_positions = self.dates.to_index().searchsorted(pd.DatetimeIndex(dates), side="right") - 1
+        num_of_dates_needed = dates_positions.max() + 1 if len(dates_positions) > 0 else 0
+        values = self.values[:num_of_dates_needed]
 
-        for i, (ticker, date) in enumerate(zip(tickers, dates)):
-            ticker_data = self.loc[:, ticker, :]
-            ticker_df = ticker_data.to_pandas()  # type: pd.DataFrame
-            data_asof = ticker_df.asof(date)
-            asof_values[i, :] = data_asof
+        # for each date and ticker find the position of the last row without NaNs (forward-fill of positions)
+        is_valid_row = ~pd.isnull(values).any(axis=2)
+        valid_rows_positions = np.where(is_valid_row, np.arange(num_of_dates_needed)[:, np.newaxis], -1)
+        last_valid_rows_positions = np.maximum.accumulate(valid_rows_positions, axis=0)
+
+        tickers_positions = np.arange(len(tickers))
+        asof_rows_positions = np.full(len(tickers), -1)
+        date_available = dates_positions >= 0
+        asof_rows_positions[date_available] = last_valid_rows_positions[
+            dates_positions[date_available], tickers_positions[date_available]]
+
+        asof_values = np.empty((len(tickers), len(fields)))
+        asof_values[:] = np.nan
+        row_available = asof_rows_positions >= 0
+        asof_values[row_available] = values[asof_rows_positions[row_available], tickers_positions[row_available]]
 
         result = pd.DataFrame(data=asof_values, index=self.tickers.to_index(), columns=self.fields.to_index())
         return result
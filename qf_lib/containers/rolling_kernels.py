@@ -0,0 +1,168 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Rolling-window kernels working in O(n) time on 1D arrays (a single series) or 2D arrays (rows are dates, columns are
+separate series). All the kernels return values for windows ending at positions: window_size - 1,
+window_size - 1 + step, window_size - 1 + 2 * step, ... (the same windows as QFSeries.rolling_window()).
+
+NaNs are skipped in the same way as they are skipped by the pandas reductions (e.g. QFSeries.mean()), so a result
+is NaN only if there are not enough valid values in the window.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+ROLLING_REDUCTIONS = ("sum", "mean", "var", "std", "min", "max")
+"""names of reductions, which may be calculated with rolling_reduction()"""
+
+
+def sliding_windows(values: np.ndarray, window_size: int, step: int = 1) -> np.ndarray:
+    """
+    Returns a read-only view of the values with windows along the first axis. The result has the shape:
+    (number of windows, window_size) + values.shape[1:]. No data is copied.
+    """
+    values = np.asarray(values)
+    num_of_windows = _num_of_windows(len(values), window_size, step)
+
+    windows = as_strided(values, shape=(num_of_windows, window_size) + values.shape[1:],
+                         strides=(values.strides[0] * step,) + values.strides, writeable=False)
+    return windows
+
+
+def rolling_sum(values: np.ndarray, window_size: int, step: int = 1) -> np.ndarray:
+    """ Rolling sum of valid values (0.0 if all the values in the window are NaN, as in pandas' sum()). """
+    sums, _ = _rolling_sums_and_counts(_as_float_array(values), window_size)
+    return sums[::step]
+
+
+def rolling_mean(values: np.ndarray, window_size: int, step: int = 1) -> np.ndarray:
+    """ Rolling mean of valid values. """
+    sums, counts = _rolling_sums_and_counts(_as_float_array(values), window_size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    means[counts == 0] = np.nan
+    return means[::step]
+
+
+def rolling_var(values: np.ndarray, window_size: int, step: int = 1, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling variance of valid values, calculated from the running sums and sums of squares. The values are centered
+    (the mean of the whole series is subtracted) first, to avoid the loss of precision when the variance is small
+    compared to the mean.
+    """
+    values = _as_float_array(values)
+    if len(values) > 0:
+        is_valid = ~np.isnan(values)
+        num_of_valid_values = np.maximum(is_valid.sum(axis=0), 1)
+        values = values - np.where(is_valid, values, 0.0).sum(axis=0) / num_of_valid_values
+
+    sums, counts = _rolling_sums_and_counts(values, window_size)
+    sums_of_squares, _ = _rolling_sums_and_counts(values * values, window_size)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variances = (sums_of_squares - sums * sums / counts) / (counts - ddof)
+    variances = np.maximum(variances, 0.0)
+    variances[counts - ddof <= 0] = np.nan
+
+    return variances[::step]
+
+
+def rolling_std(values: np.ndarray, window_size: int, step: int = 1, ddof: int = 1) -> np.ndarray:
+    """ Rolling standard deviation of valid values (see: rolling_var()). """
+    return np.sqrt(rolling_var(values, window_size, step, ddof))
+
+
+def rolling_min(values: np.ndarray, window_size: int, step: int = 1) -> np.ndarray:
+    """ Rolling minimum of valid values. """
+    return _rolling_extremum(_as_float_array(values), window_size, np.fmin)[::step]
+
+
+def rolling_max(values: np.ndarray, window_size: int, step: int = 1) -> np.ndarray:
+    """ Rolling maximum of valid values. """
+    return _rolling_extremum(_as_float_array(values), window_size, np.fmax)[::step]
+
+
+def rolling_reduction(values: np.ndarray, window_size: int, reduction: str, step: int = 1) -> np.ndarray:
+    """
+    Calculates one of the ROLLING_REDUCTIONS ("sum", "mean", "var", "std", "min", "max") for all the windows.
+    Variance and standard deviation are calculated with ddof=1 (as in pandas).
+    """
+    kernels = {
+        "sum": rolling_sum,
+        "mean": rolling_mean,
+        "var": rolling_var,
+        "std": rolling_std,
+        "min": rolling_min,
+        "max": rolling_max
+    }
+
+    try:
+        kernel = kernels[reduction]
+    except KeyError:
+        raise ValueError("Unknown rolling reduction: {}. Available reductions: {}".format(
+            reduction, ", ".join(ROLLING_REDUCTIONS)))
+
+    return kernel(values, window_size, step=step)
+
+
+def _rolling_sums_and_counts(values: np.ndarray, window_size: int):
+    _num_of_windows(len(values), window_size, 1)
+
+    is_valid = ~np.isnan(values)
+    zero_padding = np.zeros((1,) + values.shape[1:])
+
+    cumulative_sums = np.concatenate([zero_padding, np.cumsum(np.where(is_valid, values, 0.0), axis=0)])
+    cumulative_counts = np.concatenate([zero_padding, np.cumsum(is_valid, axis=0)])
+
+    sums = cumulative_sums[window_size:] - cumulative_sums[:-window_size]
+    counts = cumulative_counts[window_size:] - cumulative_counts[:-window_size]
+    return sums, counts
+
+
+def _rolling_extremum(values: np.ndarray, window_size: int, ufunc: np.ufunc) -> np.ndarray:
+    """
+    Rolling minimum or maximum (van Herk/Gil-Werman algorithm). The values are divided into blocks of window_size
+    and the cumulative extrema are calculated from the beginning and from the end of every block. Every window
+    consists of the end of one block and the beginning of the next one, so its extremum is the extremum of two
+    values. Together it is O(n), regardless of the window_size.
+    """
+    num_of_values = len(values)
+    num_of_windows = _num_of_windows(num_of_values, window_size, 1)
+    if num_of_windows == 0:
+        return np.empty((0,) + values.shape[1:])
+
+    num_of_blocks = -(-num_of_values // window_size)
+    padding = np.full((num_of_blocks * window_size - num_of_values,) + values.shape[1:], np.nan)
+    blocks = np.concatenate([values, padding]).reshape((num_of_blocks, window_size) + values.shape[1:])
+
+    extrema_from_blocks_starts = ufunc.accumulate(blocks, axis=1).reshape((-1,) + values.shape[1:])
+    extrema_from_blocks_ends = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape((-1,) + values.shape[1:])
+
+    with np.errstate(invalid='ignore'):
+        return ufunc(extrema_from_blocks_ends[:num_of_windows],
+                     extrema_from_blocks_starts[window_size - 1:num_of_values])
+
+
+def _num_of_windows(num_of_values: int, window_size: int, step: int) -> int:
+    if window_size < 1:
+        raise ValueError("window_size must be positive")
+    if step < 1:
+        raise ValueError("step must be positive")
+
+    return max(0, (num_of_values - window_size) // step + 1)
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
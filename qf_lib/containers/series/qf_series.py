@@ -19,6 +19,7 @@ import numpy as np
 import pandas as pd
 
 from qf_lib.common.enums.frequency import Frequency
+from qf_lib.containers.helpers import exponentially_smoothed_values
 from qf_lib.containers.time_indexed_container import TimeIndexedContainer
 
 
@@ -137,16 +138,8 @@ class QFSeries(pd.Series, TimeIndexedContainer):
         exponential average of the series
 
         """
-        smoothed_series = self.copy(deep=True)
-
-        for i in range(1, len(self)):
-            current_value_weighted = lambda_coeff * self.iloc[i]
-            prev_value_weighted = (1 - lambda_coeff) * smoothed_series.iloc[i - 1]
-
-            smoothed_value = current_value_weighted + prev_value_weighted
-            smoothed_series.iloc[i] = smoothed_value
-
-        return smoothed_series
+        smoothed_values = exponentially_smoothed_values(self.values, lambda_coeff)
+        return self._constructor(data=smoothed_values, index=self.index.copy()).__finalize__(self)
 
     def rolling_window_with_benchmark(self, benchmark: "QFSeries", window_size: int,
                                       func: Callable[["QFSeries"], float], step: int = 1) -> "QFSeries":
@@ -204,8 +197,8 @@ class QFSeries(pd.Series, TimeIndexedContainer):
 
         return result
 
-    def rolling_window(self, window_size: int, func: Callable[[Union["QFSeries", np.ndarray]], float], step: int = 1,
-                       optimised: bool = False) -> "QFSeries":
+    def rolling_window(self, window_size: int, func: Union[str, Callable[[Union["QFSeries", np.ndarray]], float]],
+                       step: int = 1, optimised: bool = False) -> "QFSeries":
         """
         Looks at a number of windows of size ``window_size`` and transforms the data in those windows based on the
         specified ``func``.
@@ -220,22 +213,35 @@ class QFSeries(pd.Series, TimeIndexedContainer):
             The function to call during each iteration. When ``other`` is ``None`` this function should take one
             ``QFSeries`` and return a value (Usually a number such as a ``float``). Otherwise, this function should take
             two ``QFSeries`` arguments and return a value.
+            It can also be the name of one of the common reductions: "sum", "mean", "var", "std", "min", "max".
+            Then the values for all the windows are calculated at once, in O(n) time (see: rolling_kernels),
+            and NaNs are skipped the same way as in the corresponding QFSeries methods.
         step
             The amount of data points to step through after each iteration, i.e. how much to move the window by in
             each iteration.
         optimised
-            Whether the more efficient pandas algorithm should be used for the rolling window application.
-            Note: This has some limitations: The ``step`` must be 1 and ``func`` will get an ``ndarray``
-            parameter which only contains values and no index.
+            Whether the more efficient algorithm should be used for the rolling window application.
+            Note: ``func`` will get an ``ndarray`` parameter which only contains values and no index. If the ``step``
+            is 1, the pandas algorithm is used. Otherwise ``func`` is applied to the strided views of the windows.
 
         Returns
         -------
         A ``QFSeries`` containing the transformed data.
         """
+        if isinstance(func, str):
+            from qf_lib.containers.rolling_kernels import rolling_reduction
+            values = rolling_reduction(self.values, window_size, func, step)
+            return QFSeries(data=values, index=self.index[window_size - 1::step])
+
         if optimised:
             from qf_lib.containers.series.cast_series import cast_series
-            assert step == 1, "Optimised rolling is only possible with a step of 1."
-            uncasted_result = self.rolling(window=window_size, center=False).apply(func=func)
+            if step == 1:
+                uncasted_result = self.rolling(window=window_size, center=False).apply(func=func)
+            else:
+                from qf_lib.containers.rolling_kernels import sliding_windows
+                windows = sliding_windows(self.values, window_size, step)
+                uncasted_result = QFSeries(data=[func(window) for window in windows],
+                                           index=self.index[window_size - 1::step], dtype=np.float64)
             return cast_series(uncasted_result, self._constructor)
 
         result = QFSeries()
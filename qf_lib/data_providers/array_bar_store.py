@@ -0,0 +1,118 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from datetime import datetime
+from typing import Sequence, Tuple, Union, Hashable
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.helpers import values_to_container
+
+
+class ArrayBarStore(object):
+    """
+    In-memory columnar storage of bars. The data is kept as one contiguous numpy array (dates x tickers) per field,
+    the dates are kept as a sorted int64 index and tickers/fields are mapped to positions with dictionaries.
+    Date ranges are located with np.searchsorted (O(log n)) and tickers/fields are selected with fancy indexing,
+    so no xarray operations are performed while querying. The result is converted into a QFDataArray,
+    PricesDataFrame/QFDataFrame or PricesSeries/QFSeries only at the very end.
+    """
+
+    def __init__(self, data: QFDataArray):
+        """
+        Parameters
+        ----------
+        data
+            QFDataArray (dates x tickers x fields) which should be stored; the dates don't need to be sorted
+        """
+        dates = data.dates.to_index()
+        dates_order = np.argsort(dates.values, kind="mergesort")
+        values = np.asarray(data.values)[dates_order]
+
+        self._dates = dates.values[dates_order].astype("datetime64[ns]").view(np.int64)
+        self._dates_index = pd.DatetimeIndex(self._dates.view("datetime64[ns]"), name=DATES)
+        self._ticker_to_position = {ticker: i for i, ticker in enumerate(data.tickers.values)}
+        self._field_to_position = {field: i for i, field in enumerate(data.fields.values)}
+        self._fields_arrays = [np.ascontiguousarray(values[:, :, i]) for i in range(values.shape[2])]
+        self._dtype = values.dtype
+        self._name = data.name
+
+    @property
+    def tickers(self) -> Sequence[Hashable]:
+        return list(self._ticker_to_position.keys())
+
+    @property
+    def fields(self) -> Sequence[Hashable]:
+        return list(self._field_to_position.keys())
+
+    def dates_slice(self, start_date: datetime = None, end_date: datetime = None) -> slice:
+        """
+        Returns the slice of positions of dates which are in the [start_date, end_date] range (both ends inclusive).
+        If the start_date or end_date is None, then the range is not limited from the corresponding side.
+        """
+        start_position = 0 if start_date is None else \
+            int(np.searchsorted(self._dates, pd.Timestamp(start_date).value, side="left"))
+        end_position = len(self._dates) if end_date is None else \
+            int(np.searchsorted(self._dates, pd.Timestamp(end_date).value, side="right"))
+
+        return slice(start_position, max(start_position, end_position))
+
+    def get_values(self, tickers: Sequence[Hashable], fields: Sequence[Hashable], start_date: datetime = None,
+                   end_date: datetime = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Returns the dates index and the 3-D numpy array (dates x tickers x fields) of values for the given tickers,
+        fields and dates range. Tickers and fields which are not in the store get NaN values. The returned array
+        is always a copy of the stored data.
+        """
+        dates_slice = self.dates_slice(start_date, end_date)
+        dates_index = self._dates_index[dates_slice]
+
+        tickers_positions = np.array([self._ticker_to_position.get(ticker, -1) for ticker in tickers], dtype=np.intp)
+        fields_positions = [self._field_to_position.get(field) for field in fields]
+
+        missing_tickers = tickers_positions < 0
+        is_any_label_missing = missing_tickers.any() or None in fields_positions
+        dtype = np.result_type(self._dtype, np.float64) if is_any_label_missing else self._dtype
+
+        result = np.empty((len(dates_index), len(tickers), len(fields)), dtype=dtype)
+        for i, field_position in enumerate(fields_positions):
+            if field_position is None:
+                result[:, :, i] = np.nan
+            else:
+                result[:, :, i] = self._fields_arrays[field_position][dates_slice, tickers_positions]
+
+        if missing_tickers.any():
+            result[:, missing_tickers, :] = np.nan
+
+        return dates_index, result
+
+    def get_container(
+            self, tickers: Sequence[Hashable], fields: Sequence[Hashable], start_date: datetime, end_date: datetime,
+            got_single_date: bool, got_single_ticker: bool, got_single_field: bool, use_prices_types: bool = False) \
+            -> Union[None, float, QFSeries, QFDataFrame, QFDataArray, PricesSeries, PricesDataFrame]:
+        """
+        Returns the data in the same format as normalize_data_array(...) would do for the equivalent xarray query
+        (the same container types, squeezed dimensions, labels and names), but without creating any intermediate
+        xarray objects unless a 3-D result was requested.
+        """
+        dates_index, values = self.get_values(tickers, fields, start_date, end_date)
+        return values_to_container(dates_index, tickers, fields, values, got_single_date, got_single_ticker,
+                                   got_single_field, use_prices_types, self._name)
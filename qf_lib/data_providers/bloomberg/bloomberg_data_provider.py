@@ -30,7 +30,7 @@ from qf_lib.data_providers.bloomberg.bloomberg_names import REF_DATA_SERVICE_URI
 from qf_lib.data_providers.bloomberg.historical_data_provider import HistoricalDataProvider
 from qf_lib.data_providers.bloomberg.reference_data_provider import ReferenceDataProvider, BloombergError
 from qf_lib.data_providers.bloomberg.tabular_data_provider import TabularDataProvider
-from qf_lib.data_providers.helpers import normalize_data_array, cast_dataframe_to_proper_type
+from qf_lib.data_providers.helpers import cast_dataframe_to_proper_type, values_to_container
 from qf_lib.data_providers.tickers_universe_provider import TickersUniverseProvider
 from qf_lib.settings import Settings
 
@@ -143,8 +143,10 @@ class BloombergDataProvider(AbstractPriceDataProvider, TickersUniverseProvider):
         data_array = self._historical_data_provider.get(
             tickers_str, fields, start_date, end_date, frequency, currency, override_name, override_value)
 
-        normalized_result = normalize_data_array(
-            data_array, tickers, fields, got_single_date, got_single_ticker, got_single_field)
+        # the data_array already has the requested tickers and fields (in the requested order) and sorted dates
+        normalized_result = values_to_container(
+            data_array.dates.to_index(), tickers, fields, data_array.values,
+            got_single_date, got_single_ticker, got_single_field)
 
         return normalized_result
 
@@ -60,7 +60,7 @@ def check_event_for_errors(event):
         logger.error(error_message)
         raise BloombergError(error_message)
 
-    first_msg = blpapi.event.MessageIterator(event).next()
+    first_msg = next(iter(event))
 
     if first_msg.asElement().hasElement(RESPONSE_ERROR):
         error_message = "Response error: " + str(first_msg.asElement())
@@ -69,7 +69,7 @@ def check_event_for_errors(event):
 
 
 def extract_security_data(event):
-    first_msg = blpapi.event.MessageIterator(event).next()
+    first_msg = next(iter(event))
     return first_msg.getElement(SECURITY_DATA)
 
 
@@ -81,15 +81,20 @@ def count_messages(event):
     return num_of_messages
 
 
-def get_response_events(session):
+def get_response_events(session, num_of_requests: int = 1):
+    """
+    Collects the events of responses to num_of_requests requests sent with the session. The function returns
+    when the final (RESPONSE) events of all the requests are received.
+    """
     response_events = []
-    while True:
+    num_of_final_responses = 0
+    while num_of_final_responses < num_of_requests:
         event = session.nextEvent()
         if event.eventType() == blpapi.event.Event.PARTIAL_RESPONSE:
             response_events.append(event)
         elif event.eventType() == blpapi.event.Event.RESPONSE:
             response_events.append(event)
-            break
+            num_of_final_responses += 1
 
     return response_events
 
@@ -12,15 +12,18 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from datetime import datetime
-from typing import Any, Sequence, Dict
+import math
+from datetime import datetime, timedelta
+from typing import Any, Sequence, Dict, List, Tuple
 
+import blpapi
 import numpy as np
 import pandas as pd
 
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.tickers.tickers import BloombergTicker
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dimension_names import DATES
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.data_providers.bloomberg.bloomberg_names import REF_DATA_SERVICE_URI, CURRENCY, START_DATE, END_DATE, \
     PERIODICITY_SELECTION, PERIODICITY_ADJUSTMENT, SECURITY, FIELD_DATA, DATE
@@ -28,20 +31,28 @@ from qf_lib.data_providers.bloomberg.exceptions import BloombergError
 from qf_lib.data_providers.bloomberg.helpers import set_tickers, set_fields, convert_to_bloomberg_date, \
     convert_to_bloomberg_freq, get_response_events, check_event_for_errors, check_security_data_for_errors, \
     extract_security_data
-from qf_lib.data_providers.helpers import tickers_dict_to_data_array
 
 
 class HistoricalDataProvider(object):
     """
     Used for providing historical data from Bloomberg.
+
+    Big requests (more than max_data_points_per_request tickers x fields x dates) are split into smaller
+    HistoricalDataRequests: first the tickers are divided into chunks and, if the history of a single ticker is still
+    too big, the range of dates is divided as well (only for the daily frequency, because the dates of other
+    frequencies depend on the end of the range). All the chunks are sent at once and Bloomberg processes them
+    concurrently.
     """
 
     # These revert to the actual date from today (if the end date is left blank) or from the End Date
     # (see PERIODICITY_ADJUSTMENT in blpapi-developers-guide for more)
     PERIODICITY_ADJUSTMENT = "ACTUAL"
 
-    def __init__(self, session):
+    MAX_DATA_POINTS_PER_REQUEST = 250000
+
+    def __init__(self, session, max_data_points_per_request: int = MAX_DATA_POINTS_PER_REQUEST):
         self._session = session
+        self.max_data_points_per_request = max_data_points_per_request
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
     def get(self, tickers: Sequence[str], fields: Sequence[str], start_date: datetime, end_date: datetime,
@@ -50,21 +61,58 @@ class HistoricalDataProvider(object):
         Gets historical data from Bloomberg.
         """
         ref_data_service = self._session.getService(REF_DATA_SERVICE_URI)
-        request = ref_data_service.createRequest("HistoricalDataRequest")
+        chunks = self._split_into_chunks(list(dict.fromkeys(tickers)), fields, start_date, end_date, frequency)
+
+        for request_id, (tickers_chunk, chunk_start_date, chunk_end_date) in enumerate(chunks):
+            request = ref_data_service.createRequest("HistoricalDataRequest")
+
+            set_tickers(request, tickers_chunk)
+            set_fields(request, fields)
 
-        set_tickers(request, tickers)
-        set_fields(request, fields)
+            self._set_time_period(request, chunk_start_date, chunk_end_date, frequency)
+            self._set_currency(currency, request)
 
-        self._set_time_period(request, start_date, end_date, frequency)
-        self._set_currency(currency, request)
+            if override_name is not None:
+                self._set_override(request, override_name, override_value)
 
-        if override_name is not None:
-            self._set_override(request, override_name, override_value)
+            self._session.sendRequest(request, correlationId=blpapi.CorrelationId(request_id))
 
-        self._session.sendRequest(request)
-        qf_data_array = self._receive_historical_response(tickers, fields)
+        qf_data_array = self._receive_historical_response(tickers, fields, num_of_requests=len(chunks))
         return qf_data_array
 
+    def _split_into_chunks(self, tickers: Sequence[str], fields: Sequence[str], start_date: datetime,
+                           end_date: datetime, frequency: Frequency) -> List[Tuple[Sequence[str], datetime, datetime]]:
+        """
+        Returns the list of (tickers, start date, end date) of requests, which don't exceed
+        the max_data_points_per_request (estimated from the number of periods between the dates).
+        """
+        num_of_days = (end_date - start_date).days + 1
+        occurrences_in_year = frequency.occurrences_in_year if frequency.occurrences_in_year > 0 else 365
+        num_of_periods = max(1, math.ceil(num_of_days * min(occurrences_in_year, 365) / 365))
+        data_points_per_ticker = num_of_periods * max(1, len(fields))
+
+        num_of_date_ranges = 1
+        if frequency == Frequency.DAILY:
+            num_of_date_ranges = min(num_of_days, math.ceil(data_points_per_ticker / self.max_data_points_per_request))
+
+        if num_of_date_ranges > 1:
+            # the consecutive ranges don't overlap, as the dates are sent to Bloomberg without the time
+            days_per_range = num_of_days / num_of_date_ranges
+            range_starts = [start_date + timedelta(days=math.floor(i * days_per_range))
+                            for i in range(num_of_date_ranges)]
+            range_ends = [range_start - timedelta(days=1) for range_start in range_starts[1:]] + [end_date]
+            date_ranges = list(zip(range_starts, range_ends))
+            tickers_per_request = 1
+        else:
+            date_ranges = [(start_date, end_date)]
+            tickers_per_request = max(1, self.max_data_points_per_request // data_points_per_ticker)
+
+        return [
+            (tickers[i:i + tickers_per_request], range_start, range_end)
+            for i in range(0, len(tickers), tickers_per_request)
+            for range_start, range_end in date_ranges
+        ]
+
     @classmethod
     def _set_currency(cls, currency, request):
         if currency is not None:
@@ -88,58 +136,70 @@ class HistoricalDataProvider(object):
         override.setElement("fieldId", override_name)
         override.setElement("value", override_value)
 
-    @staticmethod
-    def _get_float_or_nan(element, field_name):
-        if element.hasElement(field_name):
-            result = element.getElementAsFloat(field_name)
-            if result == '#N/A History':
-                result = float('nan')
-        else:
-            result = float("nan")
-
-        return result
-
-    def _receive_historical_response(self, requested_tickers, requested_fields):
-        response_events = get_response_events(self._session)
+    def _receive_historical_response(self, requested_tickers: Sequence[str], requested_fields: Sequence[str],
+                                     num_of_requests: int = 1) -> QFDataArray:
+        response_events = get_response_events(self._session, num_of_requests)
+        field_names = [blpapi.Name(field) for field in requested_fields]
 
-        # mapping: ticker -> DataArray[dates, fields]
-        tickers_data_dict = dict()  # type: Dict[BloombergTicker, pd.DataFrame]
+        # security name -> list of (dates, values[dates, fields]); a security may be split between many responses
+        securities_data = dict()  # type: Dict[str, List[Tuple[np.ndarray, np.ndarray]]]
 
         for event in response_events:
             check_event_for_errors(event)
             security_data = extract_security_data(event)
-
             security_name = security_data.getElementAsString(SECURITY)
-            ticker = BloombergTicker.from_string(security_name)
 
             try:
                 check_security_data_for_errors(security_data)
+                dates, values = self._decode_field_data(security_data.getElement(FIELD_DATA), field_names)
+                securities_data.setdefault(security_name, []).append((dates, values))
 
-                field_data_array = security_data.getElement(FIELD_DATA)
-                field_data_list = [field_data_array.getValueAsElement(i) for i in range(field_data_array.numValues())]
-                dates = [pd.to_datetime(x.getElementAsDatetime(DATE)) for x in field_data_list]
+            except BloombergError:
+                self.logger.exception("Error in the received historical response")
 
-                data = np.empty((len(dates), len(requested_fields)))
-                data[:] = np.nan
+        return self._create_data_array(securities_data, requested_tickers, requested_fields)
 
-                dates_fields_values = pd.DataFrame(data, index=dates, columns=requested_fields)
+    @staticmethod
+    def _decode_field_data(field_data_array, field_names: Sequence[blpapi.Name]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Writes the values of fields for all the dates of a single security into a preallocated array (dates x fields).
+        Values which are missing in the response are NaNs. Returns the dates (numpy datetime64[ns]) and the values.
+        """
+        num_of_dates = field_data_array.numValues()
+        dates = np.empty(num_of_dates, dtype=object)
+        values = np.full((num_of_dates, len(field_names)), np.nan)
 
-                for field_name in requested_fields:
-                    dates_fields_values.loc[:, field_name] = [
-                        self._get_float_or_nan(data_of_date_elem, field_name) for data_of_date_elem in field_data_list]
+        for i in range(num_of_dates):
+            data_of_date_elem = field_data_array.getValueAsElement(i)
+            dates[i] = data_of_date_elem.getElementAsDatetime(DATE)
 
-                tickers_data_dict[ticker] = dates_fields_values
+            for j, field_name in enumerate(field_names):
+                if data_of_date_elem.hasElement(field_name):
+                    values[i, j] = data_of_date_elem.getElementAsFloat(field_name)
 
-            except BloombergError:
-                self.logger.exception("Error in the received historical response")
-
-        return tickers_dict_to_data_array(tickers_data_dict, requested_tickers, requested_fields)
+        # all the dates are converted at once
+        dates = pd.DatetimeIndex(pd.to_datetime(dates)).values
+        return dates, values
 
     @staticmethod
-    def _get_subdictionary(dictionary, key):
-        subdictionary = dictionary.get(key, None)
-        if subdictionary is None:
-            subdictionary = dict()
-            dictionary[key] = subdictionary
+    def _create_data_array(securities_data: Dict[str, List[Tuple[np.ndarray, np.ndarray]]],
+                           requested_tickers: Sequence[str], requested_fields: Sequence[str]) -> QFDataArray:
+        """
+        Creates the QFDataArray (dates x requested tickers x requested fields) in a single allocation. The dates are
+        the sorted union of dates of all the securities.
+        """
+        all_dates = [dates for chunks in securities_data.values() for dates, _ in chunks]
+        dates = np.unique(np.concatenate(all_dates)) if all_dates else np.array([], dtype="datetime64[ns]")
+
+        ticker_to_positions = dict()  # type: Dict[str, List[int]]
+        for position, ticker in enumerate(requested_tickers):
+            ticker_to_positions.setdefault(ticker, []).append(position)
+
+        values = np.full((len(dates), len(requested_tickers), len(requested_fields)), np.nan)
+        for security_name, chunks in securities_data.items():
+            for position in ticker_to_positions.get(security_name, []):
+                for security_dates, security_values in chunks:
+                    values[np.searchsorted(dates, security_dates), position, :] = security_values
 
-        return subdictionary
+        tickers = [BloombergTicker.from_string(ticker) for ticker in requested_tickers]
+        return QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), tickers, requested_fields, values)
@@ -0,0 +1,378 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import hashlib
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Union, Sequence, Set, Type, Hashable, List, Tuple, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.helpers import values_to_container
+from qf_lib.data_providers.price_data_provider import DataProvider
+
+_PRICE = "price"
+_HISTORY = "history"
+
+
+class CachingDataProvider(DataProvider):
+    """
+    Read-through cache in front of another DataProvider (e.g. BloombergDataProvider or GeneralPriceProvider).
+
+    The data is stored separately for every (ticker, field) pair together with the ranges of dates which were
+    already downloaded for it. A query is answered from the cache if the requested range is covered. Otherwise only
+    the missing parts of the range (gaps) are downloaded from the wrapped provider and merged with the cached data.
+    Pairs missing the same gap are downloaded with a single call.
+
+    The most recently used pairs are kept in memory (at most max_memory_entries of them). If the cache_directory is
+    given, every pair is also written to its own .npz file (arrays of dates, values and covered ranges), so that
+    the cache survives between sessions and the pairs evicted from memory are read back from the disk.
+
+    The data of the current day (e.g. today's bar, which may be still incomplete or not published yet) is never marked
+    as covered, so it is downloaded again by every query which includes it.
+
+    Calls of get_history() with additional kwargs or without fields are passed directly to the wrapped provider.
+    Dates on which none of the requested (ticker, field) pairs has a value are not returned.
+    """
+
+    def __init__(self, data_provider: DataProvider, cache_directory: str = None, max_memory_entries: int = 10000):
+        """
+        Parameters
+        ----------
+        data_provider
+            provider used to download the data which is not cached
+        cache_directory
+            directory in which the cached data is persisted; if None, the data is kept only in memory
+        max_memory_entries
+            maximal number of (ticker, field) pairs kept in memory
+        """
+        if max_memory_entries <= 0:
+            raise ValueError("max_memory_entries must be positive")
+
+        self.data_provider = data_provider
+        self.cache_directory = cache_directory
+        self.max_memory_entries = max_memory_entries
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        if cache_directory is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+
+        self._entries = OrderedDict()  # type: Dict[Tuple[str, Ticker, Hashable], _CacheEntry]
+        self._hits = 0
+        self._misses = 0
+        self._disk_reads = 0
+        self._fetches = 0
+        self._bytes_fetched = 0
+
+    @property
+    def hits(self) -> int:
+        """ Number of requested (ticker, field) pairs which were fully served from the cache. """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """ Number of requested (ticker, field) pairs for which some data had to be downloaded. """
+        return self._misses
+
+    @property
+    def disk_reads(self) -> int:
+        """ Number of (ticker, field) pairs loaded from the cache directory. """
+        return self._disk_reads
+
+    @property
+    def fetches(self) -> int:
+        """ Number of calls of the wrapped data provider. """
+        return self._fetches
+
+    @property
+    def bytes_fetched(self) -> int:
+        """ Total size (in bytes) of the values downloaded from the wrapped data provider. """
+        return self._bytes_fetched
+
+    @property
+    def size(self) -> int:
+        """ Number of (ticker, field) pairs kept in memory. """
+        return len(self._entries)
+
+    def get_price(
+            self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
+            start_date: datetime, end_date: datetime = None) -> Union[None, PricesSeries, PricesDataFrame, QFDataArray]:
+        tickers, got_single_ticker = convert_to_list(tickers, Ticker)
+        fields, got_single_field = convert_to_list(fields, PriceField)
+
+        return self._get_data(_PRICE, tickers, fields, start_date, end_date, got_single_ticker, got_single_field)
+
+    def get_history(
+            self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[None, str, Sequence[str]],
+            start_date: datetime, end_date: datetime = None, **kwargs) -> Union[QFSeries, QFDataFrame, QFDataArray]:
+        if fields is None or kwargs:
+            return self.data_provider.get_history(tickers, fields, start_date, end_date, **kwargs)
+
+        tickers, got_single_ticker = convert_to_list(tickers, Ticker)
+        fields, got_single_field = convert_to_list(fields, str)
+
+        return self._get_data(_HISTORY, tickers, fields, start_date, end_date, got_single_ticker, got_single_field)
+
+    def supported_ticker_types(self) -> Set[Type[Ticker]]:
+        return self.data_provider.supported_ticker_types()
+
+    def clear(self):
+        """ Removes all the data kept in memory and resets the statistics. Files in the cache_directory are kept. """
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._disk_reads = 0
+        self._fetches = 0
+        self._bytes_fetched = 0
+
+    def _get_data(self, kind: str, tickers: List[Ticker], fields: List[Hashable], start_date: datetime,
+                  end_date: Optional[datetime], got_single_ticker: bool, got_single_field: bool):
+        got_single_date = start_date is not None and (start_date == end_date)
+        if end_date is None:
+            end_date = datetime.now()
+
+        tickers = list(dict.fromkeys(tickers))
+        fields = list(dict.fromkeys(fields))
+        start = pd.Timestamp(start_date).value
+        end = pd.Timestamp(end_date).value
+
+        entries = {(ticker, field): self._get_entry((kind, ticker, field)) for ticker in tickers for field in fields}
+        self._fetch_missing_ranges(kind, entries, start, end)
+
+        slices = {key: entry.slice(start, end) for key, entry in entries.items()}
+        dates = np.unique(np.concatenate([dates for dates, _ in slices.values()]))
+        dtype = np.result_type(np.float64, *(values.dtype for _, values in slices.values()))
+
+        values = np.full((len(dates), len(tickers), len(fields)), np.nan, dtype=dtype)
+        for i, ticker in enumerate(tickers):
+            for j, field in enumerate(fields):
+                entry_dates, entry_values = slices[(ticker, field)]
+                values[np.searchsorted(dates, entry_dates), i, j] = entry_values
+
+        dates_index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name=DATES)
+        return values_to_container(dates_index, tickers, fields, values, got_single_date, got_single_ticker,
+                                   got_single_field, use_prices_types=kind == _PRICE)
+
+    def _fetch_missing_ranges(self, kind: str, entries: Dict[Tuple[Ticker, Hashable], "_CacheEntry"], start: int,
+                              end: int):
+        # (ticker, field) pairs missing the same range of dates are downloaded together
+        range_to_keys = OrderedDict()  # type: Dict[Tuple[int, int], List[Tuple[Ticker, Hashable]]]
+        for key, entry in entries.items():
+            missing_ranges = entry.missing_ranges(start, end)
+            if missing_ranges:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+            for missing_range in missing_ranges:
+                range_to_keys.setdefault(missing_range, []).append(key)
+
+        # the data of the current day may change later, so the ranges are marked as covered only until its beginning
+        covered_end = (pd.Timestamp(datetime.now().date()) - pd.Timedelta(microseconds=1)).value
+
+        updated_keys = {}
+        for (range_start, range_end), keys in range_to_keys.items():
+            tickers = list(dict.fromkeys(ticker for ticker, _ in keys))
+            fields = list(dict.fromkeys(field for _, field in keys))
+            dates, values = self._fetch(kind, tickers, fields, range_start, range_end)
+
+            for i, ticker in enumerate(tickers):
+                for j, field in enumerate(fields):
+                    entries[(ticker, field)].update(range_start, range_end, dates, values[:, i, j],
+                                                    min(range_end, covered_end))
+                    updated_keys[(ticker, field)] = None
+
+        # every entry is written once, after all its missing ranges were downloaded
+        for ticker, field in updated_keys:
+            self._save_entry((kind, ticker, field), entries[(ticker, field)])
+
+    def _fetch(self, kind: str, tickers: List[Ticker], fields: List[Hashable], start: int, end: int) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Downloads the data from the wrapped provider. Returns the dates (int64 nanoseconds) and the 3-D array
+        of values (dates x tickers x fields).
+        """
+        start_date = pd.Timestamp(start).to_pydatetime()
+        end_date = pd.Timestamp(end).to_pydatetime()
+        self.logger.debug("Downloading {} tickers x {} fields from {} to {}".format(
+            len(tickers), len(fields), start_date, end_date))
+
+        if kind == _PRICE:
+            result = self.data_provider.get_price(tickers, fields, start_date, end_date)
+        else:
+            result = self.data_provider.get_history(tickers, fields, start_date, end_date)
+        self._fetches += 1
+
+        tickers_index = _labels_index(tickers)
+        fields_index = _labels_index(fields)
+
+        if isinstance(result, QFDataArray):
+            dates = result.dates.to_index()
+            result_values = np.asarray(result.values)
+            tickers_positions = tickers_index.get_indexer(result.tickers.values)
+            fields_positions = fields_index.get_indexer(result.fields.values)
+        else:
+            # single date queries return a data frame: tickers x fields
+            dates = pd.DatetimeIndex([start_date])
+            result_values = np.asarray(result.values)[np.newaxis]
+            tickers_positions = tickers_index.get_indexer(result.index)
+            fields_positions = fields_index.get_indexer(result.columns)
+
+        dtype = np.result_type(np.float64, result_values.dtype)
+        values = np.full((len(dates), len(tickers), len(fields)), np.nan, dtype=dtype)
+        is_ticker_requested = tickers_positions >= 0
+        is_field_requested = fields_positions >= 0
+        values[:, tickers_positions[is_ticker_requested][:, np.newaxis], fields_positions[is_field_requested]] = \
+            result_values[:, is_ticker_requested][:, :, is_field_requested]
+        self._bytes_fetched += result_values.nbytes
+
+        dates = pd.DatetimeIndex(dates).values.astype("datetime64[ns]").view(np.int64)
+        order = np.argsort(dates, kind="stable")
+        return dates[order], values[order]
+
+    def _get_entry(self, cache_key: Tuple[str, Ticker, Hashable]) -> "_CacheEntry":
+        try:
+            entry = self._entries[cache_key]
+            self._entries.move_to_end(cache_key)
+        except KeyError:
+            entry = self._load_entry(cache_key)
+            self._entries[cache_key] = entry
+            if len(self._entries) > self.max_memory_entries:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def _load_entry(self, cache_key: Tuple[str, Ticker, Hashable]) -> "_CacheEntry":
+        file_path = self._file_path(cache_key)
+        if file_path is None or not os.path.exists(file_path):
+            return _CacheEntry()
+
+        self._disk_reads += 1
+        with np.load(file_path, allow_pickle=True) as data:
+            return _CacheEntry(data["dates"], data["values"], data["ranges"])
+
+    def _save_entry(self, cache_key: Tuple[str, Ticker, Hashable], entry: "_CacheEntry"):
+        file_path = self._file_path(cache_key)
+        if file_path is None:
+            return
+
+        # the file is replaced atomically, so that it is never left half-written
+        temp_file_path = file_path + ".tmp"
+        with open(temp_file_path, "wb") as file:
+            np.savez(file, dates=entry.dates, values=entry.values, ranges=entry.ranges)
+        os.replace(temp_file_path, file_path)
+
+    def _file_path(self, cache_key: Tuple[str, Ticker, Hashable]) -> Optional[str]:
+        if self.cache_directory is None:
+            return None
+
+        kind, ticker, field = cache_key
+        key_str = "{}|{}|{}|{}".format(kind, type(ticker).__name__, ticker.as_string(), field)
+        file_name = hashlib.sha1(key_str.encode("utf-8")).hexdigest() + ".npz"
+        return os.path.join(self.cache_directory, file_name)
+
+    def __str__(self):
+        return "{}: {} pairs in memory, {} hits, {} misses, {} fetches, {} bytes fetched".format(
+            self.__class__.__name__, self.size, self.hits, self.misses, self.fetches, self.bytes_fetched)
+
+
+class _CacheEntry(object):
+    """
+    Data of a single (ticker, field) pair: sorted dates (int64 nanoseconds), corresponding values and the sorted,
+    disjoint ranges of dates (both ends inclusive) which were already downloaded and won't change.
+    """
+
+    def __init__(self, dates: np.ndarray = None, values: np.ndarray = None, ranges: np.ndarray = None):
+        self.dates = np.empty(0, dtype=np.int64) if dates is None else dates
+        self.values = np.empty(0, dtype=np.float64) if values is None else values
+        self.ranges = np.empty((0, 2), dtype=np.int64) if ranges is None else ranges
+
+    def missing_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Returns the parts of the [start, end] range, which are not covered yet. The returned ranges share their ends
+        with the covered ones, so that the data on the boundaries is downloaded again rather than skipped.
+        """
+        missing_ranges = []
+        current = start
+        is_current_covered = False
+
+        for range_start, range_end in self.ranges:
+            if range_end < current:
+                continue
+            if range_start > end:
+                break
+            if range_start > current:
+                missing_ranges.append((current, int(range_start)))
+            current = max(current, int(range_end))
+            is_current_covered = True
+
+        if current < end or not is_current_covered:
+            missing_ranges.append((current, end))
+
+        return missing_ranges
+
+    def update(self, start: int, end: int, dates: np.ndarray, values: np.ndarray, covered_end: int = None):
+        """
+        Replaces the data in the [start, end] range with the downloaded one and marks the [start, covered_end] range
+        as covered (by default the whole [start, end] range; nothing if covered_end is before start).
+        """
+        is_valid = ~pd.isnull(values)
+        dates = dates[is_valid]
+        values = values[is_valid]
+
+        is_outside = (self.dates < start) | (self.dates > end)
+        all_dates = np.concatenate([self.dates[is_outside], dates])
+        all_values = np.concatenate([self.values[is_outside], values])
+        order = np.argsort(all_dates, kind="stable")
+        self.dates = all_dates[order]
+        self.values = all_values[order]
+
+        covered_end = end if covered_end is None else covered_end
+        if covered_end < start:
+            return
+
+        ranges = np.concatenate([self.ranges, [[start, covered_end]]])
+        ranges = ranges[np.argsort(ranges[:, 0], kind="stable")]
+        merged_ranges = [ranges[0].tolist()]
+        for range_start, range_end in ranges[1:].tolist():
+            if range_start <= merged_ranges[-1][1]:
+                merged_ranges[-1][1] = max(merged_ranges[-1][1], range_end)
+            else:
+                merged_ranges.append([range_start, range_end])
+        self.ranges = np.array(merged_ranges, dtype=np.int64)
+
+    def slice(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """ Returns the dates and values in the [start, end] range. """
+        start_position = np.searchsorted(self.dates, start, side="left")
+        end_position = np.searchsorted(self.dates, end, side="right")
+        return self.dates[start_position:end_position], self.values[start_position:end_position]
+
+
+def _labels_index(labels: Sequence[Hashable]) -> pd.Index:
+    # the array is filled element by element, because tickers would be treated as sequences by numpy
+    labels_array = np.empty(len(labels), dtype=object)
+    labels_array[:] = labels
+    return pd.Index(labels_array)
@@ -12,17 +12,25 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, Future
 from datetime import date, datetime
-from typing import Dict, Optional, Sequence, Union
+from time import sleep
+from typing import Dict, Optional, Sequence, Union, Tuple
 
 import pandas as pd
+import requests
 from bs4 import BeautifulSoup as BS
-from requests import Session
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
 
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import CcyTicker
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
+from qf_lib.common.utils.miscellaneous.token_bucket import TokenBucket
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.qf_series import QFSeries
@@ -34,14 +42,65 @@ from qf_lib.data_providers.helpers import normalize_data_array, \
 class CryptoCurrencyDataProvider(AbstractPriceDataProvider):
     """
     Constructs a new ``CryptoCurrencyDataProvider`` instance
+
+    The pages with historical data of many tickers are downloaded concurrently (at most max_concurrent_requests
+    at a time) through one pooled HTTP session. Requests which fail because of connection errors, timeouts or
+    HTTP 429/5xx responses are retried with an exponential backoff and all the requests may be rate-limited
+    with a token bucket. The downloaded pages are parsed in the calling thread or (if parsing_workers is not 0)
+    in a pool of worker processes while the remaining pages are still being downloaded. The pool is created
+    for each call of get_history() and stopped at its end.
+
+    If the cache_directory is given, the pages are cached on disk by (ticker, date range) and revalidated with
+    conditional requests (ETag/Last-Modified), so that unchanged pages are not downloaded again.
+
+    The HTTP session (with its pool of connections) is kept open between the calls of get_history(). Call close()
+    when the provider is no longer needed to release it.
     """
 
     DATE_COLUMN = 'Date'
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
-    def __init__(self):
+    def __init__(self, base_url: str = "http://coinmarketcap.com", max_concurrent_requests: int = 4,
+                 max_retries: int = 3, backoff_factor: float = 0.5, requests_per_second: float = None,
+                 parsing_workers: Optional[int] = 0, cache_directory: str = None, timeout: float = 30.0):
+        """
+        Parameters
+        ----------
+        base_url
+            address of the service
+        max_concurrent_requests
+            maximal number of requests sent at the same time (and the size of the pool of connections)
+        max_retries
+            maximal number of retries of a failed request
+        backoff_factor
+            the n-th retry is made after backoff_factor * 2 ** (n - 1) seconds
+        requests_per_second
+            maximal rate of requests; None means no limit
+        parsing_workers
+            number of processes parsing the pages during a call of get_history(). If 0 (default), the pages are
+            parsed in the calling thread. None means the number of CPUs
+        cache_directory
+            directory in which the downloaded pages are cached; None means no cache
+        timeout
+            timeout (in seconds) of a single request
+        """
         self.logger = qf_logger.getChild(self.__class__.__name__)
         self.earliest_api_date = datetime(2013, 4, 28)
 
+        self.base_url = base_url
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.parsing_workers = parsing_workers
+        self.cache_directory = cache_directory
+        self.timeout = timeout
+
+        if cache_directory is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+
+        self._rate_limiter = TokenBucket(requests_per_second) if requests_per_second is not None else None
+        self._session = None  # type: Session
+
     def get_history(
             self, tickers: Union[CcyTicker, Sequence[CcyTicker]], fields: Union[None, str, Sequence[str]] = None,
             start_date: datetime = None, end_date: datetime = None, **kwargs) \
@@ -54,11 +113,7 @@ class CryptoCurrencyDataProvider(AbstractPriceDataProvider):
         else:
             got_single_field = False  # all existing fields will be present in the result
 
-        tickers_data_dict = {}
-        with Session() as session:
-            for ticker in tickers:
-                single_ticker_data = self._get_single_ticker(ticker, fields, start_date, end_date, session)
-                tickers_data_dict[ticker] = single_ticker_data
+        tickers_data_dict = self._get_tickers_data(tickers, fields, start_date, end_date)
 
         if fields is None:
             fields = get_fields_from_tickers_data_dict(tickers_data_dict)
@@ -79,12 +134,51 @@ class CryptoCurrencyDataProvider(AbstractPriceDataProvider):
             PriceField.Close: 'Close',
             PriceField.Volume: 'Volume'}
 
-    def _get_single_ticker(
-            self, ticker: CcyTicker, fields: Sequence[str], start_date: datetime, end_date: datetime, session: Session) \
-            -> Optional[pd.DataFrame]:
+    def close(self):
+        """ Closes the HTTP session. The provider may still be used afterwards (a new session is opened then). """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _get_tickers_data(self, tickers: Sequence[CcyTicker], fields: Optional[Sequence[str]], start_date: datetime,
+                          end_date: datetime) -> Dict[CcyTicker, pd.DataFrame]:
         """
-        Contacts the API and gets the price data for a single ticker
+        Downloads the pages of all the tickers concurrently and parses every page as soon as it is downloaded.
+        Tickers which don't exist on the API are not included in the result.
         """
+        start_date, end_date = self._get_dates_range(start_date, end_date)
+        tickers = list(dict.fromkeys(tickers))
+        session = self._get_session()
+
+        parsing_executor = None
+        if self.parsing_workers != 0:
+            parsing_executor = ProcessPoolExecutor(max_workers=self.parsing_workers)
+
+        try:
+            parsed_pages = {}  # type: Dict[CcyTicker, Union[Future, pd.DataFrame]]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrent_requests, len(tickers)))) as executor:
+                download_futures = {
+                    executor.submit(self._download_page, session, ticker, start_date, end_date): ticker
+                    for ticker in tickers
+                }
+                for download_future in as_completed(download_futures):
+                    content = download_future.result()
+                    if content is not None:
+                        parsed_pages[download_futures[download_future]] = self._parse_page(
+                            parsing_executor, content, fields)
+
+            tickers_data_dict = {}
+            for ticker in tickers:
+                if ticker in parsed_pages:
+                    page = parsed_pages[ticker]
+                    tickers_data_dict[ticker] = page.result() if isinstance(page, Future) else page
+        finally:
+            if parsing_executor is not None:
+                parsing_executor.shutdown()
+
+        return tickers_data_dict
+
+    def _get_dates_range(self, start_date: datetime, end_date: datetime) -> Tuple[datetime, datetime]:
         if end_date is None:
             end_date = date.today()
 
@@ -95,86 +189,108 @@ class CryptoCurrencyDataProvider(AbstractPriceDataProvider):
                 "This date is earlier than the earliest records on the API. Using the earliest possible date "
                 "instead (2013-04-28)")
 
-        data_url = "http://coinmarketcap.com/currencies/{ticker_str}/historical-data/?" \
+        return start_date, end_date
+
+    def _get_session(self) -> Session:
+        if self._session is None:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent_requests)
+            self._session = Session()
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+
+        return self._session
+
+    def _parse_page(self, parsing_executor: Optional[ProcessPoolExecutor], content: bytes,
+                    fields: Optional[Sequence[str]]) -> Union[Future, pd.DataFrame]:
+        if parsing_executor is None:
+            return parse_historical_data_page(content, fields, self.DATE_COLUMN)
+
+        return parsing_executor.submit(parse_historical_data_page, content, fields, self.DATE_COLUMN)
+
+    def _download_page(self, session: Session, ticker: CcyTicker, start_date: datetime, end_date: datetime) \
+            -> Optional[bytes]:
+        """
+        Contacts the API and gets the page with the price data for a single ticker. Returns None if the ticker
+        doesn't exist.
+        """
+        data_url = "{base_url}/currencies/{ticker_str}/historical-data/?" \
                    "start={start_date_str}&end={end_date_str}".format(
+                    base_url=self.base_url.rstrip("/"),
                     ticker_str=ticker.as_string(),
                     start_date_str=start_date.strftime("%Y%m%d"),
                     end_date_str=end_date.strftime("%Y%m%d"))
 
-        request = session.get(data_url)
-
-        if request.status_code is not 200:
-            if request.status_code == 404:
-                self.logger.error("The ticker {} does not exist on the API".format(ticker.as_string()))
-            else:
-                raise ConnectionError("Something went wrong connecting to the API. Try again later.")
+        cached_content, cache_headers = self._read_cached_page(data_url)
+        response = self._get_with_retries(session, data_url, cache_headers)
 
+        if response.status_code == 304 and cached_content is not None:
+            return cached_content
+        elif response.status_code == 404:
+            self.logger.error("The ticker {} does not exist on the API".format(ticker.as_string()))
             return None
-        else:
-            result_df = self._parse_request(request, fields)
-            return result_df
-
-    def _parse_request(self, request, fields):
-        table = BS(request.content, 'lxml').table
-        if table is None:
-            raise AttributeError(
-                "No data was found for the ticker. This could be an error on the API, or they may have changed their "
-                "layout format.")
-        headersHTML = table.findAll('th')
-
-        column_names = [header.string.replace('*', '') for header in headersHTML]
-        idx_of_date_column = column_names.index(self.DATE_COLUMN)
-
-        relevant_fields_set = set(fields).union({self.DATE_COLUMN})
-        relevant_fields_indices = []
-        field_names = []
-        for idx, col_name in enumerate(column_names):
-            if col_name in relevant_fields_set:
-                relevant_fields_indices.append(idx)
-
-                if idx != idx_of_date_column:
-                    field_names.append(col_name)
-
-        dates = []
-        data = []
-
-        data_rows = table.findAll('tr')
-        for row in data_rows[1:]:
-            rows_date, numeric_values = self._parse_data_row(row, relevant_fields_indices, idx_of_date_column)
-            dates.append(rows_date)
-            data.append(numeric_values)
-
-        return pd.DataFrame(data, index=dates, columns=field_names)
-
-    def _parse_data_row(self, row, relevant_fields_indices, idx_of_date_column):
-        td_elems = row.findAll('td')
-
-        rows_date = None
-        numeric_values = []
-
-        for i, elem in enumerate(td_elems):
-            if i not in relevant_fields_indices:
-                continue
-            elif i == idx_of_date_column:
-                parsed_date = datetime.strptime(elem.string, '%b %d, %Y')
-                rows_date = parsed_date
-            else:
-                value = self._parse_numeric_value(elem.string)
-                numeric_values.append(value)
+        elif response.status_code != 200:
+            raise ConnectionError("Something went wrong connecting to the API. Try again later.")
 
-        return rows_date, numeric_values
+        self._write_cached_page(data_url, response)
+        return response.content
+
+    def _get_with_retries(self, session: Session, url: str, headers: Dict[str, str]) -> Response:
+        for attempt in range(self.max_retries + 1):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
 
-    @classmethod
-    def _parse_numeric_value(cls, value: str) -> Optional[float]:
-        if value == '-':
-            value = None
-        else:
             try:
-                value = float((value.replace(',', '')))
-            except ValueError:
-                value = None
+                response = session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exception:
+                if attempt == self.max_retries:
+                    raise
+                self.logger.warning("Request to {} failed: {!r}. Retrying".format(url, exception))
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                self.logger.warning("Request to {} failed with the status {}. Retrying".format(
+                    url, response.status_code))
 
-        return value
+            sleep(self.backoff_factor * 2 ** attempt)
+
+    def _cache_file_path(self, url: str) -> Optional[str]:
+        if self.cache_directory is None:
+            return None
+        return os.path.join(self.cache_directory, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _read_cached_page(self, url: str) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """
+        Returns the cached content of the page and the headers of the conditional request, which revalidates it.
+        """
+        file_path = self._cache_file_path(url)
+        if file_path is None or not os.path.exists(file_path + ".json"):
+            return None, {}
+
+        with open(file_path + ".json") as file:
+            metadata = json.load(file)
+        with open(file_path + ".html", "rb") as file:
+            content = file.read()
+
+        headers = {}
+        if metadata.get("etag") is not None:
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified") is not None:
+            headers["If-Modified-Since"] = metadata["last_modified"]
+
+        return content, headers
+
+    def _write_cached_page(self, url: str, response: Response):
+        file_path = self._cache_file_path(url)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if file_path is None or (etag is None and last_modified is None):
+            return  # the page couldn't be revalidated
+
+        # the metadata file is written last, so that a page is used only if it was completely written
+        with open(file_path + ".html", "wb") as file:
+            file.write(response.content)
+        with open(file_path + ".json", "w") as file:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified}, file)
 
     @staticmethod
     def _format_single_ticker_table(table: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
@@ -186,3 +302,71 @@ class CryptoCurrencyDataProvider(AbstractPriceDataProvider):
         table = table.loc[start_date:end_date]
 
         return table
+
+
+def parse_historical_data_page(content: bytes, fields: Optional[Sequence[str]], date_column: str) -> pd.DataFrame:
+    """
+    Parses the table of historical data from the page (content of the HTTP response). If fields are None,
+    all the columns are returned. The function is run in worker processes, so it must be defined on the module level.
+    """
+    table = BS(content, 'lxml').table
+    if table is None:
+        raise AttributeError(
+            "No data was found for the ticker. This could be an error on the API, or they may have changed their "
+            "layout format.")
+    headersHTML = table.findAll('th')
+
+    column_names = [header.string.replace('*', '') for header in headersHTML]
+    idx_of_date_column = column_names.index(date_column)
+
+    relevant_fields_set = set(column_names if fields is None else fields).union({date_column})
+    relevant_fields_indices = []
+    field_names = []
+    for idx, col_name in enumerate(column_names):
+        if col_name in relevant_fields_set:
+            relevant_fields_indices.append(idx)
+
+            if idx != idx_of_date_column:
+                field_names.append(col_name)
+
+    dates = []
+    data = []
+
+    data_rows = table.findAll('tr')
+    for row in data_rows[1:]:
+        rows_date, numeric_values = _parse_data_row(row, relevant_fields_indices, idx_of_date_column)
+        dates.append(rows_date)
+        data.append(numeric_values)
+
+    return pd.DataFrame(data, index=dates, columns=field_names)
+
+
+def _parse_data_row(row, relevant_fields_indices, idx_of_date_column):
+    td_elems = row.findAll('td')
+
+    rows_date = None
+    numeric_values = []
+
+    for i, elem in enumerate(td_elems):
+        if i not in relevant_fields_indices:
+            continue
+        elif i == idx_of_date_column:
+            parsed_date = datetime.strptime(elem.string, '%b %d, %Y')
+            rows_date = parsed_date
+        else:
+            value = _parse_numeric_value(elem.string)
+            numeric_values.append(value)
+
+    return rows_date, numeric_values
+
+
+def _parse_numeric_value(value: str) -> Optional[float]:
+    if value == '-':
+        value = None
+    else:
+        try:
+            value = float((value.replace(',', '')))
+        except ValueError:
+            value = None
+
+    return value
@@ -12,23 +12,28 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from datetime import datetime
-from itertools import groupby
-from typing import Sequence, Union, Dict, Type
+from time import monotonic
+from typing import Sequence, Union, Dict, Type, List, Tuple, Callable, Hashable
+
+import numpy as np
+import pandas as pd
 
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
-from qf_lib.containers.dimension_names import TICKERS
+from qf_lib.containers.dimension_names import DATES
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.data_providers.bloomberg.bloomberg_data_provider import BloombergDataProvider
 from qf_lib.data_providers.cryptocurrency.cryptocurrency_data_provider import CryptoCurrencyDataProvider
 from qf_lib.data_providers.haver import HaverDataProvider
-from qf_lib.data_providers.helpers import normalize_data_array
+from qf_lib.data_providers.helpers import values_to_container
 from qf_lib.data_providers.price_data_provider import DataProvider
 from qf_lib.data_providers.quandl.quandl_data_provider import QuandlDataProvider
 
@@ -36,16 +41,49 @@ from qf_lib.data_providers.quandl.quandl_data_provider import QuandlDataProvider
 class GeneralPriceProvider(DataProvider):
     """
     The main class that should be used in order to access prices of financial instruments.
+
+    Tickers are partitioned by the data providers which support them (regardless of their order) and every data
+    provider is called once. If the tickers belong to more than one data provider, the data providers are called
+    concurrently (each in a separate thread), so that the time of the query is the time of the slowest provider,
+    not the sum of all of them. The results are written directly into one preallocated array.
+
+    If a data provider fails or doesn't respond within its timeout, the exception is raised, unless
+    allow_partial_results is True. In that case the values for the tickers of the failed data provider are NaNs
+    and the failures are reported in the last_failures attribute (list of (data provider, tickers, exception)).
     """
 
     def __init__(self, bloomberg: BloombergDataProvider = None, quandl: QuandlDataProvider = None,
-                 haver: HaverDataProvider = None, cryptocurrency: CryptoCurrencyDataProvider = None):
+                 haver: HaverDataProvider = None, cryptocurrency: CryptoCurrencyDataProvider = None,
+                 timeout: float = None, allow_partial_results: bool = False):
+        """
+        Parameters
+        ----------
+        bloomberg, quandl, haver, cryptocurrency
+            data providers used for the corresponding types of tickers
+        timeout
+            number of seconds after which the request to a single data provider is considered failed (by default
+            there is no timeout). It may be changed for a specific data provider with set_timeout()
+        allow_partial_results
+            if True, the failures of some data providers don't cause the whole query to fail
+        """
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+        self.timeout = timeout
+        self.allow_partial_results = allow_partial_results
+        self.last_failures = []  # type: List[Tuple[DataProvider, List[Ticker], BaseException]]
+
         self._ticker_type_to_data_provider_dict = {}  # type: Dict[Type[Ticker], DataProvider]
+        self._data_provider_to_timeout = {}  # type: Dict[DataProvider, float]
 
         for provider in [bloomberg, quandl, haver, cryptocurrency]:
             if provider is not None:
                 self._register_data_provider(provider)
 
+    def set_timeout(self, data_provider: DataProvider, timeout: float):
+        """
+        Sets the timeout (in seconds) of requests to the given data provider. None means no timeout.
+        """
+        self._data_provider_to_timeout[data_provider] = timeout
+
     def get_price(
             self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
             start_date: datetime, end_date: datetime = None) -> Union[None, PricesSeries, PricesDataFrame, QFDataArray]:
@@ -88,19 +126,108 @@ class GeneralPriceProvider(DataProvider):
         tickers, got_single_ticker = convert_to_list(tickers, Ticker)
         fields, got_single_field = convert_to_list(fields, type_of_field)
         got_single_date = start_date is not None and (start_date == end_date)
-        partial_results = []
-
-        for ticker_class, ticker_group in groupby(tickers, lambda t: type(t)):
-            data_provider = self._identify_data_provider(ticker_class)
-
-            partial_result = get_data_func(data_provider, list(ticker_group))
-            if partial_result is not None:
-                partial_results.append(partial_result)
 
-        result = QFDataArray.concat(partial_results, dim=TICKERS)
-        normalized_result = normalize_data_array(
-            result, tickers, fields, got_single_date, got_single_ticker, got_single_field, use_prices_types)
-        return normalized_result
+        data_provider_to_tickers = {}  # type: Dict[DataProvider, List[Ticker]]
+        for ticker in dict.fromkeys(tickers):
+            data_provider = self._identify_data_provider(type(ticker))
+            data_provider_to_tickers.setdefault(data_provider, []).append(ticker)
+
+        partial_results = self._get_partial_results(get_data_func, data_provider_to_tickers)
+        dates_index, values = self._assemble_values(partial_results, tickers, fields, start_date)
+
+        return values_to_container(dates_index, tickers, fields, values, got_single_date, got_single_ticker,
+                                   got_single_field, use_prices_types)
+
+    def _get_partial_results(self, get_data_func: Callable, data_provider_to_tickers: Dict[DataProvider, List[Ticker]]):
+        self.last_failures = []
+        if len(data_provider_to_tickers) == 0:
+            return []
+
+        timeouts = [self._data_provider_to_timeout.get(data_provider, self.timeout)
+                    for data_provider in data_provider_to_tickers]
+
+        if len(data_provider_to_tickers) == 1 and timeouts[0] is None:
+            # a single data provider without timeout is called directly
+            data_provider, tickers = next(iter(data_provider_to_tickers.items()))
+            return [get_data_func(data_provider, tickers)]
+
+        start_time = monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(data_provider_to_tickers))
+        try:
+            futures = [executor.submit(get_data_func, data_provider, tickers)
+                       for data_provider, tickers in data_provider_to_tickers.items()]
+
+            partial_results = []
+            for (data_provider, tickers), future, timeout in zip(data_provider_to_tickers.items(), futures, timeouts):
+                remaining_time = None if timeout is None else max(0.0, start_time + timeout - monotonic())
+                try:
+                    partial_results.append(future.result(timeout=remaining_time))
+                except Exception as exception:
+                    if isinstance(exception, TimeoutError):
+                        future.cancel()
+                        exception = TimeoutError("{} didn't respond within {} s".format(
+                            data_provider.__class__.__name__, timeout))
+                    if not self.allow_partial_results:
+                        raise exception
+
+                    self.logger.warning("Failed to get the data of {} tickers from {}: {!r}".format(
+                        len(tickers), data_provider.__class__.__name__, exception))
+                    self.last_failures.append((data_provider, tickers, exception))
+        finally:
+            # threads of the timed out requests are not waited for
+            executor.shutdown(wait=False)
+
+        return partial_results
+
+    @staticmethod
+    def _assemble_values(partial_results, tickers: List[Ticker], fields: List[Hashable], start_date: datetime) \
+            -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Writes the partial results (QFDataArrays or, for single date queries, data frames: tickers x fields)
+        into one array: dates x tickers x fields. Dates are the union of dates of all the partial results.
+        """
+        partial_results = [result for result in partial_results if result is not None]
+
+        # the arrays are filled element by element, because tickers would be treated as sequences by numpy
+        tickers_array = np.empty(len(tickers), dtype=object)
+        tickers_array[:] = tickers
+        fields_array = np.empty(len(fields), dtype=object)
+        fields_array[:] = fields
+        tickers_index = pd.Index(tickers_array)
+        fields_index = pd.Index(fields_array)
+
+        labelled_values = []
+        for result in partial_results:
+            if isinstance(result, QFDataArray):
+                labelled_values.append((result.dates.to_index(), result.tickers.values, result.fields.values,
+                                        np.asarray(result.values)))
+            else:
+                labelled_values.append((pd.DatetimeIndex([start_date]), result.index.values, result.columns.values,
+                                        np.asarray(result.values)[np.newaxis]))
+
+        dates_index = pd.DatetimeIndex([], name=DATES)
+        for result_dates, _, _, _ in labelled_values:
+            dates_index = dates_index.union(result_dates)
+        dates_index = pd.DatetimeIndex(dates_index, name=DATES)
+
+        dtype = np.result_type(np.float64, *(result_values.dtype for _, _, _, result_values in labelled_values))
+        values = np.full((len(dates_index), len(tickers), len(fields)), np.nan, dtype=dtype)
+
+        for result_dates, result_tickers, result_fields, result_values in labelled_values:
+            # the tickers may be requested many times, so every ticker of the result is written to all its columns
+            result_tickers_index = pd.Index(result_tickers)
+            tickers_positions = result_tickers_index.get_indexer(tickers_index)
+            fields_positions = pd.Index(result_fields).get_indexer(fields_index)
+            dates_positions = dates_index.get_indexer(result_dates)
+
+            is_ticker_available = tickers_positions >= 0
+            is_field_available = fields_positions >= 0
+            values[dates_positions[:, np.newaxis, np.newaxis],
+                   np.flatnonzero(is_ticker_available)[:, np.newaxis],
+                   np.flatnonzero(is_field_available)] = \
+                result_values[:, tickers_positions[is_ticker_available]][:, :, fields_positions[is_field_available]]
+
+        return dates_index, values
 
     def _register_data_provider(self, price_provider: DataProvider):
         for ticker_class in price_provider.supported_ticker_types():
@@ -12,8 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import Union, Dict
+from collections import OrderedDict
+from functools import reduce
+from typing import Union, Dict, Sequence, Hashable, Tuple, List
 
+import numpy as np
 import pandas as pd
 
 from qf_lib.common.tickers.tickers import Ticker
@@ -111,6 +114,49 @@ def cast_data_array_to_proper_type(result: QFDataArray, use_prices_types=False):
     return casted_result
 
 
+def values_to_container(
+        dates_index: pd.DatetimeIndex, tickers: Sequence[Hashable], fields: Sequence[Hashable], values: np.ndarray,
+        got_single_date: bool, got_single_ticker: bool, got_single_field: bool, use_prices_types: bool = False,
+        name: str = None) -> Union[None, float, QFSeries, QFDataFrame, QFDataArray, PricesSeries, PricesDataFrame]:
+    """
+    Wraps the 3-D array of values (dates x tickers x fields) into the same container as normalize_data_array(...)
+    would return for the equivalent QFDataArray (the same container types, squeezed dimensions, labels and names),
+    but without creating any intermediate xarray objects unless a 3-D result was requested.
+    """
+    single_ticker_and_field = len(tickers) == 1 and len(fields) == 1
+    container_name = tickers[0].as_string() if single_ticker_and_field else name
+
+    if got_single_date and len(dates_index) != 1:
+        # keep exactly the same behaviour as the xarray-based path in this corner case
+        data_array = QFDataArray.create(dates_index, tickers, fields, values, name)
+        squeezed_result = squeeze_data_array(data_array, got_single_date, got_single_ticker, got_single_field)
+        return cast_data_array_to_proper_type(squeezed_result, use_prices_types)
+
+    series_type, data_frame_type = (PricesSeries, PricesDataFrame) if use_prices_types else (QFSeries, QFDataFrame)
+
+    labels = []
+    if not got_single_date:
+        labels.append(dates_index)
+    if not got_single_ticker:
+        labels.append(pd.Index(tickers, name=TICKERS))
+    if not got_single_field:
+        labels.append(pd.Index(fields, name=FIELDS))
+
+    squeezed_axes = tuple(axis for axis, squeezed in enumerate((got_single_date, got_single_ticker,
+                                                                got_single_field)) if squeezed)
+    if squeezed_axes:
+        values = values.squeeze(axis=squeezed_axes)
+
+    if len(labels) == 0:
+        return values.item()
+    elif len(labels) == 1:
+        return series_type(data=values, index=labels[0], name=container_name)
+    elif len(labels) == 2:
+        return data_frame_type(data=values, index=labels[0], columns=labels[1])
+    else:
+        return QFDataArray.create(dates_index, tickers, fields, values, container_name)
+
+
 def cast_dataframe_to_proper_type(result):
     num_of_dimensions = len(result.axes)
     if num_of_dimensions == 1:
@@ -127,6 +173,11 @@ def tickers_dict_to_data_array(tickers_data_dict: Dict[Ticker, pd.DataFrame], re
     """
     Converts a dictionary tickers->DateFrame to QFDataArray.
 
+    The dates (and fields) of all the DataFrames are joined once (in the same way as xr.concat joins them: if all
+    the indices are equal, the index is used as it is, otherwise the sorted union of indices is used) and the values
+    of every DataFrame are written into a single preallocated array (dates x tickers x fields). Tickers with no data
+    are skipped (proper columns are added afterwards anyway, when the result is normalized).
+
     Parameters
     ----------
     tickers_data_dict
@@ -138,34 +189,61 @@ def tickers_dict_to_data_array(tickers_data_dict: Dict[Ticker, pd.DataFrame], re
     -------
     QFDataArray
     """
+    tickers_data_dict = {ticker: df for ticker, df in tickers_data_dict.items() if not df.empty}
+
     # return empty xr.DataArray if there is no data to be converted
     if not tickers_data_dict:
         return QFDataArray.create(dates=[], tickers=requested_tickers, fields=requested_fields)
 
-    tickers = []
-    data_arrays = []
-    for ticker, df in tickers_data_dict.items():
-        df.index.name = DATES
-        if df.empty:  # if there is no data for a given ticker, skip it (proper column will be added afterwards anyway)
-            continue
+    data_frames = list(tickers_data_dict.values())
+    dates_index, dates_indexers = _join_indices([df.index for df in data_frames])
+    fields_index, fields_indexers = _join_indices([df.columns for df in data_frames])
 
-        data_array = df.to_xarray()
-        data_array = data_array.to_array(dim=FIELDS, name=ticker)
-        data_array = data_array.transpose(DATES, FIELDS)
+    dtype = np.result_type(*[df.values.dtype for df in data_frames])
+    has_missing_values = any(len(df.index) != len(dates_index) or len(df.columns) != len(fields_index)
+                             for df in data_frames)
+    if has_missing_values:
+        dtype = _dtype_with_missing_values(dtype)
+    fill_value = np.datetime64("NaT") if dtype.kind in "mM" else np.nan
 
-        tickers.append(ticker)
-        data_arrays.append(data_array)
+    values = np.full((len(dates_index), len(data_frames), len(fields_index)), fill_value, dtype=dtype)
+    for i, (df, dates_indexer, fields_indexer) in enumerate(zip(data_frames, dates_indexers, fields_indexers)):
+        values[:, i, :][np.ix_(dates_indexer, fields_indexer)] = df.values
 
-    tickers_index = pd.Index(tickers, name=TICKERS)
-    if not data_arrays:
-        return QFDataArray.create(dates=[], tickers=requested_tickers, fields=requested_fields)
-    result = QFDataArray.concat(data_arrays, dim=tickers_index)
+    tickers = np.empty(len(tickers_data_dict), dtype=object)
+    tickers[:] = list(tickers_data_dict.keys())
 
-    # the DataArray gets a name after the first ticker in the tickers_data_dict.keys() which is incorrect;
-    # it should have no name
-    result.name = None
+    return QFDataArray.create(dates_index.rename(DATES), pd.Index(tickers, name=TICKERS),
+                              fields_index.rename(FIELDS), values)
 
-    return result
+
+def _join_indices(indices: Sequence[pd.Index]) -> Tuple[pd.Index, List[np.ndarray]]:
+    """
+    Joins the indices in the same way as xr.concat does (the sorted union of indices, unless all of them are equal)
+    and returns the positions of every index's labels in the joined index. Usually most of the indices are equal,
+    so the union and the positions are calculated only once for every distinct index.
+    """
+    distinct_indices = OrderedDict()  # type: Dict[Hashable, pd.Index]
+    keys = []
+    for index in indices:
+        key = (str(index.dtype), index.values.tobytes()) if index.dtype.kind in "biufcmM" else tuple(index)
+        distinct_indices.setdefault(key, index)
+        keys.append(key)
+
+    joined_index = reduce(lambda left_index, right_index: left_index.union(right_index), distinct_indices.values())
+
+    indexers = {key: joined_index.get_indexer(index) for key, index in distinct_indices.items()}
+    return joined_index, [indexers[key] for key in keys]
+
+
+def _dtype_with_missing_values(dtype: np.dtype) -> np.dtype:
+    """ Returns the dtype which can represent missing values (NaN or NaT) together with the values of a given dtype. """
+    if dtype.kind in "fcmM":
+        return dtype
+    elif dtype.kind in "iu":
+        return np.dtype(np.float64)
+    else:
+        return np.dtype(object)
 
 
 def get_fields_from_tickers_data_dict(tickers_data_dict):
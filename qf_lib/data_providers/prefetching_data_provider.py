@@ -32,9 +32,10 @@ class PrefetchingDataProvider(PresetDataProvider):
                  tickers: Sequence[Ticker],
                  fields: Sequence[PriceField],
                  start_date: datetime, end_date: datetime,
-                 check_data_availability: bool = True):
+                 check_data_availability: bool = True, use_array_bar_store: bool = False):
         prefetched_data = data_provider.get_price(tickers, fields, start_date, end_date)
         super().__init__(
             data=prefetched_data,
             start_date=start_date, end_date=end_date,
-            check_data_availability=check_data_availability)
+            check_data_availability=check_data_availability,
+            use_array_bar_store=use_array_bar_store)
@@ -0,0 +1,71 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the speed of queries answered by the PresetDataProvider with and without the ArrayBarStore.
+Every query is the one typical for the backtest: a window of the last bars for all the tickers.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+def create_data_array(num_of_tickers: int, num_of_years: int, fields) -> QFDataArray:
+    dates = pd.bdate_range(end="2019-01-01", periods=num_of_years * 252)
+    tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(num_of_tickers)]
+    values = np.random.rand(len(dates), len(tickers), len(fields))
+
+    return QFDataArray.create(dates, tickers, fields, values)
+
+
+def time_queries(data_provider, tickers, fields, query_dates, window_length: RelativeDelta) -> float:
+    start_time = perf_counter()
+    for date in query_dates:
+        data_provider.get_price(tickers, fields, date - window_length, date)
+    return (perf_counter() - start_time) / len(query_dates)
+
+
+def main():
+    num_of_years = 20
+    num_of_queries = 20
+    fields = [PriceField.Open, PriceField.Close]
+    window_length = RelativeDelta(days=90)
+
+    print("{:>8s} {:>14s} {:>14s} {:>10s}".format("Tickers", "xarray [ms]", "arrays [ms]", "Speedup"))
+    for num_of_tickers in [10, 500, 3000]:
+        data_array = create_data_array(num_of_tickers, num_of_years, fields)
+        start_date = data_array.dates.to_index()[0].to_pydatetime()
+        end_date = data_array.dates.to_index()[-1].to_pydatetime()
+        tickers = list(data_array.tickers.values)
+        query_dates = [date.to_pydatetime() for date in data_array.dates.to_index()[-num_of_queries:]]
+
+        xarray_provider = PresetDataProvider(data_array, start_date, end_date)
+        array_provider = PresetDataProvider(data_array, start_date, end_date, use_array_bar_store=True)
+
+        xarray_time = time_queries(xarray_provider, tickers, fields, query_dates, window_length)
+        array_time = time_queries(array_provider, tickers, fields, query_dates, window_length)
+
+        print("{:>8d} {:>14.3f} {:>14.3f} {:>9.1f}x".format(
+            num_of_tickers, xarray_time * 1000, array_time * 1000, xarray_time / array_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the number of TimeEvents dispatched per second by the standard event loop (every event passes through
+the EventManager's queue) and by the BacktestEventLoop (precomputed schedule dispatched directly to the listeners).
+All four market events are scheduled and the listener does nothing, so only the framework overhead is measured.
+"""
+from time import perf_counter
+
+from qf_lib.backtesting.events.backtest_event_loop import BacktestEventLoop
+from qf_lib.backtesting.events.event_manager import EventManager
+from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_event.after_market_close_event import AfterMarketCloseEvent
+from qf_lib.backtesting.events.time_event.before_market_open_event import BeforeMarketOpenEvent
+from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_flow_controller import BacktestTimeFlowController
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class _Listener(object):
+    def on_before_market_open(self, event):
+        pass
+
+    def on_market_open(self, event):
+        pass
+
+    def on_market_close(self, event):
+        pass
+
+    def on_after_market_close(self, event):
+        pass
+
+
+def create_components(start_date, end_date):
+    timer = SettableTimer(start_date)
+    notifiers = Notifiers(timer)
+    event_manager = EventManager(timer)
+    event_manager.register_notifiers([
+        notifiers.all_event_notifier,
+        notifiers.empty_queue_event_notifier,
+        notifiers.end_trading_event_notifier,
+        notifiers.scheduler
+    ])
+    time_flow_controller = BacktestTimeFlowController(
+        notifiers.scheduler, event_manager, timer, notifiers.empty_queue_event_notifier, end_date)
+
+    listener = _Listener()
+    for event_type in [BeforeMarketOpenEvent, MarketOpenEvent, MarketCloseEvent, AfterMarketCloseEvent]:
+        notifiers.scheduler.subscribe(event_type, listener)
+
+    return notifiers, event_manager, time_flow_controller
+
+
+def main():
+    start_date = str_to_date("1990-01-01")
+    print("{:>6s} {:>10s} {:>18s} {:>18s} {:>10s}".format(
+        "Years", "Events", "queue [events/s]", "fast [events/s]", "Speedup"))
+
+    for years in [1, 10, 30]:
+        end_date = str_to_date("{}-12-31".format(1990 + years - 1))
+
+        _, event_manager, _ = create_components(start_date, end_date)
+        start_time = perf_counter()
+        while event_manager.continue_trading:
+            event_manager.dispatch_next_event()
+        queue_time = perf_counter() - start_time
+
+        notifiers, _, time_flow_controller = create_components(start_date, end_date)
+        event_loop = BacktestEventLoop(time_flow_controller, notifiers)
+        start_time = perf_counter()
+        event_loop.run()
+        fast_time = perf_counter() - start_time
+
+        number_of_events = event_loop.number_of_dispatched_events
+        print("{:>6d} {:>10d} {:>18.0f} {:>18.0f} {:>9.1f}x".format(
+            years, number_of_events, number_of_events / queue_time, number_of_events / fast_time,
+            queue_time / fast_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the time of calculating the fill prices (VolumeShareSlippage) and commissions (IBCommissionModel) of
+the executed orders. The previous implementation, which downloaded today's volumes in every call of apply_slippage()
+and calculated commissions order by order, is compared with apply_slippage_batch() and calculate_commissions()
+fed from the DataHandler's cache of today's bars.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.execution_handler.commission_models.ib_commission_model import IBCommissionModel
+from qf_lib.backtesting.execution_handler.slippage.volume_share_slippage import VolumeShareSlippage
+from qf_lib.backtesting.order.execution_style import MarketOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class _BarsDataHandler(DataHandler):
+    def __init__(self, bars_df: pd.DataFrame):
+        super().__init__(None, SettableTimer(str_to_date("2018-01-02")))
+        self.bars_df = bars_df
+
+    def get_bar_for_today(self, tickers):
+        return self.bars_df.loc[tickers, :]
+
+
+def fill_order_by_order(slippage_model, commission_model, data_handler, mapper, orders, prices):
+    # volumes downloaded for every call, as in the previous implementation of VolumeShareSlippage
+    tickers = [mapper.contract_to_ticker(order.contract) for order in orders]
+    volumes = data_handler.get_bar_for_today(list(set(tickers))).loc[tickers, PriceField.Volume].values
+    order_volumes = np.array([order.quantity for order in orders])
+    fill_volumes = slippage_model._get_fill_volumes(order_volumes, volumes)
+    fill_prices = prices + np.copysign((fill_volumes / volumes) ** 2 * slippage_model.price_impact * prices,
+                                       order_volumes)
+
+    return [commission_model.calculate_commission(order, fill_price) for order, fill_price in zip(orders, fill_prices)]
+
+
+def fill_batch(slippage_model, commission_model, orders, quantities, prices, tickers):
+    fill_prices, _ = slippage_model.apply_slippage_batch(orders, quantities, prices, tickers)
+    return commission_model.calculate_commissions(orders, quantities, fill_prices)
+
+
+def main():
+    print("{:>8s} {:>14s} {:>14s} {:>18s}".format("Orders", "per order [s]", "batch [s]", "batch [ms/100]"))
+    random_state = np.random.RandomState(5)
+    mapper = DummyBloombergContractTickerMapper()
+    commission_model = IBCommissionModel()
+
+    for number_of_orders in [100, 1000, 5000]:
+        tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(number_of_orders)]
+        bars_df = pd.DataFrame(index=pd.Index(tickers), columns=PriceField.ohlcv(),
+                               data=np.column_stack([np.full((number_of_orders, 4), 100.0),
+                                                     random_state.randint(1e4, 1e6, number_of_orders)]))
+        data_handler = _BarsDataHandler(bars_df)
+        slippage_model = VolumeShareSlippage(0.1, 0.1, data_handler, mapper)
+
+        quantities = random_state.randint(-5000, 5000, number_of_orders)
+        prices = 100 * random_state.rand(number_of_orders)
+        orders = [Order(mapper.ticker_to_contract(ticker), int(quantity), MarketOrder(), TimeInForce.DAY)
+                  for ticker, quantity in zip(tickers, quantities)]
+
+        start_time = perf_counter()
+        fill_order_by_order(slippage_model, commission_model, data_handler, mapper, orders, prices)
+        order_by_order_time = perf_counter() - start_time
+
+        data_handler.get_bar_values_for_today(tickers, PriceField.Volume)  # bars are downloaded once per bar
+
+        start_time = perf_counter()
+        fill_batch(slippage_model, commission_model, orders, quantities, prices, tickers)
+        batch_time = perf_counter() - start_time
+
+        print("{:>8d} {:>14.4f} {:>14.4f} {:>18.4f}".format(
+            number_of_orders, order_by_order_time, batch_time, batch_time * 1000 / (number_of_orders / 100)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the speed of decoding Bloomberg historical responses (with a mocked blpapi session): the previous decoder,
+which converted every date separately and built a DataFrame per ticker, and the HistoricalDataProvider's decoder
+writing values straight into preallocated arrays. The time of assembling the QFDataArray from the decoded arrays
+(in a single allocation) is reported as well.
+"""
+from time import perf_counter
+
+import blpapi
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.bloomberg.bloomberg_names import SECURITY, FIELD_DATA, DATE
+from qf_lib.data_providers.bloomberg.helpers import get_response_events, extract_security_data
+from qf_lib.data_providers.bloomberg.historical_data_provider import HistoricalDataProvider
+from qf_lib_tests.helpers.testing_tools.bloomberg_session_mock import SessionMock
+
+FIELDS = ["PX_OPEN", "PX_HIGH", "PX_LOW", "PX_LAST", "PX_VOLUME"]
+
+
+def create_data_array(num_of_tickers: int, num_of_years: int) -> QFDataArray:
+    dates = pd.bdate_range(end="2019-01-01", periods=num_of_years * 252)
+    tickers = ["Ticker{} Equity".format(i) for i in range(num_of_tickers)]
+    values = np.random.rand(len(dates), len(tickers), len(FIELDS))
+    values[np.random.rand(*values.shape) < 0.05] = np.nan
+
+    return QFDataArray.create(dates, tickers, FIELDS, values)
+
+
+def send_request(session: SessionMock, data_array: QFDataArray):
+    request = session.createRequest("HistoricalDataRequest")
+    for ticker in data_array.tickers.values:
+        request.getElement("securities").appendValue(ticker)
+    for field in FIELDS:
+        request.getElement("fields").appendValue(field)
+    request.set("startDate", data_array.dates.values[0])
+    request.set("endDate", data_array.dates.values[-1])
+    session.sendRequest(request)
+
+
+def get_float_or_nan(element, field_name):
+    if element.hasElement(field_name):
+        return element.getElementAsFloat(field_name)
+    return float("nan")
+
+
+def previous_decoding(session: SessionMock):
+    tickers_data_dict = dict()
+    for event in get_response_events(session):
+        security_data = extract_security_data(event)
+        ticker = BloombergTicker.from_string(security_data.getElementAsString(SECURITY))
+
+        field_data_array = security_data.getElement(FIELD_DATA)
+        field_data_list = [field_data_array.getValueAsElement(i) for i in range(field_data_array.numValues())]
+        dates = [pd.to_datetime(x.getElementAsDatetime(DATE)) for x in field_data_list]
+
+        data = np.empty((len(dates), len(FIELDS)))
+        data[:] = np.nan
+        dates_fields_values = pd.DataFrame(data, index=dates, columns=FIELDS)
+
+        for field_name in FIELDS:
+            dates_fields_values.loc[:, field_name] = [
+                get_float_or_nan(data_of_date_elem, field_name) for data_of_date_elem in field_data_list]
+
+        tickers_data_dict[ticker] = dates_fields_values
+
+    return tickers_data_dict
+
+
+def preallocated_decoding(session: SessionMock):
+    field_names = [blpapi.Name(field) for field in FIELDS]
+    securities_data = dict()
+    for event in get_response_events(session):
+        security_data = extract_security_data(event)
+        dates, values = HistoricalDataProvider._decode_field_data(security_data.getElement(FIELD_DATA), field_names)
+        securities_data[security_data.getElementAsString(SECURITY)] = [(dates, values)]
+
+    return securities_data
+
+
+def time_decoding(decode, data_array: QFDataArray) -> float:
+    session = SessionMock(data_array)
+    send_request(session, data_array)
+
+    start_time = perf_counter()
+    decode(session)
+    return perf_counter() - start_time
+
+
+def time_assembly(data_array: QFDataArray) -> float:
+    session = SessionMock(data_array)
+    send_request(session, data_array)
+    securities_data = preallocated_decoding(session)
+
+    start_time = perf_counter()
+    HistoricalDataProvider._create_data_array(securities_data, list(data_array.tickers.values), FIELDS)
+    return perf_counter() - start_time
+
+
+def main():
+    num_of_years = 5
+
+    print("{:>8s} {:>18s} {:>18s} {:>10s} {:>14s}".format(
+        "Tickers", "previous [ms]", "preallocated [ms]", "Speedup", "assembly [ms]"))
+    for num_of_tickers in [1, 20, 100]:
+        data_array = create_data_array(num_of_tickers, num_of_years)
+
+        previous_time = time_decoding(previous_decoding, data_array)
+        preallocated_time = time_decoding(preallocated_decoding, data_array)
+        assembly_time = time_assembly(data_array)
+
+        print("{:>8d} {:>18.1f} {:>18.1f} {:>9.1f}x {:>14.1f}".format(
+            num_of_tickers, previous_time * 1000, preallocated_time * 1000, previous_time / preallocated_time,
+            assembly_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
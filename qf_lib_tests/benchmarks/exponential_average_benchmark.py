@@ -0,0 +1,59 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the speed of the exponential average calculated with a Python loop (the previous implementation of
+QFSeries.exponential_average) and with the linear filter used by QFSeries/QFDataFrame.exponential_average.
+The loop is timed for a few columns only and the time for all the columns is extrapolated.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+def exponential_average_in_loop(series: pd.Series, lambda_coeff: float) -> pd.Series:
+    smoothed_series = series.copy(deep=True)
+    for i in range(1, len(series)):
+        smoothed_series.iloc[i] = lambda_coeff * series.iloc[i] + (1 - lambda_coeff) * smoothed_series.iloc[i - 1]
+    return smoothed_series
+
+
+def main():
+    num_of_rows = 252 * 10
+    num_of_loop_columns = 3
+    lambda_coeff = 0.94
+
+    print("{:>8s} {:>16s} {:>14s} {:>10s}".format("Columns", "loop [s] (est.)", "filter [s]", "Speedup"))
+    for num_of_columns in [10, 1000, 5000]:
+        data_frame = QFDataFrame(data=np.random.normal(0.0, 0.01, (num_of_rows, num_of_columns)),
+                                 index=pd.bdate_range(end="2019-01-01", periods=num_of_rows))
+
+        start_time = perf_counter()
+        for column in data_frame.columns[:num_of_loop_columns]:
+            exponential_average_in_loop(data_frame[column], lambda_coeff)
+        loop_time = (perf_counter() - start_time) / num_of_loop_columns * num_of_columns
+
+        start_time = perf_counter()
+        data_frame.exponential_average(lambda_coeff)
+        filter_time = perf_counter() - start_time
+
+        print("{:>8d} {:>16.3f} {:>14.4f} {:>9.0f}x".format(
+            num_of_columns, loop_time, filter_time, loop_time / filter_time))
+
+
+if __name__ == '__main__':
+    main()
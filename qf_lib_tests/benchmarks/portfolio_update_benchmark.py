@@ -0,0 +1,90 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the time of Portfolio.update() (valuation of the open positions kept in aligned arrays) with the previous
+implementation, which mapped every contract to a ticker and valued the positions one by one.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class _DataHandler(object):
+    def __init__(self, prices: pd.Series):
+        self.prices = prices
+
+    def get_last_available_price(self, tickers):
+        return self.prices
+
+
+def update_position_by_position(portfolio: Portfolio):
+    net_liquidation = portfolio.current_cash
+    gross_value_of_positions = 0
+
+    contract_to_ticker_dict = {
+        contract: portfolio.contract_ticker_mapper.contract_to_ticker(contract)
+        for contract in portfolio.open_positions_dict}
+    current_prices_series = portfolio.data_handler.get_last_available_price(
+        tickers=list(contract_to_ticker_dict.values()))
+
+    for contract, position in portfolio.open_positions_dict.items():
+        security_price = current_prices_series[contract_to_ticker_dict[contract]]
+        position.update_price(bid_price=security_price, ask_price=security_price)
+        net_liquidation += position.market_value
+        gross_value_of_positions += abs(position.market_value)
+
+    return net_liquidation
+
+
+def main():
+    number_of_updates = 50
+    print("{:>10s} {:>22s} {:>22s} {:>10s}".format("Positions", "position by position [ms]", "arrays [ms]", "Speedup"))
+
+    for number_of_positions in [10, 100, 1000, 5000]:
+        tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(number_of_positions)]
+        prices = pd.Series(np.random.uniform(10, 100, number_of_positions), index=tickers)
+
+        timer = SettableTimer(str_to_date("2018-01-01"))
+        portfolio = Portfolio(_DataHandler(prices), 1000000, timer, DummyBloombergContractTickerMapper())
+        for i in range(number_of_positions):
+            contract = Contract("Ticker{} Equity".format(i), security_type="STK", exchange="NYSE")
+            portfolio.transact_transaction(Transaction(timer.now(), contract, 10, 50.0, 0.0))
+
+        start_time = perf_counter()
+        for _ in range(number_of_updates):
+            update_position_by_position(portfolio)
+        loop_time = (perf_counter() - start_time) / number_of_updates * 1000
+
+        start_time = perf_counter()
+        for _ in range(number_of_updates):
+            portfolio.update()
+        arrays_time = (perf_counter() - start_time) / number_of_updates * 1000
+
+        print("{:>10d} {:>22.3f} {:>22.3f} {:>9.1f}x".format(
+            number_of_positions, loop_time, arrays_time, loop_time / arrays_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the time of looking up the positions in the signal-to-order phase of the AlphaModelStrategy: current
+exposure of every ticker (AlphaModelStrategy), existing quantity for every signal (PositionSizer) and target orders
+(OrderFactory). The previous implementation, which scanned the list of positions for every contract, is compared
+with the snapshot of positions keyed by contracts, returned by BacktestBroker.get_positions_by_contract().
+"""
+from time import perf_counter
+
+from mockito import mock
+
+from qf_lib.backtesting.alpha_model.alpha_model_strategy import AlphaModelStrategy
+from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+def look_up_positions_in_lists(broker: BacktestBroker, contracts):
+    current_positions = broker.get_positions()
+    for contract in contracts:
+        # AlphaModelStrategy._get_current_exposure()
+        [position.quantity() for position in current_positions if position.contract() == contract]
+
+    for contract in contracts:
+        # PositionSizer._get_existing_position_quantity()
+        positions = broker.get_positions()
+        next((position.quantity() for position in positions if position.contract() == contract), 0)
+
+    # OrderFactory.target_orders()
+    contract_to_positions = {position.contract(): position for position in broker.get_positions()}
+    for contract in contracts:
+        contract_to_positions.get(contract, None)
+
+
+def look_up_positions_in_snapshot(broker: BacktestBroker, contracts):
+    current_positions = broker.get_positions_by_contract()
+    for contract in contracts:
+        AlphaModelStrategy._get_current_exposure(contract, current_positions)
+
+    for contract in contracts:
+        broker.get_positions_by_contract().get(contract)
+
+    contract_to_positions = broker.get_positions_by_contract()
+    for contract in contracts:
+        contract_to_positions.get(contract, None)
+
+
+def main():
+    print("{:>8s} {:>14s} {:>14s} {:>10s}".format("Tickers", "lists [s]", "snapshot [s]", "Speedup"))
+
+    for number_of_tickers in [100, 1000, 5000]:
+        timer = SettableTimer(str_to_date("2018-01-01"))
+        portfolio = Portfolio(mock(), 1000000, timer, DummyBloombergContractTickerMapper())
+        broker = BacktestBroker(portfolio, mock())
+
+        contracts = [Contract("Ticker{} Equity".format(i), security_type="STK", exchange="NYSE")
+                     for i in range(number_of_tickers)]
+        for contract in contracts[::2]:  # positions are open for half of the tickers
+            portfolio.transact_transaction(Transaction(timer.now(), contract, 10, 50.0, 0.0))
+
+        start_time = perf_counter()
+        look_up_positions_in_lists(broker, contracts)
+        lists_time = perf_counter() - start_time
+
+        start_time = perf_counter()
+        look_up_positions_in_snapshot(broker, contracts)
+        snapshot_time = perf_counter() - start_time
+
+        print("{:>8d} {:>14.4f} {:>14.4f} {:>9.0f}x".format(
+            number_of_tickers, lists_time, snapshot_time, lists_time / snapshot_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the speed of calculating the rolling volatility window by window (with get_volatility) and with the O(n)
+rolling kernels, for 20-year daily histories. The kernels are also timed for all the assets at once
+(QFDataFrame.rolling_window with the "std" reduction).
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.common.utils.volatility.rolling_volatility import rolling_volatility
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.series.log_returns_series import LogReturnsSeries
+
+
+def rolling_volatility_window_by_window(returns_tms, frequency, window_size):
+    volatility_values = [get_volatility(returns_tms[i - window_size + 1:i + 1], frequency)
+                         for i in range(window_size - 1, len(returns_tms))]
+    return pd.Series(data=volatility_values, index=returns_tms.index[window_size - 1:])
+
+
+def main():
+    num_of_years = 20
+    window_size = 63
+    dates = pd.bdate_range(end="2019-01-01", periods=num_of_years * 252)
+    returns_tms = LogReturnsSeries(data=np.random.normal(0.0, 0.01, len(dates)), index=dates)
+
+    start_time = perf_counter()
+    rolling_volatility_window_by_window(returns_tms, Frequency.DAILY, window_size)
+    loop_time = perf_counter() - start_time
+
+    start_time = perf_counter()
+    rolling_volatility(returns_tms, Frequency.DAILY, window_size=window_size)
+    kernel_time = perf_counter() - start_time
+
+    print("Single asset, {} years: window by window {:.3f} s, rolling kernel {:.5f} s, speedup {:.0f}x".format(
+        num_of_years, loop_time, kernel_time, loop_time / kernel_time))
+
+    num_of_assets = 1000
+    returns_df = QFDataFrame(data=np.random.normal(0.0, 0.01, (len(dates), num_of_assets)), index=dates)
+    start_time = perf_counter()
+    returns_df.rolling_window(window_size, "std")
+    print("{} assets, {} years: rolling kernel {:.3f} s (window by window: ~{:.0f} s)".format(
+        num_of_assets, num_of_years, perf_counter() - start_time, loop_time * num_of_assets))
+
+
+if __name__ == '__main__':
+    main()
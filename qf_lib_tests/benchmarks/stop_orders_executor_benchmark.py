@@ -0,0 +1,101 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the time of evaluating the open stop orders against today's bars in StopOrdersExecutor (one Sell Stop
+per position). The previous implementation, which looked up the bar and calculated the fill price order by order,
+is compared with the evaluation of all the orders at once.
+"""
+from itertools import count
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from mockito import mock, when
+
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.execution_handler.stop_orders_executor import StopOrdersExecutor
+from qf_lib.backtesting.order.execution_style import StopOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+def evaluate_order_by_order(open_orders, tickers, current_bars_df):
+    no_slippage_fill_prices_list = []
+    to_be_executed_orders = []
+    unexecuted_stop_orders_data_dict = {}
+
+    for order, ticker in zip(open_orders, tickers):
+        current_bar = current_bars_df.loc[ticker, :]
+        price_bar = current_bar.loc[[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]]
+
+        no_slippage_fill_price = None
+        if not price_bar.isnull().values.any():
+            stop_price = order.execution_style.stop_price
+            if current_bar.loc[PriceField.Open] <= stop_price:
+                no_slippage_fill_price = current_bar.loc[PriceField.Open]
+            elif current_bar[PriceField.Low] <= stop_price:
+                no_slippage_fill_price = stop_price
+
+        if no_slippage_fill_price is None:
+            if order.time_in_force == TimeInForce.GTC:
+                unexecuted_stop_orders_data_dict[order.id] = order
+        else:
+            to_be_executed_orders.append(order)
+            no_slippage_fill_prices_list.append(no_slippage_fill_price)
+
+    return no_slippage_fill_prices_list, to_be_executed_orders, unexecuted_stop_orders_data_dict
+
+
+def main():
+    print("{:>8s} {:>14s} {:>14s} {:>10s}".format("Orders", "loop [s]", "arrays [s]", "Speedup"))
+    random_state = np.random.RandomState(3)
+    mapper = DummyBloombergContractTickerMapper()
+
+    for number_of_orders in [100, 1000, 5000]:
+        tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(number_of_orders)]
+        data_handler = mock()
+        when(data_handler).get_last_available_price(...).thenReturn(pd.Series(data=100.0, index=pd.Index(tickers)))
+
+        open_prices = 100.0 + 5 * random_state.randn(number_of_orders)
+        current_bars_df = pd.DataFrame(index=pd.Index(tickers), columns=PriceField.ohlcv(), data=np.column_stack(
+            [open_prices, open_prices + 2.0, open_prices - 2.0, open_prices, np.full(number_of_orders, 1e6)]))
+        when(data_handler).get_bar_for_today(...).thenReturn(current_bars_df)
+
+        executor = StopOrdersExecutor(mapper, data_handler, mock(), mock(), SettableTimer(str_to_date("2018-01-01")),
+                                      count(start=1), mock(), mock())
+        executor.accept_orders([Order(mapper.ticker_to_contract(ticker), -10, StopOrder(95.0), TimeInForce.GTC)
+                                for ticker in tickers])
+        open_orders = executor.get_open_orders()
+
+        start_time = perf_counter()
+        expected_result = evaluate_order_by_order(open_orders, tickers, current_bars_df)
+        loop_time = perf_counter() - start_time
+
+        start_time = perf_counter()
+        actual_result = executor._get_orders_with_fill_prices_without_slippage(open_orders, tickers)
+        arrays_time = perf_counter() - start_time
+
+        assert expected_result[0] == actual_result[0] and expected_result[1] == actual_result[1]
+        print("{:>8d} {:>14.4f} {:>14.4f} {:>9.0f}x".format(
+            number_of_orders, loop_time, arrays_time, loop_time / arrays_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the speed of tickers_dict_to_data_array with the previous implementation, which converted every ticker's
+DataFrame to xarray (to_xarray().to_array()) and concatenated the results with QFDataArray.concat.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES, FIELDS, TICKERS
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.helpers import tickers_dict_to_data_array
+
+FIELDS_NAMES = ["PX_OPEN", "PX_HIGH", "PX_LOW", "PX_LAST", "PX_VOLUME"]
+
+
+def create_tickers_data_dict(num_of_tickers: int, num_of_years: int):
+    dates = pd.bdate_range(end="2019-01-01", periods=num_of_years * 252)
+    tickers_data_dict = dict()
+    for i in range(num_of_tickers):
+        # some of the tickers have a shorter history
+        ticker_dates = dates[(i % 5) * 10:]
+        tickers_data_dict[BloombergTicker("Ticker{} Equity".format(i))] = pd.DataFrame(
+            np.random.rand(len(ticker_dates), len(FIELDS_NAMES)), index=ticker_dates, columns=FIELDS_NAMES)
+
+    return tickers_data_dict
+
+
+def previous_tickers_dict_to_data_array(tickers_data_dict, requested_tickers, requested_fields):
+    tickers = []
+    data_arrays = []
+    for ticker, df in tickers_data_dict.items():
+        df.index.name = DATES
+        if df.empty:
+            continue
+
+        data_array = df.to_xarray()
+        data_array = data_array.to_array(dim=FIELDS, name=ticker)
+        data_array = data_array.transpose(DATES, FIELDS)
+
+        tickers.append(ticker)
+        data_arrays.append(data_array)
+
+    if not data_arrays:
+        return QFDataArray.create(dates=[], tickers=requested_tickers, fields=requested_fields)
+
+    result = QFDataArray.concat(data_arrays, dim=pd.Index(tickers, name=TICKERS))
+    result.name = None
+    return result
+
+
+def time_conversion(convert, tickers_data_dict) -> float:
+    tickers = list(tickers_data_dict.keys())
+    start_time = perf_counter()
+    convert(tickers_data_dict, tickers, FIELDS_NAMES)
+    return perf_counter() - start_time
+
+
+def main():
+    num_of_years = 10
+
+    print("{:>8s} {:>16s} {:>18s} {:>10s}".format("Tickers", "previous [ms]", "preallocated [ms]", "Speedup"))
+    for num_of_tickers in [10, 300, 3000]:
+        tickers_data_dict = create_tickers_data_dict(num_of_tickers, num_of_years)
+
+        previous_time = time_conversion(previous_tickers_dict_to_data_array, tickers_data_dict)
+        preallocated_time = time_conversion(tickers_dict_to_data_array, tickers_data_dict)
+
+        print("{:>8d} {:>16.1f} {:>18.1f} {:>9.1f}x".format(
+            num_of_tickers, previous_time * 1000, preallocated_time * 1000, previous_time / preallocated_time))
+
+
+if __name__ == '__main__':
+    main()
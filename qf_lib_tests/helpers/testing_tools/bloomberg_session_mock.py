@@ -0,0 +1,147 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Mock of the blpapi Session answering HistoricalDataRequests with the data of a given QFDataArray. Responses have
+the same structure as the ones sent by Bloomberg: one PARTIAL_RESPONSE event per security and the final RESPONSE
+event (for the last security of the request).
+"""
+from collections import deque
+from typing import Dict, List
+
+import blpapi
+import numpy as np
+import pandas as pd
+
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.bloomberg.bloomberg_names import SECURITIES, FIELDS, START_DATE, END_DATE, SECURITY, \
+    SECURITY_DATA, SECURITY_ERROR, FIELD_DATA, DATE
+
+
+class ElementMock(object):
+    """ Element with sub-elements (accessed by names) and/or an array of values (accessed by positions). """
+
+    def __init__(self, elements: Dict = None, values: List = None):
+        self._elements = {str(name): value for name, value in (elements or dict()).items()}
+        self._values = values if values is not None else []
+
+    def hasElement(self, name):
+        return str(name) in self._elements
+
+    def getElement(self, name):
+        return self._elements[str(name)]
+
+    def getElementAsString(self, name):
+        return self._elements[str(name)]
+
+    def getElementAsFloat(self, name):
+        return self._elements[str(name)]
+
+    def getElementAsDatetime(self, name):
+        return self._elements[str(name)]
+
+    def numValues(self):
+        return len(self._values)
+
+    def getValueAsElement(self, index):
+        return self._values[index]
+
+    def appendValue(self, value):
+        self._values.append(value)
+
+    def asElement(self):
+        return self
+
+    def __str__(self):
+        return str(self._elements)
+
+
+class EventMock(object):
+    def __init__(self, event_type, messages: List[ElementMock]):
+        self._event_type = event_type
+        self._messages = messages
+
+    def eventType(self):
+        return self._event_type
+
+    def __iter__(self):
+        return iter(self._messages)
+
+
+class RequestMock(ElementMock):
+    def __init__(self):
+        super().__init__({SECURITIES: ElementMock(), FIELDS: ElementMock(), "overrides": ElementMock()})
+        self.parameters = dict()
+
+    def set(self, name, value):
+        self.parameters[str(name)] = value
+
+
+class SessionMock(object):
+    """
+    Answers HistoricalDataRequests with the values of the data_array (dates x ticker strings x fields). NaN values
+    are not sent (as Bloomberg doesn't send missing fields), and tickers missing in the data_array get the security
+    error. Responses of all the sent requests are queued and the events are returned in the order of requests.
+    """
+
+    def __init__(self, data_array: QFDataArray):
+        self._data_array = data_array
+        self._tickers = list(data_array.tickers.values)
+        self._fields = list(data_array.fields.values)
+        self._dates = pd.DatetimeIndex(data_array.dates.values)
+        self._events = deque()
+
+        self.sent_requests = []  # type: List[RequestMock]
+        self.correlation_ids = []
+
+    def getService(self, _):
+        return self
+
+    def createRequest(self, _):
+        return RequestMock()
+
+    def sendRequest(self, request: RequestMock, correlationId=None):
+        self.sent_requests.append(request)
+        self.correlation_ids.append(correlationId)
+
+        start_date = pd.Timestamp(request.parameters[str(START_DATE)])
+        end_date = pd.Timestamp(request.parameters[str(END_DATE)])
+        dates_slice = slice(self._dates.searchsorted(start_date), self._dates.searchsorted(end_date, side="right"))
+
+        securities = request.getElement(SECURITIES)._values
+        fields = request.getElement(FIELDS)._values
+        for i, security in enumerate(securities):
+            event_type = blpapi.event.Event.RESPONSE if i == len(securities) - 1 \
+                else blpapi.event.Event.PARTIAL_RESPONSE
+            message = ElementMock({SECURITY_DATA: self._security_data(security, fields, dates_slice)})
+            self._events.append(EventMock(event_type, [message]))
+
+    def nextEvent(self, timeout=0):
+        return self._events.popleft()
+
+    def _security_data(self, security: str, fields: List[str], dates_slice: slice) -> ElementMock:
+        if security not in self._tickers:
+            return ElementMock({SECURITY: security, SECURITY_ERROR: ElementMock()})
+
+        ticker_index = self._tickers.index(security)
+        fields_indices = [self._fields.index(field) for field in fields]
+        values = self._data_array.values[dates_slice, ticker_index, :][:, fields_indices]
+
+        field_data = []
+        for date, values_of_date in zip(self._dates[dates_slice], values):
+            date_elements = {DATE: date.to_pydatetime().date()}
+            date_elements.update({field: value for field, value in zip(fields, values_of_date) if not np.isnan(value)})
+            field_data.append(ElementMock(date_elements))
+
+        return ElementMock({SECURITY: security, FIELD_DATA: ElementMock(values=field_data)})
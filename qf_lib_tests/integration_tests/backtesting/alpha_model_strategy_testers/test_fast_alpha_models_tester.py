@@ -24,7 +24,9 @@ from pandas.util.testing import assert_frame_equal, assert_series_equal
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.alpha_model.alpha_model_factory import AlphaModelFactory
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.backtesting.fast_alpha_model_tester.fast_alpha_models_tester import FastAlphaModelTester
+from qf_lib.backtesting.fast_alpha_model_tester.fast_data_handler import FastDataHandler
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.enums.trade_field import TradeField
 from qf_lib.common.tickers.tickers import QuandlTicker, Ticker
@@ -167,6 +169,72 @@ class TestFastAlphaModelsTester(TestCase):
         ])
         assert_series_equal(expected_returns, second_elem.returns_tms)
 
+    def test_vectorised_exposures(self):
+        parameter_lists = ((10, Exposure.LONG), (5, Exposure.SHORT))
+
+        tester = FastAlphaModelTester(self.alpha_model_type, parameter_lists, self.tickers,
+                                      self.test_start_date, self.test_end_date, self._price_provider_mock,
+                                      self.timer, self._alpha_model_factory)
+        self.assertFalse(tester.check_vectorised_exposures())
+        backtest_summary_elements = tester.test_alpha_models().elements_list
+
+        # the second model can't calculate the exposures of the first dates in the vectorised way
+        for model_type in (VectorisedDummyAlphaModel, PartiallyVectorisedDummyAlphaModel):
+            vectorised_tester = FastAlphaModelTester(model_type, parameter_lists, self.tickers,
+                                                     self.test_start_date, self.test_end_date,
+                                                     self._price_provider_mock, self.timer, self._alpha_model_factory)
+            self.assertTrue(vectorised_tester.check_vectorised_exposures())
+
+            vectorised_backtest_summary_elements = vectorised_tester.test_alpha_models().elements_list
+            for elem, vectorised_elem in zip(backtest_summary_elements, vectorised_backtest_summary_elements):
+                self.assertEqual(elem.model_parameters, vectorised_elem.model_parameters)
+                assert_frame_equal(elem.trades_df, vectorised_elem.trades_df)
+                assert_series_equal(elem.returns_tms, vectorised_elem.returns_tms)
+
+    def test_parallel_testing_of_parameter_sets(self):
+        parameter_lists = ((10, Exposure.LONG), (5, Exposure.SHORT), (3, Exposure.LONG), (2, Exposure.SHORT))
+        data_handler = FastDataHandler(self._price_provider_mock, self.timer)
+
+        for model_type in (DummyAlphaModel, VectorisedDummyAlphaModel):
+            self._assert_parallel_testing_gives_the_same_results(
+                model_type, parameter_lists, data_handler, self._alpha_model_factory)
+
+    def test_parallel_testing_of_model_looking_back_before_start_date(self):
+        # the first dates of the backtest need the prices from before the start date
+        parameter_lists = ((2,), (4,), (6,), (8,))
+        # FastDataHandler.historical_price() asks for the prices from twice as many days as the bars needed
+        data_provider = PresetDataProvider(self._mocked_prices_arr, str_to_date("2014-12-01"), self.data_end_date)
+        data_handler = FastDataHandler(data_provider, self.timer)
+        alpha_model_factory = AlphaModelFactory(data_handler)
+
+        self._assert_parallel_testing_gives_the_same_results(
+            LookbackAlphaModel, parameter_lists, data_handler, alpha_model_factory)
+
+    def test_parallel_testing_requires_preset_data_provider(self):
+        with self.assertRaises(AssertionError):
+            FastAlphaModelTester(DummyAlphaModel, ((10, Exposure.LONG),), self.tickers, self.test_start_date,
+                                 self.test_end_date, self._price_provider_mock, self.timer, self._alpha_model_factory,
+                                 number_of_workers=2)
+
+    def _assert_parallel_testing_gives_the_same_results(self, model_type, parameter_lists, data_handler,
+                                                        alpha_model_factory):
+        tester = FastAlphaModelTester(model_type, parameter_lists, self.tickers,
+                                      self.test_start_date, self.test_end_date, data_handler,
+                                      self.timer, alpha_model_factory)
+        parallel_tester = FastAlphaModelTester(model_type, parameter_lists, self.tickers,
+                                               self.test_start_date, self.test_end_date,
+                                               data_handler, self.timer, alpha_model_factory,
+                                               number_of_workers=2)
+
+        backtest_summary_elements = tester.test_alpha_models().elements_list
+        parallel_backtest_summary_elements = parallel_tester.test_alpha_models().elements_list
+
+        self.assertEqual(len(parameter_lists), len(parallel_backtest_summary_elements))
+        for elem, parallel_elem in zip(backtest_summary_elements, parallel_backtest_summary_elements):
+            self.assertEqual(elem.model_parameters, parallel_elem.model_parameters)
+            assert_frame_equal(elem.trades_df, parallel_elem.trades_df)
+            assert_series_equal(elem.returns_tms, parallel_elem.returns_tms)
+
 
 class DummyAlphaModel(AlphaModel):
     def __init__(self, period_length: int, first_suggested_exposure: Exposure, timer: Timer):
@@ -196,14 +264,44 @@ class DummyAlphaModel(AlphaModel):
         return exposure
 
 
+class VectorisedDummyAlphaModel(DummyAlphaModel):
+    def calculate_exposures_vectorised(self, prices_data_array: QFDataArray) -> pd.DataFrame:
+        exposure_values = [exposure.value for exposure in self._exposures]
+        tickers = prices_data_array.tickers.values
+        return pd.DataFrame(data=np.tile(np.array(exposure_values)[:, np.newaxis], (1, len(tickers))),
+                            index=self._exposures.index, columns=tickers)
+
+
+class PartiallyVectorisedDummyAlphaModel(VectorisedDummyAlphaModel):
+    def calculate_exposures_vectorised(self, prices_data_array: QFDataArray) -> pd.DataFrame:
+        exposures_df = super().calculate_exposures_vectorised(prices_data_array).astype(np.float64)
+        exposures_df.iloc[:3] = np.nan
+        return exposures_df
+
+
+class LookbackAlphaModel(AlphaModel):
+    """ Suggests LONG if the close price went up during the last nr_of_bars bars, SHORT if it went down. """
+
+    def __init__(self, nr_of_bars: int, risk_estimation_factor: float, data_handler: DataHandler):
+        super().__init__(risk_estimation_factor, data_handler)
+        self.nr_of_bars = nr_of_bars
+
+    def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure) -> Exposure:
+        close_prices = self.data_handler.historical_price(ticker, PriceField.Close, self.nr_of_bars + 1)
+        if len(close_prices) <= self.nr_of_bars:
+            return Exposure.OUT
+
+        return Exposure.LONG if close_prices.iloc[-1] > close_prices.iloc[0] else Exposure.SHORT
+
+
 class DummyAlphaModelFactory(object):
     def __init__(self, timer: Timer):
         self.timer = timer
 
     def make_model(self, model_type, *params):
-        assert model_type == DummyAlphaModel
+        assert model_type in (DummyAlphaModel, VectorisedDummyAlphaModel, PartiallyVectorisedDummyAlphaModel)
         period_length, first_suggested_exposure = params
-        return DummyAlphaModel(period_length, first_suggested_exposure, self.timer)
+        return model_type(period_length, first_suggested_exposure, self.timer)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,92 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.alpha_model_factory import AlphaModelFactory
+from qf_lib.backtesting.fast_alpha_model_tester.fast_alpha_models_tester import FastAlphaModelTester
+from qf_lib.backtesting.fast_alpha_model_tester.fast_data_handler import FastDataHandler
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import QuandlTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+try:
+    from demo_scripts.backtester.moving_average_alpha_model import MovingAverageAlphaModel
+    talib_missing = False
+except ImportError:
+    talib_missing = True
+
+
+@unittest.skipIf(talib_missing, "Couldn't import talib library")
+class TestMovingAverageVectorisedExposures(TestCase):
+    tickers = [QuandlTicker("AAPL", "WIKI"), QuandlTicker("IBM", "WIKI"), QuandlTicker("MSFT", "WIKI")]
+
+    data_start_date = str_to_date("2014-10-01")
+    test_start_date = str_to_date("2015-01-01")
+    test_end_date = str_to_date("2015-06-30")
+
+    def setUp(self):
+        prices_data_array = self._make_random_walk_data_array(np.random.RandomState(5))
+        data_provider = PresetDataProvider(prices_data_array, self.data_start_date, self.test_end_date)
+
+        self.timer = SettableTimer()
+        self.data_handler = FastDataHandler(data_provider, self.timer)
+        self.alpha_model_factory = AlphaModelFactory(self.data_handler)
+
+    def _make_random_walk_data_array(self, random_state: np.random.RandomState) -> QFDataArray:
+        dates = pd.bdate_range(start=self.data_start_date, end=self.test_end_date)
+        fields = PriceField.ohlcv()
+
+        log_returns = random_state.normal(0.0, 0.02, (len(dates), len(self.tickers)))
+        close_prices = 100.0 * np.exp(np.cumsum(log_returns, axis=0))
+
+        open_prices = close_prices * (1 + random_state.normal(0.0, 0.005, close_prices.shape))
+
+        values = np.empty((len(dates), len(self.tickers), len(fields)))
+        values[:, :, fields.index(PriceField.Open)] = open_prices
+        values[:, :, fields.index(PriceField.High)] = close_prices * 1.02
+        values[:, :, fields.index(PriceField.Low)] = close_prices * 0.98
+        values[:, :, fields.index(PriceField.Close)] = close_prices
+        values[:, :, fields.index(PriceField.Volume)] = 1000.0
+
+        return QFDataArray.create(dates, self.tickers, fields, data=values)
+
+    def test_vectorised_exposures_are_equal_to_exposures_calculated_date_by_date(self):
+        parameter_sets = ((5, 20), (3, 10), (10, 30))
+        tester = FastAlphaModelTester(MovingAverageAlphaModel, parameter_sets, self.tickers,
+                                      self.test_start_date, self.test_end_date, self.data_handler, self.timer,
+                                      self.alpha_model_factory, data_history_start_date=self.data_start_date)
+
+        self.assertTrue(tester.check_vectorised_exposures())
+
+    def test_vectorised_exposures_without_history_before_start_date(self):
+        # on the first dates of the backtest the windows of prices aren't full, so the exposures of these dates
+        # are calculated date by date
+        parameter_sets = ((5, 20), (3, 10))
+        tester = FastAlphaModelTester(MovingAverageAlphaModel, parameter_sets, self.tickers,
+                                      self.test_start_date, self.test_end_date, self.data_handler, self.timer,
+                                      self.alpha_model_factory)
+
+        self.assertTrue(tester.check_vectorised_exposures())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
+from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.alpha_model.feature_cache import FeatureCache
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker, Ticker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+
+
+class TestFeatureCache(TestCase):
+    def setUp(self):
+        self.ticker = BloombergTicker("AAPL US Equity")
+        self.timer = SettableTimer(datetime(2018, 1, 2, 20))
+
+        self.prices_df = PricesDataFrame(
+            data={PriceField.High: [11.0, 12.0, 13.0], PriceField.Low: [9.0, 10.0, 11.0],
+                  PriceField.Close: [10.0, 11.0, 12.0]},
+            index=pd.bdate_range(end='2018-01-02', periods=3),
+            columns=[PriceField.High, PriceField.Low, PriceField.Close])
+
+        self.data_handler = Mock(spec=DataHandler)
+        self.data_handler.timer = self.timer
+        self.data_handler.historical_price.side_effect = lambda ticker, fields, nr_of_bars: self.prices_df.copy()
+
+        self.feature_cache = FeatureCache(self.data_handler, max_size=3)
+
+    def test_hits_and_misses(self):
+        calculate_feature = Mock(return_value=1.0)
+
+        self.assertEqual(1.0, self.feature_cache.get_feature(self.ticker, "feature", (5,), calculate_feature))
+        self.assertEqual(1.0, self.feature_cache.get_feature(self.ticker, "feature", (5,), calculate_feature))
+        self.feature_cache.get_feature(self.ticker, "feature", (10,), calculate_feature)
+        self.feature_cache.get_feature(BloombergTicker("IBM US Equity"), "feature", (5,), calculate_feature)
+
+        self.assertEqual(3, calculate_feature.call_count)
+        self.assertEqual(1, self.feature_cache.hits)
+        self.assertEqual(3, self.feature_cache.misses)
+
+    def test_features_depend_on_time(self):
+        calculate_feature = Mock(return_value=1.0)
+
+        self.feature_cache.get_feature(self.ticker, "feature", (5,), calculate_feature)
+        self.timer.set_current_time(datetime(2018, 1, 3, 20))
+        self.feature_cache.get_feature(self.ticker, "feature", (5,), calculate_feature)
+
+        self.assertEqual(2, calculate_feature.call_count)
+        self.assertEqual(0, self.feature_cache.hits)
+
+    def test_least_recently_used_features_are_evicted(self):
+        for period in (1, 2, 3):
+            self.feature_cache.get_feature(self.ticker, "feature", (period,), lambda: period)
+        self.feature_cache.get_feature(self.ticker, "feature", (1,), Mock())  # feature 1 is used again
+        self.feature_cache.get_feature(self.ticker, "feature", (4,), lambda: 4)
+
+        self.assertEqual(3, self.feature_cache.size)
+
+        calculate_feature = Mock(return_value=2)
+        self.feature_cache.get_feature(self.ticker, "feature", (1,), calculate_feature)
+        self.feature_cache.get_feature(self.ticker, "feature", (2,), calculate_feature)
+        self.assertEqual(1, calculate_feature.call_count)
+
+    def test_historical_price_returns_copy(self):
+        fields = [PriceField.High, PriceField.Low, PriceField.Close]
+        prices_df = self.feature_cache.historical_price(self.ticker, fields, 3)
+        prices_df.iloc[:, :] = 0.0
+
+        prices_df = self.feature_cache.historical_price(self.ticker, fields, 3)
+        self.assertEqual(12.0, prices_df.loc[:, PriceField.Close].iloc[-1])
+        self.assertEqual(1, self.data_handler.historical_price.call_count)
+        self.assertEqual(1, self.feature_cache.hits)
+
+    def test_atr_is_shared_by_alpha_models(self):
+        first_model = _DummyAlphaModel(1.0, self.data_handler)
+        second_model = _DummyAlphaModel(2.0, self.data_handler)
+        first_model.feature_cache = self.feature_cache
+        second_model.feature_cache = self.feature_cache
+
+        first_fraction_at_risk = first_model.calculate_fraction_at_risk(self.ticker)
+        second_fraction_at_risk = second_model.calculate_fraction_at_risk(self.ticker)
+
+        self.assertAlmostEqual(first_fraction_at_risk * 2, second_fraction_at_risk)
+        self.assertEqual(1, self.data_handler.historical_price.call_count)
+        self.assertEqual(1, self.feature_cache.hits)
+
+        model_without_cache = _DummyAlphaModel(1.0, self.data_handler)
+        self.assertAlmostEqual(first_fraction_at_risk, model_without_cache.calculate_fraction_at_risk(self.ticker))
+        self.assertEqual(2, self.data_handler.historical_price.call_count)
+
+    def test_clear(self):
+        self.feature_cache.get_feature(self.ticker, "feature", (5,), lambda: 1.0)
+        self.feature_cache.clear()
+
+        self.assertEqual(0, self.feature_cache.size)
+        self.assertEqual(0, self.feature_cache.misses)
+
+
+class _DummyAlphaModel(AlphaModel):
+    def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure) -> Exposure:
+        return Exposure.LONG
+
+
+if __name__ == '__main__':
+    unittest.main()
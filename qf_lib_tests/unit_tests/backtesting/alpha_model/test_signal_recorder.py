@@ -0,0 +1,99 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import date
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.alpha_model.signal import Signal
+from qf_lib.backtesting.alpha_model.signal_recorder import SignalRecorder
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class _FirstModel(object):
+    pass
+
+
+class _SecondModel(object):
+    pass
+
+
+class TestSignalRecorder(TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(11)
+        self.models = [_FirstModel(), _SecondModel()]
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(5)]
+        self.dates = [date(2018, 1, day) for day in range(1, 11)]
+
+        self.signals_per_date = []
+        for i, signal_date in enumerate(self.dates):
+            signals = []
+            # a new ticker appears every other day
+            for ticker in self.tickers[:2 + i // 2]:
+                for model in self.models:
+                    exposure = list(Exposure)[random_state.randint(0, 3)]
+                    expected_move = None if random_state.rand() < 0.5 else random_state.rand()
+                    signals.append(Signal(ticker, exposure, random_state.rand(), random_state.rand(), expected_move,
+                                          alpha_model=model))
+            self.signals_per_date.append(signals)
+
+        self.expected_signals_df = QFDataFrame()
+        self.recorder = SignalRecorder(chunk_size=7)
+        for signal_date, signals in zip(self.dates, self.signals_per_date):
+            for signal in signals:
+                column = signal.ticker.as_string() + "@" + signal.alpha_model.__class__.__name__
+                self.expected_signals_df.loc[signal_date, column] = signal
+            self.recorder.record(signal_date, signals)
+
+    def test_signals_df(self):
+        signals_df = self.recorder.signals_df()
+        self.assertEqual(list(self.expected_signals_df.index), list(signals_df.index))
+        self.assertEqual(list(self.expected_signals_df.columns), list(signals_df.columns))
+
+        for column in signals_df.columns:
+            for expected_signal, signal in zip(self.expected_signals_df[column], signals_df[column]):
+                if not isinstance(expected_signal, Signal):
+                    self.assertTrue(pd.isnull(signal))
+                    continue
+                self.assertEqual(expected_signal.__dict__, signal.__dict__)
+
+    def test_exposures_and_fractions_at_risk(self):
+        expected_exposures_df = self.expected_signals_df.applymap(
+            lambda x: x.suggested_exposure.name if isinstance(x, Signal) else np.nan)
+        expected_fractions_df = self.expected_signals_df.applymap(
+            lambda x: x.fraction_at_risk if isinstance(x, Signal) else np.nan)
+
+        pd.testing.assert_frame_equal(expected_exposures_df, self.recorder.exposures_df(), check_dtype=False)
+        pd.testing.assert_frame_equal(expected_fractions_df.astype(float), self.recorder.fractions_at_risk_df())
+
+    def test_signals_df_is_cached_until_new_signals_are_recorded(self):
+        signals_df = self.recorder.signals_df()
+        self.assertIs(signals_df, self.recorder.signals_df())
+
+        self.recorder.record(date(2018, 1, 11), self.signals_per_date[-1])
+        self.assertEqual(len(self.dates) + 1, len(self.recorder.signals_df()))
+
+    def test_empty_recorder(self):
+        recorder = SignalRecorder()
+        self.assertEqual((0, 0), recorder.signals_df().shape)
+        self.assertEqual((0, 0), recorder.exposures_df().shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+from mockito import mock
+
+from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestBacktestBroker(TestCase):
+    def setUp(self):
+        self.timer = SettableTimer(str_to_date("2018-01-01"))
+        self.portfolio = Portfolio(mock(), 100000, self.timer, DummyBloombergContractTickerMapper())
+        self.broker = BacktestBroker(self.portfolio, mock())
+
+        self.apple = Contract("AAPL US Equity", security_type="STK", exchange="NYSE")
+        self.microsoft = Contract("MSFT US Equity", security_type="STK", exchange="NYSE")
+
+    def test_positions_by_contract(self):
+        self.assertEqual(0, len(self.broker.get_positions_by_contract()))
+
+        self._transact(self.apple, 10)
+        self._transact(self.microsoft, -5)
+        positions = self.broker.get_positions_by_contract()
+        self.assertEqual({self.apple, self.microsoft}, set(positions.keys()))
+        self.assertEqual(10, positions[self.apple].quantity())
+        self.assertEqual(-5, positions[self.microsoft].quantity())
+
+        with self.assertRaises(TypeError):
+            positions[self.apple] = None
+
+    def test_snapshot_is_reused_until_positions_change(self):
+        self._transact(self.apple, 10)
+        snapshot = self.broker.get_positions_by_contract()
+        self.assertIs(snapshot, self.broker.get_positions_by_contract())
+
+        # changing the quantity of an existing position doesn't create a new snapshot, the position is updated
+        self._transact(self.apple, 5)
+        self.assertIs(snapshot, self.broker.get_positions_by_contract())
+        self.assertEqual(15, snapshot[self.apple].quantity())
+
+        self._transact(self.microsoft, 5)
+        snapshot = self.broker.get_positions_by_contract()
+        self.assertIn(self.microsoft, snapshot)
+
+        self._transact(self.apple, -15)
+        self.assertNotIn(self.apple, self.broker.get_positions_by_contract())
+
+    def _transact(self, contract, quantity):
+        self.portfolio.transact_transaction(Transaction(self.timer.now(), contract, quantity, 100.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+from qf_lib.backtesting.events.backtest_event_loop import BacktestEventLoop
+from qf_lib.backtesting.events.end_trading_event.end_trading_event_listener import EndTradingEventListener
+from qf_lib.backtesting.events.event_manager import EventManager
+from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_event.after_market_close_event import AfterMarketCloseEvent
+from qf_lib.backtesting.events.time_event.before_market_open_event import BeforeMarketOpenEvent
+from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.regular_date_time_rule import RegularDateTimeRule
+from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+from qf_lib.backtesting.events.time_flow_controller import BacktestTimeFlowController
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class _MonthlyEvent(TimeEvent):
+    _trigger_time_rule = RegularDateTimeRule(day=1, hour=12, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def next_trigger_time(cls, now: datetime) -> datetime:
+        return cls._trigger_time_rule.next_trigger_time(now)
+
+    def notify(self, listener) -> None:
+        listener.on_monthly_event(self)
+
+
+class _RecordingListener(EndTradingEventListener):
+    def __init__(self, timer: SettableTimer, calls: list):
+        self.timer = timer
+        self.calls = calls
+
+    def _record(self, event):
+        self.calls.append((id(self), type(event).__name__, event.time, self.timer.now()))
+
+    def on_before_market_open(self, event):
+        self._record(event)
+
+    def on_market_open(self, event):
+        self._record(event)
+
+    def on_market_close(self, event):
+        self._record(event)
+
+    def on_after_market_close(self, event):
+        self._record(event)
+
+    def on_monthly_event(self, event):
+        self._record(event)
+
+    def on_end_trading_event(self, event):
+        self._record(event)
+
+
+class _SubscribingListener(_RecordingListener):
+    """ Subscribes to MarketCloseEvents in the middle of the backtest. """
+
+    def __init__(self, timer: SettableTimer, calls: list, scheduler, subscription_date: datetime):
+        super().__init__(timer, calls)
+        self.scheduler = scheduler
+        self.subscription_date = subscription_date
+
+    def on_market_open(self, event):
+        super().on_market_open(event)
+        if event.time.date() == self.subscription_date.date():
+            self.scheduler.subscribe(MarketCloseEvent, self)
+
+
+class TestBacktestEventLoop(TestCase):
+    def setUp(self):
+        self.start_date = str_to_date("2017-12-20")
+        self.end_date = str_to_date("2018-02-10")
+
+    def test_fast_loop_notifies_listeners_in_the_same_order(self):
+        def subscribe(scheduler, timer, calls):
+            first_listener = _RecordingListener(timer, calls)
+            second_listener = _RecordingListener(timer, calls)
+            scheduler.subscribe(BeforeMarketOpenEvent, first_listener)
+            scheduler.subscribe(MarketOpenEvent, second_listener)
+            scheduler.subscribe(MarketOpenEvent, first_listener)
+            scheduler.subscribe(AfterMarketCloseEvent, second_listener)
+            scheduler.subscribe(_MonthlyEvent, first_listener)
+            return [first_listener, second_listener]
+
+        self._assert_same_calls(subscribe, number_of_events=3 * 53 + 2)
+
+    def test_schedule_is_recomputed_after_new_subscription(self):
+        def subscribe(scheduler, timer, calls):
+            listener = _SubscribingListener(timer, calls, scheduler, str_to_date("2018-01-15"))
+            scheduler.subscribe(MarketOpenEvent, listener)
+            return [listener]
+
+        self._assert_same_calls(subscribe, number_of_events=53 + 27)
+
+    def test_fast_loop_is_not_applicable_with_listeners_of_all_events(self):
+        timer, notifiers, event_manager, time_flow_controller = self._create_components()
+        event_loop = BacktestEventLoop(time_flow_controller, notifiers)
+        self.assertTrue(event_loop.is_applicable())
+
+        notifiers.all_event_notifier.subscribe(_RecordingListener(timer, []))
+        self.assertFalse(event_loop.is_applicable())
+
+    def _assert_same_calls(self, subscribe, number_of_events):
+        expected_calls = []
+        timer, notifiers, event_manager, _ = self._create_components()
+        listeners = subscribe(notifiers.scheduler, timer, expected_calls)
+        notifiers.end_trading_event_notifier.subscribe(listeners[0])
+
+        while event_manager.continue_trading:
+            event_manager.dispatch_next_event()
+
+        actual_calls = []
+        timer, notifiers, event_manager, time_flow_controller = self._create_components()
+        listeners = subscribe(notifiers.scheduler, timer, actual_calls)
+        notifiers.end_trading_event_notifier.subscribe(listeners[0])
+
+        event_loop = BacktestEventLoop(time_flow_controller, notifiers)
+        event_loop.run()
+
+        self.assertFalse(event_manager.continue_trading)
+        self.assertEqual(number_of_events, event_loop.number_of_dispatched_events)
+        self.assertEqual(self._replace_ids(expected_calls), self._replace_ids(actual_calls))
+
+    def _create_components(self):
+        timer = SettableTimer(self.start_date)
+        notifiers = Notifiers(timer)
+        event_manager = EventManager(timer)
+        event_manager.register_notifiers([
+            notifiers.all_event_notifier,
+            notifiers.empty_queue_event_notifier,
+            notifiers.end_trading_event_notifier,
+            notifiers.scheduler
+        ])
+        time_flow_controller = BacktestTimeFlowController(
+            notifiers.scheduler, event_manager, timer, notifiers.empty_queue_event_notifier, self.end_date)
+        return timer, notifiers, event_manager, time_flow_controller
+
+    @staticmethod
+    def _replace_ids(calls):
+        """ Replaces ids of listeners with the order of their first call, so that calls of two runs can be compared """
+        ids = {}
+        for call in calls:
+            ids.setdefault(call[0], len(ids))
+        return [(ids[call[0]],) + call[1:] for call in calls]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@ import unittest
 from unittest import TestCase
 
 from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.regular_date_time_rule import RegularDateTimeRule
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date, DateFormat
 from qf_lib.common.utils.dateutils.timer import SettableTimer
 
@@ -41,6 +42,57 @@ class TestRules(TestCase):
         next_trigger_time = MarketOpenEvent.next_trigger_time(now)
         self.assertEqual(str_to_date("2018-01-02 09:30:00.000000", DateFormat.FULL_ISO), next_trigger_time)
 
+    def test_trigger_times(self):
+        start_time = str_to_date("2018-01-01 09:30:00.000000", DateFormat.FULL_ISO)
+        end_time = str_to_date("2018-03-15 09:30:00.000000", DateFormat.FULL_ISO)
+
+        rules = [
+            MarketOpenEvent._trigger_time_rule,
+            RegularDateTimeRule(minute=15, second=0, microsecond=0),
+            RegularDateTimeRule(weekday=2, hour=16, minute=0, second=0, microsecond=0),
+            RegularDateTimeRule(day=10, hour=8, minute=0, second=0, microsecond=0)
+        ]
+        for rule in rules:
+            expected_trigger_times = []
+            next_trigger_time = rule.next_trigger_time(start_time)
+            while next_trigger_time <= end_time:
+                expected_trigger_times.append(next_trigger_time)
+                next_trigger_time = rule.next_trigger_time(next_trigger_time)
+
+            trigger_times = rule.trigger_times(start_time, end_time)
+            self.assertEqual(expected_trigger_times, trigger_times.astype(object).tolist())
+
+        self.assertEqual(0, len(MarketOpenEvent.trigger_times(end_time, end_time)))
+
+    def test_monthly_and_yearly_trigger_times(self):
+        start_time = str_to_date("2016-01-31 13:00:00.000000", DateFormat.FULL_ISO)
+        end_time = str_to_date("2021-02-28 23:00:00.000000", DateFormat.FULL_ISO)
+
+        rules = [
+            RegularDateTimeRule(day=1, hour=9, minute=30, second=0, microsecond=0),
+            RegularDateTimeRule(day=28, hour=23, minute=0, second=0, microsecond=0),
+            RegularDateTimeRule(day=31, hour=16, minute=0, second=0, microsecond=0),
+            RegularDateTimeRule(month=2, day=28, hour=23, minute=0, second=0, microsecond=0),
+            RegularDateTimeRule(month=6)
+        ]
+        for rule in rules:
+            self._assert_trigger_times_equal_to_next_trigger_times(rule, start_time, end_time)
+
+        # the first trigger time (2018-02-28) is clamped to the end of February, the next ones are not
+        rule = RegularDateTimeRule(day=31, hour=1, minute=0, second=0, microsecond=0)
+        self._assert_trigger_times_equal_to_next_trigger_times(
+            rule, str_to_date("2018-02-01"), str_to_date("2018-08-01"))
+
+    def _assert_trigger_times_equal_to_next_trigger_times(self, rule, start_time, end_time):
+        expected_trigger_times = []
+        next_trigger_time = rule.next_trigger_time(start_time)
+        while next_trigger_time <= end_time:
+            expected_trigger_times.append(next_trigger_time)
+            next_trigger_time = rule.next_trigger_time(next_trigger_time)
+
+        trigger_times = rule.trigger_times(start_time, end_time)
+        self.assertEqual(expected_trigger_times, trigger_times.astype(object).tolist())
+
 
 if __name__ == '__main__':
     unittest.main()
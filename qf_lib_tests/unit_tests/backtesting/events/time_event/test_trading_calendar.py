@@ -0,0 +1,95 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.events.time_event.trading_calendar import TradingCalendar
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestTradingCalendar(TestCase):
+
+    def setUp(self):
+        self.start_date = datetime(2018, 1, 1)
+        self.end_date = datetime(2018, 12, 31, 23, 59)
+        self.holidays = [datetime(2018, 1, 1), datetime(2018, 12, 25)]
+
+        self.calendar = TradingCalendar(self.start_date, self.end_date)
+        self.calendar_with_holidays = TradingCalendar(self.start_date, self.end_date, self.holidays)
+
+    def test_trigger_times_equal_to_rule(self):
+        for event_type in [MarketOpenEvent, MarketCloseEvent]:
+            expected_trigger_times = event_type.trigger_times(datetime(2017, 12, 31, 23, 59), self.end_date)
+            self.assertEqual(expected_trigger_times.tolist(), self.calendar.trigger_times(event_type).tolist())
+
+    def test_holidays_are_skipped(self):
+        trigger_times = self.calendar_with_holidays.trigger_times(MarketOpenEvent).astype(object).tolist()
+
+        self.assertEqual(len(self.calendar.trigger_times(MarketOpenEvent)) - 2, len(trigger_times))
+        self.assertNotIn(datetime(2018, 1, 1, 9, 30), trigger_times)
+        self.assertNotIn(datetime(2018, 12, 25, 9, 30), trigger_times)
+        self.assertEqual(datetime(2018, 1, 2, 9, 30), trigger_times[0])
+
+    def test_next_trigger_time(self):
+        for now in [datetime(2018, 1, 1), datetime(2018, 3, 5, 9, 30), datetime(2018, 7, 4, 12, 1)]:
+            self.assertEqual(MarketOpenEvent.next_trigger_time(now),
+                             self.calendar.next_trigger_time(MarketOpenEvent, now))
+
+        self.assertEqual(datetime(2018, 12, 26, 16, 0),
+                         self.calendar_with_holidays.next_trigger_time(MarketCloseEvent, datetime(2018, 12, 24, 16, 0)))
+
+        # outside of the calendar
+        self.assertIsNone(self.calendar.next_trigger_time(MarketOpenEvent, datetime(2017, 12, 1)))
+        self.assertIsNone(self.calendar.next_trigger_time(MarketOpenEvent, datetime(2018, 12, 31, 10, 0)))
+
+    def test_latest_trigger_time(self):
+        self.assertEqual(datetime(2018, 3, 5, 9, 30),
+                         self.calendar.latest_trigger_time(MarketOpenEvent, datetime(2018, 3, 5, 9, 30)))
+        self.assertEqual(datetime(2018, 3, 4, 16, 0),
+                         self.calendar.latest_trigger_time(MarketCloseEvent, datetime(2018, 3, 5, 15, 59)))
+        self.assertEqual(datetime(2018, 12, 24, 16, 0),
+                         self.calendar_with_holidays.latest_trigger_time(MarketCloseEvent,
+                                                                         datetime(2018, 12, 25, 20, 0)))
+
+        # outside of the calendar
+        self.assertIsNone(self.calendar.latest_trigger_time(MarketOpenEvent, datetime(2018, 1, 1, 9, 0)))
+        self.assertIsNone(self.calendar.latest_trigger_time(MarketOpenEvent, datetime(2019, 1, 2)))
+
+    def test_scheduler_with_calendar(self):
+        timer = SettableTimer(self.start_date)
+        scheduler = Scheduler(timer, self.calendar_with_holidays)
+        scheduler_without_calendar = Scheduler(timer)
+        for s in [scheduler, scheduler_without_calendar]:
+            s.subscribe(MarketOpenEvent, listener=object())
+            s.subscribe(MarketCloseEvent, listener=object())
+
+        times, event_types = scheduler.get_schedule(self.start_date, datetime(2018, 1, 3))
+        self.assertEqual([datetime(2018, 1, 2, 9, 30), datetime(2018, 1, 2, 16, 0)], times.astype(object).tolist())
+        self.assertEqual([MarketOpenEvent, MarketCloseEvent], event_types)
+
+        self.assertEqual(datetime(2018, 1, 2, 9, 30), scheduler.get_next_time_event().time)
+        self.assertEqual(datetime(2018, 1, 1, 9, 30), scheduler_without_calendar.get_next_time_event().time)
+
+        # after the end of the calendar the trigger times are calculated with the rules
+        timer.set_current_time(datetime(2019, 1, 5))
+        self.assertEqual(datetime(2019, 1, 5, 9, 30), scheduler.get_next_time_event().time)
+
+
+if __name__ == '__main__':
+    unittest.main()
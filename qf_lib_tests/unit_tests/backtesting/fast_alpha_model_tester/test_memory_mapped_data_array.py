@@ -0,0 +1,76 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import os
+import pickle
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.fast_alpha_model_tester.memory_mapped_data_array import MemoryMappedDataArray
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+
+
+class TestMemoryMappedDataArray(TestCase):
+    def setUp(self):
+        self.dates = pd.bdate_range(start='2018-01-01', periods=10)
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(3)]
+        self.fields = PriceField.ohlcv()
+
+        values = np.random.RandomState(0).rand(len(self.dates), len(self.tickers), len(self.fields))
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields, values)
+
+    def test_to_data_array(self):
+        with MemoryMappedDataArray(self.data_array) as shared_array:
+            actual_array = shared_array.to_data_array()
+
+            self.assertEqual(QFDataArray, type(actual_array))
+            self.assertTrue(self.dates.equals(actual_array.dates.to_index()))
+            self.assertEqual(self.tickers, list(actual_array.tickers.values))
+            self.assertEqual(self.fields, list(actual_array.fields.values))
+            np.testing.assert_equal(self.data_array.values, actual_array.values)
+
+    def test_values_are_not_pickled(self):
+        with MemoryMappedDataArray(self.data_array) as shared_array:
+            pickled_array = pickle.dumps(shared_array)
+            self.assertLess(len(pickled_array), self.data_array.values.nbytes)
+
+            np.testing.assert_equal(self.data_array.values, pickle.loads(pickled_array).to_data_array().values)
+
+    def test_modifications_are_not_written_to_file(self):
+        with MemoryMappedDataArray(self.data_array) as shared_array:
+            modified_array = shared_array.to_data_array()
+            modified_array.values[:] = 0.0
+
+            np.testing.assert_equal(self.data_array.values, shared_array.to_data_array().values)
+
+    def test_file_is_removed(self):
+        with MemoryMappedDataArray(self.data_array) as shared_array:
+            self.assertTrue(os.path.exists(shared_array.file_path))
+        self.assertFalse(os.path.exists(shared_array.file_path))
+
+    def test_empty_array(self):
+        empty_array = QFDataArray.create(self.dates[:0], self.tickers, self.fields)
+
+        with MemoryMappedDataArray(empty_array) as shared_array:
+            self.assertIsNone(shared_array.file_path)
+            self.assertEqual((0, len(self.tickers), len(self.fields)), shared_array.to_data_array().shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from qf_lib.backtesting.fast_alpha_model_tester.trades_extractor import extract_trades, TRADE_FIELDS
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+
+
+class TestTradesExtractor(TestCase):
+    def setUp(self):
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(2)]
+        self.dates = pd.bdate_range(start='2018-01-01', periods=6)
+
+        self.open_prices = np.array([[10.0, 20.0], [11.0, 21.0], [12.0, 22.0], [13.0, 23.0], [14.0, 24.0],
+                                     [15.0, 25.0]])
+        self.high_prices = self.open_prices + 5.0
+        self.low_prices = self.open_prices - 3.0
+
+    def test_extract_trades(self):
+        exposures = np.array([
+            [np.nan, np.nan],
+            [1.0, -1.0],
+            [1.0, np.nan],
+            [-1.0, -1.0],
+            [0.0, 1.0],
+            [0.0, 1.0]
+        ])
+
+        actual_trades = extract_trades(exposures, self.open_prices, self.high_prices, self.low_prices,
+                                       self.dates, self.tickers)
+
+        expected_trades = pd.DataFrame(columns=pd.Index(TRADE_FIELDS), data=[
+            [
+                self.tickers[0], str_to_date("2018-01-02"), str_to_date("2018-01-04"),
+                11.0, 6.0, -3.0, 13.0, 13.0 / 11.0 - 1, 1.0
+            ],
+            [
+                self.tickers[0], str_to_date("2018-01-04"), str_to_date("2018-01-05"),
+                13.0, 3.0, -5.0, 14.0, 1 - 14.0 / 13.0, -1.0
+            ],
+            [
+                # the NaN exposure on 2018-01-03 is skipped
+                self.tickers[1], str_to_date("2018-01-02"), str_to_date("2018-01-05"),
+                21.0, 3.0, -7.0, 24.0, 1 - 24.0 / 21.0, -1.0
+            ]
+        ])
+        assert_frame_equal(expected_trades, actual_trades)
+
+    def test_no_trades(self):
+        exposures = np.array([[np.nan, np.nan], [0.0, np.nan], [0.0, 1.0], [0.0, 1.0], [0.0, 1.0], [0.0, 1.0]])
+        actual_trades = extract_trades(exposures, self.open_prices, self.high_prices, self.low_prices,
+                                       self.dates, self.tickers)
+
+        self.assertTrue(actual_trades.empty)
+        self.assertEqual(TRADE_FIELDS, list(actual_trades.columns))
+
+    def test_random_exposures(self):
+        random_state = np.random.RandomState(7)
+        num_of_dates, num_of_tickers = 300, 20
+        dates = pd.bdate_range(start='2015-01-01', periods=num_of_dates)
+        tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(num_of_tickers)]
+
+        exposures = random_state.choice([-1.0, 0.0, 1.0], size=(num_of_dates, num_of_tickers), p=[0.1, 0.1, 0.8])
+        exposures[random_state.rand(num_of_dates, num_of_tickers) < 0.05] = np.nan
+        exposures[0, :] = np.nan
+        open_prices = random_state.rand(num_of_dates, num_of_tickers) * 100 + 50
+        high_prices = open_prices + random_state.rand(num_of_dates, num_of_tickers) * 10
+        low_prices = open_prices - random_state.rand(num_of_dates, num_of_tickers) * 10
+
+        actual_trades = extract_trades(exposures, open_prices, high_prices, low_prices, dates, tickers)
+        expected_trades = self._extract_trades_date_by_date(exposures, open_prices, high_prices, low_prices,
+                                                            dates, tickers)
+
+        self.assertGreater(len(actual_trades), 1000)
+        assert_frame_equal(expected_trades, actual_trades)
+
+    @staticmethod
+    def _extract_trades_date_by_date(exposures, open_prices, high_prices, low_prices, dates, tickers):
+        trades = []
+        for j, ticker in enumerate(tickers):
+            prev_exposure = 0.0
+            trade = None
+
+            for i, date in enumerate(dates):
+                curr_exposure = exposures[i, j]
+                if np.isnan(curr_exposure):
+                    continue
+
+                if trade is not None and curr_exposure != prev_exposure:
+                    entry_price, exposure = trade[3], trade[8]
+                    highest_high, lowest_low = trade.pop(), trade.pop()
+                    if exposure == 1.0:
+                        trade[4], trade[5] = highest_high - entry_price, lowest_low - entry_price
+                    else:
+                        trade[4], trade[5] = entry_price - lowest_low, entry_price - highest_high
+                    trade[2], trade[6] = date, open_prices[i, j]
+                    trade[7] = (open_prices[i, j] / entry_price - 1) * exposure
+                    trades.append(trade)
+                    trade = None
+                elif trade is not None:
+                    trade[-2] = min(trade[-2], low_prices[i, j])
+                    trade[-1] = max(trade[-1], high_prices[i, j])
+
+                if trade is None and curr_exposure != prev_exposure and curr_exposure != 0.0:
+                    trade = [ticker, date, None, open_prices[i, j], None, None, None, None, curr_exposure,
+                             low_prices[i, j], high_prices[i, j]]
+
+                prev_exposure = curr_exposure
+
+        return pd.DataFrame(columns=pd.Index(TRADE_FIELDS), data=trades)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import csv
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+import pandas as pd
+from mockito import mock, when, unstub
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.monitoring import headless_backtest_monitor
+from qf_lib.backtesting.monitoring.background_exports import BackgroundExports, BackgroundExportError
+from qf_lib.backtesting.monitoring.headless_backtest_monitor import HeadlessBacktestMonitor
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.containers.series.qf_series import QFSeries
+
+
+def _write_series(file_path, series):
+    series.to_csv(file_path)
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+class _TestedMonitor(HeadlessBacktestMonitor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exports_directory = None
+        self.failing = False
+
+    def _export_tasks(self, portfolio_tms, leverage):
+        if self.failing:
+            return [("failing export", _fail, ("no data",))]
+        return [
+            ("portfolio", _write_series, (os.path.join(self.exports_directory, "portfolio.csv"), portfolio_tms)),
+            ("leverage", _write_series, (os.path.join(self.exports_directory, "leverage.csv"), leverage))
+        ]
+
+
+class TestHeadlessBacktestMonitor(TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+        when(headless_backtest_monitor).get_starting_dir_abs_path().thenReturn(self.output_directory)
+        self.settings = mock()
+        self.settings.output_directory = "output"
+
+        dates = pd.bdate_range("2018-01-01", periods=5)
+        portfolio = mock()
+        when(portfolio).get_portfolio_timeseries().thenReturn(QFSeries(data=[1.0, 2.0, 3.0, 4.0, 5.0], index=dates))
+        when(portfolio).leverage().thenReturn(QFSeries(data=[1.0] * 5, index=dates))
+
+        self.backtest_result = mock()
+        self.backtest_result.backtest_name = "Test Backtest"
+        self.backtest_result.portfolio = portfolio
+
+        self.contract = Contract("MSFT US Equity", security_type="STK", exchange="NASDAQ")
+
+    def tearDown(self):
+        unstub()
+        shutil.rmtree(self.output_directory)
+
+    def test_transactions_written_in_batches(self):
+        monitor = self._create_monitor(BackgroundExports(), csv_buffer_size=3)
+        csv_file_path = glob.glob(os.path.join(self.output_directory, "output", "backtesting", "trades", "*.csv"))[0]
+
+        for i in range(7):
+            monitor.record_transaction(Transaction(str_to_date("2018-01-02"), self.contract, i + 1, 10.0, 1.0))
+
+        # two full batches are already in the file
+        monitor._csv_file.flush()
+        self.assertEqual(1 + 6, len(self._read_csv(csv_file_path)))
+
+        monitor.end_of_trading_update()
+        monitor.wait_for_exports()
+
+        rows = self._read_csv(csv_file_path)
+        self.assertEqual(["Timestamp", "Contract", "Quantity", "Price", "Commission"], rows[0])
+        self.assertEqual([str(i + 1) for i in range(7)], [row[2] for row in rows[1:]])
+
+    def test_exports_run_in_background(self):
+        with BackgroundExports(max_workers=2) as background_exports:
+            monitors = [self._create_monitor(background_exports) for _ in range(2)]
+            for monitor in monitors:
+                monitor.end_of_trading_update()
+
+            self.assertEqual([], background_exports.wait())
+
+        for monitor in monitors:
+            portfolio_tms = pd.read_csv(os.path.join(monitor.exports_directory, "portfolio.csv"), index_col=0)
+            self.assertEqual([1.0, 2.0, 3.0, 4.0, 5.0], portfolio_tms.iloc[:, 0].tolist())
+            self.assertTrue(os.path.exists(os.path.join(monitor.exports_directory, "leverage.csv")))
+
+    def test_export_errors_are_surfaced(self):
+        monitor = self._create_monitor()
+        monitor.failing = True
+        monitor.end_of_trading_update()
+
+        with self.assertRaises(BackgroundExportError) as context:
+            monitor.wait_for_exports()
+
+        description, exception = context.exception.errors[0]
+        self.assertEqual("failing export of Test Backtest", description)
+        self.assertIsInstance(exception, ValueError)
+
+    def test_export_errors_without_raising(self):
+        monitor = self._create_monitor()
+        monitor.failing = True
+        monitor.end_of_trading_update()
+
+        errors = monitor.wait_for_exports(raise_errors=False)
+        self.assertEqual(1, len(errors))
+
+    def _create_monitor(self, background_exports=None, csv_buffer_size=1000):
+        monitor = _TestedMonitor(self.backtest_result, self.settings, mock(), mock(),
+                                 background_exports=background_exports, csv_buffer_size=csv_buffer_size)
+        monitor.exports_directory = tempfile.mkdtemp(dir=self.output_directory)
+        return monitor
+
+    @staticmethod
+    def _read_csv(file_path):
+        with open(file_path, newline='') as file:
+            return list(csv.reader(file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import pandas as pd
+from mockito import mock, when, ANY
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.portfolio.ledger import TransactionsLedger, TradesLedger
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestLedger(TestCase):
+    def setUp(self):
+        self.apple = Contract("AAPL US Equity", security_type="STK", exchange="NYSE")
+        self.microsoft = Contract("MSFT US Equity", security_type="STK", exchange="NYSE")
+        self.transactions = [
+            Transaction(str_to_date("2018-01-02"), self.apple, 10, 100.5, 1.0),
+            Transaction(str_to_date("2018-01-03"), self.microsoft, -5, 80.25, 0.5),
+            Transaction(str_to_date("2018-01-04"), self.apple, -10, 110.0, 1.0)
+        ]
+
+    def test_transactions_ledger(self):
+        for spill_threshold in [None, 2]:
+            ledger = TransactionsLedger(chunk_size=2, spill_threshold=spill_threshold)
+            for transaction in self.transactions:
+                ledger.append(transaction)
+
+            self.assertEqual(3, len(ledger))
+            self.assertEqual(self.transactions, list(ledger))
+            self.assertEqual(self.transactions[-1], ledger[-1])
+            self.assertEqual(self.transactions[1:], ledger[1:])
+            self.assertEqual(10, ledger[0].quantity)
+            self.assertIsInstance(ledger[0].quantity, int)
+            ledger.close()
+
+    def test_transactions_ledger_to_data_frame(self):
+        ledger = TransactionsLedger()
+        for transaction in self.transactions:
+            ledger.append(transaction)
+
+        transactions_df = ledger.to_data_frame()
+        self.assertEqual(["time", "contract", "quantity", "price", "commission"], list(transactions_df.columns))
+        self.assertEqual([self.apple, self.microsoft, self.apple], list(transactions_df["contract"]))
+        self.assertEqual([10, -5, -10], list(transactions_df["quantity"]))
+        self.assertEqual(pd.Timestamp("2018-01-03"), transactions_df["time"][1])
+
+    def test_trades_ledger(self):
+        trades = [
+            Trade(str_to_date("2018-01-04"), self.apple, 10, 100.6, 109.9),
+            Trade(str_to_date("2018-01-05"), self.microsoft, -5, 80.15, 81.0, risk_as_percent=0.02)
+        ]
+        ledger = TradesLedger()
+        for trade in trades:
+            ledger.append(trade)
+
+        self.assertEqual(2, len(ledger))
+        for expected_trade, actual_trade in zip(trades, ledger):
+            self.assertEqual(expected_trade.__dict__.keys(), actual_trade.__dict__.keys())
+            for name, value in expected_trade.__dict__.items():
+                if name != "risk_as_percent":
+                    self.assertEqual(value, getattr(actual_trade, name))
+
+        self.assertEqual(0.02, ledger[1].risk_as_percent)
+        self.assertAlmostEqual(trades[0].pnl, ledger[0].pnl)
+
+
+class TestPortfolioLedger(TestCase):
+    def setUp(self):
+        self.contract = Contract("AAPL US Equity", security_type="STK", exchange="NYSE")
+        self.ticker = BloombergTicker("AAPL US Equity")
+        self.timer = SettableTimer(str_to_date("2018-01-01"))
+
+        self.data_handler = mock()
+        when(self.data_handler).get_last_available_price(tickers=ANY).thenReturn(pd.Series([110.0], [self.ticker]))
+
+    def test_portfolio_series_and_trades(self):
+        for spill_threshold in [None, 2]:
+            portfolio = Portfolio(self.data_handler, 10000, self.timer, DummyBloombergContractTickerMapper(),
+                                  spill_threshold=spill_threshold)
+            dates = pd.bdate_range("2018-01-01", periods=5)
+            for i, date in enumerate(dates):
+                self.timer.set_current_time(date.to_pydatetime())
+                if i < 2:
+                    portfolio.transact_transaction(Transaction(self.timer.now(), self.contract, 10, 100.0, 0.0))
+                else:
+                    portfolio.transact_transaction(Transaction(self.timer.now(), self.contract, -5, 110.0, 0.0))
+                if i < 4:
+                    portfolio.update()
+
+            portfolio_tms = portfolio.get_portfolio_timeseries()
+            self.assertEqual(list(dates[:4]), list(portfolio_tms.index))
+            self.assertEqual([10100.0, 10200.0, 10200.0, 10200.0], list(portfolio_tms))
+            self.assertEqual(list(dates[:4]), list(portfolio.leverage().index))
+            self.assertAlmostEqual(1100.0 / 10100.0, portfolio.leverage()[0])
+
+            trades = portfolio.get_trades()
+            self.assertEqual(3, len(trades))
+            self.assertEqual([5, 5, 5], [trade.quantity for trade in trades])
+            self.assertEqual([100.0, 100.0, 100.0], [trade.entry_price for trade in trades])
+            self.assertEqual(5, len(portfolio.transactions))
+            self.assertEqual(dates[4].to_pydatetime(), portfolio.transactions[-1].time)
+
+
+if __name__ == '__main__':
+    unittest.main()
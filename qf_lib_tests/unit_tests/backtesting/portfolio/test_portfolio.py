@@ -0,0 +1,108 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from mockito import mock, when, ANY
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestPortfolioUpdate(TestCase):
+    def setUp(self):
+        self.timer = SettableTimer(str_to_date("2018-01-01"))
+        self.contracts = [Contract("Ticker{} Equity".format(i), security_type="STK", exchange="NYSE")
+                          for i in range(200)]
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(200)]
+
+        random_state = np.random.RandomState(3)
+        self.prices = pd.Series(random_state.uniform(10, 100, len(self.tickers)), index=self.tickers)
+
+        self.data_handler = mock()
+        when(self.data_handler).get_last_available_price(tickers=ANY).thenReturn(self.prices)
+
+        self.portfolio = Portfolio(self.data_handler, 1000000, self.timer, DummyBloombergContractTickerMapper())
+        self.quantities = {}
+        for i, contract in enumerate(self.contracts):
+            quantity = int(random_state.randint(1, 100)) * (1 if i % 3 else -1)
+            self._transact(contract, quantity, 50.0)
+
+        # positions closed in the middle of the sequence of positions
+        for contract in self.contracts[10:20]:
+            self._transact(contract, -self.quantities[contract], 60.0)
+
+    def test_update(self):
+        self.portfolio.update()
+
+        expected_net_liquidation = self.portfolio.current_cash
+        expected_gross_value = 0
+        for contract, ticker in zip(self.contracts, self.tickers):
+            if self.quantities[contract] != 0:
+                market_value = self.quantities[contract] * self.prices[ticker]
+                expected_net_liquidation += market_value
+                expected_gross_value += abs(market_value)
+
+        self.assertEqual(190, len(self.portfolio.open_positions_dict))
+        self.assertEqual(expected_net_liquidation, self.portfolio.net_liquidation)
+        self.assertEqual(expected_gross_value, self.portfolio.gross_value_of_positions)
+        self.assertEqual(expected_gross_value / expected_net_liquidation, self.portfolio.leverage()[-1])
+
+        position = self.portfolio.open_positions_dict[self.contracts[5]]
+        self.assertEqual(self.prices[self.tickers[5]], position.current_price)
+
+    def test_update_after_further_transactions(self):
+        self.portfolio.update()
+        self._transact(self.contracts[5], 7, 40.0)
+        self._transact(self.contracts[15], 3, 40.0)
+        self.portfolio.update()
+
+        expected_net_liquidation = self.portfolio.current_cash
+        for contract, ticker in zip(self.contracts, self.tickers):
+            expected_net_liquidation += self.quantities[contract] * self.prices[ticker]
+
+        self.assertAlmostEqual(expected_net_liquidation, self.portfolio.net_liquidation, places=6)
+        self.assertEqual(191, len(self.portfolio.open_positions_dict))
+
+    def test_positions_without_prices_are_removed(self):
+        self.portfolio.update()
+        cash_before = self.portfolio.current_cash
+        value_of_removed_position = self.quantities[self.contracts[7]] * self.prices[self.tickers[7]]
+
+        prices = self.prices.copy()
+        prices[self.tickers[7]] = np.nan
+        when(self.data_handler).get_last_available_price(tickers=ANY).thenReturn(prices)
+        self.portfolio.update()
+
+        self.assertNotIn(self.contracts[7], self.portfolio.open_positions_dict)
+        self.assertEqual(189, len(self.portfolio.open_positions_dict))
+        self.assertAlmostEqual(cash_before + value_of_removed_position, self.portfolio.current_cash, places=6)
+        self.assertFalse(np.isnan(self.portfolio.net_liquidation))
+
+    def _transact(self, contract, quantity, price):
+        self.portfolio.transact_transaction(Transaction(self.timer.now(), contract, quantity, price, 0.0))
+        self.quantities[contract] = self.quantities.get(contract, 0) + quantity
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,10 @@
 #     limitations under the License.
 
 import unittest
+from time import perf_counter
+
+import numpy as np
+from numpy import sign
 
 from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
@@ -204,5 +208,122 @@ class TestPosition(unittest.TestCase):
         position.transact_transaction(Transaction(self.time, self.contract, 3, 103, 0))
         self.assertAlmostEqual(position.realized_pnl(), 36.62, places=2)
 
+    def test_position_without_transactions_history(self):
+        position = BacktestPosition(self.contract, keep_transactions=False)
+        position.transact_transaction(Transaction(self.time, self.contract, 20, 100, 0))
+        position.transact_transaction(Transaction(self.time, self.contract, -10, 120, 20))
+
+        self.assertIsNone(position.transactions)
+        self.assertEqual(position.number_of_shares, 10)
+        self.assertEqual(position.realized_pnl(), 180)
+        self.assertEqual(position.avg_cost_per_share(), 100)
+
+    def test_running_aggregates_match_transactions_scan(self):
+        random_state = np.random.RandomState(7)
+
+        for _ in range(10):
+            position = BacktestPosition(self.contract)
+            number_of_shares = 0
+
+            for _ in range(100):
+                quantity = int(random_state.randint(-50, 51))
+                if quantity == 0 or number_of_shares + quantity == 0:
+                    continue
+
+                transaction = Transaction(self.time, self.contract, quantity, float(random_state.uniform(50, 150)),
+                                          float(random_state.uniform(0, 5)))
+                position.transact_transaction(transaction)
+                number_of_shares += quantity
+
+                self.assertEqual(_cost_basis(position.transactions), position.cost_basis())
+                self.assertEqual(_avg_cost_per_share(position.transactions), position.avg_cost_per_share())
+                self.assertEqual(_realized_pnl(position.transactions), position.realized_pnl())
+
+    def test_position_with_100k_transactions(self):
+        number_of_transactions = 100000
+        position = BacktestPosition(self.contract)
+
+        start_time = perf_counter()
+        for i in range(number_of_transactions):
+            # scaling in: 3 shares are bought and 1 share is sold in every 2 transactions
+            quantity = 3 if i % 2 == 0 else -1
+            position.transact_transaction(Transaction(self.time, self.contract, quantity, 100.0 + i % 2, 0.0))
+            position.avg_cost_per_share()
+        elapsed_time = perf_counter() - start_time
+
+        self.assertEqual(number_of_transactions, len(position.transactions))
+        self.assertEqual(number_of_transactions, position.number_of_shares)
+        self.assertEqual(100.0, position.avg_cost_per_share())
+        self.assertEqual(100.0 * number_of_transactions - 50000, position.cost_basis())
+        self.assertEqual(number_of_transactions / 2, position.realized_pnl())
+        self.assertLess(elapsed_time, 10.0)
+
+
+def _cost_basis(transactions):
+    if sum(t.quantity for t in transactions) == 0:
+        return 0.0
+
+    result = 0.0
+    for transaction in transactions:
+        result += transaction.price * transaction.quantity + transaction.commission
+    return result
+
+
+def _avg_cost_per_share(transactions):
+    direction = sign(sum(t.quantity for t in transactions))
+    cost = 0.0
+    shares = 0
+    for transaction in transactions:
+        if sign(transaction.quantity) == direction:
+            cost += transaction.price * transaction.quantity + transaction.commission
+            shares += transaction.quantity
+    if shares == 0:
+        return 0
+    return cost / shares
+
+
+def _realized_pnl(transactions):
+    """ Realised PnL calculated by scanning all the transactions """
+    quantity = 0
+    avg_buy_price = 0.0
+    avg_sell_price = 0.0
+    realized_pnl = 0.0
+
+    quantities_bought = []
+    quantities_sold = []
+    prices_bought = []
+    prices_sold = []
+
+    for transaction in transactions:
+        shares_for_pnl_calc = min([abs(transaction.quantity), abs(quantity)])
+        shares_for_avg_price_calc = abs(transaction.quantity)
+
+        if sign(quantity) == 1 and sign(transaction.quantity) == -1:
+            realized_pnl += (transaction.price - avg_buy_price) * shares_for_pnl_calc - transaction.commission
+            shares_for_avg_price_calc -= shares_for_pnl_calc
+
+        if sign(quantity) == -1 and sign(transaction.quantity) == 1:
+            realized_pnl += (avg_sell_price - transaction.price) * shares_for_pnl_calc - transaction.commission
+            shares_for_avg_price_calc -= shares_for_pnl_calc
+
+        quantity += transaction.quantity
+        if sign(transaction.quantity) == 1:
+            quantities_bought.append(shares_for_avg_price_calc)
+            prices_bought.append(transaction.average_price_including_commission())
+        if sign(transaction.quantity) == -1:
+            quantities_sold.append(shares_for_avg_price_calc)
+            prices_sold.append(transaction.average_price_including_commission())
+
+        if sum(quantities_bought) > 0:
+            avg_buy_price = sum(price * q for price, q in zip(prices_bought, quantities_bought))
+            avg_buy_price /= sum(quantities_bought)
+
+        if sum(quantities_sold) > 0:
+            avg_sell_price = sum(price * q for price, q in zip(prices_sold, quantities_sold))
+            avg_sell_price /= sum(quantities_sold)
+
+    return realized_pnl
+
+
 if __name__ == "__main__":
     unittest.main()
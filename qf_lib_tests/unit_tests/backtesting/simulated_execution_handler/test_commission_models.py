@@ -0,0 +1,61 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.execution_handler.commission_models.bps_trade_value_commission_model import \
+    BpsTradeValueCommissionModel
+from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
+from qf_lib.backtesting.execution_handler.commission_models.ib_commission_model import IBCommissionModel
+from qf_lib.backtesting.order.execution_style import MarketOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+
+
+class TestCommissionModels(TestCase):
+    """
+    Compares the commissions calculated for all the orders at once with the commissions calculated order by order.
+    """
+
+    def setUp(self):
+        random_state = np.random.RandomState(11)
+        contract = Contract("MSFT US Equity", security_type="STK", exchange="NASDAQ")
+
+        self.quantities = random_state.randint(-5000, 5000, 1000)
+        self.fill_prices = 500 * random_state.rand(1000)
+        self.fill_prices[::50] = np.nan  # e.g. orders not filled because of the volume limit
+        self.orders = [Order(contract, int(quantity), MarketOrder(), TimeInForce.GTC) for quantity in self.quantities]
+
+    def test_fixed_commission_model(self):
+        self._assert_commissions_equal(FixedCommissionModel(commission=2.5))
+
+    def test_bps_trade_value_commission_model(self):
+        self._assert_commissions_equal(BpsTradeValueCommissionModel(commission=2.0))
+
+    def test_ib_commission_model(self):
+        self._assert_commissions_equal(IBCommissionModel())
+
+    def _assert_commissions_equal(self, commission_model):
+        expected_commissions = [commission_model.calculate_commission(order, fill_price)
+                                for order, fill_price in zip(self.orders, self.fill_prices)]
+        actual_commissions = commission_model.calculate_commissions(self.orders, self.quantities, self.fill_prices)
+        np.testing.assert_array_equal(np.array(expected_commissions, dtype=np.float64), actual_commissions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@
 import unittest
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import DummyBloombergContractTickerMapper
@@ -27,6 +28,8 @@ from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.containers.dimension_names import TICKERS, FIELDS
 from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_lists_equal
 
@@ -70,7 +73,7 @@ class TestSlippage(TestCase):
     def _create_data_handler_mock(self):
         saved_tickers = self.tickers
 
-        class DataHandlerMock(object):
+        class DataHandlerMock(DataHandler):
             def get_bar_for_today(self, tickers):
                 assert set(tickers) == set(saved_tickers)
 
@@ -88,7 +91,7 @@ class TestSlippage(TestCase):
 
                 return result
 
-        data_handler = DataHandlerMock()  # type: DataHandler
+        data_handler = DataHandlerMock(None, SettableTimer(str_to_date("2018-02-04")))  # type: DataHandler
 
         return data_handler
 
@@ -131,6 +134,37 @@ class TestSlippage(TestCase):
         assert_lists_equal(expected_fill_prices, actual_fill_prices)
         assert_lists_equal(expected_fill_volumes, actual_fill_volumes)
 
+    def test_batch_slippage_equal_to_slippage_of_orders(self):
+        quantities = np.array([order.quantity for order in self.orders])
+        prices = np.array(self.prices_without_slippage)
+        slippage_models = [
+            FixedSlippage(slippage_per_share=0.05),
+            VolumeShareSlippage(volume_share_limit=0.1, price_impact=0.1, data_handler=self.data_handler,
+                                contract_ticker_mapper=DummyBloombergContractTickerMapper())
+        ]
+
+        for slippage_model in slippage_models:
+            expected_fill_prices, expected_fill_volumes = slippage_model.apply_slippage(
+                self.orders, self.prices_without_slippage)
+            actual_fill_prices, actual_fill_volumes = slippage_model.apply_slippage_batch(
+                self.orders, quantities, prices, self.tickers)
+
+            np.testing.assert_array_equal(expected_fill_prices, actual_fill_prices)
+            np.testing.assert_array_equal(expected_fill_volumes, actual_fill_volumes)
+
+    def test_default_batch_slippage_uses_slippage_of_orders(self):
+        quantities = np.array([order.quantity for order in self.orders])
+        prices = np.array(self.prices_without_slippage)
+        slippage_model = PriceBasedSlippage(slippage_rate=0.1)
+
+        expected_fill_prices, expected_fill_volumes = slippage_model.apply_slippage(
+            self.orders, self.prices_without_slippage)
+        actual_fill_prices, actual_fill_volumes = slippage_model.apply_slippage_batch(
+            self.orders, quantities, prices, self.tickers)
+
+        np.testing.assert_array_equal(expected_fill_prices, actual_fill_prices)
+        np.testing.assert_array_equal(expected_fill_volumes, actual_fill_volumes)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,149 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from itertools import count
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from mockito import mock, when
+
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.execution_handler.stop_orders_executor import StopOrdersExecutor
+from qf_lib.backtesting.order.execution_style import StopOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestStopOrdersExecutor(TestCase):
+    """
+    Compares the fill prices of StopOrdersExecutor (evaluated for all the orders at once) with the fill prices
+    calculated order by order.
+    """
+
+    def setUp(self):
+        self.mapper = DummyBloombergContractTickerMapper()
+        self.data_handler = mock(strict=True)
+        self.executor = StopOrdersExecutor(self.mapper, self.data_handler, mock(), mock(),
+                                           SettableTimer(str_to_date("2018-02-04")), count(start=1), mock(), mock())
+
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(20)]
+        self.contracts = [self.mapper.ticker_to_contract(ticker) for ticker in self.tickers]
+        self.random_state = np.random.RandomState(7)
+
+    def test_fill_prices_equal_to_order_by_order_evaluation(self):
+        for _ in range(20):
+            orders = self._accept_random_orders(100)
+            bars_df = self._random_bars()
+            when(self.data_handler).get_bar_for_today(...).thenReturn(bars_df)
+
+            open_orders = self.executor.get_open_orders()
+            tickers = [self.mapper.contract_to_ticker(order.contract) for order in open_orders]
+            fill_prices, executed_orders, unexecuted_orders = \
+                self.executor._get_orders_with_fill_prices_without_slippage(open_orders, tickers)
+
+            expected_fill_prices = [self._fill_price(bars_df.loc[ticker, :], order)
+                                    for order, ticker in zip(orders, tickers)]
+            self.assertEqual([price for price in expected_fill_prices if price is not None], fill_prices)
+            self.assertEqual([order for order, price in zip(orders, expected_fill_prices) if price is not None],
+                             executed_orders)
+            self.assertEqual([order.id for order, price in zip(orders, expected_fill_prices)
+                              if price is None and order.time_in_force == TimeInForce.GTC],
+                             list(unexecuted_orders.keys()))
+
+            self.executor.cancel_all_open_orders()
+
+    def test_open_orders_arrays_follow_the_open_orders(self):
+        orders = self._accept_random_orders(10)
+        bars_df = pd.DataFrame(index=pd.Index(self.tickers), columns=PriceField.ohlcv())
+        when(self.data_handler).get_bar_for_today(...).thenReturn(bars_df)
+        self._evaluate()  # all the orders remain unexecuted, DAY orders are dropped
+
+        gtc_orders = [order for order in orders if order.time_in_force == TimeInForce.GTC]
+        self.assertEqual(gtc_orders, self.executor.get_open_orders())
+
+        self.executor.cancel_order(gtc_orders[0].id)
+        new_orders = self._accept_random_orders(5)
+
+        open_orders = self.executor.get_open_orders()
+        self.assertEqual(gtc_orders[1:] + new_orders, open_orders)
+
+        # all the bars trigger all the orders at the stop price
+        bars_df = pd.DataFrame(index=pd.Index(self.tickers), columns=PriceField.ohlcv(),
+                               data=[[100.0, 1000.0, 1.0, 100.0, 1.0]] * len(self.tickers))
+        when(self.data_handler).get_bar_for_today(...).thenReturn(bars_df)
+
+        fill_prices, executed_orders, unexecuted_orders = self._evaluate()
+        self.assertEqual(open_orders, executed_orders)
+        self.assertEqual([order.execution_style.stop_price for order in open_orders], fill_prices)
+        self.assertEqual({}, unexecuted_orders)
+
+    def _evaluate(self):
+        open_orders = self.executor.get_open_orders()
+        tickers = [self.mapper.contract_to_ticker(order.contract) for order in open_orders]
+        result = self.executor._get_orders_with_fill_prices_without_slippage(open_orders, tickers)
+        self.executor._awaiting_orders = result[2]
+        return result
+
+    def _accept_random_orders(self, num_of_orders):
+        when(self.data_handler).get_last_available_price(...).thenReturn(
+            pd.Series(data=100.0, index=pd.Index(self.tickers)))
+
+        orders = []
+        for i in range(num_of_orders):
+            contract = self.contracts[i % len(self.contracts)]
+            is_sell = self.random_state.rand() < 0.5
+            stop_price = 100.0 - 10 * self.random_state.rand() if is_sell else 100.0 + 10 * self.random_state.rand()
+            time_in_force = TimeInForce.GTC if self.random_state.rand() < 0.5 else TimeInForce.DAY
+            orders.append(Order(contract, -1 if is_sell else 1, StopOrder(stop_price), time_in_force))
+
+        self.executor.accept_orders(orders)
+        return orders
+
+    def _random_bars(self):
+        open_prices = 100.0 + 15 * self.random_state.randn(len(self.tickers))
+        high_prices = open_prices + 10 * self.random_state.rand(len(self.tickers))
+        low_prices = open_prices - 10 * self.random_state.rand(len(self.tickers))
+        close_prices = (high_prices + low_prices) / 2
+        values = np.column_stack([open_prices, high_prices, low_prices, close_prices, np.full(len(self.tickers), 1.0)])
+        values[self.random_state.rand(*values.shape) < 0.05] = np.nan
+        return pd.DataFrame(index=pd.Index(self.tickers), columns=PriceField.ohlcv(), data=values)
+
+    @staticmethod
+    def _fill_price(current_bar, order):
+        if current_bar.loc[[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]].isnull().any():
+            return None
+
+        stop_price = order.execution_style.stop_price
+        if order.quantity < 0:
+            if current_bar[PriceField.Open] <= stop_price:
+                return current_bar[PriceField.Open]
+            elif current_bar[PriceField.Low] <= stop_price:
+                return stop_price
+        else:
+            if current_bar[PriceField.Open] >= stop_price:
+                return current_bar[PriceField.Open]
+            elif current_bar[PriceField.High] >= stop_price:
+                return stop_price
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from mockito import mock, when, verify, unstub
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.date_format import DateFormat
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestDataHandlerBarValuesCache(TestCase):
+    def setUp(self):
+        self.timer = SettableTimer(str_to_date("2018-01-02 16:00:00.000000", DateFormat.FULL_ISO))
+        self.data_handler = DataHandler(mock(), self.timer)
+
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(3)]
+        self.bars_df = pd.DataFrame(index=pd.Index(self.tickers), columns=PriceField.ohlcv(), data=[
+            [1.0, 2.0, 0.5, 1.5, 100.0],
+            [10.0, 20.0, 5.0, 15.0, None],
+            [None, None, None, None, None]
+        ])
+
+    def tearDown(self):
+        unstub()
+
+    def test_values_aligned_with_tickers(self):
+        tickers = [self.tickers[1], self.tickers[0], self.tickers[1], self.tickers[2]]
+        when(self.data_handler).get_bar_for_today([self.tickers[1], self.tickers[0], self.tickers[2]]).thenReturn(
+            self.bars_df)
+
+        volumes = self.data_handler.get_bar_values_for_today(tickers, PriceField.Volume)
+        np.testing.assert_array_equal(np.array([np.nan, 100.0, np.nan, np.nan]), volumes)
+
+        open_prices = self.data_handler.get_bar_values_for_today(tickers, PriceField.Open)
+        np.testing.assert_array_equal(np.array([10.0, 1.0, 10.0, np.nan]), open_prices)
+
+    def test_bars_downloaded_once_per_time(self):
+        when(self.data_handler).get_bar_for_today([self.tickers[0], self.tickers[1]]).thenReturn(
+            self.bars_df.iloc[:2])
+        when(self.data_handler).get_bar_for_today([self.tickers[2]]).thenReturn(self.bars_df.iloc[2:])
+        when(self.data_handler).get_bar_for_today(self.tickers).thenReturn(self.bars_df)
+
+        self.data_handler.get_bar_values_for_today(self.tickers[:2], PriceField.Close)
+        self.data_handler.get_bar_values_for_today(self.tickers[:2], PriceField.Volume)
+        verify(self.data_handler, times=1).get_bar_for_today([self.tickers[0], self.tickers[1]])
+
+        # only the missing ticker is downloaded
+        close_prices = self.data_handler.get_bar_values_for_today(self.tickers, PriceField.Close)
+        np.testing.assert_array_equal(np.array([1.5, 15.0, np.nan]), close_prices)
+        verify(self.data_handler, times=1).get_bar_for_today([self.tickers[2]])
+
+        # the cache is cleared when the time changes
+        self.timer.set_current_time(str_to_date("2018-01-03 16:00:00.000000", DateFormat.FULL_ISO))
+        self.data_handler.get_bar_values_for_today(self.tickers, PriceField.Close)
+        verify(self.data_handler, times=1).get_bar_for_today(self.tickers)
+
+
+if __name__ == '__main__':
+    unittest.main()
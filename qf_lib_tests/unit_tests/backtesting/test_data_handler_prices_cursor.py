@@ -0,0 +1,107 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_series_equal
+
+
+class TestDataHandlerPricesCursor(TestCase):
+    """
+    Checks that the prices returned by the DataHandler with the data bundle (which uses the CurrentPricesCursor)
+    are the same as the ones calculated from the 7-day window of prices, for randomly generated calendars.
+    """
+
+    times_of_day = [
+        RelativeDelta(hour=6, minute=0), RelativeDelta(hour=9, minute=30), RelativeDelta(hour=12, minute=0),
+        RelativeDelta(hour=16, minute=0), RelativeDelta(hour=20, minute=0)
+    ]
+
+    def setUp(self):
+        self.tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(5)]
+        self.start_date = datetime(2018, 1, 1)
+        self.end_date = datetime(2018, 2, 28)
+
+    def test_prices_on_random_calendars(self):
+        for seed in range(3):
+            random_state = np.random.RandomState(seed)
+            data_array = self._create_random_data_array(random_state)
+            query_times = self._create_query_times(random_state)
+
+            self._assert_prices_are_the_same(data_array, query_times)
+
+    def test_prices_when_time_goes_back(self):
+        random_state = np.random.RandomState(10)
+        data_array = self._create_random_data_array(random_state)
+        query_times = self._create_query_times(random_state)
+        random_state.shuffle(query_times)
+
+        self._assert_prices_are_the_same(data_array, query_times[:50])
+
+    def _assert_prices_are_the_same(self, data_array, query_times):
+        price_provider = PresetDataProvider(data_array, self.start_date, self.end_date)
+
+        timer = SettableTimer()
+        expected_data_handler = DataHandler(price_provider, timer)
+        actual_data_handler = DataHandler(price_provider, timer)
+        actual_data_handler.use_data_bundle(self.tickers, PriceField.ohlcv(), self.start_date, self.end_date)
+
+        for query_time in query_times:
+            timer.set_current_time(query_time)
+
+            for method_name in ("get_current_price", "get_last_available_price"):
+                expected_prices = getattr(expected_data_handler, method_name)(self.tickers)
+                actual_prices = getattr(actual_data_handler, method_name)(self.tickers)
+                assert_series_equal(expected_prices, actual_prices, check_dtype=True)
+
+                expected_price = getattr(expected_data_handler, method_name)(self.tickers[0])
+                actual_price = getattr(actual_data_handler, method_name)(self.tickers[0])
+                self.assertTrue(expected_price == actual_price or (np.isnan(expected_price) and np.isnan(actual_price)))
+
+    def _create_random_data_array(self, random_state: np.random.RandomState) -> QFDataArray:
+        business_days = pd.bdate_range(self.start_date, self.end_date)
+        dates = business_days[random_state.rand(len(business_days)) < 0.8]
+
+        fields = PriceField.ohlcv()
+        values = random_state.rand(len(dates), len(self.tickers), len(fields)) * 100
+        values[random_state.rand(len(dates), len(self.tickers)) < 0.3, :] = np.nan
+        values[random_state.rand(len(dates), len(self.tickers), len(fields)) < 0.1] = np.nan
+
+        # one ticker without any data for more than 7 days
+        values[10:20, 0, :] = np.nan
+
+        return QFDataArray.create(dates, self.tickers, fields, values)
+
+    def _create_query_times(self, random_state: np.random.RandomState):
+        # the DataHandler looks 7 days back for the last available prices, so the first dates are skipped
+        dates = pd.date_range(self.start_date + RelativeDelta(days=8), self.end_date)
+        dates = dates[random_state.rand(len(dates)) < 0.3]
+
+        return [date.to_pydatetime() + time_of_day for date in dates for time_of_day in self.times_of_day]
+
+
+if __name__ == '__main__':
+    unittest.main()
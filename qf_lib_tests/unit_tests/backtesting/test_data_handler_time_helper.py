@@ -18,6 +18,7 @@ from unittest import TestCase
 from qf_lib.backtesting.data_handler.data_handler import _DataHandlerTimeHelper
 from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.trading_calendar import TradingCalendar
 from qf_lib.common.utils.dateutils.date_format import DateFormat
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
 from qf_lib.common.utils.dateutils.timer import SettableTimer
@@ -65,6 +66,25 @@ class TestDataHandlerTimeHelper(TestCase):
         self.assertEqual(market_open_datetime, self.TODAY_OPEN)
         self.assertEqual(market_close_datetime, self.TODAY_CLOSE)
 
+    def test_datetime_of_latest_market_event_with_trading_calendar(self):
+        calendar = TradingCalendar(str_to_date("2018-01-01"), str_to_date("2018-02-28"))
+        time_helper = _DataHandlerTimeHelper(self.timer, calendar)
+
+        for now in [self.TODAY_BEFORE_OPEN, self.TODAY_OPEN, self.TODAY_MIDDLE_DAY, self.TODAY_CLOSE,
+                    self.TODAY_AFTER_CLOSE]:
+            self.timer.set_current_time(now)
+            for event_class in [MarketOpenEvent, MarketCloseEvent]:
+                self.assertEqual(self.time_helper.datetime_of_latest_market_event(event_class),
+                                 time_helper.datetime_of_latest_market_event(event_class))
+
+    def test_datetime_of_latest_market_event_skips_holidays(self):
+        calendar = TradingCalendar(str_to_date("2018-01-01"), str_to_date("2018-02-28"), [self.YESTERDAY_CLOSE])
+        time_helper = _DataHandlerTimeHelper(self.timer, calendar)
+        self.timer.set_current_time(self.TODAY_BEFORE_OPEN)
+
+        market_close_datetime = time_helper.datetime_of_latest_market_event(MarketCloseEvent)
+        self.assertEqual(str_to_date("2018-01-28 16:00:00.000000", DateFormat.FULL_ISO), market_close_datetime)
+
 
 if __name__ == '__main__':
     unittest.main()
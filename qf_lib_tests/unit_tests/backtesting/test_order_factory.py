@@ -42,6 +42,7 @@ class TestOrderFactory(unittest.TestCase):
         broker = mock(strict=True)
         when(broker).get_portfolio_value().thenReturn(cls.current_portfolio_value)
         when(broker).get_positions().thenReturn([position])
+        when(broker).get_positions_by_contract().thenReturn({cls.contract: position})
 
         data_handler = mock(strict=True)
         when(data_handler).get_last_available_price([cls.ticker]).thenReturn(
@@ -45,6 +45,7 @@ class TestPositionSizer(unittest.TestCase):
 
         broker = mock(strict=True)
         when(broker).get_positions().thenReturn([position])
+        when(broker).get_positions_by_contract().thenReturn({cls.contract: position})
 
         data_handler = mock(strict=True)
         when(data_handler).get_last_available_price(cls.ticker).thenReturn(110)
@@ -0,0 +1,160 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.trading_session.backtest_profiler import BacktestProfiler
+from qf_lib.common.utils.dateutils.date_format import DateFormat
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class _DataHandler(object):
+    def __init__(self):
+        self.number_of_queries = 0
+
+    def get_price(self, *args):
+        self.number_of_queries += 1
+        return 1.0
+
+
+class _Portfolio(object):
+    def update(self):
+        pass
+
+
+class _Broker(object):
+    def __init__(self):
+        self.execution_handler = _ExecutionHandler()
+
+
+class _ExecutionHandler(object):
+    def on_market_open(self, _):
+        pass
+
+
+class _Listener(object):
+    def __init__(self, data_handler, portfolio):
+        self.data_handler = data_handler
+        self.portfolio = portfolio
+
+    def on_market_open(self, _):
+        self.data_handler.get_price()
+        self.data_handler.get_price()
+
+    def on_market_close(self, _):
+        self.data_handler.get_price()
+        self.portfolio.update()
+
+
+class _Session(object):
+    def __init__(self, timer):
+        self.timer = timer
+        self.notifiers = Notifiers(timer)
+        self.data_handler = _DataHandler()
+        self.portfolio = _Portfolio()
+        self.monitor = None
+        self.position_sizer = None
+        self.broker = _Broker()
+
+
+class TestBacktestProfiler(TestCase):
+    def setUp(self):
+        self.timer = SettableTimer(str_to_date("2018-01-01 00:00:00.000000", DateFormat.FULL_ISO))
+        self.ts = _Session(self.timer)
+
+        scheduler = self.ts.notifiers.scheduler
+        self.listener = _Listener(self.ts.data_handler, self.ts.portfolio)
+        scheduler.subscribe(MarketOpenEvent, self.listener)
+        scheduler.subscribe(MarketCloseEvent, self.listener)
+        scheduler.subscribe(MarketOpenEvent, self.ts.broker.execution_handler)
+
+        self.output_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_directory)
+
+    def test_statistics_per_event_type_and_component(self):
+        profiler = BacktestProfiler()
+        profiler.instrument_session(self.ts)
+        self._run_days(3)
+
+        statistics_df = profiler.to_data_frame()
+        calls = {(row["event type"], row["component"], row["method"]): row["calls"]
+                 for _, row in statistics_df.iterrows()}
+
+        self.assertEqual({
+            ("MarketOpenEvent", "_Listener", "notify"): 3,
+            ("MarketOpenEvent", "_ExecutionHandler", "notify"): 3,
+            ("MarketOpenEvent", "ExecutionHandler", "on_market_open"): 3,
+            ("MarketOpenEvent", "DataHandler", "get_price"): 6,
+            ("MarketCloseEvent", "_Listener", "notify"): 3,
+            ("MarketCloseEvent", "DataHandler", "get_price"): 3,
+            ("MarketCloseEvent", "Portfolio", "update"): 3,
+        }, calls)
+
+        # the instrumented methods still work as before
+        self.assertEqual(9, self.ts.data_handler.number_of_queries)
+        self.assertTrue((statistics_df["total time [s]"] >= 0).all())
+        self.assertTrue(statistics_df["total time [s]"].is_monotonic_decreasing)
+
+    def test_profiling_window(self):
+        window = (str_to_date("2018-01-02"), str_to_date("2018-01-02 23:59:59.000000", DateFormat.FULL_ISO))
+        profiler = BacktestProfiler(profiling_window=window, use_cprofile=True, use_tracemalloc=True)
+        profiler.instrument_session(self.ts)
+
+        self._run_days(1)
+        self.assertIsNone(profiler.cprofile_stats)
+
+        self._run_days(2)
+        self.assertIsNotNone(profiler.cprofile_stats)
+        self.assertIsNotNone(profiler.tracemalloc_snapshots)
+
+        profiled_functions = [function_name for _, _, function_name in profiler.cprofile_stats.stats.keys()]
+        self.assertIn("on_market_open", profiled_functions)
+
+    def test_finish_writes_statistics(self):
+        profiler = BacktestProfiler(output_directory=self.output_directory)
+        profiler.instrument_session(self.ts)
+        self._run_days(2)
+        profiler.finish()
+
+        file_path = os.path.join(self.output_directory, BacktestProfiler.PROFILE_FILE_NAME)
+        with open(file_path + ".json") as file:
+            records = json.load(file)
+
+        self.assertEqual(len(profiler.to_data_frame()), len(records))
+        self.assertEqual({"event type", "component", "method", "calls", "total time [s]", "mean time [us]"},
+                         set(records[0].keys()))
+        self.assertTrue(os.path.exists(file_path + ".csv"))
+        self.assertFalse(os.path.exists(file_path + ".prof"))  # no profiling window
+
+    def _run_days(self, number_of_days):
+        scheduler = self.ts.notifiers.scheduler
+        for _ in range(2 * number_of_days):
+            time_event = scheduler.get_next_time_event()
+            self.timer.set_current_time(time_event.time)
+            scheduler.notify_all(time_event)
+
+
+if __name__ == '__main__':
+    unittest.main()
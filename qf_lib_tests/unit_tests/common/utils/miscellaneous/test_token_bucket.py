@@ -0,0 +1,56 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from threading import Thread
+from time import perf_counter
+from unittest import TestCase
+
+from qf_lib.common.utils.miscellaneous.token_bucket import TokenBucket
+
+
+class TestTokenBucket(TestCase):
+
+    def test_burst_is_not_delayed(self):
+        token_bucket = TokenBucket(rate=1.0, capacity=5)
+
+        start_time = perf_counter()
+        for _ in range(5):
+            token_bucket.acquire()
+        self.assertLess(perf_counter() - start_time, 0.1)
+
+    def test_rate_is_limited(self):
+        token_bucket = TokenBucket(rate=50.0)
+
+        def acquire_tokens():
+            for _ in range(5):
+                token_bucket.acquire()
+
+        start_time = perf_counter()
+        threads = [Thread(target=acquire_tokens) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # the first token is available immediately, the other 19 are added at the rate of 50 per second
+        self.assertGreaterEqual(perf_counter() - start_time, 19 / 50.0 - 0.01)
+
+    def test_invalid_parameters(self):
+        self.assertRaises(ValueError, TokenBucket, 0.0)
+        self.assertRaises(ValueError, TokenBucket, 1.0, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from qf_lib.containers.chunked_array import ChunkedArray
+
+
+class TestChunkedArray(TestCase):
+    def test_append_and_access(self):
+        chunked_array = ChunkedArray(np.float64, chunk_size=3)
+        self.assertEqual(0, len(chunked_array))
+        self.assertEqual(0, len(chunked_array.values()))
+
+        for value in range(10):
+            chunked_array.append(value)
+
+        self.assertEqual(10, len(chunked_array))
+        self.assertEqual(4.0, chunked_array[4])
+        self.assertEqual(9.0, chunked_array[-1])
+        np.testing.assert_array_equal(np.arange(10.0), chunked_array.values())
+        np.testing.assert_array_equal(np.arange(2.0, 5.0), chunked_array[2:5])
+        self.assertEqual(list(range(10)), list(chunked_array))
+
+        with self.assertRaises(IndexError):
+            chunked_array[10]
+
+    def test_values_are_read_only(self):
+        chunked_array = ChunkedArray(np.int64, chunk_size=3)
+        chunked_array.append(1)
+
+        with self.assertRaises(ValueError):
+            chunked_array.values()[0] = 2
+
+    def test_values_are_updated_after_append(self):
+        chunked_array = ChunkedArray(np.int64, chunk_size=3)
+        chunked_array.append(1)
+        np.testing.assert_array_equal([1], chunked_array.values())
+
+        chunked_array.append(2)
+        np.testing.assert_array_equal([1, 2], chunked_array.values())
+
+    def test_spill_to_disk(self):
+        chunked_array = ChunkedArray("datetime64[us]", chunk_size=4, spill_threshold=6)
+        dates = np.arange("2018-01-01", "2018-01-21", dtype="datetime64[D]").astype("datetime64[us]")
+
+        for date in dates[:5]:
+            chunked_array.append(date)
+        self.assertFalse(chunked_array.is_spilled)
+
+        for date in dates[5:]:
+            chunked_array.append(date)
+        self.assertTrue(chunked_array.is_spilled)
+
+        values = chunked_array.values()
+        self.assertIsInstance(values.base, np.memmap)
+        np.testing.assert_array_equal(dates, values)
+        self.assertEqual(dates[7], chunked_array[7])
+        chunked_array.close()
+
+    def test_objects_cant_be_spilled(self):
+        with self.assertRaises(ValueError):
+            ChunkedArray(object, spill_threshold=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
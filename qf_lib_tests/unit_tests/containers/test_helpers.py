@@ -15,9 +15,11 @@
 import unittest
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
-from qf_lib.containers.helpers import rolling_window_slices
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.helpers import rolling_window_slices, exponentially_smoothed_values
 from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_lists_equal
 
 
@@ -37,6 +39,29 @@ class TestSeries(TestCase):
         ]
         assert_lists_equal(expected_slices, actual_slices)
 
+    def test_exponentially_smoothed_values(self):
+        values = np.random.RandomState(2).rand(100, 4)
+        values[40, 1] = np.nan
+        values[0, 2] = np.nan
+        lambda_coefficients = [0.94, 0.5, 0.94, 1.0]
+
+        actual_values = exponentially_smoothed_values(values, lambda_coefficients)
+
+        expected_values = values.copy()
+        for i in range(1, len(values)):
+            for j, lambda_coeff in enumerate(lambda_coefficients):
+                expected_values[i, j] = lambda_coeff * values[i, j] + (1 - lambda_coeff) * expected_values[i - 1, j]
+
+        np.testing.assert_allclose(expected_values, actual_values, rtol=1e-12)
+        self.assertTrue(np.isnan(actual_values[40:, 1]).all())
+
+        actual_frame = QFDataFrame(data=values).exponential_average(lambda_coefficients)
+        np.testing.assert_allclose(expected_values, actual_frame.values, rtol=1e-12)
+
+    def test_exponentially_smoothed_values_of_short_series(self):
+        self.assertEqual(0, len(exponentially_smoothed_values(np.array([]), 0.94)))
+        np.testing.assert_equal([2.0], exponentially_smoothed_values(np.array([2.0]), 0.94))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,89 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from time import perf_counter
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal
+
+
+class TestQFDataArrayAsOfPerformance(TestCase):
+    """
+    Compares the vectorised QFDataArray.asof with the implementation which calls pd.DataFrame.asof
+    for every ticker separately (the results must be the same) and logs the speedup.
+    """
+
+    def setUp(self):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        random_state = np.random.RandomState(5)
+        num_of_dates, num_of_tickers = 250, 400
+
+        self.dates = pd.bdate_range(start='2017-01-02', periods=num_of_dates)
+        tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(num_of_tickers)]
+        fields = PriceField.ohlcv()
+
+        values = random_state.rand(num_of_dates, num_of_tickers, len(fields))
+        values[random_state.rand(num_of_dates, num_of_tickers, len(fields)) < 0.05] = np.nan
+        values[-20:, :50, :] = np.nan  # no data at the end for some of the tickers
+        self.qf_data_array = QFDataArray.create(self.dates, tickers, fields, values)
+
+        self.random_dates = [self.dates[i] for i in random_state.randint(0, num_of_dates, num_of_tickers)]
+
+    def test_asof_single_date(self):
+        for date in [self.dates[-1], self.dates[100], self.dates[0] - pd.Timedelta(days=1)]:
+            self._compare_with_asof_for_each_ticker(date)
+
+    def test_asof_date_per_ticker(self):
+        self._compare_with_asof_for_each_ticker(self.random_dates)
+
+    def _compare_with_asof_for_each_ticker(self, dates):
+        start_time = perf_counter()
+        expected_result = self._asof_for_each_ticker(self.qf_data_array, dates)
+        loop_time = perf_counter() - start_time
+
+        start_time = perf_counter()
+        actual_result = self.qf_data_array.asof(dates)
+        vectorised_time = perf_counter() - start_time
+
+        assert_dataframes_equal(expected_result, actual_result)
+        self.logger.info("QFDataArray.asof: loop {:.4f}s, vectorised {:.4f}s, speedup {:.1f}x".format(
+            loop_time, vectorised_time, loop_time / vectorised_time))
+
+    @staticmethod
+    def _asof_for_each_ticker(qf_data_array, dates):
+        tickers = qf_data_array.tickers.values
+        fields = qf_data_array.fields.values
+        if not isinstance(dates, list):
+            dates = [dates] * len(tickers)
+
+        asof_values = np.empty((len(tickers), len(fields)))
+        for i, (ticker, date) in enumerate(zip(tickers, dates)):
+            ticker_df = pd.DataFrame(data=qf_data_array.values[:, i, :], index=qf_data_array.dates.to_index())
+            asof_values[i, :] = ticker_df.asof(date)
+
+        return pd.DataFrame(data=asof_values, index=qf_data_array.tickers.to_index(),
+                            columns=qf_data_array.fields.to_index())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.common.utils.volatility.rolling_volatility import rolling_volatility
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.rolling_kernels import rolling_reduction, sliding_windows, ROLLING_REDUCTIONS
+from qf_lib.containers.series.log_returns_series import LogReturnsSeries
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_series_equal, assert_dataframes_equal
+
+
+class TestRollingKernels(TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(3)
+        dates = pd.bdate_range(start='2010-01-01', periods=250)
+
+        values = random_state.normal(100.0, 0.5, size=(len(dates), 4))
+        values[random_state.rand(*values.shape) < 0.1] = np.nan
+        values[50:70, 1] = np.nan  # more NaNs than the window size
+
+        self.data_frame = QFDataFrame(data=values, index=dates, columns=['a', 'b', 'c', 'd'])
+        self.series = QFSeries(data=values[:, 0], index=dates)
+
+    def test_reductions_are_the_same_as_in_loop(self):
+        for reduction in ROLLING_REDUCTIONS:
+            for window_size, step in [(1, 1), (2, 1), (10, 1), (10, 3), (30, 7), (250, 1), (300, 1)]:
+                expected_series = self.series.rolling_window(window_size, lambda x: getattr(x, reduction)(), step)
+                actual_series = self.series.rolling_window(window_size, reduction, step)
+                assert_series_equal(expected_series.astype(np.float64), actual_series, absolute_tolerance=1e-9,
+                                    check_names=False)
+
+    def test_reductions_for_data_frame(self):
+        for reduction in ROLLING_REDUCTIONS:
+            expected_frame = self.data_frame.rolling_window(15, lambda x: getattr(x, reduction)(), step=2)
+            actual_frame = self.data_frame.rolling_window(15, reduction, step=2)
+            assert_dataframes_equal(expected_frame.astype(np.float64), actual_frame, absolute_tolerance=1e-9)
+
+    def test_optimised_rolling_window_with_step(self):
+        expected_series = self.series.rolling_window(20, lambda x: np.nanmedian(x.values), step=5)
+        actual_series = self.series.rolling_window(20, np.nanmedian, step=5, optimised=True)
+        assert_series_equal(expected_series.astype(np.float64), actual_series, check_names=False)
+
+    def test_sliding_windows(self):
+        values = np.arange(20).reshape(10, 2)
+        windows = sliding_windows(values, 4, step=3)
+
+        self.assertEqual((3, 4, 2), windows.shape)
+        np.testing.assert_equal(values[3:7], windows[1])
+        np.testing.assert_equal(values[6:10], windows[2])
+        self.assertFalse(windows.flags.writeable)
+
+    def test_unknown_reduction(self):
+        self.assertRaises(ValueError, rolling_reduction, self.series.values, 5, "median")
+
+    def test_rolling_volatility(self):
+        returns_tms = LogReturnsSeries(data=self.series.values[:100] / 100.0 - 1, index=self.series.index[:100])
+
+        actual_volatility = rolling_volatility(returns_tms, Frequency.DAILY, annualise=True, window_size=20)
+
+        expected_values = [get_volatility(returns_tms.iloc[i - 19:i + 1], Frequency.DAILY, annualise=True)
+                           for i in range(19, 100)]
+        expected_volatility = QFSeries(data=expected_values, index=returns_tms.index[19:])
+        assert_series_equal(expected_volatility, actual_volatility, absolute_tolerance=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES, TICKERS, FIELDS
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.data_providers.array_bar_store import ArrayBarStore
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestArrayBarStore(unittest.TestCase):
+    def setUp(self):
+        self.msft_ticker = BloombergTicker("MSFT US Equity")
+        self.google_ticker = BloombergTicker("GOOGL US Equity")
+        self.apple_ticker = BloombergTicker("AAPL US Equity")
+
+        self.tickers = [self.msft_ticker, self.google_ticker, self.apple_ticker]
+        self.fields = [PriceField.Open, PriceField.Close, PriceField.Volume]
+
+        # dates are deliberately not sorted
+        self.dates = pd.DatetimeIndex(
+            [datetime(2018, 2, 7), datetime(2018, 2, 5), datetime(2018, 2, 6), datetime(2018, 2, 8)], name=DATES)
+        self.values = np.arange(len(self.dates) * len(self.tickers) * len(self.fields), dtype=np.float64).reshape(
+            (len(self.dates), len(self.tickers), len(self.fields)))
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields, self.values)
+
+        self.start_date = datetime(2018, 2, 5)
+        self.end_date = datetime(2018, 2, 8)
+        self.data_provider = PresetDataProvider(self.data_array, self.start_date, self.end_date,
+                                                use_array_bar_store=True)
+
+        self.sorted_dates = self.dates.sort_values()
+        self.sorted_values = self.values[np.argsort(self.dates.values)]
+
+    def test_dates_slice(self):
+        store = ArrayBarStore(self.data_array)
+
+        self.assertEqual(slice(0, 4), store.dates_slice())
+        self.assertEqual(slice(1, 3), store.dates_slice(datetime(2018, 2, 6), datetime(2018, 2, 7)))
+        self.assertEqual(slice(1, 3), store.dates_slice(datetime(2018, 2, 5, 12), datetime(2018, 2, 7, 16)))
+        self.assertEqual(slice(2, 4), store.dates_slice(datetime(2018, 2, 7)))
+        self.assertEqual(slice(0, 1), store.dates_slice(end_date=datetime(2018, 2, 5)))
+        self.assertEqual(slice(4, 4), store.dates_slice(datetime(2018, 2, 10), datetime(2018, 2, 11)))
+        self.assertEqual(slice(2, 2), store.dates_slice(datetime(2018, 2, 7), datetime(2018, 2, 6)))
+
+    def test_get_values_with_missing_labels(self):
+        store = ArrayBarStore(QFDataArray.create(self.dates, self.tickers[:2], self.fields, self.values[:, :2, :]))
+        dates, values = store.get_values([self.google_ticker, self.apple_ticker], [PriceField.Close, PriceField.Low])
+
+        tt.assert_lists_equal(list(self.sorted_dates), list(dates))
+        np.testing.assert_equal(self.sorted_values[:, 1, 1], values[:, 0, 0])
+        self.assertTrue(np.isnan(values[:, 1, :]).all())
+        self.assertTrue(np.isnan(values[:, :, 1]).all())
+
+    def test_get_values_returns_copy(self):
+        store = ArrayBarStore(self.data_array)
+        _, values = store.get_values(self.tickers, self.fields)
+        values[:] = 0.0
+
+        _, values = store.get_values(self.tickers, self.fields)
+        np.testing.assert_equal(self.sorted_values, values)
+
+    def test_get_price_multiple_tickers_and_fields(self):
+        actual_array = self.data_provider.get_price(
+            [self.apple_ticker, self.msft_ticker], self.fields, datetime(2018, 2, 6), datetime(2018, 2, 8))
+
+        self.assertEqual(QFDataArray, type(actual_array))
+        tt.assert_lists_equal(list(self.sorted_dates[1:]), list(actual_array.dates.to_index()))
+        tt.assert_lists_equal([self.apple_ticker, self.msft_ticker], list(actual_array.tickers.values))
+        tt.assert_lists_equal(self.fields, list(actual_array.fields.values))
+        np.testing.assert_equal(self.sorted_values[1:][:, [2, 0], :], actual_array.values)
+
+    def test_get_price_single_ticker(self):
+        actual_frame = self.data_provider.get_price(self.google_ticker, self.fields, self.start_date, self.end_date)
+
+        expected_frame = PricesDataFrame(data=self.sorted_values[:, 1, :], index=self.sorted_dates,
+                                         columns=pd.Index(self.fields, name=FIELDS))
+        tt.assert_dataframes_equal(expected_frame, actual_frame, check_index_type=True, check_column_type=True)
+
+    def test_get_price_single_field(self):
+        actual_frame = self.data_provider.get_price(self.tickers, PriceField.Close, self.start_date, self.end_date)
+
+        expected_frame = PricesDataFrame(data=self.sorted_values[:, :, 1], index=self.sorted_dates,
+                                         columns=pd.Index(self.tickers, name=TICKERS))
+        tt.assert_dataframes_equal(expected_frame, actual_frame, check_index_type=True, check_column_type=True)
+
+    def test_get_price_single_ticker_and_field(self):
+        actual_series = self.data_provider.get_price(self.apple_ticker, PriceField.Open, self.start_date,
+                                                     self.end_date)
+
+        expected_series = PricesSeries(data=self.sorted_values[:, 2, 0], index=self.sorted_dates,
+                                       name=self.apple_ticker.as_string())
+        tt.assert_series_equal(expected_series, actual_series)
+
+    def test_get_price_single_date(self):
+        date = datetime(2018, 2, 7)
+        actual_frame = self.data_provider.get_price(self.tickers, self.fields, date, date)
+
+        expected_frame = PricesDataFrame(data=self.values[0], index=pd.Index(self.tickers, name=TICKERS),
+                                         columns=pd.Index(self.fields, name=FIELDS))
+        tt.assert_dataframes_equal(expected_frame, actual_frame, check_index_type=True, check_column_type=True)
+
+        actual_value = self.data_provider.get_price(self.msft_ticker, PriceField.Volume, date, date)
+        self.assertEqual(self.values[0, 0, 2], actual_value)
+
+    def test_get_history(self):
+        fields = ["PX_OPEN", "PX_LAST", "PX_VOLUME"]
+        data_provider = PresetDataProvider(QFDataArray.create(self.dates, self.tickers, fields, self.values),
+                                           self.start_date, self.end_date, use_array_bar_store=True)
+        actual_frame = data_provider.get_history(self.tickers, "PX_LAST", self.start_date, self.end_date)
+
+        expected_frame = QFDataFrame(data=self.sorted_values[:, :, 1], index=self.sorted_dates,
+                                     columns=pd.Index(self.tickers, name=TICKERS))
+        tt.assert_dataframes_equal(expected_frame, actual_frame, check_index_type=True, check_column_type=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
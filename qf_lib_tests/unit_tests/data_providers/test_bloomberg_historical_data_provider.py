@@ -0,0 +1,121 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.bloomberg.bloomberg_names import START_DATE, END_DATE
+from qf_lib.data_providers.bloomberg.historical_data_provider import HistoricalDataProvider
+from qf_lib_tests.helpers.testing_tools.bloomberg_session_mock import SessionMock
+
+
+class TestHistoricalDataProvider(TestCase):
+    def setUp(self):
+        self.start_date = datetime(2019, 1, 1)
+        self.end_date = datetime(2019, 3, 31)
+        self.dates = pd.date_range(self.start_date, self.end_date, freq="D")
+        self.tickers = ["A Equity", "B Equity", "C Equity"]
+        self.fields = ["PX_OPEN", "PX_LAST"]
+
+        random_state = np.random.RandomState(7)
+        values = random_state.rand(len(self.dates), len(self.tickers), len(self.fields))
+        values[random_state.rand(*values.shape) < 0.1] = np.nan
+        values[:10, 1, :] = np.nan  # no data at the beginning for one of the tickers
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields, values)
+
+    def test_decoding_of_response(self):
+        session = SessionMock(self.data_array)
+        result = self._get(session, self.tickers)
+
+        self.assertEqual(1, len(session.sent_requests))
+        self._assert_data_array_equal(self.data_array, self.tickers, result)
+
+    def test_missing_and_duplicated_tickers(self):
+        session = SessionMock(self.data_array)
+        tickers = ["C Equity", "Missing Equity", "A Equity", "C Equity"]
+        result = self._get(session, tickers)
+
+        self.assertEqual([BloombergTicker.from_string(ticker) for ticker in tickers], list(result.tickers.values))
+        self.assertTrue(np.isnan(result.values[:, 1, :]).all())
+        np.testing.assert_equal(result.values[:, 0, :], result.values[:, 3, :])
+        self._assert_data_array_equal(self.data_array, ["C Equity", "A Equity"], result[:, [0, 2], :])
+
+    def test_no_data(self):
+        session = SessionMock(self.data_array)
+        result = self._get(session, ["Missing Equity"])
+
+        self.assertEqual((0, 1, 2), result.shape)
+
+    def test_request_split_into_chunks_of_tickers(self):
+        session = SessionMock(self.data_array)
+        data_provider = HistoricalDataProvider(session, max_data_points_per_request=2 * 90 * len(self.fields))
+        result = data_provider.get(self.tickers, self.fields, self.start_date, self.end_date, Frequency.DAILY,
+                                   None, None, None)
+
+        self.assertEqual(2, len(session.sent_requests))
+        self.assertEqual(2, len({correlation_id.value() for correlation_id in session.correlation_ids}))
+        self._assert_data_array_equal(self.data_array, self.tickers, result)
+
+    def test_request_split_into_chunks_of_dates(self):
+        session = SessionMock(self.data_array)
+        data_provider = HistoricalDataProvider(session, max_data_points_per_request=20 * len(self.fields))
+        result = data_provider.get(self.tickers, self.fields, self.start_date, self.end_date, Frequency.DAILY,
+                                   None, None, None)
+
+        # 90 days ~ 63 business days, so 126 data points per ticker are split into 4 ranges of dates
+        self.assertEqual(len(self.tickers) * 4, len(session.sent_requests))
+
+        # date ranges of a single ticker cover the whole period and don't overlap
+        date_ranges = [(request.parameters[str(START_DATE)], request.parameters[str(END_DATE)])
+                       for request in session.sent_requests[:4]]
+        self.assertEqual("20190101", date_ranges[0][0])
+        self.assertEqual("20190331", date_ranges[-1][1])
+        for (_, previous_end), (next_start, _) in zip(date_ranges[:-1], date_ranges[1:]):
+            self.assertEqual(pd.Timestamp(previous_end) + pd.Timedelta(days=1), pd.Timestamp(next_start))
+
+        self._assert_data_array_equal(self.data_array, self.tickers, result)
+
+    def test_weekly_request_is_not_split_into_chunks_of_dates(self):
+        data_provider = HistoricalDataProvider(SessionMock(self.data_array), max_data_points_per_request=10)
+        chunks = data_provider._split_into_chunks(self.tickers, self.fields, self.start_date, self.end_date,
+                                                  Frequency.WEEKLY)
+
+        self.assertEqual([([ticker], self.start_date, self.end_date) for ticker in self.tickers], chunks)
+
+    def _get(self, session, tickers):
+        data_provider = HistoricalDataProvider(session)
+        return data_provider.get(tickers, self.fields, self.start_date, self.end_date, Frequency.DAILY,
+                                 None, None, None)
+
+    def _assert_data_array_equal(self, expected_data_array, expected_tickers, actual_data_array):
+        ticker_indices = [list(expected_data_array.tickers.values).index(ticker) for ticker in expected_tickers]
+        expected_values = expected_data_array.values[:, ticker_indices, :]
+
+        # dates on which none of the tickers has data are not sent by Bloomberg
+        has_data = ~np.isnan(expected_values).all(axis=(1, 2))
+
+        np.testing.assert_array_equal(expected_data_array.dates.values[has_data], actual_data_array.dates.values)
+        self.assertEqual(self.fields, list(actual_data_array.fields.values))
+        np.testing.assert_array_equal(expected_values[has_data], actual_data_array.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
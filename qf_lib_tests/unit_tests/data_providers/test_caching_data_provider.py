@@ -0,0 +1,193 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.caching_data_provider import CachingDataProvider, _CacheEntry
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class _CountingDataProvider(PresetDataProvider):
+    """ Fake of a remote data provider, which records all the requested ranges of dates. """
+
+    def __init__(self, data: QFDataArray):
+        super().__init__(data, None, None, check_data_availability=False, use_array_bar_store=True)
+        self.requests = []
+
+    def get_price(self, tickers, fields, start_date, end_date=None):
+        self.requests.append((start_date, end_date))
+        return super().get_price(tickers, fields, start_date, end_date)
+
+    def get_history(self, tickers, fields, start_date, end_date=None, **kwargs):
+        self.requests.append((start_date, end_date))
+        return super().get_history(tickers, fields, start_date, end_date, **kwargs)
+
+
+class TestCachingDataProvider(unittest.TestCase):
+    def setUp(self):
+        self.msft_ticker = BloombergTicker("MSFT US Equity")
+        self.google_ticker = BloombergTicker("GOOGL US Equity")
+        self.tickers = [self.msft_ticker, self.google_ticker]
+        self.fields = [PriceField.Open, PriceField.Close, PriceField.Volume]
+
+        self.dates = pd.bdate_range(start=datetime(2018, 1, 1), end=datetime(2018, 3, 30), name=DATES)
+        values = np.arange(len(self.dates) * len(self.tickers) * len(self.fields), dtype=np.float64).reshape(
+            (len(self.dates), len(self.tickers), len(self.fields)))
+        values[:10, 1, :] = np.nan  # no data for GOOGL at the beginning
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields, values)
+
+        self.remote_provider = _CountingDataProvider(self.data_array)
+        self.expected_provider = PresetDataProvider(self.data_array, None, None, check_data_availability=False,
+                                                    use_array_bar_store=True)
+        self.cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_directory)
+
+    def test_sub_range_is_served_from_cache(self):
+        provider = CachingDataProvider(self.remote_provider)
+        start_date, end_date = datetime(2018, 1, 1), datetime(2018, 2, 28)
+
+        result = provider.get_price(self.tickers, self.fields, start_date, end_date)
+        expected_result = self.expected_provider.get_price(self.tickers, self.fields, start_date, end_date)
+        np.testing.assert_equal(expected_result.values, result.values)
+        self.assertEqual(1, provider.fetches)
+        self.assertEqual(6, provider.misses)
+
+        for tickers, fields in [(self.msft_ticker, PriceField.Close), (self.tickers, PriceField.Open),
+                                (self.google_ticker, self.fields)]:
+            result = provider.get_price(tickers, fields, datetime(2018, 1, 15), datetime(2018, 2, 15))
+            expected_result = self.expected_provider.get_price(
+                tickers, fields, datetime(2018, 1, 15), datetime(2018, 2, 15))
+            self.assertEqual(type(expected_result), type(result))
+            tt.assert_same_index(expected_result.index, result.index, check_index_type=True, check_names=True)
+            np.testing.assert_equal(expected_result.values, result.values)
+
+        self.assertEqual(1, provider.fetches)
+        self.assertEqual(6, provider.hits)
+        self.assertEqual(1, len(self.remote_provider.requests))
+
+    def test_only_missing_ranges_are_fetched(self):
+        provider = CachingDataProvider(self.remote_provider)
+        provider.get_price(self.tickers, PriceField.Close, datetime(2018, 1, 10), datetime(2018, 1, 31))
+        provider.get_price(self.tickers, PriceField.Close, datetime(2018, 2, 15), datetime(2018, 2, 28))
+
+        result = provider.get_price(self.tickers, PriceField.Close, datetime(2018, 1, 1), datetime(2018, 3, 15))
+        expected_result = self.expected_provider.get_price(
+            self.tickers, PriceField.Close, datetime(2018, 1, 1), datetime(2018, 3, 15))
+        np.testing.assert_equal(expected_result.values, result.values)
+
+        self.assertEqual([
+            (datetime(2018, 1, 10), datetime(2018, 1, 31)),
+            (datetime(2018, 2, 15), datetime(2018, 2, 28)),
+            (datetime(2018, 1, 1), datetime(2018, 1, 10)),
+            (datetime(2018, 1, 31), datetime(2018, 2, 15)),
+            (datetime(2018, 2, 28), datetime(2018, 3, 15))
+        ], self.remote_provider.requests)
+
+        # all the ranges were merged
+        provider.get_price(self.tickers, PriceField.Close, datetime(2018, 1, 5), datetime(2018, 3, 10))
+        self.assertEqual(5, provider.fetches)
+
+    def test_data_is_persisted(self):
+        provider = CachingDataProvider(self.remote_provider, self.cache_directory)
+        provider.get_price(self.tickers, self.fields, datetime(2018, 1, 1), datetime(2018, 3, 30))
+        self.assertGreater(provider.bytes_fetched, 0)
+
+        new_provider = CachingDataProvider(self.remote_provider, self.cache_directory)
+        result = new_provider.get_price(self.msft_ticker, self.fields, datetime(2018, 2, 1), datetime(2018, 3, 1))
+        expected_result = self.expected_provider.get_price(
+            self.msft_ticker, self.fields, datetime(2018, 2, 1), datetime(2018, 3, 1))
+
+        np.testing.assert_equal(expected_result.values, result.values)
+        self.assertEqual(0, new_provider.fetches)
+        self.assertEqual(3, new_provider.disk_reads)
+
+    def test_bar_of_current_day_is_fetched_again(self):
+        today = pd.Timestamp(datetime.now().date())
+        dates = pd.date_range(end=today, periods=10, name=DATES)
+        values = np.arange(len(dates), dtype=np.float64).reshape((len(dates), 1, 1))
+        published_data_array = QFDataArray.create(dates, [self.msft_ticker], [PriceField.Close], values)
+        # today's bar isn't published yet
+        remote_provider = _CountingDataProvider(published_data_array[:-1])
+
+        provider = CachingDataProvider(remote_provider, self.cache_directory)
+        result = provider.get_price(self.msft_ticker, PriceField.Close, dates[0])
+        self.assertEqual(9, len(result))
+
+        # today's bar is published
+        remote_provider = _CountingDataProvider(published_data_array)
+        provider.data_provider = remote_provider
+        result = provider.get_price(self.msft_ticker, PriceField.Close, dates[0])
+        np.testing.assert_equal(values[:, 0, 0], result.values)
+        self.assertEqual(2, provider.fetches)
+
+        # the bar is fetched again also in a new session, which reads the rest of the data from the disk
+        new_provider = CachingDataProvider(remote_provider, self.cache_directory)
+        result = new_provider.get_price(self.msft_ticker, PriceField.Close, dates[0])
+        np.testing.assert_equal(values[:, 0, 0], result.values)
+        self.assertEqual(1, new_provider.disk_reads)
+        self.assertEqual(1, new_provider.fetches)
+        self.assertLess(dates[-2], remote_provider.requests[-1][0])  # only the current day is downloaded
+
+    def test_least_recently_used_pairs_are_evicted(self):
+        provider = CachingDataProvider(self.remote_provider, max_memory_entries=2)
+        provider.get_price(self.tickers, PriceField.Close, datetime(2018, 1, 1), datetime(2018, 1, 31))
+        provider.get_price(self.msft_ticker, PriceField.Open, datetime(2018, 1, 1), datetime(2018, 1, 31))
+        self.assertEqual(2, provider.size)
+
+        # (MSFT, Close) was evicted by (MSFT, Open)
+        provider.get_price(self.msft_ticker, PriceField.Close, datetime(2018, 1, 1), datetime(2018, 1, 31))
+        self.assertEqual(3, provider.fetches)
+        provider.get_price(self.msft_ticker, PriceField.Open, datetime(2018, 1, 1), datetime(2018, 1, 31))
+        self.assertEqual(3, provider.fetches)
+        provider.get_price(self.google_ticker, PriceField.Close, datetime(2018, 1, 1), datetime(2018, 1, 31))
+        self.assertEqual(4, provider.fetches)
+
+    def test_cache_entry_missing_ranges(self):
+        entry = _CacheEntry()
+        self.assertEqual([(0, 100)], entry.missing_ranges(0, 100))
+        self.assertEqual([(5, 5)], entry.missing_ranges(5, 5))
+
+        entry.update(10, 20, np.array([10, 15, 20]), np.array([1.0, np.nan, 3.0]))
+        entry.update(40, 50, np.array([45]), np.array([4.0]))
+        entry.update(20, 30, np.array([20, 25]), np.array([3.0, 2.0]))
+
+        np.testing.assert_equal([[10, 30], [40, 50]], entry.ranges)
+        np.testing.assert_equal([10, 20, 25, 45], entry.dates)
+        self.assertEqual([(0, 10), (30, 40), (50, 60)], entry.missing_ranges(0, 60))
+        self.assertEqual([], entry.missing_ranges(12, 28))
+        self.assertEqual([(30, 35)], entry.missing_ranges(25, 35))
+
+        # the data after covered_end is stored, but the range isn't marked as covered
+        entry.update(50, 70, np.array([55, 65]), np.array([5.0, 6.0]), covered_end=60)
+        entry.update(80, 90, np.array([85]), np.array([7.0]), covered_end=60)
+        np.testing.assert_equal([[10, 30], [40, 60]], entry.ranges)
+        np.testing.assert_equal([10, 20, 25, 45, 55, 65, 85], entry.dates)
+        self.assertEqual([(60, 90)], entry.missing_ranges(50, 90))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Thread, Lock
+from time import sleep, perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.tickers.tickers import CcyTicker
+from qf_lib.data_providers.cryptocurrency.cryptocurrency_data_provider import CryptoCurrencyDataProvider
+
+
+def _recorded_page(first_price: float) -> bytes:
+    """ Page in the format of the coinmarketcap.com historical data, with prices for 5 days. """
+    dates = pd.date_range(start=datetime(2018, 1, 1), periods=5)[::-1]
+    rows = "".join(
+        "<tr><td>{}</td><td>{:,.2f}</td><td>{:,.2f}</td><td>{:,.2f}</td><td>{:,.2f}</td><td>{:,}</td><td>-</td></tr>"
+        .format(date.strftime("%b %d, %Y"), first_price + i, first_price + i + 2, first_price + i - 1,
+                first_price + i + 1, 1000 * (i + 1))
+        for i, date in enumerate(dates))
+    page = "<html><body><table><tr><th>Date</th><th>Open*</th><th>High</th><th>Low</th><th>Close**</th>" \
+           "<th>Volume</th><th>Market Cap</th></tr>{}</table></body></html>".format(rows)
+    return page.encode("utf-8")
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _StandInServer(object):
+    """
+    Local HTTP server serving the recorded pages of the tickers. It supports the ETag revalidation, may respond
+    with errors to the first requests of a ticker and may delay all the responses.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.delay = 0.0
+        self.failures_to_serve = {}
+        self.requests = []
+        self.not_modified_responses = 0
+        self._lock = Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                ticker_str = self.path.split("/")[2]
+                with server._lock:
+                    server.requests.append(ticker_str)
+                    should_fail = server.failures_to_serve.get(ticker_str, 0) > 0
+                    if should_fail:
+                        server.failures_to_serve[ticker_str] -= 1
+                sleep(server.delay)
+
+                if should_fail:
+                    self.send_response(503)
+                    self.end_headers()
+                elif ticker_str not in server.pages:
+                    self.send_response(404)
+                    self.end_headers()
+                else:
+                    etag = '"{}"'.format(ticker_str)
+                    if self.headers.get("If-None-Match") == etag:
+                        with server._lock:
+                            server.not_modified_responses += 1
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+
+                    content = server.pages[ticker_str]
+                    self.send_response(200)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self._http_server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{}".format(self._http_server.server_port)
+        self._thread = Thread(target=self._http_server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+
+class TestCryptoCurrencyDataProvider(unittest.TestCase):
+    START_DATE = datetime(2018, 1, 1)
+    END_DATE = datetime(2018, 1, 5)
+    FIELDS = ['Open', 'Close', 'Volume']
+    TICKERS = [CcyTicker('bitcoin'), CcyTicker('ethereum'), CcyTicker('ripple')]
+    FIRST_PRICES = {TICKERS[0]: 100.0, TICKERS[1]: 200.0, TICKERS[2]: 300.0}
+
+    def setUp(self):
+        self.server = _StandInServer({
+            'bitcoin': _recorded_page(100.0),
+            'ethereum': _recorded_page(200.0),
+            'ripple': _recorded_page(300.0)
+        })
+        self.cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        shutil.rmtree(self.cache_directory)
+
+    def _create_provider(self, **kwargs):
+        kwargs.setdefault("backoff_factor", 0.01)
+        provider = CryptoCurrencyDataProvider(base_url=self.server.url, **kwargs)
+        self.addCleanup(provider.close)
+        return provider
+
+    def _get_tickers_data(self, provider, tickers=None):
+        return provider._get_tickers_data(tickers or self.TICKERS, self.FIELDS, self.START_DATE, self.END_DATE)
+
+    def _assert_prices(self, tickers_data_dict, first_prices):
+        self.assertEqual(list(first_prices), list(tickers_data_dict))
+
+        for ticker, first_price in first_prices.items():
+            data_frame = tickers_data_dict[ticker]
+            self.assertEqual(self.FIELDS, list(data_frame.columns))
+
+            # the page lists the dates in the descending order
+            self.assertEqual(list(pd.date_range(self.START_DATE, periods=5)[::-1]), list(data_frame.index))
+            np.testing.assert_almost_equal(first_price + np.arange(5), data_frame['Open'].values)
+            np.testing.assert_almost_equal(first_price + np.arange(5) + 1, data_frame['Close'].values)
+            np.testing.assert_almost_equal(1000 * np.arange(1, 6), data_frame['Volume'].values)
+
+    def test_concurrent_download(self):
+        self.server.delay = 0.3
+        provider = self._create_provider(max_concurrent_requests=3)
+
+        start_time = perf_counter()
+        data = self._get_tickers_data(provider)
+        elapsed_time = perf_counter() - start_time
+
+        self._assert_prices(data, self.FIRST_PRICES)
+        self.assertLess(elapsed_time, 2 * self.server.delay)
+
+    def test_parsing_in_worker_processes(self):
+        provider = self._create_provider(parsing_workers=2)
+        data = self._get_tickers_data(provider)
+        self._assert_prices(data, self.FIRST_PRICES)
+
+        # the worker processes are stopped at the end of the call
+        self.assertEqual([], multiprocessing.active_children())
+
+    def test_failed_requests_are_retried(self):
+        self.server.failures_to_serve = {'ethereum': 2}
+        provider = self._create_provider()
+
+        data = self._get_tickers_data(provider)
+
+        self._assert_prices(data, self.FIRST_PRICES)
+        self.assertEqual(3, self.server.requests.count('ethereum'))
+
+    def test_error_after_all_retries(self):
+        self.server.failures_to_serve = {'ethereum': 3}
+        provider = self._create_provider(max_retries=2)
+
+        with self.assertRaises(ConnectionError):
+            self._get_tickers_data(provider)
+
+    def test_unknown_ticker(self):
+        provider = self._create_provider()
+        tickers = [self.TICKERS[0], CcyTicker('unknown'), self.TICKERS[1]]
+
+        data = self._get_tickers_data(provider, tickers)
+
+        self._assert_prices(data, {self.TICKERS[0]: 100.0, self.TICKERS[1]: 200.0})
+
+    def test_pages_are_revalidated(self):
+        provider = self._create_provider(cache_directory=self.cache_directory)
+        self._get_tickers_data(provider)
+        self.assertEqual(0, self.server.not_modified_responses)
+
+        new_provider = self._create_provider(cache_directory=self.cache_directory)
+        data = self._get_tickers_data(new_provider)
+
+        self._assert_prices(data, self.FIRST_PRICES)
+        self.assertEqual(3, self.server.not_modified_responses)
+
+    def test_requests_are_rate_limited(self):
+        provider = self._create_provider(requests_per_second=10.0)
+
+        start_time = perf_counter()
+        self._get_tickers_data(provider)
+        self.assertGreaterEqual(perf_counter() - start_time, 0.19)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from concurrent.futures import TimeoutError
+from time import sleep, perf_counter
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import QuandlTicker, BloombergTicker, HaverTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.general_price_provider import GeneralPriceProvider
+from qf_lib.data_providers.price_data_provider import DataProvider
+
+
+class _SlowDataProvider(DataProvider):
+    """ Stand-in for a remote data provider, which responds after the delay. Value of a ticker is its number. """
+
+    def __init__(self, ticker_type, delay: float, dates: pd.DatetimeIndex, exception: Exception = None):
+        self.ticker_type = ticker_type
+        self.delay = delay
+        self.dates = dates
+        self.exception = exception
+        self.requested_tickers = []
+
+    def get_price(self, tickers, fields, start_date, end_date=None):
+        self.requested_tickers.append(tickers)
+        sleep(self.delay)
+        if self.exception is not None:
+            raise self.exception
+
+        values = np.empty((len(self.dates), len(tickers), len(fields)))
+        values[:] = [[float(ticker.ticker[-1])] for ticker in tickers]
+        return QFDataArray.create(self.dates, tickers, fields, values)
+
+    def get_history(self, tickers, fields, start_date, end_date=None, **kwargs):
+        return self.get_price(tickers, fields, start_date, end_date)
+
+    def supported_ticker_types(self):
+        return {self.ticker_type}
+
+
+class TestGeneralPriceProviderConcurrency(unittest.TestCase):
+    START_DATE = str_to_date('2017-10-02')
+    END_DATE = str_to_date('2017-10-06')
+
+    BBG_TICKERS = [BloombergTicker('BBG1'), BloombergTicker('BBG2')]
+    QUANDL_TICKERS = [QuandlTicker('Quandl3', 'DB'), QuandlTicker('Quandl4', 'DB')]
+    HAVER_TICKERS = [HaverTicker('Haver5', 'DB')]
+
+    DELAY = 0.3
+
+    def setUp(self):
+        dates = pd.bdate_range(self.START_DATE, self.END_DATE)
+        self.bloomberg = _SlowDataProvider(BloombergTicker, self.DELAY, dates)
+        self.quandl = _SlowDataProvider(QuandlTicker, self.DELAY, dates[1:])
+        self.haver = _SlowDataProvider(HaverTicker, self.DELAY, dates[:-1])
+
+        # tickers of different providers are interleaved
+        self.tickers = [self.BBG_TICKERS[0], self.QUANDL_TICKERS[0], self.HAVER_TICKERS[0], self.BBG_TICKERS[1],
+                        self.QUANDL_TICKERS[1]]
+
+    def test_data_providers_are_called_concurrently_and_once(self):
+        price_provider = GeneralPriceProvider(self.bloomberg, self.quandl, self.haver)
+
+        start_time = perf_counter()
+        data = price_provider.get_price(self.tickers, PriceField.Close, self.START_DATE, self.END_DATE)
+        elapsed_time = perf_counter() - start_time
+
+        self.assertLess(elapsed_time, 2 * self.DELAY)
+        self.assertEqual([self.BBG_TICKERS], self.bloomberg.requested_tickers)
+        self.assertEqual([self.QUANDL_TICKERS], self.quandl.requested_tickers)
+        self.assertEqual([self.HAVER_TICKERS], self.haver.requested_tickers)
+
+        self.assertEqual(PricesDataFrame, type(data))
+        self.assertEqual(self.tickers, list(data.columns))
+        self.assertEqual(5, len(data))
+
+        expected_values = np.array([[1.0, np.nan, 5.0, 2.0, np.nan]] + [[1.0, 3.0, 5.0, 2.0, 4.0]] * 3 +
+                                   [[1.0, 3.0, np.nan, 2.0, 4.0]])
+        np.testing.assert_equal(expected_values, data.values)
+
+    def test_duplicated_tickers(self):
+        price_provider = GeneralPriceProvider(self.bloomberg, self.quandl)
+        tickers = [self.QUANDL_TICKERS[0], self.BBG_TICKERS[0], self.QUANDL_TICKERS[0]]
+
+        data = price_provider.get_price(tickers, [PriceField.Open, PriceField.Close], self.START_DATE, self.END_DATE)
+
+        self.assertEqual(QFDataArray, type(data))
+        self.assertEqual((5, 3, 2), data.shape)
+        np.testing.assert_equal(data.values[1:, 0, :], data.values[1:, 2, :])
+        self.assertEqual([[self.QUANDL_TICKERS[0]]], self.quandl.requested_tickers)
+
+    def test_failure_is_raised(self):
+        self.quandl.exception = ValueError("Service unavailable")
+        price_provider = GeneralPriceProvider(self.bloomberg, self.quandl)
+
+        with self.assertRaises(ValueError):
+            price_provider.get_price(self.tickers[:2], PriceField.Close, self.START_DATE, self.END_DATE)
+
+    def test_partial_results(self):
+        self.quandl.exception = ValueError("Service unavailable")
+        price_provider = GeneralPriceProvider(self.bloomberg, self.quandl, allow_partial_results=True)
+
+        data = price_provider.get_price(self.BBG_TICKERS + self.QUANDL_TICKERS, PriceField.Close, self.START_DATE,
+                                        self.END_DATE)
+
+        np.testing.assert_equal(1.0, data[self.BBG_TICKERS[0]].values)
+        self.assertTrue(data[self.QUANDL_TICKERS].isnull().values.all())
+
+        self.assertEqual(1, len(price_provider.last_failures))
+        data_provider, tickers, exception = price_provider.last_failures[0]
+        self.assertIs(self.quandl, data_provider)
+        self.assertEqual(self.QUANDL_TICKERS, tickers)
+        self.assertIsInstance(exception, ValueError)
+
+    def test_timeout(self):
+        self.haver.delay = 4 * self.DELAY
+        price_provider = GeneralPriceProvider(self.bloomberg, self.quandl, self.haver, allow_partial_results=True)
+        price_provider.set_timeout(self.haver, self.DELAY)
+
+        start_time = perf_counter()
+        data = price_provider.get_price(self.tickers, PriceField.Close, self.START_DATE, self.END_DATE)
+        elapsed_time = perf_counter() - start_time
+
+        self.assertLess(elapsed_time, 3 * self.DELAY)
+        self.assertTrue(data[self.HAVER_TICKERS[0]].isnull().all())
+        self.assertIsInstance(price_provider.last_failures[0][2], TimeoutError)
+
+        price_provider.allow_partial_results = False
+        with self.assertRaises(TimeoutError):
+            price_provider.get_price(self.tickers, PriceField.Close, self.START_DATE, self.END_DATE)
+
+
+if __name__ == '__main__':
+    unittest.main()
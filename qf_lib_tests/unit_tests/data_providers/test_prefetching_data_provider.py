@@ -118,5 +118,14 @@ class TestPrefetchingDataProvider(unittest.TestCase):
             )
 
 
+class TestPrefetchingDataProviderWithArrayBarStore(TestPrefetchingDataProvider):
+    def setUp(self):
+        super().setUp()
+        self.prefetching_data_provider = PrefetchingDataProvider(
+            self.data_provider, self.cached_tickers, self.cached_fields, self.start_date, self.end_date,
+            use_array_bar_store=True
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
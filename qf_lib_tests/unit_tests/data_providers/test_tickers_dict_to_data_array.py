@@ -0,0 +1,96 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.helpers import tickers_dict_to_data_array
+
+
+class TestTickersDictToDataArray(TestCase):
+    def setUp(self):
+        self.dates = pd.date_range("2020-01-01", periods=5, name=DATES)
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+        self.fields = ["PX_LAST", "PX_OPEN"]
+
+    def test_data_frames_with_the_same_dates_and_fields(self):
+        values = np.arange(20, dtype=np.float64).reshape(5, 2, 2)
+        tickers_data_dict = {
+            self.tickers[0]: pd.DataFrame(values[:, 0, :], self.dates, self.fields),
+            self.tickers[1]: pd.DataFrame(values[:, 1, :], self.dates, self.fields)
+        }
+        result = tickers_dict_to_data_array(tickers_data_dict, self.tickers, self.fields)
+
+        self.assertEqual(QFDataArray, type(result))
+        self.assertIsNone(result.name)
+        self._assert_labels_equal(result, self.dates, self.tickers[:2], self.fields)
+        np.testing.assert_array_equal(values, result.values)
+
+    def test_dates_and_fields_are_joined(self):
+        tickers_data_dict = {
+            self.tickers[1]: pd.DataFrame([[1.0, 2.0], [3.0, 4.0]], self.dates[[3, 0]], ["PX_OPEN", "PX_LAST"]),
+            self.tickers[0]: pd.DataFrame([[5.0], [6.0]], self.dates[[1, 3]], ["PX_VOLUME"])
+        }
+        result = tickers_dict_to_data_array(tickers_data_dict, self.tickers, self.fields)
+
+        expected_values = np.full((3, 2, 3), np.nan)
+        expected_values[[2, 0], 0, 1] = [1.0, 3.0]
+        expected_values[[2, 0], 0, 0] = [2.0, 4.0]
+        expected_values[[1, 2], 1, 2] = [5.0, 6.0]
+
+        self._assert_labels_equal(result, self.dates[[0, 1, 3]], [self.tickers[1], self.tickers[0]],
+                                  ["PX_LAST", "PX_OPEN", "PX_VOLUME"])
+        np.testing.assert_array_equal(expected_values, result.values)
+
+    def test_tickers_without_data_are_skipped(self):
+        tickers_data_dict = {
+            self.tickers[0]: pd.DataFrame(columns=self.fields),
+            self.tickers[2]: pd.DataFrame(np.ones((5, 2)), self.dates, self.fields)
+        }
+        result = tickers_dict_to_data_array(tickers_data_dict, self.tickers, self.fields)
+
+        self._assert_labels_equal(result, self.dates, [self.tickers[2]], self.fields)
+        np.testing.assert_array_equal(np.ones((5, 1, 2)), result.values)
+
+    def test_no_data(self):
+        for tickers_data_dict in [dict(), {self.tickers[0]: pd.DataFrame(columns=self.fields)}]:
+            result = tickers_dict_to_data_array(tickers_data_dict, self.tickers, self.fields)
+
+            self.assertEqual((0, 3, 2), result.shape)
+            self.assertEqual(self.tickers, list(result.tickers.values))
+            self.assertEqual(self.fields, list(result.fields.values))
+
+    def test_dtype(self):
+        int_values = np.arange(10).reshape(5, 2)
+        full_data_dict = {ticker: pd.DataFrame(int_values, self.dates, self.fields) for ticker in self.tickers}
+        self.assertEqual(np.int64, tickers_dict_to_data_array(full_data_dict, self.tickers, self.fields).dtype)
+
+        # missing values can't be represented by integers
+        full_data_dict[self.tickers[0]] = full_data_dict[self.tickers[0]].iloc[1:]
+        self.assertEqual(np.float64, tickers_dict_to_data_array(full_data_dict, self.tickers, self.fields).dtype)
+
+    def _assert_labels_equal(self, data_array, expected_dates, expected_tickers, expected_fields):
+        self.assertEqual(list(expected_dates), list(pd.DatetimeIndex(data_array.dates.values)))
+        self.assertEqual(list(expected_tickers), list(data_array.tickers.values))
+        self.assertEqual(list(expected_fields), list(data_array.fields.values))
+
+
+if __name__ == '__main__':
+    unittest.main()